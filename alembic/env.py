@@ -5,6 +5,7 @@ from sqlalchemy import pool
 from alembic import context
 import autobyteus_server.workflow.persistence.conversation.models as models
 import autobyteus_server.prompt_engineering.models as models
+import autobyteus_server.workspaces.persistence.models as models
 
 from autobyteus_server.config import app_config_provider
 
@@ -2,7 +2,6 @@
 import logging
 from typing import Dict, Optional
 from autobyteus.utils.singleton import SingletonMeta
-from autobyteus.llm.llm_factory import LLMFactory
 
 from autobyteus_server.agent_runtime.agent_runtime import AgentRuntime
 from autobyteus_server.agent_runtime.base_agent_streaming_conversation import BaseAgentStreamingConversation
@@ -2,7 +2,6 @@
 import logging
 from typing import List, Optional
 from autobyteus.conversation.user_message import UserMessage
-from autobyteus.llm.llm_factory import LLMFactory
 from autobyteus_server.agent_runtime.base_agent_conversation_manager import BaseAgentConversationManager
 from autobyteus_server.ai_terminal.runtime.ai_terminal_agent_streaming_conversation import AITerminalAgentStreamingConversation
 
@@ -33,6 +32,8 @@ class AITerminalAgentConversationManager(BaseAgentConversationManager):
         Returns:
             AITerminalAgentStreamingConversation: New conversation instance
         """
+        # Imported on use: the factory loads the SDKs of all LLM providers
+        from autobyteus.llm.llm_factory import LLMFactory
         llm = LLMFactory.create_llm(llm_model)
 
         conversation = AITerminalAgentStreamingConversation(
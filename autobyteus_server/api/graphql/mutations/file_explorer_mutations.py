@@ -1,11 +1,25 @@
+import json
 import logging
+from typing import List, Optional
 import strawberry
 from autobyteus_server.workspaces.workspace_manager import WorkspaceManager
 from autobyteus_server.file_explorer.file_system_changes import serialize_change_event
+from autobyteus_server.file_explorer.operations.batch_operation import BatchOperationSpec, BatchOperationType
 
 workspace_manager = WorkspaceManager()
 logger = logging.getLogger(__name__)
 
+FileOperationType = strawberry.enum(BatchOperationType, name="FileOperationType")
+
+@strawberry.input
+class FileOperationInput:
+    type: FileOperationType
+    path: str
+    content: Optional[str] = None
+    destination_path: Optional[str] = None
+    new_name: Optional[str] = None
+    is_file: bool = True
+
 @strawberry.type
 class Mutation:
     """
@@ -13,7 +27,7 @@ class Mutation:
     """
 
     @strawberry.mutation
-    def write_file_content(self, workspace_id: str, file_path: str, content: str) -> str:
+    async def write_file_content(self, workspace_id: str, file_path: str, content: str) -> str:
         """
         Writes new content to the specified file.
         """
@@ -22,11 +36,11 @@ class Mutation:
             raise ValueError("Workspace not found")
 
         file_explorer = workspace.get_file_explorer()
-        change_event = file_explorer.write_file_content(file_path, content)
+        change_event = await file_explorer.write_file_content_async(file_path, content)
         return serialize_change_event(change_event)
 
     @strawberry.mutation
-    def delete_file_or_folder(self, workspace_id: str, path: str) -> str:
+    async def delete_file_or_folder(self, workspace_id: str, path: str) -> str:
         """
         Deletes a file or folder from the workspace.
         """
@@ -35,11 +49,11 @@ class Mutation:
             raise ValueError("Workspace not found")
 
         file_explorer = workspace.get_file_explorer()
-        change_event = file_explorer.remove_file_or_folder(path)
+        change_event = await file_explorer.remove_file_or_folder_async(path)
         return serialize_change_event(change_event)
 
     @strawberry.mutation
-    def move_file_or_folder(self, workspace_id: str, source_path: str, destination_path: str) -> str:
+    async def move_file_or_folder(self, workspace_id: str, source_path: str, destination_path: str) -> str:
         """
         Moves or renames a file or folder within the workspace.
         """
@@ -48,11 +62,11 @@ class Mutation:
             raise ValueError("Workspace not found")
 
         file_explorer = workspace.get_file_explorer()
-        change_event = file_explorer.move_file_or_folder(source_path, destination_path)
+        change_event = await file_explorer.move_file_or_folder_async(source_path, destination_path)
         return serialize_change_event(change_event)
 
     @strawberry.mutation
-    def rename_file_or_folder(self, workspace_id: str, target_path: str, new_name: str) -> str:
+    async def rename_file_or_folder(self, workspace_id: str, target_path: str, new_name: str) -> str:
         """
         Renames a file or folder within the same directory.
         """
@@ -61,11 +75,11 @@ class Mutation:
             raise ValueError("Workspace not found")
 
         file_explorer = workspace.get_file_explorer()
-        change_event = file_explorer.rename_file_or_folder(target_path, new_name)
+        change_event = await file_explorer.rename_file_or_folder_async(target_path, new_name)
         return serialize_change_event(change_event)
 
     @strawberry.mutation
-    def create_file_or_folder(self, workspace_id: str, path: str, is_file: bool) -> str:
+    async def create_file_or_folder(self, workspace_id: str, path: str, is_file: bool) -> str:
         """
         Creates a new file or folder at the specified path within the workspace.
         """
@@ -74,5 +88,80 @@ class Mutation:
             raise ValueError("Workspace not found")
 
         file_explorer = workspace.get_file_explorer()
-        change_event = file_explorer.add_file_or_folder(path, is_file)
+        change_event = await file_explorer.add_file_or_folder_async(path, is_file)
         return serialize_change_event(change_event)
+
+    @strawberry.mutation
+    async def delete_file_or_folder_in_background(self, workspace_id: str, path: str) -> str:
+        """
+        Deletes a file or folder from the workspace tree right away and reclaims the disk space in
+        the background. Follow the reclaim through the background_operation_progress subscription.
+
+        Returns:
+            str: JSON with "operation" and "change_event".
+        """
+        workspace = workspace_manager.get_workspace_by_id(workspace_id)
+        if not workspace:
+            raise ValueError("Workspace not found")
+
+        file_explorer = workspace.get_file_explorer()
+        change_event, operation = await file_explorer.remove_file_or_folder_in_background_async(path)
+        return json.dumps({"operation": operation.to_dict(), "change_event": json.loads(serialize_change_event(change_event))})
+
+    @strawberry.mutation
+    async def move_file_or_folder_in_background(self, workspace_id: str, source_path: str, destination_path: str) -> str:
+        """
+        Moves a file or folder within the workspace. A move to another filesystem copies in the
+        background; its progress is reported through the background_operation_progress subscription
+        and the change event is published on file_system_changed once the data is in place.
+
+        Returns:
+            str: JSON with "operation" and "change_event" (null while the move is running).
+        """
+        workspace = workspace_manager.get_workspace_by_id(workspace_id)
+        if not workspace:
+            raise ValueError("Workspace not found")
+
+        file_explorer = workspace.get_file_explorer()
+        change_event, operation = await file_explorer.move_file_or_folder_in_background_async(source_path, destination_path)
+        serialized_event = json.loads(serialize_change_event(change_event)) if change_event is not None else None
+        return json.dumps({"operation": operation.to_dict(), "change_event": serialized_event})
+
+    @strawberry.mutation
+    def cancel_content_search(self, workspace_id: str, search_id: str) -> bool:
+        """
+        Cancels a running search_workspace_content subscription; it then ends with "cancelled": true.
+
+        Returns:
+            bool: False if no search with that id is running.
+        """
+        workspace = workspace_manager.get_workspace_by_id(workspace_id)
+        if not workspace:
+            raise ValueError("Workspace not found")
+
+        return workspace.get_file_explorer().content_searcher.cancel(search_id)
+
+    @strawberry.mutation
+    async def apply_file_operations(self, workspace_id: str, operations: List[FileOperationInput],
+                                    atomic: bool = False) -> str:
+        """
+        Applies an ordered list of write, add, move, rename and delete operations in one call and
+        returns one merged change event. Operations run until one fails; with atomic set, the
+        operations applied before the failure are rolled back.
+
+        Returns:
+            str: JSON with "applied", "failed_index", "error", "rolled_back" and "change_event".
+        """
+        workspace = workspace_manager.get_workspace_by_id(workspace_id)
+        if not workspace:
+            raise ValueError("Workspace not found")
+
+        file_explorer = workspace.get_file_explorer()
+        specs = [
+            BatchOperationSpec(type=BatchOperationType(operation.type), path=operation.path,
+                               content=operation.content, destination_path=operation.destination_path,
+                               new_name=operation.new_name, is_file=operation.is_file)
+            for operation in operations
+        ]
+        result = await file_explorer.apply_file_operations_async(specs, atomic=atomic)
+        return result.to_json()
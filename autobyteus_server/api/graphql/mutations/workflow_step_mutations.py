@@ -24,7 +24,9 @@ class WorkflowStepMutation:
         context_file_paths: List[ContextFilePathInput],
         requirement: str,
         conversation_id: Optional[str] = None,
-        llm_model: Optional[str] = None
+        llm_model: Optional[str] = None,
+        auto_context: bool = False,
+        context_token_budget: Optional[int] = None
     ) -> str:
         workspace = workspace_manager.get_workspace_by_id(workspace_id)
         if not workspace:
@@ -49,7 +51,9 @@ class WorkflowStepMutation:
             requirement,
             processed_context_files,
             llm_model_name,
-            conversation_id
+            conversation_id,
+            auto_context=auto_context,
+            context_token_budget=context_token_budget
         )
 
         return conversation_id
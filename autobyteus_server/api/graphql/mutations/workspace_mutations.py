@@ -10,7 +10,10 @@ to perform operations on workspaces.
 """
 
 import logging
+from typing import List, Optional
 import strawberry
+from autobyteus_server.file_explorer.file_system_changes import serialize_change_event
+from autobyteus_server.file_explorer.workspace_scope import WorkspaceScope
 from autobyteus_server.workspaces.workspace_manager import WorkspaceManager
 from autobyteus_server.api.graphql.types.workspace_info import WorkspaceInfo
 
@@ -63,15 +66,21 @@ class Mutation:
             return False
 
     @strawberry.mutation
-    async def add_workspace(self, workspace_root_path: str) -> WorkspaceInfo:
+    async def add_workspace(self, workspace_root_path: str, max_depth: Optional[int] = None) -> WorkspaceInfo:
         """
         Adds a new workspace to the workspace service or returns the existing one.
 
         This mutation attempts to add a new workspace with the given root path. If a workspace
         already exists at the specified path, it returns the existing workspace information.
+        A new workspace is returned right away, while its directory tree is scanned in the
+        background: its file explorer holds the part of the tree scanned so far, scanProgress tells
+        whether the scan is done, and the workspaceScanProgress subscription streams the progress
+        and the finished tree.
 
         Args:
             workspace_root_path (str): The root path of the workspace to be added or retrieved.
+            max_depth (Optional[int]): If given, the returned tree only contains this many levels below
+                the root; deeper folders are fetched with the folderChildren query.
 
         Returns:
             WorkspaceInfo: An object containing the workspace ID, name, and file explorer information.
@@ -81,20 +90,53 @@ class Mutation:
         """
         try:
             # Attempt to add the workspace or retrieve existing one
-            workspace = workspace_manager.add_workspace(workspace_root_path)
+            workspace = await workspace_manager.add_workspace_in_background(workspace_root_path)
             logger.info(f"Workspace added/retrieved with ID {workspace.workspace_id} at path {workspace_root_path}.")
 
             # Construct and return the WorkspaceInfo object
             return WorkspaceInfo(
                 workspace_id=workspace.workspace_id,
                 name=workspace.name,
-                file_explorer=workspace.file_explorer.to_json()
+                explorer=workspace.file_explorer,
+                max_depth=max_depth
             )
         except Exception as e:
             error_message = f"Error while adding/retrieving workspace: {str(e)}"
             logger.error(error_message)
             raise  # Re-raise the exception after logging
 
+    @strawberry.mutation
+    async def set_workspace_scope(self, workspace_id: str, include: Optional[List[str]] = None,
+                                  exclude: Optional[List[str]] = None, max_depth: Optional[int] = None,
+                                  max_files: Optional[int] = None) -> str:
+        """
+        Limits a workspace to part of its files, e.g. a few subprojects of a large monorepo.
+
+        Globs use .gitignore syntax relative to the workspace root. Only the folders affected by
+        the change are read again; the changes of the tree are returned and published to the
+        file_system_changed subscribers. Omitting every argument loads the whole workspace again.
+
+        Args:
+            workspace_id (str): The unique identifier of the workspace.
+            include (Optional[List[str]]): Globs of the files to load. Defaults to all files.
+            exclude (Optional[List[str]]): Globs of the files and folders to leave out.
+            max_depth (Optional[int]): The number of folder levels loaded below the root.
+            max_files (Optional[int]): The maximum number of files loaded.
+
+        Returns:
+            str: The serialized change event of the tree.
+
+        Raises:
+            ValueError: If the workspace does not exist or the limits are not positive.
+        """
+        scope = WorkspaceScope(include=tuple(include or ()), exclude=tuple(exclude or ()),
+                               max_depth=max_depth, max_files=max_files)
+        change_event = await workspace_manager.set_workspace_scope(workspace_id, scope)
+        if change_event is None:
+            raise ValueError("Workspace not found")
+        logger.info(f"Scope of workspace ID {workspace_id} set to {scope.to_dict()}.")
+        return serialize_change_event(change_event)
+
     @strawberry.mutation
     async def execute_bash_commands(self, workspace_id: str, command: str) -> CommandExecutionResult:
         """
@@ -6,28 +6,48 @@ This module provides GraphQL queries related to code search operations.
 
 import json
 import logging
+from typing import Optional
 import strawberry
 from strawberry.scalars import JSON
+from autobyteus_server.file_explorer.io_executor import run_io
+from autobyteus_server.workspaces.workspace_manager import WorkspaceManager
+from autobyteus_server.workspaces.workspace_tools.workspace_indexer.workspace_indexer import WorkspaceIndexer
+
+# Singleton instance
+workspace_manager = WorkspaceManager()
+
 logger = logging.getLogger(__name__)
 
 @strawberry.type
 class Query:
     @strawberry.field
-    def search_code_entities(self, query: str) -> JSON:
+    async def search_code_entities(self, workspace_id: str, query: str, limit: int = 20,
+                                   kind: Optional[str] = None) -> JSON:
         """
         Searches for relevant code entities based on the provided query.
 
+        Entities are matched by name: exact matches first, then names starting with the query,
+        then fuzzy matches. Files changed since the last search are re-indexed first.
+
         Args:
+            workspace_id (str): The ID of the workspace.
             query (str): The search query.
+            limit (int): The maximum number of results.
+            kind (Optional[str]): Only return entities of this kind ('class', 'function' or 'method').
 
         Returns:
-            JSON: The search results.
+            JSON: The search results, e.g. {"results": [{"name", "qualified_name", "kind", "path",
+                  "line", "end_line", "score"}, ...]}.
         """
         try:
-            #search_result: SearchResult = search_service.search(query)
-            #return search_result.to_json()
-            return None
+            workspace = workspace_manager.get_workspace_by_id(workspace_id)
+            if not workspace:
+                return json.dumps({"error": "Workspace not found"})
+
+            indexer = WorkspaceIndexer(workspace)
+            results = await run_io(indexer.search, query, limit, kind)
+            return json.dumps({"results": results})
         except Exception as e:
             error_message = f"Error while searching code entities: {str(e)}"
             logger.error(error_message)
-            return json.dumps({"error": error_message})
\ No newline at end of file
+            return json.dumps({"error": error_message})
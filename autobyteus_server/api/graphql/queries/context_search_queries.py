@@ -8,6 +8,7 @@ particularly focused on hackathon workspace searches.
 import logging
 from typing import List
 import strawberry
+from autobyteus_server.file_explorer.io_executor import run_io
 from autobyteus_server.workspaces.workspace_manager import WorkspaceManager
 
 workspace_manager = WorkspaceManager()
@@ -16,16 +17,18 @@ logger = logging.getLogger(__name__)
 @strawberry.type
 class ContextQuery:
     @strawberry.field
-    def hackathon_search(self, workspace_id: str, query: str) -> List[str]:
+    async def hackathon_search(self, workspace_id: str, query: str) -> List[str]:
         """
         Performs a hackathon-specific search within the specified workspace.
 
+        Files are ranked by BM25 relevance of their contents and paths to the query.
+
         Args:
             workspace_id (str): The ID of the workspace to search in.
             query (str): The search query.
 
         Returns:
-            List[str]: A list of file paths that match the search query.
+            List[str]: A list of file paths that match the search query, most relevant first.
         """
         try:
             workspace = workspace_manager.get_workspace_by_id(workspace_id)
@@ -33,7 +36,7 @@ class ContextQuery:
                 logger.error(f"Workspace not found: {workspace_id}")
                 return []
 
-            search_result = workspace.hackathon_search_service.search(query)
+            search_result = await run_io(workspace.hackathon_search_service.search, query)
             return search_result.paths
         except Exception as e:
             error_message = f"Error during hackathon search: {str(e)}"
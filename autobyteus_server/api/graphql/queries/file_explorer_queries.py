@@ -6,10 +6,10 @@ This module provides GraphQL queries related to file explorer operations.
 
 import json
 import logging
-from typing import List
+from typing import List, Optional
 import strawberry
+from strawberry.scalars import JSON
 from autobyteus_server.workspaces.workspace_manager import WorkspaceManager
-from rapidfuzz import process, fuzz
 
 # Singleton instance
 workspace_manager = WorkspaceManager()
@@ -19,7 +19,7 @@ logger = logging.getLogger(__name__)
 @strawberry.type
 class Query:
     @strawberry.field
-    def file_content(self, workspace_id: str, file_path: str) -> str:
+    async def file_content(self, workspace_id: str, file_path: str) -> str:
         """
         Fetches the content of a file using its relative path from the workspace root.
 
@@ -36,7 +36,7 @@ class Query:
                 return json.dumps({"error": "Workspace not found"})
 
             file_explorer = workspace.get_file_explorer()
-            return file_explorer.read_file_content(file_path)
+            return await file_explorer.read_file_content_async(file_path)
         except FileNotFoundError as e:
             return json.dumps({"error": f"File not found: {str(e)}"})
         except PermissionError as e:
@@ -48,37 +48,169 @@ class Query:
             return json.dumps({"error": "An unexpected error occurred while reading the file"})
 
     @strawberry.field
-    def search_files(self, workspace_id: str, query: str) -> List[str]:
+    async def file_content_range(self, workspace_id: str, file_path: str, start_line: Optional[int] = None,
+                                 line_count: Optional[int] = None, byte_offset: Optional[int] = None,
+                                 byte_length: Optional[int] = None) -> JSON:
         """
-        Searches for files matching the query using fuzzy search on file names.
+        Fetches a range of lines or bytes of a file, for viewing files too large to load at once.
+
+        A line range is returned if start_line or line_count is given, otherwise a byte range.
 
         Args:
             workspace_id (str): The ID of the workspace.
-            query (str): The search query.
+            file_path (str): The relative path of the file from the workspace root.
+            start_line (Optional[int]): The 1-based first line. Defaults to 1.
+            line_count (Optional[int]): The number of lines. Defaults to 1000.
+            byte_offset (Optional[int]): The offset of the first byte. Defaults to 0.
+            byte_length (Optional[int]): The number of bytes. Defaults to the maximum of 4MB.
 
         Returns:
-            List[str]: A list of file paths that match the search query.
+            JSON: {"content", "start_byte", "end_byte", "file_size"}, plus "start_line", "end_line"
+                  and "total_lines" for line ranges.
         """
         try:
             workspace = workspace_manager.get_workspace_by_id(workspace_id)
             if not workspace:
-                return []
+                return json.dumps({"error": "Workspace not found"})
 
-            # Get the file name index from the workspace
-            file_name_index = workspace.get_file_name_index()
-            if not file_name_index:
-                return []
+            file_explorer = workspace.get_file_explorer()
+            if start_line is not None or line_count is not None:
+                result = await file_explorer.read_file_lines_async(file_path, start_line or 1,
+                                                                   1000 if line_count is None else line_count)
+            elif byte_length is None:
+                result = await file_explorer.read_file_bytes_async(file_path, byte_offset or 0)
+            else:
+                result = await file_explorer.read_file_bytes_async(file_path, byte_offset or 0, byte_length)
+            return json.dumps(result)
+        except FileNotFoundError as e:
+            return json.dumps({"error": f"File not found: {str(e)}"})
+        except PermissionError as e:
+            return json.dumps({"error": f"Permission denied: {str(e)}"})
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        except Exception as e:
+            logger.error(f"Error reading file range: {str(e)}")
+            return json.dumps({"error": "An unexpected error occurred while reading the file"})
+
+    @strawberry.field
+    def folder_children(self, workspace_id: str, node_id: Optional[str] = None, depth: int = 1,
+                        cursor: Optional[str] = None, limit: int = 500) -> JSON:
+        """
+        Fetches the children of a folder of the workspace tree, for expanding the tree on demand.
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+            node_id (Optional[str]): The id of the folder node. Defaults to the workspace root.
+            depth (int): Number of levels to return below the folder.
+            cursor (Optional[str]): The next_cursor of a previous page of the same folder.
+            limit (int): Maximum number of children returned per folder.
+
+        Returns:
+            JSON: {"node_id", "children", "next_cursor"}, where children have the shape of the
+                  workspace tree nodes and folders not yet expanded have "has_children" set.
+        """
+        try:
+            workspace = workspace_manager.get_workspace_by_id(workspace_id)
+            if not workspace:
+                return json.dumps({"error": "Workspace not found"})
+
+            file_explorer = workspace.get_file_explorer()
+            page = file_explorer.get_children_page(node_id=node_id, depth=depth, cursor=cursor, limit=limit)
+            return json.dumps(page)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        except Exception as e:
+            logger.error(f"Error fetching folder children: {str(e)}")
+            return json.dumps({"error": "An unexpected error occurred while fetching folder children"})
+
+    @strawberry.field
+    def file_system_watch_metrics(self, workspace_id: str) -> JSON:
+        """
+        Reports how the file system of a workspace is watched: the backend in use, the number of
+        watches against the budget, the polling cost and event statistics.
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+
+        Returns:
+            JSON: The watcher metrics, with "backend" set to null if the workspace is not watched.
+        """
+        try:
+            workspace = workspace_manager.get_workspace_by_id(workspace_id)
+            if not workspace:
+                return json.dumps({"error": "Workspace not found"})
 
-            # Perform fuzzy search using rapidfuzz
-            matches = process.extract(
-                query,
-                file_name_index.keys(),
-                limit=10,
-                scorer=fuzz.WRatio
-            )
+            file_watcher = workspace.get_file_explorer().file_watcher
+            if file_watcher is None:
+                return json.dumps({"backend": None})
+            return json.dumps(file_watcher.get_metrics())
+        except Exception as e:
+            logger.error(f"Error fetching watch metrics: {str(e)}")
+            return json.dumps({"error": "An unexpected error occurred while fetching watch metrics"})
+
+    @strawberry.field
+    def file_content_cache_stats(self, workspace_id: str) -> JSON:
+        """
+        Reports the hit, miss, eviction and invalidation counts and the size of the file content
+        cache of a workspace.
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+
+        Returns:
+            JSON: {"hits", "misses", "evictions", "invalidations", "entries", "bytes", "max_bytes"}.
+        """
+        try:
+            workspace = workspace_manager.get_workspace_by_id(workspace_id)
+            if not workspace:
+                return json.dumps({"error": "Workspace not found"})
+
+            return json.dumps(workspace.get_file_explorer().content_cache.get_stats())
+        except Exception as e:
+            logger.error(f"Error fetching content cache stats: {str(e)}")
+            return json.dumps({"error": "An unexpected error occurred while fetching content cache stats"})
+
+    @strawberry.field
+    def background_operations(self, workspace_id: str) -> JSON:
+        """
+        Lists the running and recently finished background operations of a workspace.
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+
+        Returns:
+            JSON: A list of operations with "operation_id", "kind", "status", "bytes_done", "bytes_total", ...
+        """
+        try:
+            workspace = workspace_manager.get_workspace_by_id(workspace_id)
+            if not workspace:
+                return json.dumps({"error": "Workspace not found"})
+
+            operations = workspace.get_file_explorer().background_operations.list_operations()
+            return json.dumps([operation.to_dict() for operation in operations])
+        except Exception as e:
+            logger.error(f"Error fetching background operations: {str(e)}")
+            return json.dumps({"error": "An unexpected error occurred while fetching background operations"})
+
+    @strawberry.field
+    async def search_files(self, workspace_id: str, query: str, limit: int = 10) -> List[str]:
+        """
+        Searches for files matching the query using fuzzy search on their relative paths.
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+            query (str): The search query, e.g. 'butt' or 'src/comp/butt'.
+            limit (int): The maximum number of results.
+
+        Returns:
+            List[str]: A list of file paths that match the search query, best first.
+        """
+        try:
+            workspace = workspace_manager.get_workspace_by_id(workspace_id)
+            if not workspace:
+                return []
 
-            # Return the matched file paths
-            return [file_name_index[match[0]] for match in matches]
+            return await workspace.get_file_explorer().find_files_async(query, limit)
         except Exception as e:
             logger.error(f"Error searching files: {str(e)}")
             return []
\ No newline at end of file
@@ -6,7 +6,7 @@ This module provides GraphQL queries related to workspace operations.
 
 import json
 import logging
-from typing import List
+from typing import List, Optional
 
 import strawberry
 from strawberry.scalars import JSON
@@ -93,10 +93,25 @@ class Query:
             )
 
     @strawberry.field
-    def all_workspaces(self) -> List[WorkspaceInfo]:
+    def workspace_memory_usage(self) -> JSON:
+        """
+        Estimates the memory held by each workspace.
+
+        Returns:
+            JSON: Per workspace ID: "loaded", "idle_seconds", and the bytes of its "tree",
+                "content_cache", "symbol_index" and "search_index", and their "total".
+        """
+        return json.dumps(workspace_manager.get_memory_usage())
+
+    @strawberry.field
+    def all_workspaces(self, max_depth: Optional[int] = None) -> List[WorkspaceInfo]:
         """
         Retrieves all workspaces.
 
+        Args:
+            max_depth (Optional[int]): If given, the returned trees only contain this many levels
+                below their roots.
+
         Returns:
             List[WorkspaceInfo]: A list of all workspace information objects.
         """
@@ -107,7 +122,8 @@ class Query:
                 WorkspaceInfo(
                     workspace_id=ws.workspace_id,
                     name=ws.name,
-                    file_explorer=ws.file_explorer.to_json()
+                    explorer=ws.file_explorer,
+                    max_depth=max_depth
                 ) for ws in workspaces
             ]
         except Exception as e:
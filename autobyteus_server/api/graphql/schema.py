@@ -10,6 +10,7 @@ from autobyteus_server.api.graphql.mutations import llm_provider_mutations
 from autobyteus_server.api.graphql.mutations import prompt_mutations
 from autobyteus_server.api.graphql.mutations import server_settings_mutations  # New import
 from autobyteus_server.api.graphql.subscriptions import workflow_step_subscriptions
+from autobyteus_server.api.graphql.subscriptions import file_system_subscription
 from autobyteus_server.api.graphql.queries import (
     context_search_queries,
     workspace_queries,
@@ -50,6 +51,7 @@ class Mutation(
 @strawberry.type
 class Subscription(
     workflow_step_subscriptions.Subscription,
+    file_system_subscription.FileSystemSubscription,
 ):
     pass
 
@@ -1,7 +1,11 @@
 import asyncio
+import json
 import strawberry
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from autobyteus_server.workspaces.workspace_manager import WorkspaceManager
+from autobyteus_server.file_explorer.content_search import DEFAULT_MAX_RESULTS, ContentSearchQuery
+from autobyteus_server.file_explorer.io_executor import run_io
+from autobyteus_server.file_explorer.tree_scan import TreeScanStatus
 
 workspace_manager = WorkspaceManager()
 
@@ -12,22 +16,108 @@ class FileSystemSubscription:
     """
 
     @strawberry.subscription
-    async def file_system_changed(self, workspace_id: str) -> AsyncGenerator[str, None]:
+    async def file_system_changed(self, workspace_id: str, after_sequence: Optional[int] = None,
+                                  epoch: Optional[str] = None) -> AsyncGenerator[str, None]:
         """
         Subscription that notifies when the file system is changed.
-        Retrieves the workspace, accesses its FileExplorer's FileWatcher,
-        and yields the latest event (if available) followed by new events.
+        Every subscriber receives all events of the workspace. To resume after a reconnect, pass the
+        sequence and epoch of the last event received; missed events are replayed if still buffered,
+        otherwise a message with "resync_required": true asks the client to reload the tree.
         
         Args:
             workspace_id (str): The ID of the workspace to listen for file system changes.
+            after_sequence (Optional[int]): The sequence number of the last event the client received.
+            epoch (Optional[str]): The epoch of the last event the client received.
         
         Yields:
-            str: The serialized FileSystemChangeEvent as JSON.
+            str: The serialized FileSystemChangeEvent as JSON, with "sequence" and "epoch".
         """
         workspace = workspace_manager.get_workspace_by_id(workspace_id)
         if not workspace:
             raise Exception("Workspace not found")
 
-        file_watcher = workspace.file_explorer.file_watcher
-        async for change_event in file_watcher.events():
+        async for change_event in workspace.file_explorer.change_hub.subscribe(after_sequence, epoch):
             yield change_event
+
+    @strawberry.subscription
+    async def background_operation_progress(self, workspace_id: str,
+                                            operation_id: Optional[str] = None) -> AsyncGenerator[str, None]:
+        """
+        Subscription that reports the progress of background file operations (background deletes,
+        moves to another filesystem and the cleanup of interrupted operations).
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+            operation_id (Optional[str]): Only follow this operation; the subscription ends when it
+                finishes. By default all operations of the workspace are reported.
+
+        Yields:
+            str: The operation as JSON, with "status", "bytes_done", "bytes_total" and "files_done".
+        """
+        workspace = workspace_manager.get_workspace_by_id(workspace_id)
+        if not workspace:
+            raise Exception("Workspace not found")
+
+        async for operation in workspace.file_explorer.background_operations.watch(operation_id):
+            yield operation
+
+    @strawberry.subscription
+    async def search_workspace_content(self, workspace_id: str, pattern: str, is_regex: bool = False,
+                                       case_sensitive: bool = False,
+                                       max_results: int = DEFAULT_MAX_RESULTS) -> AsyncGenerator[str, None]:
+        """
+        Searches the contents of the workspace files and streams the matching lines as they are found.
+        Ignored and binary files are skipped. The search stops after max_results matching lines,
+        when the subscription is closed or when cancel_content_search is called with its id.
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+            pattern (str): The text, or regular expression if is_regex is set, to search for.
+            is_regex (bool): Whether pattern is a regular expression.
+            case_sensitive (bool): Whether the search is case-sensitive.
+            max_results (int): The maximum number of matching lines.
+
+        Yields:
+            str: JSON with "search_id" and "matches" (each with "path", "line_number", "line",
+                 "match_start" and "match_end"); the first message has no matches, the last one has
+                 "done": true with "match_count", "files_searched", "truncated" and "cancelled".
+        """
+        workspace = workspace_manager.get_workspace_by_id(workspace_id)
+        if not workspace:
+            raise Exception("Workspace not found")
+
+        query = ContentSearchQuery(pattern=pattern, is_regex=is_regex, case_sensitive=case_sensitive,
+                                   max_results=max_results)
+        async for message in workspace.file_explorer.content_searcher.stream(query):
+            yield json.dumps(message)
+
+
+    @strawberry.subscription
+    async def workspace_scan_progress(self, workspace_id: str,
+                                      max_depth: Optional[int] = None) -> AsyncGenerator[str, None]:
+        """
+        Subscription that reports the progress of the scan building the directory tree of a
+        workspace added in the background. It ends when the scan is finished; if the scan already
+        finished, only the final message is sent.
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+            max_depth (Optional[int]): Limits the depth of the tree in the final message, like the
+                max_depth of addWorkspace.
+
+        Yields:
+            str: JSON with "status", "directories_scanned" and "files_scanned"; the final message of
+                 a completed scan also has the "tree".
+        """
+        workspace = workspace_manager.get_workspace_by_id(workspace_id)
+        if not workspace:
+            raise Exception("Workspace not found")
+
+        file_explorer = workspace.file_explorer
+        async for progress in file_explorer.scan_progress.watch():
+            if progress["status"] != TreeScanStatus.COMPLETED.value:
+                yield json.dumps(progress)
+                continue
+            # The tree is already JSON; splice it in instead of decoding and encoding it again
+            tree_json = await run_io(file_explorer.to_json, max_depth)
+            yield json.dumps(progress)[:-1] + ', "tree": ' + (tree_json or 'null') + '}'
@@ -1,8 +1,54 @@
+import json
+from typing import Optional
+
 import strawberry
 from strawberry.scalars import JSON
 
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+
 @strawberry.type
 class WorkspaceInfo:
     workspace_id: str
     name: str  # The name of the workspace, set to root_path
-    file_explorer: JSON  # This will be a JSON representation of the file explorer
\ No newline at end of file
+    # None for a workspace released to save memory; it is loaded again when accessed by its id
+    explorer: strawberry.Private[Optional[FileExplorer]]
+    max_depth: strawberry.Private[Optional[int]] = None
+
+    @strawberry.field
+    def loaded(self) -> bool:
+        """
+        Whether the workspace holds its tree in memory. Released workspaces have no file_explorer
+        and scan_progress until they are accessed again.
+        """
+        return self.explorer is not None
+
+    @strawberry.field
+    def file_explorer(self) -> Optional[JSON]:
+        """
+        The JSON representation of the file explorer. It is only serialized, by the streaming tree
+        serializer, when a query selects this field.
+        """
+        if self.explorer is None:
+            return None
+        return self.explorer.to_json(max_depth=self.max_depth)
+
+    @strawberry.field
+    def scan_progress(self) -> Optional[JSON]:
+        """
+        The progress of the directory tree scan: "status" (pending, scanning, completed or failed),
+        "directories_scanned" and "files_scanned". While scanning, file_explorer is partial.
+        """
+        if self.explorer is None:
+            return None
+        return json.dumps(self.explorer.scan_progress.to_dict())
+
+    @strawberry.field
+    def scope(self) -> Optional[JSON]:
+        """
+        The part of the workspace that is loaded: "include" and "exclude" globs, "max_depth",
+        "max_files", and "truncated" if files were left out because of max_files.
+        """
+        if self.explorer is None:
+            return None
+        return json.dumps(self.explorer.get_scope_status())
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 import os
 import logging
+from typing import Optional
 from autobyteus_server.workspaces.workspace_manager import WorkspaceManager
 
 router = APIRouter(prefix="/files", tags=["files"])
@@ -11,6 +12,33 @@ logger = logging.getLogger(__name__)
 
 workspace_manager = WorkspaceManager()
 
+@router.get("/{workspace_id}/range")
+def stream_file_range(workspace_id: str, path: str, start_line: Optional[int] = None,
+                      line_count: Optional[int] = None, offset: Optional[int] = None,
+                      length: Optional[int] = None):
+    """
+    Streams a line range (start_line/line_count) or a byte range (offset/length) of a workspace
+    file, without a size limit. The range is described in the X-Start-Byte, X-End-Byte, X-File-Size
+    and, for line ranges, X-Start-Line and X-Total-Lines headers.
+    """
+    workspace = workspace_manager.get_workspace_by_id(workspace_id)
+    if not workspace:
+        logger.error(f"Invalid workspace ID: {workspace_id}")
+        raise HTTPException(status_code=400, detail="Invalid workspace ID.")
+
+    try:
+        chunks, info = workspace.get_file_explorer().open_file_range_stream(
+            path, start_line=start_line, line_count=line_count, offset=offset, length=length)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found.")
+    except PermissionError:
+        raise HTTPException(status_code=403, detail="Permission denied.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {f"X-{key.replace('_', '-').title()}": str(value) for key, value in info.items()}
+    return StreamingResponse(chunks, media_type="text/plain; charset=utf-8", headers=headers)
+
 @router.get("/{workspace_id}/{category}/{filename}")
 async def get_file(workspace_id: str, category: str, filename: str):
     # Validate workspace
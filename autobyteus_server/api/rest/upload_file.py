@@ -4,6 +4,7 @@ import os
 import uuid
 import logging
 from typing import List
+from autobyteus_server.file_explorer.io_executor import run_io
 from autobyteus_server.workspaces.workspace_manager import WorkspaceManager
 
 router = APIRouter()
@@ -119,16 +120,10 @@ async def upload_file(
         logger.exception("Error reading file.")
         raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
 
-    # Check workspace storage quota
-    total_size = 0
-    for root, dirs, files in os.walk(BASE_UPLOAD_DIRECTORY):
-        for f in files:
-            fp = os.path.join(root, f)
-            try:
-                total_size += os.path.getsize(fp)
-            except Exception as e:
-                logger.warning(f"Could not get size for file {fp}: {str(e)}")
-    if total_size + len(content) > MAX_WORKSPACE_STORAGE:
+    # Check workspace storage quota against the sizes the workspace tree already knows
+    file_explorer = workspace.file_explorer
+    usage = await run_io(file_explorer.directory_stats.get_usage, "uploads")
+    if usage.byte_count + len(content) > MAX_WORKSPACE_STORAGE:
         logger.error("Workspace storage quota exceeded.")
         raise HTTPException(status_code=400, detail="Workspace storage quota exceeded.")
 
@@ -154,6 +149,7 @@ async def upload_file(
         with open(file_path, "wb") as buffer:
             buffer.write(content)
         logger.info(f"File saved successfully: {file_path}")
+        file_explorer.directory_stats.record_file(os.path.join("uploads", category, unique_filename), len(content))
     except Exception as e:
         logger.exception("Failed to save file.")
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
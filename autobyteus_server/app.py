@@ -14,7 +14,7 @@ from strawberry.fastapi import GraphQLRouter
 from strawberry.subscriptions import GRAPHQL_TRANSPORT_WS_PROTOCOL, GRAPHQL_WS_PROTOCOL
 from autobyteus_server.config import app_config_provider
 from autobyteus_server.config.app_config import AppConfigError
-from autobyteus_server.startup import run_migrations
+from autobyteus_server.startup import run_migrations, restore_workspaces
 
 # Set up minimal logging before config is initialized
 logging.basicConfig(
@@ -57,6 +57,8 @@ except Exception as e:
 from autobyteus_server.api.graphql.schema import schema
 from autobyteus_server.api.rest import router as rest_router
 from autobyteus_server.api.websocket.real_time_audio_router import transcription_router
+from autobyteus_server.file_explorer.io_executor import shutdown_io_executor
+from autobyteus_server.file_explorer.content_search import shutdown_search_process_pool
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -67,6 +69,8 @@ async def lifespan(app: FastAPI):
         logger.info("Starting up AutoByteus server...")
         # Run database migrations
         run_migrations()
+        # Register the workspaces of the previous run without building them
+        restore_workspaces()
         logger.info("Startup complete")
         yield
     except Exception as e:
@@ -74,6 +78,8 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         logger.info("Shutting down AutoByteus server...")
+        shutdown_io_executor()
+        shutdown_search_process_pool()
         logger.info("Shutdown complete")
 
 # Create FastAPI app with lifespan
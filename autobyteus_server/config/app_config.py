@@ -224,6 +224,16 @@ class AppConfig:
         logs_dir.mkdir(exist_ok=True)
         return logs_dir
 
+    def get_workspace_snapshots_dir(self) -> Path:
+        snapshots_dir = self.data_dir / 'workspace_snapshots'
+        snapshots_dir.mkdir(exist_ok=True)
+        return snapshots_dir
+
+    def get_workspace_indexes_dir(self) -> Path:
+        indexes_dir = self.data_dir / 'workspace_indexes'
+        indexes_dir.mkdir(exist_ok=True)
+        return indexes_dir
+
     def get_download_dir(self) -> Path:
         download_dir = self.data_dir / 'download'
         download_dir.mkdir(exist_ok=True)
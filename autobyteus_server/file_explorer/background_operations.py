@@ -0,0 +1,449 @@
+"""
+File operations that finish in the background.
+
+Deleting a huge folder or moving one to another filesystem takes as long as the disk needs. In
+background mode these operations update the tree right away, or as soon as the data is in place,
+and do the slow part on the background executor:
+
+- Delete renames the target into a trash directory on the same filesystem (a cheap rename),
+  removes it from the tree and emits the change event immediately. The space is reclaimed
+  afterwards.
+- A move within one filesystem is a rename and completes immediately. A move to another filesystem
+  copies the data into a staging directory next to the destination, reporting progress, and then
+  moves the node in the tree and emits the change event. The source is reclaimed like a delete.
+
+Trash and staging directories are named TRASH_DIRECTORY_NAME and are ignored by the tree. The
+workspace trash directory is at the workspace root; staging directories on other filesystems are
+recorded there, so whatever an interrupted operation left behind is removed by
+cleanup_interrupted() the next time the workspace is opened.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from autobyteus_server.file_explorer.file_system_changes import FileSystemChangeEvent
+from autobyteus_server.file_explorer.io_executor import background_stop_event, get_background_executor
+from autobyteus_server.file_explorer.operations.move_file_operation import MoveFileOperation
+from autobyteus_server.file_explorer.operations.remove_file_operation import RemoveFileOperation
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+logger = logging.getLogger(__name__)
+
+TRASH_DIRECTORY_NAME = '.autobyteus-trash'
+_STAGING_MARKER_SUFFIX = '.staging'
+_COPY_CHUNK_SIZE = 1024 * 1024
+_PROGRESS_INTERVAL_SECONDS = 0.1
+_MAX_FINISHED_OPERATIONS = 100
+
+
+class BackgroundOperationStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class BackgroundOperation:
+    """
+    The state of one background operation.
+
+    Attributes:
+        operation_id: The id of the operation.
+        kind: "delete", "move" or "cleanup".
+        path: The relative path the operation applies to.
+        destination_path: The relative destination of a move.
+        status: Running, completed or failed.
+        bytes_total: The number of bytes to copy, for moves to another filesystem.
+        bytes_done: The number of bytes copied or reclaimed so far.
+        files_done: The number of files copied or reclaimed so far.
+        error: The error of a failed operation.
+    """
+    operation_id: str
+    kind: str
+    path: str
+    destination_path: Optional[str] = None
+    status: BackgroundOperationStatus = BackgroundOperationStatus.RUNNING
+    bytes_total: Optional[int] = None
+    bytes_done: int = 0
+    files_done: int = 0
+    error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    version: int = 0
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status != BackgroundOperationStatus.RUNNING
+
+    def to_dict(self) -> dict:
+        return {
+            "operation_id": self.operation_id,
+            "kind": self.kind,
+            "path": self.path,
+            "destination_path": self.destination_path,
+            "status": self.status.value,
+            "bytes_total": self.bytes_total,
+            "bytes_done": self.bytes_done,
+            "files_done": self.files_done,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class BackgroundOperationManager:
+    """
+    Runs the background operations of one workspace and broadcasts their progress.
+    """
+
+    def __init__(self, file_explorer: 'FileExplorer'):
+        self.file_explorer = file_explorer
+        self._operations: 'OrderedDict[str, BackgroundOperation]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def trash_directory(self) -> str:
+        return os.path.join(self.file_explorer.workspace_root_path, TRASH_DIRECTORY_NAME)
+
+    def get_operation(self, operation_id: str) -> Optional[BackgroundOperation]:
+        return self._operations.get(operation_id)
+
+    def list_operations(self) -> List[BackgroundOperation]:
+        with self._lock:
+            return list(self._operations.values())
+
+    def delete(self, path: str) -> Tuple[FileSystemChangeEvent, BackgroundOperation]:
+        """
+        Moves a file or folder into the trash and removes it from the tree; the space is reclaimed
+        in the background. Blocks only for the rename, so call it from the I/O executor.
+
+        Args:
+            path (str): The relative path of the file or folder.
+
+        Returns:
+            Tuple[FileSystemChangeEvent, BackgroundOperation]: The (not yet published) change event
+                and the reclaim operation.
+
+        Raises:
+            ValueError: If the path is not valid, as for remove_file_or_folder.
+        """
+        operation = self._start('delete', path)
+        absolute_path = os.path.normpath(os.path.join(self.file_explorer.workspace_root_path, path))
+        try:
+            staging_directory = self._staging_directory(os.path.dirname(absolute_path), operation)
+            trash_path = os.path.join(staging_directory, f"{operation.operation_id}-{os.path.basename(absolute_path)}")
+            remove_operation = RemoveFileOperation(self.file_explorer, path, trash_path=trash_path)
+            with self.file_explorer.tree_lock:
+                change_event = remove_operation.execute()
+            self.file_explorer.content_cache.invalidate(absolute_path, recursive=True)
+        except Exception as e:
+            self._finish(operation, e)
+            raise
+        get_background_executor().submit(self._run_reclaim, operation, [trash_path])
+        return change_event, operation
+
+    def move(self, source_path: str, destination_path: str) -> Tuple[Optional[FileSystemChangeEvent], BackgroundOperation]:
+        """
+        Moves a file or folder. Within one filesystem this is a rename and the change event is
+        returned right away; otherwise the data is copied in the background and the change event
+        is published once it is in place.
+
+        Returns:
+            Tuple[Optional[FileSystemChangeEvent], BackgroundOperation]: The (not yet published)
+                change event of an immediate move, or None, and the operation.
+
+        Raises:
+            ValueError: If the paths are not valid, as for move_file_or_folder.
+        """
+        operation = self._start('move', source_path, destination_path)
+        move_operation = MoveFileOperation(self.file_explorer, source_path, destination_path)
+        try:
+            normalized_source, absolute_source, final_destination = move_operation.resolve()
+            if _same_device(absolute_source, os.path.dirname(final_destination)):
+                with self.file_explorer.tree_lock:
+                    change_event = move_operation.execute()
+                self._invalidate(absolute_source, final_destination)
+                self._finish(operation)
+                return change_event, operation
+            operation.bytes_total = _measure(absolute_source)
+        except Exception as e:
+            self._finish(operation, e)
+            raise
+        get_background_executor().submit(self._run_cross_device_move, operation, move_operation,
+                                         normalized_source, absolute_source, final_destination)
+        return None, operation
+
+    def cleanup_interrupted(self) -> Optional[BackgroundOperation]:
+        """
+        Reclaims the trash and the staging directories left behind by operations that were
+        interrupted, e.g. by a server restart.
+
+        Returns:
+            Optional[BackgroundOperation]: The cleanup operation, or None if there is nothing to clean up.
+        """
+        trash_directory = self.trash_directory
+        if not os.path.isdir(trash_directory):
+            return None
+        leftovers = []
+        for entry in os.listdir(trash_directory):
+            entry_path = os.path.join(trash_directory, entry)
+            if entry == '.gitignore':
+                continue
+            if entry.endswith(_STAGING_MARKER_SUFFIX):
+                leftovers.extend(self._read_staging_marker(entry_path))
+            leftovers.append(entry_path)
+        if not leftovers:
+            return None
+        operation = self._start('cleanup', TRASH_DIRECTORY_NAME)
+        logger.info(f"Cleaning up {len(leftovers)} leftovers of interrupted operations in "
+                    f"{self.file_explorer.workspace_root_path}")
+        get_background_executor().submit(self._run_reclaim, operation, leftovers)
+        return operation
+
+    async def watch(self, operation_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Yields the JSON state of operations whenever they change, starting with their current state.
+
+        Args:
+            operation_id (Optional[str]): Only follow this operation, until it finishes. By default
+                all operations of the workspace are followed, without end.
+        """
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        self._waiters.add(waiter)
+        seen: Dict[str, int] = {}
+        try:
+            while True:
+                event.clear()
+                if operation_id is not None:
+                    operation = self.get_operation(operation_id)
+                    if operation is None:
+                        raise ValueError(f"Background operation not found: {operation_id}")
+                    operations = [operation]
+                else:
+                    operations = self.list_operations()
+                for operation in operations:
+                    version = operation.version
+                    if seen.get(operation.operation_id) != version:
+                        seen[operation.operation_id] = version
+                        yield json.dumps(operation.to_dict())
+                if operation_id is not None and operations[0].is_finished:
+                    return
+                await event.wait()
+        finally:
+            self._waiters.discard(waiter)
+
+    def _start(self, kind: str, path: str, destination_path: Optional[str] = None) -> BackgroundOperation:
+        operation = BackgroundOperation(operation_id=uuid.uuid4().hex[:12], kind=kind, path=path,
+                                        destination_path=destination_path)
+        with self._lock:
+            self._operations[operation.operation_id] = operation
+            finished = [key for key, value in self._operations.items() if value.is_finished]
+            for key in finished[:max(0, len(finished) - _MAX_FINISHED_OPERATIONS)]:
+                del self._operations[key]
+        self._notify(operation)
+        return operation
+
+    def _finish(self, operation: BackgroundOperation, error: Optional[Exception] = None) -> None:
+        operation.status = BackgroundOperationStatus.FAILED if error else BackgroundOperationStatus.COMPLETED
+        operation.error = str(error) if error else None
+        operation.finished_at = time.time()
+        self._remove_staging_directories(operation)
+        if error:
+            logger.error(f"Background {operation.kind} of {operation.path} failed: {error}")
+        self._notify(operation)
+
+    def _notify(self, operation: BackgroundOperation) -> None:
+        operation.version += 1
+        for loop, event in list(self._waiters):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+
+    def _invalidate(self, *absolute_paths: str) -> None:
+        for absolute_path in absolute_paths:
+            self.file_explorer.content_cache.invalidate(absolute_path, recursive=True)
+
+    def _publish(self, change_event: FileSystemChangeEvent) -> None:
+        loop = self.file_explorer.loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.file_explorer.publish_change_event, change_event)
+        else:
+            self.file_explorer.publish_change_event(change_event)
+
+    def _staging_directory(self, directory: str, operation: BackgroundOperation) -> str:
+        """
+        Returns a trash directory on the same filesystem as directory, creating it if needed.
+        Directories other than the workspace trash are recorded so they are cleaned up after an
+        interruption.
+        """
+        trash_directory = self.trash_directory
+        if not os.path.isdir(trash_directory):
+            os.makedirs(trash_directory)
+            with open(os.path.join(trash_directory, '.gitignore'), 'w', encoding='utf-8') as gitignore:
+                gitignore.write('*\n')
+        if _same_device(directory, trash_directory):
+            return trash_directory
+        staging_directory = os.path.join(directory, TRASH_DIRECTORY_NAME)
+        os.makedirs(staging_directory, exist_ok=True)
+        marker_path = os.path.join(trash_directory, operation.operation_id + _STAGING_MARKER_SUFFIX)
+        with open(marker_path, 'a', encoding='utf-8') as marker:
+            marker.write(staging_directory + '\n')
+        return staging_directory
+
+    def _read_staging_marker(self, marker_path: str) -> List[str]:
+        root_path = self.file_explorer.workspace_root_path + os.sep
+        with open(marker_path, 'r', encoding='utf-8') as marker:
+            staging_directories = [line.strip() for line in marker if line.strip()]
+        # Only staging directories inside the workspace are ever removed
+        return [os.path.join(directory, entry)
+                for directory in staging_directories
+                if directory.startswith(root_path) and os.path.basename(directory) == TRASH_DIRECTORY_NAME
+                and os.path.isdir(directory)
+                for entry in os.listdir(directory)]
+
+    def _remove_staging_directories(self, operation: BackgroundOperation) -> None:
+        marker_path = os.path.join(self.trash_directory, operation.operation_id + _STAGING_MARKER_SUFFIX)
+        if not os.path.exists(marker_path):
+            return
+        with open(marker_path, 'r', encoding='utf-8') as marker:
+            staging_directories = [line.strip() for line in marker if line.strip()]
+        for staging_directory in staging_directories:
+            try:
+                os.rmdir(staging_directory)
+            except OSError:
+                pass  # Still used by another operation
+        os.remove(marker_path)
+
+    def _run_reclaim(self, operation: BackgroundOperation, paths: List[str]) -> None:
+        try:
+            for path in paths:
+                self._remove(operation, path)
+            self._finish(operation)
+        except Exception as e:
+            self._finish(operation, e)
+
+    def _remove(self, operation: BackgroundOperation, path: str, count_progress: bool = True) -> None:
+        """
+        Removes a file or folder bottom-up, counting progress unless count_progress is False. Stops
+        (leaving the rest in the trash) when the server shuts down.
+        """
+        if not os.path.isdir(path) or os.path.islink(path):
+            if os.path.lexists(path):
+                if count_progress:
+                    operation.bytes_done += os.lstat(path).st_size
+                    operation.files_done += 1
+                os.remove(path)
+            return
+        last_notified = time.monotonic()
+        for directory, directory_names, file_names in os.walk(path, topdown=False):
+            if background_stop_event.is_set():
+                raise InterruptedError("Stopped by shutdown")
+            for name in file_names:
+                file_path = os.path.join(directory, name)
+                if count_progress:
+                    operation.bytes_done += os.lstat(file_path).st_size
+                    operation.files_done += 1
+                os.remove(file_path)
+            for name in directory_names:
+                directory_path = os.path.join(directory, name)
+                if os.path.islink(directory_path):
+                    os.remove(directory_path)
+                else:
+                    os.rmdir(directory_path)
+            if count_progress and time.monotonic() - last_notified > _PROGRESS_INTERVAL_SECONDS:
+                last_notified = time.monotonic()
+                self._notify(operation)
+        os.rmdir(path)
+
+    def _run_cross_device_move(self, operation: BackgroundOperation, move_operation: MoveFileOperation,
+                               normalized_source: str, absolute_source: str, final_destination: str) -> None:
+        partial_path = None
+        try:
+            staging_directory = self._staging_directory(os.path.dirname(final_destination), operation)
+            partial_path = os.path.join(staging_directory, f"{operation.operation_id}-{os.path.basename(final_destination)}")
+            progress = _CopyProgress(self, operation)
+            if os.path.isdir(absolute_source) and not os.path.islink(absolute_source):
+                shutil.copytree(absolute_source, partial_path, symlinks=True, copy_function=progress.copy)
+            else:
+                progress.copy(absolute_source, partial_path)
+
+            source_staging_directory = self._staging_directory(os.path.dirname(absolute_source), operation)
+            source_trash_path = os.path.join(source_staging_directory,
+                                             f"{operation.operation_id}-{os.path.basename(absolute_source)}")
+            with self.file_explorer.tree_lock:
+                if os.path.lexists(final_destination):
+                    raise ValueError(f"Destination path already exists: {operation.destination_path}")
+                os.rename(partial_path, final_destination)
+                partial_path = None
+                os.rename(absolute_source, source_trash_path)
+                change_event = move_operation.move_node(normalized_source, final_destination)
+            self._invalidate(absolute_source, final_destination)
+            self._publish(change_event)
+            # Progress reports the copy; reclaiming the source is not counted again
+            self._remove(operation, source_trash_path, count_progress=False)
+            self._finish(operation)
+        except Exception as e:
+            if partial_path is not None and os.path.lexists(partial_path):
+                shutil.rmtree(partial_path, ignore_errors=True)
+            self._finish(operation, e)
+
+
+class _CopyProgress:
+    """
+    A copy function for shutil.copytree that copies in chunks and reports the bytes copied.
+    """
+
+    def __init__(self, manager: BackgroundOperationManager, operation: BackgroundOperation):
+        self.manager = manager
+        self.operation = operation
+        self.last_notified = time.monotonic()
+
+    def copy(self, source: str, destination: str) -> str:
+        with open(source, 'rb') as source_file, open(destination, 'wb') as destination_file:
+            while True:
+                if background_stop_event.is_set():
+                    raise InterruptedError("Stopped by shutdown")
+                chunk = source_file.read(_COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                destination_file.write(chunk)
+                self.operation.bytes_done += len(chunk)
+                if time.monotonic() - self.last_notified > _PROGRESS_INTERVAL_SECONDS:
+                    self.last_notified = time.monotonic()
+                    self.manager._notify(self.operation)
+        shutil.copystat(source, destination)
+        self.operation.files_done += 1
+        return destination
+
+
+def _same_device(path: str, other_path: str) -> bool:
+    return os.stat(path).st_dev == os.stat(other_path).st_dev
+
+
+def _measure(path: str) -> int:
+    """
+    Returns the total size of the files of a folder, or the size of a file.
+    """
+    if not os.path.isdir(path) or os.path.islink(path):
+        return os.lstat(path).st_size
+    total = 0
+    for directory, _, file_names in os.walk(path):
+        for name in file_names:
+            try:
+                total += os.lstat(os.path.join(directory, name)).st_size
+            except OSError:
+                pass
+    return total
@@ -0,0 +1,183 @@
+"""
+Per-workspace broadcast of filesystem change events.
+
+Every published FileSystemChangeEvent gets the next sequence number and is kept in a bounded ring
+buffer. Subscribers do not own queues; each one only holds a cursor into the buffer, so any number
+of subscribers can read the same events and memory stays bounded by the buffer size.
+
+- A subscriber can resume from the last sequence number it saw (after_sequence) and receives all
+  events it missed, as long as they are still buffered.
+- A subscriber that fell behind by more than the buffer, or resumes with a sequence number that
+  is no longer (or was never) available, receives a "resync required" message and continues with
+  new events. It should then reload the tree.
+- The epoch identifies one hub instance; after a server restart sequence numbers start again, so
+  resuming with an unknown epoch also requires a resync.
+
+Messages are the JSON of the FileSystemChangeEvent with "sequence" and "epoch" added, plus
+"resync_required": true for resync messages (with empty "changes").
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import uuid
+import weakref
+from collections import deque
+from typing import AsyncIterator, Deque, Optional, Tuple
+
+from autobyteus_server.file_explorer.file_system_changes import FileSystemChangeEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 1024
+
+
+class ChangeEventHub:
+    """
+    A ring buffer of sequence-numbered change events with independent subscriber cursors.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        """
+        Initialize the ChangeEventHub.
+
+        Args:
+            capacity (Optional[int]): Number of events kept for late or resuming subscribers.
+                Defaults to FILE_EXPLORER_CHANGE_BUFFER_SIZE, or 1024.
+        """
+        if capacity is None:
+            capacity = int(os.getenv('FILE_EXPLORER_CHANGE_BUFFER_SIZE', DEFAULT_BUFFER_SIZE))
+        if capacity < 1:
+            raise ValueError("Change buffer capacity must be at least 1")
+        self.capacity = capacity
+        self.epoch = uuid.uuid4().hex
+        self._buffer: Deque[Tuple[int, str]] = deque(maxlen=capacity)
+        self._last_sequence = 0
+        self._lock = threading.Lock()
+        self._subscriptions: 'weakref.WeakSet[ChangeSubscription]' = weakref.WeakSet()
+
+    @property
+    def last_sequence(self) -> int:
+        """The sequence number of the latest event, 0 if none was published."""
+        return self._last_sequence
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, change_event: FileSystemChangeEvent) -> int:
+        """
+        Appends an event to the buffer and wakes up all subscribers. Safe to call from any thread.
+
+        Returns:
+            int: The sequence number assigned to the event.
+        """
+        event_json = change_event.to_json()
+        with self._lock:
+            self._last_sequence += 1
+            sequence = self._last_sequence
+            # Splice the sequence into the event object instead of re-serializing it
+            message = f'{{"sequence":{sequence},"epoch":"{self.epoch}",{event_json[1:]}'
+            self._buffer.append((sequence, message))
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.notify()
+        return sequence
+
+    def subscribe(self, after_sequence: Optional[int] = None, epoch: Optional[str] = None) -> 'ChangeSubscription':
+        """
+        Creates a subscription, to be consumed from the current event loop.
+
+        Args:
+            after_sequence (Optional[int]): The last sequence number the subscriber has seen. If None,
+                only events published from now on are delivered.
+            epoch (Optional[str]): The epoch that after_sequence belongs to. A different epoch means
+                the sequence numbers are not comparable and a resync is required.
+        """
+        with self._lock:
+            if after_sequence is None:
+                cursor, resync = self._last_sequence + 1, False
+            elif (epoch is not None and epoch != self.epoch) or after_sequence > self._last_sequence:
+                cursor, resync = self._last_sequence + 1, True
+            else:
+                cursor, resync = after_sequence + 1, False
+            subscription = ChangeSubscription(self, cursor, resync)
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def _read(self, cursor: int) -> Tuple[Optional[str], int, bool]:
+        """
+        Returns (message or None, next cursor, resync required) for a subscriber at cursor.
+        """
+        with self._lock:
+            if cursor > self._last_sequence:
+                return None, cursor, False
+            oldest_sequence = self._buffer[0][0]
+            if cursor < oldest_sequence:
+                return None, self._last_sequence + 1, True
+            return self._buffer[cursor - oldest_sequence][1], cursor + 1, False
+
+    def _resync_message(self, sequence: int) -> str:
+        return json.dumps({"sequence": sequence, "epoch": self.epoch,
+                           "changes": [], "resync_required": True}, separators=(',', ':'))
+
+
+class ChangeSubscription:
+    """
+    The cursor of one subscriber into a ChangeEventHub. Iterate it asynchronously to receive
+    message strings.
+    """
+
+    def __init__(self, hub: ChangeEventHub, cursor: int, resync_required: bool = False):
+        self.hub = hub
+        self.cursor = cursor
+        self._resync_required = resync_required
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+    @property
+    def lag(self) -> int:
+        """Number of published events this subscriber has not received yet."""
+        return max(0, self.hub.last_sequence - self.cursor + 1)
+
+    def notify(self) -> None:
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._wakeup.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def close(self) -> None:
+        self.hub._subscriptions.discard(self)
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[str]:
+        try:
+            while True:
+                if self._resync_required:
+                    self._resync_required = False
+                    logger.info("Change subscriber requires a resync")
+                    # Events after cursor - 1 will still be delivered
+                    yield self.hub._resync_message(self.cursor - 1)
+                    continue
+                message, self.cursor, resync_required = self.hub._read(self.cursor)
+                if resync_required:
+                    self._resync_required = True
+                    continue
+                if message is not None:
+                    yield message
+                    continue
+                self._wakeup.clear()
+                # Re-check after clearing, in case an event was published in between
+                if self.cursor <= self.hub.last_sequence:
+                    continue
+                await self._wakeup.wait()
+        finally:
+            self.close()
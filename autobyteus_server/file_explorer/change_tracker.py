@@ -0,0 +1,155 @@
+"""
+Change tracking for indexes over the files of a workspace (symbol index, relevance index).
+
+An index refreshes itself from the workspace tree, so the traversal ignore strategies apply. The
+first refresh, and any refresh after the tree was rebuilt, checks every file. Later refreshes only
+check the files and folders that the file explorer reported changed: every file operation and
+watcher event invalidates the content cache, which notifies the tracker.
+
+A checked file is only re-read if its (mtime_ns, size) differs from the one the index recorded.
+"""
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+# (mtime_ns, size) of a file when it was indexed
+FileStat = Tuple[int, int]
+
+
+class WorkspaceChangeTracker:
+    """
+    Collects the paths of a workspace that changed since an index was last refreshed.
+    """
+
+    def __init__(self, file_explorer: 'FileExplorer'):
+        """
+        Initialize the WorkspaceChangeTracker and start following the changes of the workspace.
+
+        Args:
+            file_explorer (FileExplorer): The file explorer of the workspace.
+        """
+        self.file_explorer = file_explorer
+        self.root_path = file_explorer.workspace_root_path
+        # The path index the last refresh saw; a rebuilt tree requires a full refresh
+        self._refreshed_path_index: Optional[Any] = None
+        self._changed_paths: Set[str] = set()
+        self._lock = threading.Lock()
+        file_explorer.content_cache.listeners.append(self._on_content_changed)
+
+    @property
+    def is_refreshed(self) -> bool:
+        """
+        Whether a refresh completed since the tracker was created or reset.
+        """
+        return self._refreshed_path_index is not None
+
+    @property
+    def is_stale(self) -> bool:
+        """
+        Whether files changed, or the tree was rebuilt, since the last refresh.
+        """
+        return self._refreshed_path_index is not self.file_explorer.path_index or bool(self._changed_paths)
+
+    def reset(self) -> None:
+        """
+        Makes the next refresh check every file.
+        """
+        self._refreshed_path_index = None
+
+    def _on_content_changed(self, absolute_path: str, recursive: bool) -> None:
+        relative_path = os.path.relpath(absolute_path, self.root_path)
+        if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+            return
+        with self._lock:
+            self._changed_paths.add('' if relative_path == os.curdir else relative_path)
+
+    def collect(self, indexed_paths: Iterable[str], indexable: Callable[[str], bool],
+                full: bool = False) -> Tuple[List[str], Set[str], Any]:
+        """
+        Takes the changes since the last refresh. Call refreshed() with the returned token once
+        they are applied; until then the next refresh checks every file.
+
+        Args:
+            indexed_paths (Iterable[str]): The paths currently in the index.
+            indexable (Callable[[str], bool]): Whether a file belongs in the index.
+            full (bool): Check every file of the workspace.
+
+        Returns:
+            Tuple[List[str], Set[str], Any]: The indexable files to check, the indexed files that
+                no longer exist in the tree, and the refresh token.
+        """
+        with self._lock:
+            changed_paths, self._changed_paths = self._changed_paths, set()
+        path_index = self.file_explorer.path_index
+        full = full or path_index is not self._refreshed_path_index
+        self._refreshed_path_index = None
+        with self.file_explorer.tree_lock:
+            if full:
+                candidates = [path for path in self.file_explorer.get_all_file_paths() if indexable(path)]
+                current = set(candidates)
+                return candidates, {path for path in indexed_paths if path not in current}, path_index
+            return self._changed_files(changed_paths, indexed_paths, indexable) + (path_index,)
+
+    def _changed_files(self, changed_paths: Set[str], indexed_paths: Iterable[str],
+                       indexable: Callable[[str], bool]) -> Tuple[List[str], Set[str]]:
+        if not changed_paths:
+            return [], set()
+        path_index = self.file_explorer.path_index
+        store = path_index.store
+        candidates: Set[str] = set()
+        for changed_path in changed_paths:
+            index = path_index.resolve(changed_path)
+            if index is None:
+                continue
+            if store.is_file(index):
+                candidates.add(path_index.path_of(index))
+            else:
+                candidates.update(path for _, path in store.iter_subtree(index, files_only=True,
+                                                                        prefix=path_index.path_of(index)))
+        folder_prefixes = tuple(path + os.sep for path in changed_paths)
+        removed = {path for path in indexed_paths
+                   if (path in changed_paths or path.startswith(folder_prefixes) or '' in changed_paths)
+                   and path_index.resolve(path) is None}
+        return [path for path in candidates if indexable(path)], removed
+
+    def refreshed(self, token: Any) -> None:
+        """
+        Records that the changes returned by collect() were applied.
+        """
+        self._refreshed_path_index = token
+
+    def stat_changed(self, candidates: Iterable[str],
+                     indexed_stat: Callable[[str], Optional[FileStat]]) -> Tuple[List[str], Set[str]]:
+        """
+        Splits files into the ones whose (mtime_ns, size) differs from the indexed one and the ones
+        that no longer exist on disk.
+
+        Args:
+            candidates (Iterable[str]): The files to check.
+            indexed_stat (Callable[[str], Optional[FileStat]]): Returns the recorded stat of a file,
+                or None if it is not indexed.
+        """
+        changed: List[str] = []
+        missing: Set[str] = set()
+        for path in candidates:
+            try:
+                stat = os.stat(os.path.join(self.root_path, path))
+            except OSError:
+                missing.add(path)
+                continue
+            if indexed_stat(path) != (stat.st_mtime_ns, stat.st_size):
+                changed.append(path)
+        return changed, missing
+
+    def close(self) -> None:
+        """
+        Stops following the changes of the workspace.
+        """
+        try:
+            self.file_explorer.content_cache.listeners.remove(self._on_content_changed)
+        except ValueError:
+            pass
@@ -0,0 +1,619 @@
+"""
+Compact, array-backed storage for workspace directory trees.
+
+A workspace tree can hold millions of nodes, and a TreeNode object per file (uuid string id,
+name string, children list, parent pointer) costs several hundred bytes each. CompactTreeStore
+keeps the same information in parallel typed arrays indexed by an integer node id, with node
+names stored once in a shared UTF-8 name table. CompactTreeNode is a thin TreeNode-compatible
+view over one slot of the store, created on demand, so existing code that walks `children`,
+reads `name`/`id`/`is_file` or serializes nodes keeps working.
+"""
+
+import json
+import os
+import struct
+import sys
+import threading
+import uuid
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from autobyteus_server.file_explorer.tree_node import TreeNode
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.path_index import PathIndex
+
+NO_NODE = -1
+
+_FLAG_FILE = 1
+_FLAG_LINKED = 2
+
+_STORE_FORMAT_VERSION = 1
+
+
+def pack_sections(sections: List[bytes]) -> bytes:
+    """
+    Concatenates binary sections, each prefixed with its length.
+    """
+    parts = [struct.pack('<I', len(sections))]
+    for section in sections:
+        parts.append(struct.pack('<Q', len(section)))
+        parts.append(section)
+    return b''.join(parts)
+
+
+def unpack_sections(data: bytes) -> List[bytes]:
+    """
+    Splits data produced by pack_sections() back into its sections.
+
+    Raises:
+        ValueError: If the data is truncated.
+    """
+    try:
+        (count,) = struct.unpack_from('<I', data, 0)
+        offset = 4
+        sections = []
+        for _ in range(count):
+            (length,) = struct.unpack_from('<Q', data, offset)
+            offset += 8
+            if offset + length > len(data):
+                raise ValueError("Truncated section")
+            sections.append(data[offset:offset + length])
+            offset += length
+        return sections
+    except struct.error as e:
+        raise ValueError(f"Invalid section data: {e}") from e
+
+
+class NameTable:
+    """
+    Stores node names as UTF-8 bytes in a single buffer, addressed by an integer name reference.
+
+    While a tree is bulk loaded, identical names (e.g. '__init__.py', 'index.ts') are interned
+    so they are stored only once. The interning dictionary is dropped by finish_bulk_load() to
+    keep the steady state footprint small; names added afterwards are simply appended.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._offsets = array('Q', [0])
+        self._lookup: Optional[Dict[str, int]] = {}
+
+    def add(self, name: str) -> int:
+        """
+        Adds a name to the table and returns its reference.
+        """
+        if self._lookup is not None:
+            ref = self._lookup.get(name)
+            if ref is not None:
+                return ref
+        self._buffer += name.encode('utf-8', 'surrogateescape')
+        self._offsets.append(len(self._buffer))
+        ref = len(self._offsets) - 2
+        if self._lookup is not None:
+            self._lookup[name] = ref
+        return ref
+
+    def get(self, ref: int) -> str:
+        """
+        Returns the name stored under the given reference.
+        """
+        return self._buffer[self._offsets[ref]:self._offsets[ref + 1]].decode('utf-8', 'surrogateescape')
+
+    def finish_bulk_load(self) -> None:
+        """
+        Stops interning new names and releases the interning dictionary.
+        """
+        self._lookup = None
+
+    def to_sections(self) -> List[bytes]:
+        return [bytes(self._buffer), self._offsets.tobytes()]
+
+    @classmethod
+    def from_sections(cls, buffer: bytes, offsets: bytes) -> 'NameTable':
+        table = cls()
+        table._buffer = bytearray(buffer)
+        table._offsets = array('Q')
+        table._offsets.frombytes(offsets)
+        table._lookup = None
+        return table
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate memory used by the table in bytes.
+        """
+        size = len(self._buffer) + self._offsets.itemsize * len(self._offsets)
+        if self._lookup is not None:
+            size += sys.getsizeof(self._lookup) + sum(sys.getsizeof(name) for name in self._lookup)
+        return size
+
+
+class CompactTreeStore:
+    """
+    Struct-of-arrays storage for a directory tree.
+
+    Every node is an integer index into the parallel arrays below. Children are kept as a doubly
+    linked sibling list, so appending, unlinking and relinking nodes are O(1) and the insertion
+    order produced by the traversal's sort strategy is preserved. Slots are never reused: node ids
+    handed out to clients stay unambiguous for the lifetime of the store.
+
+    The store is safe to populate from several threads (as ParallelDirectoryTraversal does);
+    structural mutations are serialized through an internal lock. If a PathIndex is attached,
+    links, unlinks and renames of attached nodes are reflected in it.
+    """
+
+    def __init__(self, store_id: Optional[str] = None):
+        """
+        Initialize an empty CompactTreeStore.
+
+        Args:
+            store_id (Optional[str]): Prefix used for the string node ids. A random one is
+                generated if not provided.
+        """
+        self.store_id = store_id or uuid.uuid4().hex[:8]
+        self.root_index = NO_NODE
+        self._parent = array('i')
+        self._first_child = array('i')
+        self._last_child = array('i')
+        self._next_sibling = array('i')
+        self._prev_sibling = array('i')
+        self._name_ref = array('I')
+        self._flags = bytearray()
+        self.names = NameTable()
+        self.path_index: Optional['PathIndex'] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    # Node creation
+
+    def create_root(self, name: str, is_file: bool = False) -> 'CompactTreeNode':
+        """
+        Creates the root node of the tree and returns a view on it.
+        """
+        self.root_index = self.create_node(name, is_file)
+        self._flags[self.root_index] |= _FLAG_LINKED
+        return self.view(self.root_index)
+
+    def create_node(self, name: str, is_file: bool, parent: int = NO_NODE) -> int:
+        """
+        Allocates a new node and, if a parent is given, appends it as the parent's last child.
+
+        Returns:
+            int: The index of the new node.
+        """
+        with self._lock:
+            index = len(self._flags)
+            self._parent.append(NO_NODE)
+            self._first_child.append(NO_NODE)
+            self._last_child.append(NO_NODE)
+            self._next_sibling.append(NO_NODE)
+            self._prev_sibling.append(NO_NODE)
+            self._name_ref.append(self.names.add(name))
+            self._flags.append(_FLAG_FILE if is_file else 0)
+            if parent != NO_NODE:
+                self.link(index, parent)
+            return index
+
+    def import_tree_node(self, node: TreeNode, parent: int = NO_NODE) -> int:
+        """
+        Copies a TreeNode subtree into the store.
+
+        Args:
+            node (TreeNode): The subtree to copy.
+            parent (int): The index of the node the copy is attached to.
+
+        Returns:
+            int: The index of the copied subtree root.
+        """
+        with self._lock:
+            root = self.create_node(node.name, node.is_file, parent)
+            stack: List[Tuple[TreeNode, int]] = [(node, root)]
+            while stack:
+                current, current_index = stack.pop()
+                for child in current.children:
+                    child_index = self.create_node(child.name, child.is_file, current_index)
+                    if child.children:
+                        stack.append((child, child_index))
+            return root
+
+    @classmethod
+    def from_tree_node(cls, root: TreeNode) -> 'CompactTreeStore':
+        """
+        Builds a store holding a copy of the given TreeNode tree.
+        """
+        store = cls()
+        store.root_index = store.import_tree_node(root)
+        store._flags[store.root_index] |= _FLAG_LINKED
+        store.finish_bulk_load()
+        return store
+
+    def finish_bulk_load(self) -> None:
+        """
+        Signals that the initial tree has been loaded, releasing bulk-load helpers.
+        """
+        self.names.finish_bulk_load()
+
+    # Serialization
+
+    def _arrays(self) -> Tuple[array, ...]:
+        return (self._parent, self._first_child, self._last_child,
+                self._next_sibling, self._prev_sibling, self._name_ref)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the store, including detached nodes, into a compact binary form.
+        """
+        with self._lock:
+            header = json.dumps({
+                "version": _STORE_FORMAT_VERSION,
+                "store_id": self.store_id,
+                "root_index": self.root_index,
+                "typecodes": [a.typecode for a in self._arrays()]
+            }).encode('utf-8')
+            sections = [header] + [a.tobytes() for a in self._arrays()] + [bytes(self._flags)]
+            return pack_sections(sections + self.names.to_sections())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CompactTreeStore':
+        """
+        Restores a store serialized with to_bytes().
+
+        Raises:
+            ValueError: If the data is not a compatible serialized store.
+        """
+        sections = unpack_sections(data)
+        if len(sections) != 10:
+            raise ValueError("Unexpected number of sections in serialized tree store")
+        header = json.loads(sections[0])
+        store = cls(store_id=header["store_id"])
+        if header.get("version") != _STORE_FORMAT_VERSION or \
+                header.get("typecodes") != [a.typecode for a in store._arrays()]:
+            raise ValueError("Incompatible serialized tree store")
+        for target, section in zip(store._arrays(), sections[1:7]):
+            target.frombytes(section)
+        store._flags = bytearray(sections[7])
+        store.names = NameTable.from_sections(sections[8], sections[9])
+        if any(len(a) != len(store._flags) for a in store._arrays()):
+            raise ValueError("Inconsistent serialized tree store")
+        store.root_index = header["root_index"]
+        return store
+
+    # Structure
+
+    def link(self, index: int, parent: int) -> None:
+        """
+        Appends a node as the last child of parent, unlinking it from its current parent first.
+        """
+        with self._lock:
+            if self._flags[index] & _FLAG_LINKED:
+                self.unlink(index)
+            last = self._last_child[parent]
+            self._prev_sibling[index] = last
+            self._next_sibling[index] = NO_NODE
+            if last == NO_NODE:
+                self._first_child[parent] = index
+            else:
+                self._next_sibling[last] = index
+            self._last_child[parent] = index
+            self._parent[index] = parent
+            self._flags[index] |= _FLAG_LINKED
+            if self.path_index is not None and self.is_attached(index):
+                self.path_index.add_subtree(index)
+
+    def unlink(self, index: int) -> None:
+        """
+        Detaches a node (and with it its subtree) from its parent. The subtree stays intact
+        and can be linked elsewhere.
+        """
+        with self._lock:
+            if not self._flags[index] & _FLAG_LINKED or index == self.root_index:
+                return
+            if self.path_index is not None and self.is_attached(index):
+                self.path_index.remove_subtree(index)
+            parent = self._parent[index]
+            prev_index = self._prev_sibling[index]
+            next_index = self._next_sibling[index]
+            if prev_index == NO_NODE:
+                self._first_child[parent] = next_index
+            else:
+                self._next_sibling[prev_index] = next_index
+            if next_index == NO_NODE:
+                self._last_child[parent] = prev_index
+            else:
+                self._prev_sibling[next_index] = prev_index
+            self._prev_sibling[index] = NO_NODE
+            self._next_sibling[index] = NO_NODE
+            self._parent[index] = NO_NODE
+            self._flags[index] &= ~_FLAG_LINKED
+
+    def set_parent(self, index: int, parent: int) -> None:
+        """
+        Records the parent of a detached node without linking it. Linked nodes are moved.
+        """
+        with self._lock:
+            if parent == NO_NODE:
+                self.unlink(index)
+            elif self._flags[index] & _FLAG_LINKED:
+                if self._parent[index] != parent:
+                    self.link(index, parent)
+            else:
+                self._parent[index] = parent
+
+    # Accessors
+
+    def name(self, index: int) -> str:
+        return self.names.get(self._name_ref[index])
+
+    def set_name(self, index: int, name: str) -> None:
+        with self._lock:
+            indexed = self.path_index is not None and self.is_attached(index)
+            if indexed:
+                self.path_index.remove_subtree(index)
+            self._name_ref[index] = self.names.add(name)
+            if indexed:
+                self.path_index.add_subtree(index)
+
+    def is_file(self, index: int) -> bool:
+        return bool(self._flags[index] & _FLAG_FILE)
+
+    def set_is_file(self, index: int, is_file: bool) -> None:
+        if is_file:
+            self._flags[index] |= _FLAG_FILE
+        else:
+            self._flags[index] &= ~_FLAG_FILE
+
+    def parent(self, index: int) -> int:
+        return self._parent[index]
+
+    def next_sibling(self, index: int) -> int:
+        return self._next_sibling[index]
+
+    def is_linked(self, index: int) -> bool:
+        return bool(self._flags[index] & _FLAG_LINKED)
+
+    def iter_children(self, index: int) -> Iterator[int]:
+        child = self._first_child[index]
+        while child != NO_NODE:
+            yield child
+            child = self._next_sibling[child]
+
+    def child_count(self, index: int) -> int:
+        return sum(1 for _ in self.iter_children(index))
+
+    def has_children(self, index: int) -> bool:
+        return self._first_child[index] != NO_NODE
+
+    def is_attached(self, index: int) -> bool:
+        """
+        Returns True if the node is reachable from the root, i.e. it has not been removed.
+        """
+        if self.root_index == NO_NODE or index < 0 or index >= len(self._flags):
+            return False
+        while index != self.root_index:
+            if not self._flags[index] & _FLAG_LINKED:
+                return False
+            index = self._parent[index]
+        return True
+
+    def get_path(self, index: int) -> str:
+        """
+        Returns the path of the node relative to the root, mirroring TreeNode.get_path().
+        """
+        if index == self.root_index:
+            return self.name(index)
+        parts = []
+        while index != NO_NODE and index != self.root_index:
+            parts.append(self.name(index))
+            index = self._parent[index]
+        if index == NO_NODE:
+            # Detached subtree: the top-most node plays the role of the root
+            root_name = parts.pop()
+            if not parts:
+                return root_name
+        return os.path.join(*reversed(parts))
+
+    def iter_subtree(self, index: int, files_only: bool = False,
+                     prefix: Optional[str] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Yields (index, relative path) for every node below the given node, building the paths
+        incrementally instead of walking up to the root for each node.
+
+        Args:
+            index (int): The node whose descendants are yielded.
+            files_only (bool): Only yield file nodes.
+            prefix (Optional[str]): Path of the given node; computed from the tree if not provided.
+        """
+        if prefix is None:
+            prefix = '' if index == self.root_index else self.get_path(index)
+        stack = [(self.iter_children(index), prefix)]
+        while stack:
+            children, parent_path = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                continue
+            name = self.name(child)
+            child_path = os.path.join(parent_path, name) if parent_path else name
+            if self.is_file(child):
+                yield child, child_path
+            else:
+                if not files_only:
+                    yield child, child_path
+                stack.append((self.iter_children(child), child_path))
+
+    # Ids and views
+
+    def node_id(self, index: int) -> str:
+        """
+        Returns the string id of a node, as exposed to clients.
+        """
+        return f"{self.store_id}-{index}"
+
+    def index_of(self, node_id: str) -> Optional[int]:
+        """
+        Resolves a string node id to the index of a node that is still part of the tree.
+        """
+        store_id, _, raw_index = node_id.rpartition('-')
+        if store_id != self.store_id or not raw_index.isdigit():
+            return None
+        index = int(raw_index)
+        return index if self.is_attached(index) else None
+
+    def view(self, index: int) -> 'CompactTreeNode':
+        return CompactTreeNode(self, index)
+
+    @property
+    def root(self) -> Optional['CompactTreeNode']:
+        return self.view(self.root_index) if self.root_index != NO_NODE else None
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate memory used by the store in bytes.
+        """
+        return (sum(a.itemsize * len(a) for a in self._arrays())
+                + len(self._flags)
+                + self.names.nbytes())
+
+
+class CompactChildren:
+    """
+    A list-like, live view over the children of a CompactTreeNode.
+
+    Supports the list operations used on TreeNode.children (iteration, indexing, len,
+    membership, append and remove); mutations are applied to the underlying store.
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: CompactTreeStore, index: int):
+        self._store = store
+        self._index = index
+
+    def _indices(self) -> List[int]:
+        return list(self._store.iter_children(self._index))
+
+    def __iter__(self) -> Iterator['CompactTreeNode']:
+        return (self._store.view(child) for child in self._indices())
+
+    def __len__(self) -> int:
+        return self._store.child_count(self._index)
+
+    def __bool__(self) -> bool:
+        return self._store.has_children(self._index)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._store.view(child) for child in self._indices()[item]]
+        return self._store.view(self._indices()[item])
+
+    def __contains__(self, node) -> bool:
+        return (isinstance(node, CompactTreeNode) and node._store is self._store
+                and node._store.is_linked(node._index) and node._store.parent(node._index) == self._index)
+
+    def __eq__(self, other) -> bool:
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def append(self, node: TreeNode) -> None:
+        self._store.view(self._index).add_child(node)
+
+    def remove(self, node: 'CompactTreeNode') -> None:
+        if node not in self:
+            raise ValueError("CompactChildren.remove(x): x not in children")
+        self._store.unlink(node._index)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class CompactTreeNode(TreeNode):
+    """
+    A TreeNode-compatible view over a single node of a CompactTreeStore.
+
+    Views hold no state of their own besides the store and the node index; two views on the
+    same node compare equal. Attribute reads and writes (name, parent, children, id) go straight
+    to the store, so views can be created and discarded freely.
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: CompactTreeStore, index: int):
+        # Deliberately not calling TreeNode.__init__: all state lives in the store.
+        self._store = store
+        self._index = index
+
+    @property
+    def store(self) -> CompactTreeStore:
+        return self._store
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def id(self) -> str:
+        return self._store.node_id(self._index)
+
+    @property
+    def name(self) -> str:
+        return self._store.name(self._index)
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._store.set_name(self._index, value)
+
+    @property
+    def is_file(self) -> bool:
+        return self._store.is_file(self._index)
+
+    @is_file.setter
+    def is_file(self, value: bool) -> None:
+        self._store.set_is_file(self._index, value)
+
+    @property
+    def parent(self) -> Optional['CompactTreeNode']:
+        parent = self._store.parent(self._index)
+        return self._store.view(parent) if parent != NO_NODE else None
+
+    @parent.setter
+    def parent(self, value: Optional['CompactTreeNode']) -> None:
+        self._store.set_parent(self._index, value._index if value is not None else NO_NODE)
+
+    @property
+    def children(self) -> CompactChildren:
+        return CompactChildren(self._store, self._index)
+
+    def add_child(self, node: TreeNode) -> None:
+        """
+        Adds a child to this node.
+
+        A view from the same store is (re)linked under this node. Any other TreeNode is copied
+        into the store; use create_child() to get a handle on the stored node directly.
+        """
+        if isinstance(node, CompactTreeNode) and node._store is self._store:
+            self._store.link(node._index, self._index)
+        else:
+            self._store.import_tree_node(node, self._index)
+
+    def create_child(self, name: str, is_file: bool = False) -> 'CompactTreeNode':
+        return self._store.view(self._store.create_node(name, is_file, self._index))
+
+    def remove_child(self, node: 'CompactTreeNode') -> None:
+        self.children.remove(node)
+
+    def get_path(self) -> str:
+        return self._store.get_path(self._index)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, CompactTreeNode)
+                and other._store is self._store and other._index == self._index)
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._index))
+
+    def __repr__(self) -> str:
+        return f"CompactTreeNode(id={self.id!r}, name={self.name!r}, is_file={self.is_file})"
@@ -0,0 +1,146 @@
+"""
+Per-workspace cache of file contents.
+
+The same files are read over and over (file_content queries, workflow step context, refactorers),
+so their decoded text is kept in a least-recently-used cache with a byte budget. An entry is only
+returned while the file's (mtime_ns, size) still match, so a file changed by another program is
+never served stale. File explorer operations and watcher events also invalidate entries, which
+frees their memory early and covers rewrites that keep the same mtime and size.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class _CacheEntry(NamedTuple):
+    mtime_ns: int
+    size: int
+    content: str
+
+
+class FileContentCache:
+    """
+    An LRU cache of file contents bounded by the total size of the cached files.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_entry_bytes: Optional[int] = None):
+        """
+        Initialize the FileContentCache.
+
+        Args:
+            max_bytes (Optional[int]): The byte budget of the cache. Defaults to FILE_EXPLORER_CONTENT_CACHE_MB
+                megabytes, or 32MB. 0 disables caching.
+            max_entry_bytes (Optional[int]): Files larger than this are read but not cached.
+                Defaults to an eighth of the budget, so a single file cannot flush the whole cache.
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('FILE_EXPLORER_CONTENT_CACHE_MB', DEFAULT_MAX_BYTES / (1024 * 1024)))
+                            * 1024 * 1024)
+        self.max_bytes = max(0, max_bytes)
+        self.max_entry_bytes = self.max_bytes // 8 if max_entry_bytes is None else max_entry_bytes
+        self._entries: 'OrderedDict[str, _CacheEntry]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Called with (path, recursive) on every invalidation, cached or not, so indexes over
+        # file contents (e.g. the workspace SymbolIndex) learn which files changed
+        self.listeners: List[Callable[[str, bool], None]] = []
+
+    def read_text(self, path: str) -> str:
+        """
+        Returns the UTF-8 content of a file, from the cache if the file did not change.
+
+        Args:
+            path (str): The absolute path of the file.
+
+        Returns:
+            str: The content of the file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            UnicodeDecodeError: If the file is not valid UTF-8.
+        """
+        path = os.path.normpath(path)
+        stat_result = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.mtime_ns == stat_result.st_mtime_ns and entry.size == stat_result.st_size:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry.content
+            self.misses += 1
+
+        with open(path, 'r', encoding='utf-8') as file:
+            content = file.read()
+
+        # Only cache what was read if the file did not change while reading it
+        after = os.stat(path)
+        if (after.st_mtime_ns, after.st_size) == (stat_result.st_mtime_ns, stat_result.st_size):
+            self._store(path, _CacheEntry(after.st_mtime_ns, after.st_size, content))
+        return content
+
+    def _store(self, path: str, entry: _CacheEntry) -> None:
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            if entry.size > self.max_entry_bytes or entry.size > self.max_bytes:
+                return
+            self._entries[path] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def invalidate(self, path: str, recursive: bool = False) -> None:
+        """
+        Drops the cached content of a file, or with recursive=True of everything below a folder.
+
+        Args:
+            path (str): The absolute path of the file or folder.
+            recursive (bool): Whether path may be a folder.
+        """
+        path = os.path.normpath(path)
+        for listener in self.listeners:
+            listener(path, recursive)
+        with self._lock:
+            if not self._entries:
+                return
+            keys = [path] if path in self._entries else []
+            if recursive:
+                prefix = path.rstrip(os.sep) + os.sep
+                keys.extend(key for key in self._entries if key.startswith(prefix))
+            for key in keys:
+                self._bytes -= self._entries.pop(key).size
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache counters and its current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,263 @@
+"""
+Parallel search of workspace file contents.
+
+The files of the workspace tree are searched, so the traversal ignore strategies (.gitignore,
+.git, the workspace trash, ...) apply. They are split into small batches that worker processes
+search in parallel (see content_search_worker); matches are handed to the caller batch by batch
+as soon as a worker returns them. Only a few batches per worker are in flight at any time, so a
+search that is cancelled, or reaches its maximum number of results, stops within one batch.
+
+All workspaces share one process pool with FILE_EXPLORER_SEARCH_WORKERS processes (default: the
+number of CPUs, at most 8). Workers are spawned rather than forked, as the server runs threads.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Set
+
+from autobyteus_server.file_explorer.content_search_worker import compile_pattern, search_files
+from autobyteus_server.file_explorer.io_executor import run_io
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RESULTS = 1000
+MAX_RESULTS_LIMIT = 100000
+FILES_PER_BATCH = 32
+BATCHES_IN_FLIGHT_PER_WORKER = 2
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+_process_pool_lock = threading.Lock()
+
+
+def get_search_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the shared content search process pool, creating it on first use.
+    """
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is None:
+            default_workers = min(8, os.cpu_count() or 1)
+            _process_pool_workers = max(1, int(os.getenv('FILE_EXPLORER_SEARCH_WORKERS', default_workers)))
+            _process_pool = ProcessPoolExecutor(max_workers=_process_pool_workers,
+                                                mp_context=multiprocessing.get_context('spawn'))
+            logger.info(f"Started content search process pool with {_process_pool_workers} workers")
+        return _process_pool
+
+
+def shutdown_search_process_pool() -> None:
+    """
+    Stops the content search worker processes; the pool is re-created on next use.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        process_pool, _process_pool = _process_pool, None
+    if process_pool is not None:
+        process_pool.shutdown(wait=True, cancel_futures=True)
+
+
+@dataclass
+class ContentMatch:
+    """
+    A line of a file that matches a content search.
+
+    Attributes:
+        path: The relative path of the file.
+        line_number: The 1-based line number.
+        line: The text of the line, or a window of it around the match for very long lines.
+        match_start: The position of the first matched character in line.
+        match_end: The position after the last matched character in line.
+    """
+    path: str
+    line_number: int
+    line: str
+    match_start: int
+    match_end: int
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "line_number": self.line_number,
+            "line": self.line,
+            "match_start": self.match_start,
+            "match_end": self.match_end,
+        }
+
+
+@dataclass
+class ContentSearchQuery:
+    """
+    The parameters of a content search.
+
+    Attributes:
+        pattern: The literal text or regular expression to search for.
+        is_regex: Whether pattern is a regular expression.
+        case_sensitive: Whether the search is case-sensitive.
+        max_results: Stop after this many matching lines.
+        max_file_size: Skip files larger than this many bytes.
+    """
+    pattern: str
+    is_regex: bool = False
+    case_sensitive: bool = False
+    max_results: int = DEFAULT_MAX_RESULTS
+    max_file_size: int = field(default_factory=lambda: int(float(os.getenv('FILE_EXPLORER_SEARCH_MAX_FILE_MB', 10))
+                                                           * 1024 * 1024))
+
+    def validate(self) -> None:
+        """
+        Raises:
+            ValueError: If the pattern is empty or an invalid regular expression, or max_results
+                is out of range.
+        """
+        compile_pattern(self.pattern, self.is_regex, self.case_sensitive)
+        if not 1 <= self.max_results <= MAX_RESULTS_LIMIT:
+            raise ValueError(f"max_results must be between 1 and {MAX_RESULTS_LIMIT}")
+
+
+class ContentSearch:
+    """
+    One running content search. Iterate over results() to run it.
+    """
+
+    def __init__(self, file_explorer: 'FileExplorer', query: ContentSearchQuery):
+        self.search_id = uuid.uuid4().hex[:12]
+        self.file_explorer = file_explorer
+        self.query = query
+        self.match_count = 0
+        self.files_searched = 0
+        self.truncated = False
+        self.cancelled = False
+        self._pending: Set['asyncio.Future'] = set()
+
+    def cancel(self) -> None:
+        """
+        Stops the search: no more batches are started and the results end after the current ones.
+        """
+        self.cancelled = True
+        self._cancel_pending()
+
+    def _cancel_pending(self) -> None:
+        for future in self._pending:
+            future.cancel()
+
+    def summary(self) -> dict:
+        return {
+            "search_id": self.search_id,
+            "done": True,
+            "match_count": self.match_count,
+            "files_searched": self.files_searched,
+            "truncated": self.truncated,
+            "cancelled": self.cancelled,
+        }
+
+    async def results(self) -> AsyncIterator[List[ContentMatch]]:
+        """
+        Runs the search and yields the matches of every batch of files as soon as it is searched.
+        Closing the iterator cancels the search.
+        """
+        file_paths = await run_io(self._list_files)
+        batches = iter([file_paths[start:start + FILES_PER_BATCH]
+                        for start in range(0, len(file_paths), FILES_PER_BATCH)])
+        process_pool = get_search_process_pool()
+        max_in_flight = _process_pool_workers * BATCHES_IN_FLIGHT_PER_WORKER
+        query = self.query
+        try:
+            while not self.cancelled and not self.truncated:
+                while len(self._pending) < max_in_flight:
+                    batch = next(batches, None)
+                    if batch is None:
+                        break
+                    remaining = query.max_results - self.match_count
+                    future: Future = process_pool.submit(
+                        search_files, self.file_explorer.workspace_root_path, batch, query.pattern,
+                        query.is_regex, query.case_sensitive, remaining, query.max_file_size)
+                    self._pending.add(asyncio.wrap_future(future))
+                if not self._pending:
+                    break
+                done, _ = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    self._pending.discard(future)
+                    if future.cancelled():
+                        continue
+                    match_tuples, files_searched = future.result()
+                    self.files_searched += files_searched
+                    remaining = query.max_results - self.match_count
+                    if len(match_tuples) >= remaining:
+                        match_tuples = match_tuples[:remaining]
+                        self.truncated = True
+                    if match_tuples:
+                        self.match_count += len(match_tuples)
+                        yield [ContentMatch(*match_tuple) for match_tuple in match_tuples]
+                    if self.truncated:
+                        break
+        finally:
+            if self._pending:
+                # Closed early, cancelled or truncated: drop the batches that did not start yet
+                self._cancel_pending()
+                self._pending.clear()
+                self.cancelled = self.cancelled or not self.truncated
+
+    def _list_files(self) -> List[str]:
+        with self.file_explorer.tree_lock:
+            return self.file_explorer.get_all_file_paths()
+
+
+class ContentSearcher:
+    """
+    Starts the content searches of one workspace and keeps track of the running ones, so they
+    can be cancelled by id.
+    """
+
+    def __init__(self, file_explorer: 'FileExplorer'):
+        self.file_explorer = file_explorer
+        self._searches: Dict[str, ContentSearch] = {}
+
+    def start(self, query: ContentSearchQuery) -> ContentSearch:
+        """
+        Validates a query and creates its search; iterate over results() to run it.
+
+        Raises:
+            ValueError: If the query is invalid.
+        """
+        query.validate()
+        return ContentSearch(self.file_explorer, query)
+
+    async def stream(self, query: ContentSearchQuery) -> AsyncIterator[dict]:
+        """
+        Runs a search and yields {"search_id", "matches"} for every batch of matches and a final
+        summary with "done": true. The search can be cancelled by id while it runs.
+
+        Raises:
+            ValueError: If the query is invalid.
+        """
+        search = self.start(query)
+        self._searches[search.search_id] = search
+        try:
+            yield {"search_id": search.search_id, "matches": []}
+            async for matches in search.results():
+                yield {"search_id": search.search_id, "matches": [match.to_dict() for match in matches]}
+            yield search.summary()
+        finally:
+            self._searches.pop(search.search_id, None)
+
+    def cancel(self, search_id: str) -> bool:
+        """
+        Cancels a running search.
+
+        Returns:
+            bool: False if no search with that id is running.
+        """
+        search = self._searches.get(search_id)
+        if search is None:
+            return False
+        search.cancel()
+        return True
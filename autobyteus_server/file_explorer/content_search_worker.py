@@ -0,0 +1,107 @@
+"""
+The part of the workspace content search that runs in worker processes.
+
+This module only imports the standard library, so starting a worker process is cheap.
+"""
+
+import os
+import re
+from typing import List, Optional, Tuple
+
+# (relative path, 1-based line number, line text, match start, match end); the offsets are
+# character positions within the line text
+MatchTuple = Tuple[str, int, str, int, int]
+
+BINARY_SNIFF_SIZE = 8192
+MAX_LINE_LENGTH = 500
+_CONTEXT_BEFORE_MATCH = 100
+
+
+def compile_pattern(pattern: str, is_regex: bool, case_sensitive: bool) -> 're.Pattern':
+    """
+    Compiles a search query into a multi-line regular expression.
+
+    Raises:
+        ValueError: If the pattern is empty or not a valid regular expression.
+    """
+    if not pattern:
+        raise ValueError("Search pattern must not be empty")
+    flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+    try:
+        return re.compile(pattern if is_regex else re.escape(pattern), flags)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression: {e}") from e
+
+
+def search_files(root_path: str, paths: List[str], pattern: str, is_regex: bool, case_sensitive: bool,
+                 max_matches: int, max_file_size: int) -> Tuple[List[MatchTuple], int]:
+    """
+    Searches files for a pattern, one match per line at most.
+
+    Binary files (with a NUL byte in their first 8 KB), files larger than max_file_size and
+    unreadable files are skipped.
+
+    Args:
+        root_path (str): The workspace root.
+        paths (List[str]): The relative paths of the files to search.
+        pattern (str): The literal text or regular expression.
+        is_regex (bool): Whether pattern is a regular expression.
+        case_sensitive (bool): Whether the search is case-sensitive.
+        max_matches (int): Stop after this many matches.
+        max_file_size (int): Skip files larger than this many bytes.
+
+    Returns:
+        Tuple[List[MatchTuple], int]: The matches and the number of files searched.
+    """
+    expression = compile_pattern(pattern, is_regex, case_sensitive)
+    matches: List[MatchTuple] = []
+    files_searched = 0
+    for path in paths:
+        text = _read_text(os.path.join(root_path, path), max_file_size)
+        if text is None:
+            continue
+        files_searched += 1
+        line_number = 1
+        counted_until = 0
+        next_line_start = -1
+        for match in expression.finditer(text):
+            start = match.start()
+            if start < next_line_start:
+                continue  # Already reported this line
+            line_number += text.count('\n', counted_until, start)
+            counted_until = start
+            line_start = text.rfind('\n', 0, start) + 1
+            line_end = text.find('\n', start)
+            if line_end == -1:
+                line_end = len(text)
+            end = min(match.end(), line_end)
+            matches.append(_match_tuple(path, line_number, text[line_start:line_end],
+                                        start - line_start, end - line_start))
+            if len(matches) >= max_matches:
+                return matches, files_searched
+            next_line_start = line_end + 1
+    return matches, files_searched
+
+
+def _read_text(absolute_path: str, max_file_size: int) -> Optional[str]:
+    try:
+        with open(absolute_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size > max_file_size:
+                return None
+            data = file.read()
+    except OSError:
+        return None
+    if b'\0' in data[:BINARY_SNIFF_SIZE]:
+        return None
+    return data.decode('utf-8', errors='replace')
+
+
+def _match_tuple(path: str, line_number: int, line: str, start: int, end: int) -> MatchTuple:
+    line = line.rstrip('\r')
+    end = min(end, len(line))
+    if len(line) > MAX_LINE_LENGTH:
+        # Keep a window of the line around the match
+        offset = max(0, start - _CONTEXT_BEFORE_MATCH)
+        line = line[offset:offset + MAX_LINE_LENGTH]
+        start, end = start - offset, min(end - offset, len(line))
+    return path, line_number, line, start, end
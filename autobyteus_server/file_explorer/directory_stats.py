@@ -0,0 +1,187 @@
+"""
+File counts and byte sizes of the folders of a workspace, from its tree.
+
+The counts come from the in-memory tree and the sizes are remembered per file node, so asking for
+the usage of a folder (e.g. the upload quota of uploads/) does not walk the folder on disk. Sizes
+are taken from the scan when FILE_EXPLORER_SCAN_FILE_SIZES is set, and otherwise stat'ed on first
+use. The content cache tells the stats about every change made by file operations or seen by the
+watcher, which forgets the sizes of the changed files; they are stat'ed again when next needed.
+"""
+
+import logging
+import os
+import threading
+from array import array
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional
+
+from autobyteus_server.file_explorer.compact_tree import CompactTreeStore
+from autobyteus_server.file_explorer.directory_traversal import DirectoryListing
+from autobyteus_server.file_explorer.scan_pipeline import ScanVisitor
+from autobyteus_server.file_explorer.tree_node import TreeNode
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+logger = logging.getLogger(__name__)
+
+_UNKNOWN = -1
+
+
+class DirectoryUsage(NamedTuple):
+    file_count: int
+    byte_count: int
+
+
+class DirectoryStats(ScanVisitor):
+    """
+    The file count and total size of any folder of a workspace tree.
+    """
+
+    def __init__(self, file_explorer: 'FileExplorer', collect_file_sizes: Optional[bool] = None):
+        """
+        Initialize DirectoryStats and follow the changes seen by the content cache of the file explorer.
+
+        Args:
+            file_explorer (FileExplorer): The file explorer of the workspace.
+            collect_file_sizes (Optional[bool]): Whether the scan reads the size of every file. Defaults to
+                FILE_EXPLORER_SCAN_FILE_SIZES, or False.
+        """
+        self.file_explorer = file_explorer
+        if collect_file_sizes is None:
+            collect_file_sizes = os.getenv('FILE_EXPLORER_SCAN_FILE_SIZES', 'false').lower() == 'true'
+        self.needs_file_sizes = collect_file_sizes
+        self._lock = threading.Lock()
+        self._store: Optional[CompactTreeStore] = None
+        self._sizes = array('q')
+        # Sizes of files written but not in the tree yet (the watcher adds them a moment later)
+        self._pending: Dict[str, int] = {}
+        file_explorer.content_cache.listeners.append(self._invalidate)
+
+    def visit_directory(self, node: TreeNode, path: str, listing: DirectoryListing) -> None:
+        if listing.file_sizes is None:
+            return
+        store = node.store
+        with self._lock:
+            self._use_store(store)
+            for child, size in zip(store.iter_children(node.index), listing.file_sizes):
+                if store.is_file(child):
+                    self._set_size(child, size)
+
+    def scan_finished(self, file_explorer: 'FileExplorer') -> None:
+        with self._lock:
+            self._use_store(file_explorer.tree_store)
+            self._pending.clear()
+
+    def get_usage(self, path: str = '') -> DirectoryUsage:
+        """
+        Returns the number of files below a folder and their total size.
+
+        Args:
+            path (str): The folder, relative to the workspace root. '' is the whole workspace. A folder
+                that is not part of the tree (ignored, or created a moment ago) is walked on disk.
+
+        Returns:
+            DirectoryUsage: The file count and byte count.
+        """
+        file_explorer = self.file_explorer
+        with file_explorer.tree_lock:
+            path_index = file_explorer.path_index
+            index = path_index.resolve(path) if path_index is not None else None
+            if index is None:
+                return self._walk(os.path.join(file_explorer.workspace_root_path, path))
+            store = path_index.store
+            prefix = path_index.path_of(index)
+            if store.is_file(index):
+                files = [(index, prefix)]
+            else:
+                files = list(store.iter_subtree(index, files_only=True, prefix=prefix))
+            with self._lock:
+                self._use_store(store)
+                sizes = [self._get_size(file_index) for file_index, _ in files]
+                pending = [(pending_path, size) for pending_path, size in self._pending.items()
+                           if _is_below(pending_path, prefix)]
+            file_count, byte_count = len(files), 0
+            for (file_index, file_path), size in zip(files, sizes):
+                if size == _UNKNOWN:
+                    size = self._stat(file_path)
+                    with self._lock:
+                        if self._store is store:
+                            self._set_size(file_index, size)
+                byte_count += size
+            for pending_path, size in pending:
+                if path_index.resolve(pending_path) is None:
+                    file_count += 1
+                    byte_count += size
+                else:
+                    with self._lock:
+                        self._pending.pop(pending_path, None)
+        return DirectoryUsage(file_count, byte_count)
+
+    def record_file(self, path: str, size: int) -> None:
+        """
+        Tells the stats about a file that was just written, before the tree has it.
+
+        Args:
+            path (str): The file, relative to the workspace root.
+            size (int): Its size in bytes.
+        """
+        with self._lock:
+            self._pending[os.path.normpath(path)] = size
+
+    def nbytes(self) -> int:
+        return self._sizes.itemsize * len(self._sizes)
+
+    def _use_store(self, store: Optional[CompactTreeStore]) -> None:
+        # Sizes are kept by node index, which only has a meaning within one store
+        if store is not self._store:
+            self._store = store
+            self._sizes = array('q')
+
+    def _get_size(self, index: int) -> int:
+        return self._sizes[index] if index < len(self._sizes) else _UNKNOWN
+
+    def _set_size(self, index: int, size: int) -> None:
+        if index >= len(self._sizes):
+            self._sizes.extend([_UNKNOWN] * (index + 1 - len(self._sizes)))
+        self._sizes[index] = size
+
+    def _invalidate(self, abs_path: str, recursive: bool) -> None:
+        path_index = self.file_explorer.path_index
+        if path_index is None:
+            return
+        relative_path = os.path.relpath(abs_path, self.file_explorer.workspace_root_path)
+        index = path_index.resolve(relative_path)
+        if index is None:
+            return
+        with self._lock:
+            if path_index.store is not self._store:
+                return
+            if index < len(self._sizes):
+                self._sizes[index] = _UNKNOWN
+            if recursive and not path_index.store.is_file(index):
+                for child, _ in path_index.store.iter_subtree(index, files_only=True, prefix=''):
+                    if child < len(self._sizes):
+                        self._sizes[child] = _UNKNOWN
+
+    def _stat(self, path: str) -> int:
+        try:
+            return os.stat(os.path.join(self.file_explorer.workspace_root_path, path)).st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _walk(abs_path: str) -> DirectoryUsage:
+        file_count, byte_count = 0, 0
+        for root, _, files in os.walk(abs_path):
+            for name in files:
+                try:
+                    byte_count += os.path.getsize(os.path.join(root, name))
+                except OSError as e:
+                    logger.warning(f"Could not get size for file {os.path.join(root, name)}: {e}")
+                    continue
+                file_count += 1
+        return DirectoryUsage(file_count, byte_count)
+
+
+def _is_below(path: str, folder: str) -> bool:
+    return not folder or path == folder or path.startswith(folder.rstrip(os.sep) + os.sep)
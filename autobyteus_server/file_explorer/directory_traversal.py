@@ -1,16 +1,39 @@
 # directory_traversal.py
 
 import os
-from typing import List, Optional
+from typing import Callable, List, NamedTuple, Optional, Tuple
 from collections import deque
 
 from autobyteus_server.file_explorer.traversal_ignore_strategy.traversal_ignore_strategy import TraversalIgnoreStrategy
-from autobyteus_server.file_explorer.traversal_ignore_strategy.git_ignore_strategy import GitIgnoreStrategy
+from autobyteus_server.file_explorer.traversal_ignore_strategy.ignore_matcher import IgnoreMatcher
 from autobyteus_server.file_explorer.tree_node import TreeNode
 from autobyteus_server.file_explorer.sort_strategy.default_sort_strategy import DefaultSortStrategy
 from autobyteus_server.file_explorer.sort_strategy.sort_strategy import SortStrategy
 
 
+class DirectoryListing(NamedTuple):
+    """
+    The visible content of a single directory.
+
+    Attributes:
+        entries: (name, absolute path, is_file) of the entries that are not ignored, in sort order.
+        ignore_matcher: The ignore rules applied to the entries, including the directory's own .gitignore.
+            Sub-directories inherit them through ignore_matcher.descend(name).
+        has_gitignore: Whether the directory contains a .gitignore file.
+        mtime_ns: The modification time of the directory taken before it was read, if requested.
+        file_sizes: The size of each entry (0 for directories), in the order of entries, if requested.
+    """
+    entries: List[Tuple[str, str, bool]]
+    ignore_matcher: IgnoreMatcher
+    has_gitignore: bool
+    mtime_ns: Optional[int]
+    file_sizes: Optional[List[int]] = None
+
+
+# Called with (directory node, directory path, listing) for every directory read while building a tree
+DirectoryListener = Callable[[TreeNode, str, DirectoryListing], None]
+
+
 class DirectoryTraversal:
     """
     A class used to traverse directories and represent the directory structure as a TreeNode.
@@ -20,10 +43,17 @@ class DirectoryTraversal:
     -------
     build_tree(folder_path: str) -> TreeNode:
         Traverses a specified directory and returns its structure as a TreeNode.
+    populate(node: TreeNode, folder_path: str, ignore_matcher: Optional[IgnoreMatcher] = None):
+        Traverses a directory and attaches its structure below an existing node.
+    list_directory(folder_path: str, ignore_matcher: IgnoreMatcher) -> Optional[DirectoryListing]:
+        Reads the visible entries of a single directory.
     """
 
     def __init__(self, file_ignore_strategies: Optional[List[TraversalIgnoreStrategy]] = None, 
-                 sort_strategy: Optional[SortStrategy] = None):
+                 sort_strategy: Optional[SortStrategy] = None,
+                 root_node_factory: Optional[Callable[[str, bool], TreeNode]] = None,
+                 directory_listener: Optional[DirectoryListener] = None,
+                 collect_file_sizes: bool = False):
         """
         Initialize DirectoryTraversal.
 
@@ -32,9 +62,18 @@ class DirectoryTraversal:
                 If none is provided, no file or folder will be ignored.
             sort_strategy (Optional[SortStrategy]): A strategy for sorting directories and files.
                 If none is provided, DefaultSortStrategy is used.
+            root_node_factory (Optional[Callable[[str, bool], TreeNode]]): Creates the root node from its name and
+                is_file flag. Child nodes are created through the root's create_child(), so the factory decides the
+                tree representation. If none is provided, plain TreeNode objects are built.
+            directory_listener (Optional[DirectoryListener]): Called for every directory that is read. When set,
+                the listings also carry the directory modification times.
+            collect_file_sizes (bool): Whether the listings carry the sizes of the files.
         """
         self.file_ignore_strategies = file_ignore_strategies or []
         self.sort_strategy = sort_strategy or DefaultSortStrategy()
+        self.root_node_factory = root_node_factory or TreeNode
+        self.directory_listener = directory_listener
+        self.collect_file_sizes = collect_file_sizes
 
     def build_tree(self, folder_path: str) -> TreeNode:
         """
@@ -55,49 +94,95 @@ class DirectoryTraversal:
         """
         folder_path = os.path.normpath(folder_path)
         root_name = os.path.basename(folder_path) or folder_path  # Handle root directories like '/'
-        root_node = TreeNode(root_name, is_file=os.path.isfile(folder_path))
+        root_node = self.root_node_factory(root_name, os.path.isfile(folder_path))
 
         if root_node.is_file:
             return root_node
 
+        self.populate(root_node, folder_path)
+        return root_node
+
+    def create_ignore_matcher(self, folder_path: str) -> IgnoreMatcher:
+        """
+        Compiles the traversal's ignore strategies into the matcher for the entries of folder_path.
+        """
+        return IgnoreMatcher.from_strategies(self.file_ignore_strategies, folder_path)
+
+    def populate(self, node: TreeNode, folder_path: str, ignore_matcher: Optional[IgnoreMatcher] = None) -> None:
+        """
+        Traverses a directory and attaches its structure below an existing node.
+
+        Args:
+            node (TreeNode): The node representing folder_path.
+            folder_path (str): The absolute path of the directory.
+            ignore_matcher (Optional[IgnoreMatcher]): The ignore rules that apply to the entries of folder_path,
+                not including its own .gitignore, which is detected while reading it. Compiled from the
+                traversal's ignore strategies if not provided.
+        """
         queue = deque()
-        # Each item in the queue is a tuple: (current_node, current_path, current_strategies)
-        queue.append((root_node, folder_path, list(self.file_ignore_strategies)))
+        # Each item in the queue is a tuple: (current_node, current_path, current_matcher)
+        queue.append((node, folder_path, ignore_matcher or self.create_ignore_matcher(folder_path)))
 
         while queue:
-            current_node, current_path, current_strategies = queue.popleft()
+            current_node, current_path, current_matcher = queue.popleft()
 
-            try:
-                children = os.listdir(current_path)
-            except (PermissionError, FileNotFoundError) as e:
-                # Log the error or handle accordingly
+            listing = self.list_directory(current_path, current_matcher)
+            if listing is None:
                 continue  # Skip directories that cannot be accessed
 
-            # Generate absolute paths
-            children_abs_paths = [os.path.join(current_path, child) for child in children]
-            sorted_children = self.sort_strategy.sort(children_abs_paths)
+            for name, child_abs_path, is_file in listing.entries:
+                child_node = current_node.create_child(name, is_file=is_file)
 
-            # Check for .gitignore once per directory
-            gitignore_path = os.path.join(current_path, '.gitignore')
-            if os.path.isfile(gitignore_path):
-                git_strategy = GitIgnoreStrategy(root_path=current_path)
-                # Prepend to strategies for higher priority
-                updated_strategies = [git_strategy] + current_strategies
-            else:
-                updated_strategies = current_strategies
-
-            for child_abs_path in sorted_children:
-                if any(strategy.should_ignore(child_abs_path) for strategy in updated_strategies):
-                    continue
+                if not is_file:
+                    # Add directory to queue with the inherited ignore rules
+                    queue.append((child_node, child_abs_path, listing.ignore_matcher.descend(name)))
 
-                name = os.path.basename(child_abs_path)
-                is_file = os.path.isfile(child_abs_path)
-                child_node = TreeNode(name, is_file=is_file, parent=current_node)
+            if self.directory_listener:
+                self.directory_listener(current_node, current_path, listing)
 
-                current_node.add_child(child_node)
+    def list_directory(self, folder_path: str, ignore_matcher: IgnoreMatcher) -> Optional[DirectoryListing]:
+        """
+        Reads the visible entries of a single directory.
 
-                if not is_file:
-                    # Add directory to queue with updated strategies
-                    queue.append((child_node, child_abs_path, list(updated_strategies)))
+        Args:
+            folder_path (str): The absolute path of the directory.
+            ignore_matcher (IgnoreMatcher): The ignore rules inherited by the directory.
 
-        return root_node
+        Returns:
+            Optional[DirectoryListing]: The listing, or None if the directory cannot be read.
+        """
+        try:
+            mtime_ns = os.stat(folder_path).st_mtime_ns if self.directory_listener else None
+            children = os.listdir(folder_path)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            # Log the error or handle accordingly
+            return None
+
+        # Generate absolute paths
+        children_abs_paths = [os.path.join(folder_path, child) for child in children]
+        sorted_children = self.sort_strategy.sort(children_abs_paths)
+
+        # Check for .gitignore once per directory
+        has_gitignore = '.gitignore' in children and os.path.isfile(os.path.join(folder_path, '.gitignore'))
+        if has_gitignore:
+            ignore_matcher = ignore_matcher.with_gitignore(folder_path)
+
+        entries = []
+        file_sizes = [] if self.collect_file_sizes else None
+        for child_abs_path in sorted_children:
+            name = os.path.basename(child_abs_path)
+            is_file = os.path.isfile(child_abs_path)
+            if ignore_matcher.is_ignored(name, child_abs_path, is_dir=not is_file):
+                continue
+            entries.append((name, child_abs_path, is_file))
+            if file_sizes is not None:
+                file_sizes.append(_file_size(child_abs_path) if is_file else 0)
+
+        return DirectoryListing(entries, ignore_matcher, has_gitignore, mtime_ns, file_sizes)
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
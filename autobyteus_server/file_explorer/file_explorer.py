@@ -1,86 +1,412 @@
 import os
 import asyncio
-from typing import Optional, List
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, List, Tuple
 import json
 
 from autobyteus_server.file_explorer.operations.add_file_or_folder_operation import AddFileOrFolderOperation
 from autobyteus_server.file_explorer.tree_node import TreeNode
-from autobyteus_server.file_explorer.directory_traversal import DirectoryTraversal
+from autobyteus_server.file_explorer.compact_tree import CompactTreeStore
+from autobyteus_server.file_explorer.path_index import PathIndex
+from autobyteus_server.file_explorer.file_finder import FileFinderIndex
+from autobyteus_server.file_explorer.content_search import ContentSearcher
+from autobyteus_server.file_explorer import tree_pagination, tree_serializer
+from autobyteus_server.file_explorer.tree_snapshot import TreeSnapshot, TreeSnapshotCache
+from autobyteus_server.file_explorer.tree_scan import TreeScanProgress
+from autobyteus_server.file_explorer.scan_pipeline import ScanPipeline
+from autobyteus_server.file_explorer.directory_stats import DirectoryStats
+from autobyteus_server.file_explorer.directory_traversal import DirectoryListener, DirectoryListing
+from autobyteus_server.file_explorer.traversal_engine import TraversalEngine, create_directory_traversal
 from autobyteus_server.file_explorer.traversal_ignore_strategy.git_ignore_strategy import GitIgnoreStrategy
 from autobyteus_server.file_explorer.traversal_ignore_strategy.specific_folder_ignore_strategy import SpecificFolderIgnoreStrategy
 from autobyteus_server.file_explorer.traversal_ignore_strategy.traversal_ignore_strategy import TraversalIgnoreStrategy
+from autobyteus_server.file_explorer.traversal_ignore_strategy.scope_ignore_strategy import ScopeIgnoreStrategy
+from autobyteus_server.file_explorer.workspace_scope import WorkspaceScope
 from autobyteus_server.file_explorer.file_system_changes import FileSystemChangeEvent
+from autobyteus_server.file_explorer.change_event_hub import ChangeEventHub
+from autobyteus_server.file_explorer.large_file_reader import large_file_reader
+from autobyteus_server.file_explorer.content_cache import FileContentCache
 
 from autobyteus_server.file_explorer.operations.write_file_operation import WriteFileOperation
 from autobyteus_server.file_explorer.operations.remove_file_operation import RemoveFileOperation
 from autobyteus_server.file_explorer.operations.move_file_operation import MoveFileOperation
 from autobyteus_server.file_explorer.operations.rename_file_operation import RenameFileOperation
+from autobyteus_server.file_explorer.io_executor import get_background_executor, run_io
+from autobyteus_server.file_explorer.operations.base_operation import BaseFileOperation
+from autobyteus_server.file_explorer.operations.batch_operation import BatchFileOperation, BatchOperationSpec, BatchResult
+from autobyteus_server.file_explorer.background_operations import (
+    TRASH_DIRECTORY_NAME, BackgroundOperation, BackgroundOperationManager)
 
 from autobyteus_server.file_explorer.file_system_watcher import FileSystemWatcher
+from autobyteus_server.file_explorer.watch_event_pipeline import WatchEventPipeline, coalesce_changes, is_node_live
+
+logger = logging.getLogger(__name__)
+
+# Limits of ranges returned as JSON; streamed ranges are unlimited
+MAX_RANGE_LINES = 10000
+MAX_RANGE_BYTES = 4 * 1024 * 1024
+# How long file operations wait for a scheduled scan to build the tree
+TREE_WAIT_SECONDS = 600
 
 class FileExplorer:
     """
     Class to manage workspace directory tree and filesystem operations.
     Simplified to take only a root path and initialize all attributes internally.
     """
-    def __init__(self, workspace_root_path: str):
+    def __init__(self, workspace_root_path: str, traversal_engine: Optional[TraversalEngine] = None,
+                 snapshot_cache: Optional[TreeSnapshotCache] = None, scope: Optional[WorkspaceScope] = None):
         """
         Initialize the FileExplorer with a workspace root path.
 
         Args:
             workspace_root_path (str): The root directory path of the workspace.
+            traversal_engine (Optional[TraversalEngine]): The engine used to build the directory tree.
+                Defaults to the engine configured through FILE_EXPLORER_TRAVERSAL_ENGINE.
+            snapshot_cache (Optional[TreeSnapshotCache]): If given, the tree is restored from a snapshot of a
+                previous build and only changed directories are re-read; the new state is saved back.
+            scope (Optional[WorkspaceScope]): The include and exclude globs and limits of a sparse workspace.
+                Defaults to loading the whole workspace.
         """
         self.workspace_root_path = os.path.normpath(workspace_root_path)
+        self.traversal_engine = traversal_engine or TraversalEngine.from_env()
+        self.snapshot_cache = snapshot_cache
+        self.tree_store: Optional[CompactTreeStore] = None
+        self.path_index: Optional[PathIndex] = None
         self.root_node: Optional[TreeNode] = None
+        self.file_finder = FileFinderIndex()
+        self.scan_progress = TreeScanProgress()
+        # Set while a scan of the tree is scheduled or running; file operations wait for it
+        self._scan_pending = False
+        self.scope_strategy = ScopeIgnoreStrategy(self.workspace_root_path, scope, tree_files=self._tree_file_paths)
         self.ignore_strategies: List[TraversalIgnoreStrategy] = [
-            SpecificFolderIgnoreStrategy(folders_to_ignore=['.git']),
-            GitIgnoreStrategy(root_path=self.workspace_root_path)
+            SpecificFolderIgnoreStrategy(folders_to_ignore=['.git', TRASH_DIRECTORY_NAME]),
+            GitIgnoreStrategy(root_path=self.workspace_root_path),
+            # Last, so only files that are not ignored otherwise count towards the file limit
+            self.scope_strategy
         ]
-        self.loop = asyncio.get_event_loop()
-        #self.file_watcher = FileSystemWatcher(self, self.loop, self.ignore_strategies)
-        #self.file_watcher.start()
+        try:
+            self.loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            # Created outside of an event loop (e.g. from synchronous code or tests)
+            self.loop = None
+        self.change_hub = ChangeEventHub()
+        self.content_cache = FileContentCache()
+        self.directory_stats = DirectoryStats(self)
+        # Everything derived from the files of the workspace is produced during the single tree scan
+        self.scan_pipeline = ScanPipeline([self.scan_progress, self.file_finder, self.directory_stats])
+        self.file_watcher: Optional[FileSystemWatcher] = None
+        # Held while an operation changes files and the tree; the watcher does not apply events meanwhile
+        self.tree_lock = threading.RLock()
+        self._mutation_lock = asyncio.Lock()
+        self.background_operations = BackgroundOperationManager(self)
+        self.content_searcher = ContentSearcher(self)
+
+    def start_watching(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> bool:
+        """
+        Starts keeping the tree up to date with changes made on disk by other programs.
+
+        Args:
+            loop (Optional[asyncio.AbstractEventLoop]): The loop the tree updates run on. Defaults to the
+                loop the FileExplorer was created in.
+
+        Returns:
+            bool: True if the watcher is running, False if there is no event loop to run it on.
+        """
+        if self.file_watcher is not None:
+            return True
+        loop = loop or self.loop
+        if loop is None:
+            logger.warning(f"Cannot watch {self.workspace_root_path} without a running event loop")
+            return False
+        self.loop = loop
+        self.file_watcher = FileSystemWatcher(self, loop)
+        self.file_watcher.start()
+        return True
+
+    def stop_watching(self) -> None:
+        """
+        Stops the filesystem watcher, if it is running.
+        """
+        if self.file_watcher is not None:
+            self.file_watcher.stop()
+            self.file_watcher = None
 
     def build_workspace_directory_tree(self) -> TreeNode:
         """
         Builds and returns the directory tree of a workspace.
 
+        The tree is held in a CompactTreeStore; root_node is a TreeNode-compatible view on it.
+        A PathIndex over the store is kept up to date for find_node(). With a snapshot cache, a
+        previously saved tree is revalidated instead of walking the whole workspace.
+
+        On the first build, root_node is set as soon as the root exists, so the tree can be served
+        while it is still being filled; path-based lookups only work once the build is done.
+        scan_progress reports how far the build got. The visitors of scan_pipeline see every directory
+        read and are told when the tree is complete.
+
         Returns:
             TreeNode: The root TreeNode of the directory tree.
         """
         if not self.workspace_root_path:
             raise ValueError("Workspace root path is not set")
 
-        directory_traversal = DirectoryTraversal(file_ignore_strategies=self.ignore_strategies)
-        self.root_node = directory_traversal.build_tree(self.workspace_root_path)
+        self._scan_pending = True
+        self.scan_progress.start()
+        try:
+            root_node = self._build_tree()
+        except Exception as e:
+            self._scan_pending = False
+            self.scan_progress.finish(e)
+            raise
+        self._scan_pending = False
+        self.scan_progress.finish()
+        return root_node
+
+    def mark_scan_pending(self) -> None:
+        """
+        Tells the file explorer that a scan of its tree was scheduled, e.g. in the background.
+        File operations requested before the tree is built wait for the scan.
+        """
+        self._scan_pending = True
+
+    async def wait_for_tree(self, timeout: float = TREE_WAIT_SECONDS) -> None:
+        """
+        Waits until the directory tree is built, if a scan is scheduled or running.
+
+        Raises:
+            ValueError: If the tree is not built, or the scan failed or did not finish in time.
+        """
+        if self.path_index is None and self._scan_pending:
+            async def scan_finished() -> None:
+                async for _ in self.scan_progress.watch():
+                    pass
+            try:
+                await asyncio.wait_for(scan_finished(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._check_tree_ready()
+
+    def _check_tree_ready(self) -> None:
+        """
+        Raises:
+            ValueError: If the directory tree is not built (yet).
+        """
+        if self.path_index is not None:
+            return
+        if self._scan_pending:
+            raise ValueError("Directory tree is still being scanned")
+        if self.scan_progress.error:
+            raise ValueError(f"Directory tree could not be built: {self.scan_progress.error}")
+        raise ValueError("Directory tree is not built")
+
+    def _build_tree(self) -> TreeNode:
+        start_time = time.perf_counter()
+        self.scope_strategy.reset()
+        snapshot = self._restore_snapshot()
+        if snapshot is None:
+            tree_store = CompactTreeStore()
+            snapshot = TreeSnapshot(self.workspace_root_path, tree_store)
+            directory_traversal = create_directory_traversal(
+                self.traversal_engine,
+                file_ignore_strategies=self.ignore_strategies,
+                root_node_factory=self._root_node_factory(tree_store),
+                directory_listener=self._directory_listener(snapshot),
+                collect_file_sizes=self.scan_pipeline.needs_file_sizes)
+            directory_traversal.build_tree(self.workspace_root_path)
+            logger.info(f"Built directory tree of {self.workspace_root_path} with {len(tree_store)} nodes "
+                        f"in {time.perf_counter() - start_time:.3f}s")
+
+        tree_store = snapshot.store
+        tree_store.finish_bulk_load()
+        self.tree_store = tree_store
+        self.root_node = tree_store.root
+        self.path_index = PathIndex(tree_store)
+        self.scan_pipeline.scan_finished(self)
+        if self.snapshot_cache:
+            self.snapshot_cache.save(snapshot)
         return self.root_node
 
+    def _root_node_factory(self, tree_store: CompactTreeStore):
+        def create_root(name: str, is_file: bool = False) -> TreeNode:
+            root_node = tree_store.create_root(name, is_file)
+            if self.root_node is None:
+                # Serve the partial tree while it is being built; a rebuild keeps serving the old one
+                self.tree_store, self.root_node = tree_store, root_node
+            return root_node
+        return create_root
+
+    def _directory_listener(self, snapshot: TreeSnapshot) -> DirectoryListener:
+        def directory_read(node: TreeNode, path: str, listing: DirectoryListing) -> None:
+            self.scan_pipeline.visit_directory(node, path, listing)
+            if self.snapshot_cache:
+                snapshot.record_directory(node, path, listing)
+        return directory_read
+
+    async def scan_workspace_directory_tree(self) -> TreeNode:
+        """
+        Builds the directory tree on the background executor without blocking the event loop.
+
+        The tree lock is held during the build, so file operations and index refreshes wait for the
+        complete tree, while the partial tree can already be read. Follow scan_progress for the
+        progress.
+
+        Returns:
+            TreeNode: The root TreeNode of the directory tree.
+        """
+        def build() -> TreeNode:
+            with self.tree_lock:
+                return self.build_workspace_directory_tree()
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_background_executor(), build)
+
+    def _restore_snapshot(self) -> Optional[TreeSnapshot]:
+        """
+        Loads the tree snapshot of the workspace and brings it up to date with the file system.
+
+        Returns:
+            Optional[TreeSnapshot]: The revalidated snapshot, or None if a full build is needed.
+        """
+        if not self.snapshot_cache or not os.path.isdir(self.workspace_root_path):
+            return None
+        start_time = time.perf_counter()
+        snapshot = self.snapshot_cache.load(self.workspace_root_path)
+        if snapshot is None:
+            return None
+        # Files kept from the snapshot count towards the file limit of the scope
+        self.scope_strategy.sync_files(path for _, path in snapshot.store.iter_subtree(
+            snapshot.store.root_index, files_only=True))
+
+        directory_traversal = create_directory_traversal(self.traversal_engine,
+                                                         file_ignore_strategies=self.ignore_strategies,
+                                                         directory_listener=self._directory_listener(snapshot),
+                                                         collect_file_sizes=self.scan_pipeline.needs_file_sizes)
+        checked, rescanned = snapshot.revalidate(directory_traversal)
+        logger.info(f"Restored directory tree of {self.workspace_root_path} from snapshot in "
+                    f"{time.perf_counter() - start_time:.3f}s ({checked} directories checked, {rescanned} re-read)")
+        return snapshot
+
+    @property
+    def scope(self) -> WorkspaceScope:
+        """
+        The include and exclude globs and limits that decide which part of the workspace is loaded.
+        """
+        return self.scope_strategy.scope
+
+    def get_scope_status(self) -> Dict[str, Any]:
+        """
+        Returns the scope as a dictionary, with "truncated" telling whether files were left out
+        because the scope's max_files was reached.
+        """
+        return {**self.scope.to_dict(), "truncated": self.scope_strategy.truncated}
+
+    def set_scope(self, scope: WorkspaceScope) -> FileSystemChangeEvent:
+        """
+        Changes the scope of the workspace and publishes the resulting changes of the tree.
+
+        Only the folders the change affects are read again: the folders leading to the changed globs
+        and the subtrees below them, or the folders at the old or new maximum depth. Changing
+        max_files, or adding the first or removing the last include glob, reads the whole tree again.
+        Sub-directories that stay in scope keep their nodes (and ids).
+
+        Args:
+            scope (WorkspaceScope): The new scope.
+
+        Returns:
+            FileSystemChangeEvent: The changes made to the tree.
+        """
+        return self.publish_change_event(self._apply_scope(scope))
+
+    async def set_scope_async(self, scope: WorkspaceScope) -> FileSystemChangeEvent:
+        """
+        Like set_scope, but reads the affected folders on the file explorer I/O executor.
+        """
+        async with self._mutation_lock:
+            change_event = await run_io(self._apply_scope, scope)
+            return self.publish_change_event(change_event)
+
+    def _apply_scope(self, scope: WorkspaceScope) -> FileSystemChangeEvent:
+        with self.tree_lock:
+            scope_change = scope.changes_from(self.scope)
+            if scope_change.is_empty:
+                return FileSystemChangeEvent(changes=[])
+            self.scope_strategy.set_scope(scope)
+            if self.snapshot_cache:
+                # The snapshot was read with the previous scope; the next build reads the tree anew
+                self.snapshot_cache.remove(self.workspace_root_path)
+            if self.path_index is None:
+                # No tree yet, the scope applies to the coming scan
+                return FileSystemChangeEvent(changes=[])
+
+            start_time = time.perf_counter()
+            if scope_change.full:
+                self.scope_strategy.reset()
+                subtrees, directories = {''}, set()
+            else:
+                self.scope_strategy.sync_files(self._tree_file_paths())
+                subtrees, directories = set(scope_change.subtrees), set(scope_change.directories)
+                if scope_change.depth is not None:
+                    subtrees.update(path for index, path in self.tree_store.iter_subtree(self.tree_store.root_index)
+                                    if not self.tree_store.is_file(index)
+                                    and path.count(os.sep) + 1 == scope_change.depth)
+            # Subtrees are read after the folders leading to them, and only if they were in the tree;
+            # folders that come into scope are read completely when their parent is read
+            subtrees = {path for path in subtrees if self._is_folder_in_tree(path)}
+            subtrees = {path for path in subtrees
+                        if not any(other != path and _is_below(path, other) for other in subtrees)}
+            directories = {path for path in directories if not any(_is_below(path, other) for other in subtrees)}
+
+            pipeline = WatchEventPipeline(self, callback=lambda change_event: None)
+            changes = []
+            for directory in sorted(directories):
+                pipeline.rescan(directory, changes, recursive=False)
+            for subtree in sorted(subtrees):
+                pipeline.rescan(subtree, changes)
+            self.scope_strategy.sync_files(self._tree_file_paths())
+            changes = coalesce_changes(changes, lambda node: is_node_live(node, self.root_node))
+            logger.info(f"Applied scope {scope.to_dict()} to {self.workspace_root_path} in "
+                        f"{time.perf_counter() - start_time:.3f}s ({len(directories)} folders and "
+                        f"{len(subtrees)} subtrees re-read, {len(changes)} changes)")
+        return FileSystemChangeEvent(changes=changes)
+
+    def _is_folder_in_tree(self, path: str) -> bool:
+        node = self.find_node(path)
+        return node is not None and not node.is_file
+
+    def _tree_file_paths(self) -> Iterator[str]:
+        if self.tree_store is None or self.tree_store.root_index < 0:
+            return iter(())
+        return (path for _, path in self.tree_store.iter_subtree(self.tree_store.root_index, files_only=True))
+
     def write_file_content(self, file_path: str, content: str) -> FileSystemChangeEvent:
         """
         Write file content operation, delegates to WriteFileOperation.
         """
-        operation = WriteFileOperation(self, file_path, content)
-        return operation.execute()
+        return self.publish_change_event(self._run_operation(WriteFileOperation(self, file_path, content), file_path))
 
     def remove_file_or_folder(self, file_or_folder_path: str) -> FileSystemChangeEvent:
         """
         Remove file or folder operation, delegates to RemoveFileOperation.
         """
         operation = RemoveFileOperation(self, file_or_folder_path)
-        return operation.execute()
+        return self.publish_change_event(self._run_operation(operation, file_or_folder_path))
 
     def move_file_or_folder(self, source_path: str, destination_path: str) -> FileSystemChangeEvent:
         """
         Move file or folder operation, delegates to MoveFileOperation.
         """
         operation = MoveFileOperation(self, source_path, destination_path)
-        return operation.execute()
+        return self.publish_change_event(self._run_operation(operation, source_path, destination_path))
 
     def rename_file_or_folder(self, target_path: str, new_name: str) -> FileSystemChangeEvent:
         """
         Rename file or folder operation, delegates to RenameFileOperation.
         """
         operation = RenameFileOperation(self, target_path, new_name)
-        return operation.execute()
+        renamed_path = os.path.join(os.path.dirname(target_path), new_name)
+        return self.publish_change_event(self._run_operation(operation, target_path, renamed_path))
 
     def add_file_or_folder(self, path: str, is_file: bool) -> FileSystemChangeEvent:
         """
@@ -97,12 +423,173 @@ class FileExplorer:
             ValueError: If the path is outside the workspace.
             RuntimeError: If creation fails.
         """
-        operation = AddFileOrFolderOperation(self, path, is_file)
-        return operation.execute()
+        return self.publish_change_event(self._run_operation(AddFileOrFolderOperation(self, path, is_file), path))
+
+    def apply_file_operations(self, operations: List[BatchOperationSpec], atomic: bool = False) -> BatchResult:
+        """
+        Applies an ordered list of write, add, move, rename and delete operations in one pass and
+        publishes a single merged change event.
+
+        Args:
+            operations (List[BatchOperationSpec]): The operations, applied in order until one fails.
+            atomic (bool): If True, a failing operation rolls back all operations applied before it.
+
+        Returns:
+            BatchResult: The merged change event, the number of applied operations and the index
+                         and error of the failed operation, if any.
+        """
+        operation = BatchFileOperation(self, operations, atomic=atomic)
+        change_event = self._run_operation(operation, *self._batch_paths(operations))
+        return operation.result(self.publish_change_event(change_event))
+
+    async def write_file_content_async(self, file_path: str, content: str) -> FileSystemChangeEvent:
+        """
+        Like write_file_content, but runs the disk I/O on the file explorer I/O executor.
+        """
+        return await self._run_operation_async(WriteFileOperation(self, file_path, content), file_path)
+
+    async def remove_file_or_folder_async(self, file_or_folder_path: str) -> FileSystemChangeEvent:
+        """
+        Like remove_file_or_folder, but runs the disk I/O on the file explorer I/O executor.
+        """
+        return await self._run_operation_async(RemoveFileOperation(self, file_or_folder_path), file_or_folder_path)
+
+    async def move_file_or_folder_async(self, source_path: str, destination_path: str) -> FileSystemChangeEvent:
+        """
+        Like move_file_or_folder, but runs the disk I/O on the file explorer I/O executor.
+        """
+        operation = MoveFileOperation(self, source_path, destination_path)
+        return await self._run_operation_async(operation, source_path, destination_path)
+
+    async def rename_file_or_folder_async(self, target_path: str, new_name: str) -> FileSystemChangeEvent:
+        """
+        Like rename_file_or_folder, but runs the disk I/O on the file explorer I/O executor.
+        """
+        operation = RenameFileOperation(self, target_path, new_name)
+        renamed_path = os.path.join(os.path.dirname(target_path), new_name)
+        return await self._run_operation_async(operation, target_path, renamed_path)
+
+    async def add_file_or_folder_async(self, path: str, is_file: bool) -> FileSystemChangeEvent:
+        """
+        Like add_file_or_folder, but runs the disk I/O on the file explorer I/O executor.
+        """
+        return await self._run_operation_async(AddFileOrFolderOperation(self, path, is_file), path)
+
+    async def apply_file_operations_async(self, operations: List[BatchOperationSpec],
+                                          atomic: bool = False) -> BatchResult:
+        """
+        Like apply_file_operations, but runs the disk I/O on the file explorer I/O executor.
+        """
+        operation = BatchFileOperation(self, operations, atomic=atomic)
+        change_event = await self._run_operation_async(operation, *self._batch_paths(operations))
+        return operation.result(change_event)
+
+    def remove_file_or_folder_in_background(self, file_or_folder_path: str) -> Tuple[FileSystemChangeEvent, BackgroundOperation]:
+        """
+        Moves a file or folder into the workspace trash, removes it from the tree and publishes the
+        change event; the space is reclaimed in the background.
+
+        Returns:
+            Tuple[FileSystemChangeEvent, BackgroundOperation]: The change event and the reclaim operation.
+        """
+        self._check_tree_ready()
+        change_event, operation = self.background_operations.delete(file_or_folder_path)
+        return self.publish_change_event(change_event), operation
+
+    def move_file_or_folder_in_background(self, source_path: str,
+                                          destination_path: str) -> Tuple[Optional[FileSystemChangeEvent], BackgroundOperation]:
+        """
+        Moves a file or folder. A move to another filesystem copies in the background, reporting
+        progress, and publishes the change event when the data is in place.
+
+        Returns:
+            Tuple[Optional[FileSystemChangeEvent], BackgroundOperation]: The change event if the move
+                completed immediately, otherwise None, and the operation.
+        """
+        self._check_tree_ready()
+        change_event, operation = self.background_operations.move(source_path, destination_path)
+        if change_event is not None:
+            self.publish_change_event(change_event)
+        return change_event, operation
+
+    async def remove_file_or_folder_in_background_async(
+            self, file_or_folder_path: str) -> Tuple[FileSystemChangeEvent, BackgroundOperation]:
+        """
+        Like remove_file_or_folder_in_background, but runs the rename on the file explorer I/O executor.
+        """
+        async with self._mutation_lock:
+            await self.wait_for_tree()
+            change_event, operation = await run_io(self.background_operations.delete, file_or_folder_path)
+            return self.publish_change_event(change_event), operation
+
+    async def move_file_or_folder_in_background_async(
+            self, source_path: str, destination_path: str) -> Tuple[Optional[FileSystemChangeEvent], BackgroundOperation]:
+        """
+        Like move_file_or_folder_in_background, but runs the disk I/O on the file explorer I/O executor.
+        """
+        async with self._mutation_lock:
+            await self.wait_for_tree()
+            change_event, operation = await run_io(self.background_operations.move, source_path, destination_path)
+            if change_event is not None:
+                self.publish_change_event(change_event)
+            return change_event, operation
+
+    @staticmethod
+    def _batch_paths(operations: List[BatchOperationSpec]) -> List[str]:
+        paths = [spec.path for spec in operations]
+        paths.extend(spec.destination_path for spec in operations if spec.destination_path)
+        return paths
+
+    def _run_operation(self, operation: BaseFileOperation, *touched_paths: str) -> FileSystemChangeEvent:
+        """
+        Executes an operation while holding the tree lock, then drops cached contents below the
+        touched paths. Safe to call from any thread.
+
+        Raises:
+            ValueError: If the directory tree is not built (yet).
+        """
+        with self.tree_lock:
+            self._check_tree_ready()
+            try:
+                return operation.execute()
+            finally:
+                for path in touched_paths:
+                    self._invalidate_content(path, recursive=True)
+
+    async def _run_operation_async(self, operation: BaseFileOperation, *touched_paths: str) -> FileSystemChangeEvent:
+        """
+        Executes an operation on the I/O executor and publishes its change event on the event loop.
+
+        Mutations of one workspace run one at a time and in the order they were requested, so
+        waiting mutations do not occupy executor threads. Mutations requested while the tree is
+        scanned wait for the scan.
+        """
+        async with self._mutation_lock:
+            await self.wait_for_tree()
+            change_event = await run_io(self._run_operation, operation, *touched_paths)
+            return self.publish_change_event(change_event)
+
+    def _invalidate_content(self, path: str, recursive: bool = False) -> None:
+        self.content_cache.invalidate(os.path.join(self.workspace_root_path, path), recursive=recursive)
+
+    def publish_change_event(self, change_event: FileSystemChangeEvent) -> FileSystemChangeEvent:
+        """
+        Broadcasts a change event to the file_system_changed subscribers of the workspace, unless
+        it is empty.
+
+        Returns:
+            FileSystemChangeEvent: The same event, for chaining.
+        """
+        if change_event.changes:
+            self.scope_strategy.mark_stale()
+            self.change_hub.publish(change_event)
+            if self.file_watcher is not None:
+                self.file_watcher.on_tree_changed(change_event)
+        return change_event
 
     def read_file_content(self, file_path: str, max_size: int = 1024 * 1024) -> str:
         """
-        Reads and returns the content of a file within the workspace.
+        Reads and returns the content of a file within the workspace, through the content cache.
 
         Args:
             file_path (str): The relative path of the file to read.
@@ -116,11 +603,31 @@ class FileExplorer:
             FileNotFoundError: If the file does not exist.
             PermissionError: If there's no permission to read the file.
         """
+        absolute_file_path = self._resolve_readable_file(file_path)
+
+        file_size = os.path.getsize(absolute_file_path)
+        if file_size > max_size:
+            raise ValueError(f"File size ({file_size} bytes) exceeds the maximum allowed size ({max_size} bytes).")
+
+        return self.content_cache.read_text(absolute_file_path)
+
+    def _resolve_readable_file(self, file_path: str) -> str:
+        """
+        Returns the absolute path of a readable file within the workspace.
+
+        Raises:
+            ValueError: If the file is not within the workspace.
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If there's no permission to read the file.
+        """
         if not self.workspace_root_path:
             raise ValueError("Workspace root path is not set")
 
         absolute_file_path = os.path.normpath(os.path.join(self.workspace_root_path, file_path))
-        if not absolute_file_path.startswith(self.workspace_root_path):
+        # Compared by path components, so a sibling such as '../ws2' of root '/tmp/ws' is outside too,
+        # and on real paths, so symlinks cannot lead out of the workspace
+        root_path = os.path.realpath(self.workspace_root_path)
+        if os.path.commonpath([root_path, os.path.realpath(absolute_file_path)]) != root_path:
             raise ValueError("Access denied: File is outside the workspace.")
 
         if not os.path.exists(absolute_file_path):
@@ -129,12 +636,186 @@ class FileExplorer:
         if not os.access(absolute_file_path, os.R_OK):
             raise PermissionError(f"Permission denied: Cannot read {absolute_file_path}")
 
-        file_size = os.path.getsize(absolute_file_path)
-        if file_size > max_size:
-            raise ValueError(f"File size ({file_size} bytes) exceeds the maximum allowed size ({max_size} bytes).")
+        if os.path.isdir(absolute_file_path):
+            raise ValueError(f"Not a file: {file_path}")
+
+        return absolute_file_path
+
+    def read_file_lines(self, file_path: str, start_line: int = 1, line_count: int = 1000) -> Dict[str, Any]:
+        """
+        Reads a range of lines of a file of any size. The file is memory-mapped and its line index
+        cached, so reading further ranges of the same file does not re-read it.
+
+        Args:
+            file_path (str): The relative path of the file to read.
+            start_line (int): The 1-based number of the first line.
+            line_count (int): The number of lines, at most MAX_RANGE_LINES.
+
+        Returns:
+            Dict[str, Any]: The range as returned by LineRange.to_dict: content, start_line, end_line,
+                            total_lines, start_byte, end_byte and file_size.
+
+        Raises:
+            ValueError: If the file is not within the workspace or the range is invalid.
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If there's no permission to read the file.
+        """
+        if line_count > MAX_RANGE_LINES:
+            raise ValueError(f"line_count must not exceed {MAX_RANGE_LINES}")
+        absolute_file_path = self._resolve_readable_file(file_path)
+        return large_file_reader.read_lines(absolute_file_path, start_line, line_count).to_dict()
+
+    def read_file_bytes(self, file_path: str, offset: int = 0, length: int = MAX_RANGE_BYTES) -> Dict[str, Any]:
+        """
+        Reads a byte range of a file of any size. Multi-byte characters cut at the range boundaries
+        are replaced by U+FFFD.
+
+        Args:
+            file_path (str): The relative path of the file to read.
+            offset (int): The offset of the first byte.
+            length (int): The number of bytes, at most MAX_RANGE_BYTES.
+
+        Returns:
+            Dict[str, Any]: {"content", "start_byte", "end_byte", "file_size"}.
+
+        Raises:
+            ValueError: If the file is not within the workspace or the range is invalid.
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If there's no permission to read the file.
+        """
+        if length > MAX_RANGE_BYTES:
+            raise ValueError(f"length must not exceed {MAX_RANGE_BYTES}")
+        absolute_file_path = self._resolve_readable_file(file_path)
+        data = large_file_reader.read_bytes(absolute_file_path, offset, length)
+        return {
+            "content": data.decode('utf-8', errors='replace'),
+            "start_byte": offset,
+            "end_byte": offset + len(data),
+            "file_size": os.path.getsize(absolute_file_path),
+        }
+
+    def open_file_range_stream(self, file_path: str, start_line: Optional[int] = None,
+                               line_count: Optional[int] = None, offset: Optional[int] = None,
+                               length: Optional[int] = None) -> Tuple[Iterator[bytes], Dict[str, Any]]:
+        """
+        Prepares streaming a line range or a byte range of a file, without a size limit.
+
+        A line range is used if start_line or line_count is given (reading to the end of the file
+        if line_count is None), otherwise the byte range from offset (default 0) of length bytes
+        (default: to the end of the file).
+
+        Returns:
+            Tuple[Iterator[bytes], Dict[str, Any]]: The chunk iterator and the range: start_byte,
+                end_byte and file_size, plus start_line and total_lines for line ranges.
+
+        Raises:
+            ValueError: If the file is not within the workspace or the range is invalid.
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If there's no permission to read the file.
+        """
+        absolute_file_path = self._resolve_readable_file(file_path)
+        if start_line is not None or line_count is not None:
+            start_line = 1 if start_line is None else start_line
+            index, start, end = large_file_reader.line_byte_range(
+                absolute_file_path, start_line, line_count if line_count is not None else 2 ** 62)
+            info = {"start_line": start_line, "total_lines": index.line_count, "file_size": index.size}
+        else:
+            offset = 0 if offset is None else offset
+            if offset < 0 or (length is not None and length < 0):
+                raise ValueError("offset and length must not be negative")
+            file_size = os.path.getsize(absolute_file_path)
+            start = min(offset, file_size)
+            end = file_size if length is None else min(file_size, offset + length)
+            info = {"file_size": file_size}
+        info.update(start_byte=start, end_byte=end)
+        return large_file_reader.iter_bytes(absolute_file_path, start, end), info
+
+    async def read_file_content_async(self, file_path: str, max_size: int = 1024 * 1024) -> str:
+        """
+        Like read_file_content, but reads on the file explorer I/O executor.
+        """
+        return await run_io(self.read_file_content, file_path, max_size)
+
+    async def read_file_lines_async(self, file_path: str, start_line: int = 1, line_count: int = 1000) -> Dict[str, Any]:
+        """
+        Like read_file_lines, but reads (and indexes the file, if needed) on the I/O executor.
+        """
+        return await run_io(self.read_file_lines, file_path, start_line, line_count)
+
+    async def read_file_bytes_async(self, file_path: str, offset: int = 0,
+                                    length: int = MAX_RANGE_BYTES) -> Dict[str, Any]:
+        """
+        Like read_file_bytes, but reads on the file explorer I/O executor.
+        """
+        return await run_io(self.read_file_bytes, file_path, offset, length)
+
+    def find_files(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Fuzzy-searches the relative paths of the files of the workspace, e.g. for "go to file".
+        The search index is built on first use.
+
+        Args:
+            query (str): Part of a file name or path, e.g. 'butt' or 'src/comp/butt'.
+            limit (int): The maximum number of results.
+
+        Returns:
+            List[str]: The best matching relative paths, best first.
+        """
+        if self.path_index is None:
+            return []
+        if not self.file_finder.is_built:
+            with self.tree_lock:
+                self.file_finder.build()
+        return self.file_finder.search(query, limit)
+
+    async def find_files_async(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Like find_files, but runs on the file explorer I/O executor, so building the index does
+        not block the event loop.
+        """
+        return await run_io(self.find_files, query, limit)
+
+    def find_node(self, path: str) -> Optional[TreeNode]:
+        """
+        Finds a node of the workspace tree by its path relative to the workspace root.
+
+        Args:
+            path (str): The relative path. '' or '.' refers to the root node.
+
+        Returns:
+            Optional[TreeNode]: The node, or None if the path is not part of the tree.
+        """
+        if self.path_index is None:
+            return None
+        index = self.path_index.resolve(path)
+        return self.tree_store.view(index) if index is not None else None
+
+    def find_node_by_id(self, node_id: str) -> Optional[TreeNode]:
+        """
+        Finds a node of the workspace tree by its id.
 
-        with open(absolute_file_path, 'r', encoding='utf-8') as file:
-            return file.read()
+        Args:
+            node_id (str): The id of the node.
+
+        Returns:
+            Optional[TreeNode]: The node, or None if no node with that id is part of the tree.
+        """
+        if self.tree_store is None:
+            return None
+        index = self.tree_store.index_of(node_id)
+        return self.tree_store.view(index) if index is not None else None
+
+    def get_memory_usage(self) -> int:
+        """
+        Returns the approximate memory used by the workspace tree in bytes.
+        """
+        with self.tree_lock:
+            if self.tree_store is None:
+                return 0
+            # The path index only exists once a scan is done
+            path_index_bytes = self.path_index.nbytes() if self.path_index is not None else 0
+            return (self.tree_store.nbytes() + path_index_bytes + self.file_finder.nbytes()
+                    + self.directory_stats.nbytes())
 
     def get_tree(self) -> Optional[TreeNode]:
         """
@@ -145,11 +826,52 @@ class FileExplorer:
         """
         return self.root_node
 
-    def to_json(self) -> str:
+    def to_json(self, max_depth: Optional[int] = None) -> str:
         """
         Returns a JSON representation of the workspace directory tree.
+
+        Args:
+            max_depth (Optional[int]): If given, only this many levels below the root are included;
+                deeper folders can be fetched with get_children_page().
+        """
+        if not self.root_node:
+            return ""
+        return tree_serializer.tree_to_json(self.root_node, max_depth=max_depth)
+
+    def iter_json(self, max_depth: Optional[int] = None) -> Iterator[str]:
+        """
+        Yields the JSON representation of the workspace directory tree in chunks, for streaming
+        large trees without building the whole document in memory.
+
+        Args:
+            max_depth (Optional[int]): See to_json().
         """
-        return self.root_node.to_json() if self.root_node else ""
+        if self.root_node:
+            yield from tree_serializer.iter_tree_json(self.root_node, max_depth=max_depth)
+
+    def get_children_page(self, node_id: Optional[str] = None, depth: int = 1, cursor: Optional[str] = None,
+                          limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Returns a page of the children of a folder, for lazily expanding the tree.
+
+        Args:
+            node_id (Optional[str]): The id of the folder. Defaults to the root folder.
+            depth (int): Number of levels to include below the folder.
+            cursor (Optional[str]): The next_cursor returned with the previous page.
+            limit (Optional[int]): Maximum number of children returned per folder.
+
+        Returns:
+            Dict[str, Any]: The page, see tree_pagination.get_children_page().
+
+        Raises:
+            ValueError: If the tree is not built, the node does not exist or the arguments are invalid.
+        """
+        if not self.root_node:
+            raise ValueError("Directory tree is not built")
+        node = self.root_node if node_id is None else self.find_node_by_id(node_id)
+        if node is None:
+            raise ValueError(f"Node not found: {node_id}")
+        return tree_pagination.get_children_page(node, depth=depth, cursor=cursor, limit=limit)
 
     def get_all_file_paths(self) -> List[str]:
         """
@@ -158,6 +880,9 @@ class FileExplorer:
         if not self.root_node:
             raise ValueError("Directory tree is not built")
 
+        if self.tree_store is not None and self.tree_store.root == self.root_node:
+            return [path for _, path in self.tree_store.iter_subtree(self.tree_store.root_index, files_only=True)]
+
         all_paths = []
 
         def traverse(node: TreeNode):
@@ -169,3 +894,7 @@ class FileExplorer:
 
         traverse(self.root_node)
         return all_paths
+
+
+def _is_below(path: str, folder: str) -> bool:
+    return not folder or path == folder or path.startswith(folder.rstrip(os.sep) + os.sep)
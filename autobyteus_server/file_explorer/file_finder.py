@@ -0,0 +1,403 @@
+"""
+Fuzzy "go to file" search over the full relative paths of a workspace.
+
+The index holds every file of the tree, including the many files that share a name
+('__init__.py', 'index.ts'), and ranks them by how well the file name and the path match the
+query, with bonuses for name prefixes and for query segments ('src/comp/butt') that match path
+segments in order.
+
+To keep a query fast on hundreds of thousands of paths, candidates are first narrowed with two
+signatures stored per path in numpy arrays: a 32-bit mask of the characters in the path (every
+query character must occur) and a 256-bit bloom filter of its trigrams (used when the character
+test leaves too many candidates). Only the remaining candidates, at most CANDIDATE_LIMIT, are
+scored, with rapidfuzz's vectorized process.cdist.
+
+The index is a visitor of the workspace scan: once the scan is done it is attached to the
+PathIndex of the tree, built on first search and from then on updated with the PathIndex: adding,
+removing, moving and renaming nodes update the affected entries, keyed by the node index of the
+store. numpy is optional; without it every file is scored.
+"""
+
+import heapq
+import logging
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from rapidfuzz import fuzz, process
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from autobyteus_server.file_explorer.scan_pipeline import ScanVisitor
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.file_explorer import FileExplorer
+    from autobyteus_server.file_explorer.path_index import PathIndex
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_LIMIT = 1000
+PATH_SCORED_LIMIT = 200
+_BULK_CHUNK_SIZE = 20000
+_BLOOM_WORDS = 8
+_NAME_PREFIX_BONUS = 10.0
+_EXACT_NAME_BONUS = 10.0
+_SEGMENT_BONUS = 10.0
+_DEPTH_PENALTY = 0.5
+# Files whose name and path both score below this are not returned
+MIN_MATCH_SCORE = 50.0
+
+
+def _byte_masks() -> List[int]:
+    """
+    Maps every byte to its bit in the 32-bit character mask: letters get their own bits, digits,
+    '_' and '.' share a few, all other bytes the last one, and separators have none.
+    """
+    masks = []
+    for byte in range(256):
+        if ord('a') <= byte <= ord('z'):
+            bit = byte - ord('a')
+        elif ord('0') <= byte <= ord('9'):
+            bit = 26 + byte % 3
+        elif byte in (ord('/'), ord('\\'), ord(' '), ord('\n')):
+            masks.append(0)
+            continue
+        elif byte == ord('_'):
+            bit = 29
+        elif byte == ord('.'):
+            bit = 30
+        else:
+            bit = 31
+        masks.append(1 << bit)
+    return masks
+
+
+_BYTE_MASKS = _byte_masks()
+
+
+def _encode(text: str) -> bytes:
+    return text.lower().encode('utf-8', 'replace')
+
+
+def _trigram_bit(first: int, second: int, third: int) -> int:
+    return (((first << 16) | (second << 8) | third) * 2654435761 & 0xFFFFFFFF) >> 24
+
+
+def query_signature(query: str) -> Tuple[int, List[int]]:
+    """
+    Returns the character mask and the eight 32-bit words of the trigram bloom filter of a query.
+    Trigrams are taken within whitespace-separated words only.
+    """
+    data = _encode(query)
+    char_mask = 0
+    for byte in data:
+        char_mask |= _BYTE_MASKS[byte]
+    bloom = [0] * _BLOOM_WORDS
+    for word in data.split():
+        for position in range(len(word) - 2):
+            bit = _trigram_bit(word[position], word[position + 1], word[position + 2])
+            bloom[bit >> 5] |= 1 << (bit & 31)
+    return char_mask, bloom
+
+
+if np is not None:
+    _BYTE_MASK_ARRAY = np.array(_BYTE_MASKS, dtype=np.uint32)
+
+    def path_signatures(paths: Sequence[str]) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """
+        Computes the character masks of paths and of their file names, shape (n,), and the trigram
+        bloom filters of the paths, shape (8, n), vectorized.
+        """
+        char_masks = np.zeros(len(paths), dtype=np.uint32)
+        name_masks = np.zeros(len(paths), dtype=np.uint32)
+        blooms = np.zeros((_BLOOM_WORDS, len(paths)), dtype=np.uint32)
+        for chunk_start in range(0, len(paths), _BULK_CHUNK_SIZE):
+            encoded = [_encode(path) for path in paths[chunk_start:chunk_start + _BULK_CHUNK_SIZE]]
+            stop = chunk_start + len(encoded)
+            lengths = np.fromiter((len(data) for data in encoded), dtype=np.int64, count=len(encoded))
+            starts = np.zeros(len(encoded), dtype=np.int64)
+            np.cumsum(lengths[:-1] + 1, out=starts[1:])
+            name_starts = starts + np.fromiter((data.rfind(b'/') + 1 for data in encoded), dtype=np.int64,
+                                               count=len(encoded))
+            # Paths are separated by newlines; two more pad the trigrams of the last path
+            data = np.frombuffer(b'\n'.join(encoded) + b'\n\n\n', dtype=np.uint8)
+            byte_masks = _BYTE_MASK_ARRAY[data]
+            char_masks[chunk_start:stop] = np.bitwise_or.reduceat(byte_masks, starts)
+            name_bounds = np.empty(2 * len(encoded), dtype=np.int64)
+            name_bounds[0::2] = name_starts
+            name_bounds[1::2] = starts + lengths
+            name_masks[chunk_start:stop] = np.bitwise_or.reduceat(byte_masks, name_bounds)[0::2]
+
+            first, second, third = (data[offset:len(data) - 2 + offset].astype(np.uint64) for offset in range(3))
+            codes = (first << np.uint64(16)) | (second << np.uint64(8)) | third
+            bits = ((codes * np.uint64(2654435761)) & np.uint64(0xFFFFFFFF)) >> np.uint64(24)
+            words = np.where((first != 10) & (second != 10) & (third != 10), bits >> np.uint64(5),
+                             np.uint64(_BLOOM_WORDS))
+            bit_values = np.left_shift(np.uint32(1), (bits & np.uint64(31)).astype(np.uint32))
+            for word in range(_BLOOM_WORDS):
+                values = np.where(words == word, bit_values, np.uint32(0))
+                blooms[word, chunk_start:stop] = np.bitwise_or.reduceat(values, starts)
+        return char_masks, name_masks, blooms
+
+
+class FileFinderIndex(ScanVisitor):
+    """
+    A fuzzy search index over the files of a workspace tree, keyed by node index.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._path_index: Optional['PathIndex'] = None
+        self._built = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._paths: List[Optional[str]] = []
+        self._names: List[Optional[str]] = []
+        self._count = 0
+        if np is not None:
+            self._live = np.zeros(0, dtype=bool)
+            self._char_masks = np.zeros(0, dtype=np.uint32)
+            self._name_masks = np.zeros(0, dtype=np.uint32)
+            self._blooms = np.zeros((_BLOOM_WORDS, 0), dtype=np.uint32)
+            self._lengths = np.zeros(0, dtype=np.int32)
+            self._scratch_words = np.zeros(0, dtype=np.uint32)
+            self._scratch_flags = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def attach(self, path_index: 'PathIndex') -> None:
+        """
+        Follows the tree of a PathIndex. The files are indexed by build(), on first search.
+        """
+        with self._lock:
+            if self._path_index is not None and self in self._path_index.listeners:
+                self._path_index.listeners.remove(self)
+            self._path_index = path_index
+            self._built = False
+            self._reset()
+            path_index.listeners.append(self)
+
+    def scan_finished(self, file_explorer: 'FileExplorer') -> None:
+        self.attach(file_explorer.path_index)
+
+    def build(self) -> None:
+        """
+        Indexes all files of the attached tree. The tree must not change meanwhile, so callers
+        hold the tree lock of the file explorer.
+        """
+        with self._lock:
+            if self._built or self._path_index is None:
+                return
+            self._reset()
+            self._built = True
+            self.add_nodes([(index, path) for path, index in self._path_index.items()])
+
+    def add_nodes(self, entries: List[Tuple[int, str]]) -> None:
+        """
+        Indexes the files among the given (node index, relative path) entries.
+        """
+        if not self._built:
+            return
+        store = self._path_index.store
+        files = [(index, path) for index, path in entries if path and store.is_file(index)]
+        if not files:
+            return
+        with self._lock:
+            self._resize(max(index for index, _ in files) + 1)
+            for index, path in files:
+                if self._paths[index] is None:
+                    self._count += 1
+                self._paths[index] = path
+                self._names[index] = path.rpartition('/')[2].lower()
+            if np is not None:
+                indices = np.fromiter((index for index, _ in files), dtype=np.int64, count=len(files))
+                char_masks, name_masks, blooms = path_signatures([path for _, path in files])
+                self._char_masks[indices] = char_masks
+                self._name_masks[indices] = name_masks
+                self._blooms[:, indices] = blooms
+                self._lengths[indices] = [len(path) for _, path in files]
+                self._live[indices] = True
+
+    def remove_nodes(self, indices: List[int]) -> None:
+        """
+        Drops the given node indices from the index; indices of folders are ignored.
+        """
+        if not self._built:
+            return
+        with self._lock:
+            for index in indices:
+                if index < len(self._paths) and self._paths[index] is not None:
+                    self._paths[index] = None
+                    self._names[index] = None
+                    self._count -= 1
+                    if np is not None:
+                        self._live[index] = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def _resize(self, size: int) -> None:
+        if size <= len(self._paths):
+            return
+        capacity = max(size, len(self._paths) * 2, 1024)
+        self._paths.extend([None] * (capacity - len(self._paths)))
+        self._names.extend([None] * (capacity - len(self._names)))
+        if np is not None:
+            self._live = self._grow(self._live, capacity)
+            self._char_masks = self._grow(self._char_masks, capacity)
+            self._name_masks = self._grow(self._name_masks, capacity)
+            self._blooms = self._grow(self._blooms, capacity)
+            self._lengths = self._grow(self._lengths, capacity)
+
+    @staticmethod
+    def _grow(values: 'np.ndarray', capacity: int) -> 'np.ndarray':
+        grown = np.zeros(values.shape[:-1] + (capacity,), dtype=values.dtype)
+        grown[..., :values.shape[-1]] = values
+        return grown
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Returns the relative paths of the files that best match a query, best first.
+
+        Args:
+            query (str): Part of a file name or path, e.g. 'butt' or 'src/comp/butt'. Words
+                separated by spaces may match anywhere in the path.
+            limit (int): The maximum number of results.
+
+        Returns:
+            List[str]: The matching paths.
+        """
+        query = query.strip().lower()
+        if not query or limit <= 0:
+            return []
+        with self._lock:
+            self.build()
+            candidates = self._candidates(query)
+            if not candidates:
+                return []
+            paths = [self._paths[index] for index in candidates]
+            names = [self._names[index] for index in candidates]
+        scores = self._score(query, paths, names)
+        ranked = sorted((position for position, score in enumerate(scores) if score is not None),
+                        key=lambda position: (-scores[position], len(paths[position])))
+        return [paths[position] for position in ranked[:limit]]
+
+    def _candidates(self, query: str) -> List[int]:
+        if np is None:
+            return [index for index, path in enumerate(self._paths) if path is not None]
+        char_mask, bloom = query_signature(query)
+        size = len(self._paths)
+        # Preallocated buffers save allocating (and page-faulting) several arrays per keystroke
+        if len(self._scratch_words) != size:
+            self._scratch_words = np.empty(size, dtype=np.uint32)
+            self._scratch_flags = np.empty(size, dtype=bool)
+        words, flags = self._scratch_words, self._scratch_flags
+        matches = self._test_mask(self._char_masks, char_mask, self._live.copy(), words, flags)
+        if any(bloom) and np.count_nonzero(matches) > CANDIDATE_LIMIT:
+            narrowed = matches.copy()
+            for word, word_bits in enumerate(bloom):
+                if word_bits:
+                    self._test_mask(self._blooms[word], word_bits, narrowed, words, flags)
+            # Typos break trigrams, so only narrow down when enough exact trigram matches remain
+            if np.count_nonzero(narrowed) >= CANDIDATE_LIMIT // 10:
+                matches = narrowed
+        if np.count_nonzero(matches) > CANDIDATE_LIMIT:
+            # Prefer files whose name has all query characters, then short paths
+            name_mask = query_signature(query.rsplit('/', 1)[-1])[0]
+            in_name = self._test_mask(self._name_masks, name_mask, matches.copy(), words, flags)
+            if np.count_nonzero(in_name) >= CANDIDATE_LIMIT:
+                matches = in_name
+            candidates = np.flatnonzero(matches)
+            lengths = self._lengths[candidates]
+            return candidates[np.argpartition(lengths, CANDIDATE_LIMIT)[:CANDIDATE_LIMIT]].tolist()
+        return np.flatnonzero(matches).tolist()
+
+    @staticmethod
+    def _test_mask(values: 'np.ndarray', mask: int, matches: 'np.ndarray', words: 'np.ndarray',
+                   flags: 'np.ndarray') -> 'np.ndarray':
+        """
+        Clears the entries of matches whose value does not have all bits of mask, in place.
+        """
+        mask = np.uint32(mask)
+        np.bitwise_and(values, mask, out=words)
+        np.equal(words, mask, out=flags)
+        matches &= flags
+        return matches
+
+    @staticmethod
+    def _score(query: str, paths: List[str], names: List[str]) -> List[Optional[float]]:
+        has_segments = '/' in query
+        name_query = query.rsplit('/', 1)[-1] or query
+        if np is not None:
+            name_scores = (0.6 * process.cdist([name_query], names, scorer=fuzz.partial_ratio)[0]
+                           + 0.4 * process.cdist([name_query], names, scorer=fuzz.ratio)[0]).tolist()
+        else:
+            name_scores = [0.6 * fuzz.partial_ratio(name_query, name) + 0.4 * fuzz.ratio(name_query, name)
+                           for name in names]
+        # Path scores only reorder the best name matches, unless the query spans several segments or words
+        positions = range(len(paths))
+        if not has_segments and ' ' not in query:
+            positions = heapq.nlargest(PATH_SCORED_LIMIT, positions, key=name_scores.__getitem__)
+        scored_paths = [paths[position].lower() for position in positions]
+        if np is not None:
+            scored = process.cdist([query], scored_paths, scorer=fuzz.partial_ratio)[0].tolist()
+        else:
+            scored = [fuzz.partial_ratio(query, path) for path in scored_paths]
+        path_scores = [0.0] * len(paths)
+        for position, score in zip(positions, scored):
+            path_scores[position] = score
+
+        name_weight = 0.4 if has_segments else 0.7
+        query_segments = [segment for segment in query.split('/') if segment][:-1] if has_segments else []
+        scores = []
+        for name, path, name_score, path_score in zip(names, paths, name_scores, path_scores):
+            if name_score < MIN_MATCH_SCORE and path_score < MIN_MATCH_SCORE:
+                scores.append(None)
+                continue
+            score = name_weight * name_score + (1 - name_weight) * path_score
+            if name.startswith(name_query):
+                score += _NAME_PREFIX_BONUS
+                if name == name_query or name.rpartition('.')[0] == name_query:
+                    score += _EXACT_NAME_BONUS
+            if query_segments and _segments_match(query_segments, path.lower().split('/')[:-1]):
+                score += _SEGMENT_BONUS
+            scores.append(score - _DEPTH_PENALTY * path.count('/'))
+        return scores
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate memory used by the index in bytes, without the path strings,
+        which are shared with the PathIndex.
+        """
+        with self._lock:
+            size = sys.getsizeof(self._paths) + sys.getsizeof(self._names)
+            size += sum(sys.getsizeof(name) for name in self._names if name is not None)
+            if np is not None:
+                size += sum(values.nbytes for values in (self._live, self._char_masks, self._name_masks,
+                                                         self._blooms, self._lengths))
+            return size
+
+
+def _segments_match(query_segments: List[str], directories: List[str]) -> bool:
+    """
+    Returns True if every query segment is a prefix of a directory, in order.
+    """
+    position = 0
+    for segment in query_segments:
+        while position < len(directories) and not directories[position].startswith(segment):
+            position += 1
+        if position == len(directories):
+            return False
+        position += 1
+    return True
@@ -1,9 +1,12 @@
 from enum import Enum
-from typing import List, Union, Optional, Literal, Any, Dict
+from typing import List, Union, Optional, Literal, Any, Dict, Iterator
 from dataclasses import dataclass, field
 import json
 
 from autobyteus_server.file_explorer.tree_node import TreeNode  # Ensure TreeNode is available
+from autobyteus_server.file_explorer.tree_serializer import iter_tree_json
+
+_COMPACT_SEPARATORS = (',', ':')
 
 
 class ChangeType(str, Enum):
@@ -22,6 +25,22 @@ class FileSystemChange:
             "type": self.type.value,
         }
 
+    def iter_json(self) -> Iterator[str]:
+        """
+        Yields the compact JSON representation of the change in chunks.
+        """
+        yield json.dumps(self.to_dict(), separators=_COMPACT_SEPARATORS)
+
+    def _iter_json_with_node(self, node_chunks: Iterator[str], **fields: Any) -> Iterator[str]:
+        """
+        Writes the change with its node streamed by the tree serializer instead of a node dictionary.
+        """
+        yield f'{{"type":{json.dumps(self.type.value)},"node":'
+        yield from node_chunks
+        for key, value in fields.items():
+            yield f',{json.dumps(key)}:{json.dumps(value)}'
+        yield '}'
+
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'FileSystemChange':
         change_type = ChangeType(data["type"])
@@ -63,6 +82,10 @@ class AddChange(FileSystemChange):
         })
         return base
 
+    def iter_json(self) -> Iterator[str]:
+        return self._iter_json_with_node(iter_tree_json(self.node, include_children=False),
+                                         parent_id=self.parent_id)
+
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'AddChange':
         node = TreeNode.from_dict(data["node"])
@@ -105,6 +128,9 @@ class RenameChange(FileSystemChange):
         })
         return base
 
+    def iter_json(self) -> Iterator[str]:
+        return self._iter_json_with_node(iter_tree_json(self.node), parent_id=self.parent_id)
+
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'RenameChange':
         node = TreeNode.from_dict(data["node"])
@@ -128,6 +154,10 @@ class MoveChange(FileSystemChange):
         })
         return base
 
+    def iter_json(self) -> Iterator[str]:
+        return self._iter_json_with_node(iter_tree_json(self.node), old_parent_id=self.old_parent_id,
+                                         new_parent_id=self.new_parent_id)
+
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'MoveChange':
         node = TreeNode.from_dict(data["node"])
@@ -150,8 +180,20 @@ class FileSystemChangeEvent:
         changes = [FileSystemChange.from_dict(change_data) for change_data in data["changes"]]
         return FileSystemChangeEvent(changes=changes)
 
+    def iter_json(self) -> Iterator[str]:
+        """
+        Yields the compact JSON representation of the event in chunks, serializing node subtrees
+        directly instead of building their dictionaries first.
+        """
+        yield '{"changes":['
+        for position, change in enumerate(self.changes):
+            if position:
+                yield ','
+            yield from change.iter_json()
+        yield ']}'
+
     def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+        return ''.join(self.iter_json())
 
     @staticmethod
     def from_json(json_data: str) -> 'FileSystemChangeEvent':
@@ -1,77 +1,157 @@
 import asyncio
 import logging
-from typing import Optional, AsyncGenerator, TYPE_CHECKING, List
-
-from watchdog.observers import Observer
+import os
+from typing import Any, Dict, List, Optional, AsyncGenerator, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from autobyteus_server.file_explorer.file_explorer import FileExplorer
 
-from autobyteus_server.file_explorer.file_system_changes import FileSystemChangeEvent
-from autobyteus_server.file_explorer.watchdog_handler import WatchdogHandler
-from autobyteus_server.file_explorer.traversal_ignore_strategy.traversal_ignore_strategy import TraversalIgnoreStrategy
+from autobyteus_server.file_explorer.file_system_changes import AddChange, FileSystemChangeEvent
+from autobyteus_server.file_explorer.watch_backends import (
+    InotifyWatchBackend, PollingWatchBackend, WatchBackend, WatchdogWatchBackend, read_max_user_watches
+)
+from autobyteus_server.file_explorer.watch_event_pipeline import WatchEvent, WatchEventPipeline, WatchSettings
 
 logger = logging.getLogger(__name__)
 
 class FileSystemWatcher:
     """
-    Watches the filesystem for changes and notifies via a simple queue-based mechanism.
-    Integrates ignore strategies to filter events consistent with directory traversal.
+    Watches the filesystem for changes and broadcasts them through the workspace's ChangeEventHub.
+    Raw events are debounced and applied to the workspace tree by a WatchEventPipeline, which
+    filters them with the same ignore rules as the directory traversal.
+
+    Only the directories of the workspace tree are observed, so ignored folders cost nothing. The
+    backend is chosen by WatchSettings.backend; "auto" uses inotify on Linux (with polling beyond
+    the watch budget) and the recursive watchdog observer elsewhere, and falls back to polling if
+    the backend cannot be started.
     """
 
-    def __init__(self, file_explorer: 'FileExplorer', loop: asyncio.AbstractEventLoop, 
-                 ignore_strategies: List[TraversalIgnoreStrategy]):
+    def __init__(self, file_explorer: 'FileExplorer', loop: asyncio.AbstractEventLoop,
+                 settings: Optional[WatchSettings] = None):
         """
-        Initialize the watcher with a FileExplorer instance, event loop, and ignore strategies.
+        Initialize the watcher with a FileExplorer instance and event loop.
         
         Args:
             file_explorer (FileExplorer): The FileExplorer instance managing the workspace.
-            loop (asyncio.AbstractEventLoop): The event loop for async operations.
-            ignore_strategies (List[TraversalIgnoreStrategy]): Strategies to filter events.
+            loop (asyncio.AbstractEventLoop): The event loop for async operations. Tree updates run on it.
+            settings (Optional[WatchSettings]): Debounce and rescan settings. Defaults to the environment.
         """
         self.file_explorer = file_explorer
         self.loop = loop
-        self.observer: Optional[Observer] = None
-        self.handler = WatchdogHandler(file_explorer, self.handle_change_event, ignore_strategies)
-        self._event_queue: asyncio.Queue[str] = asyncio.Queue()
+        self.pipeline = WatchEventPipeline(file_explorer, self.handle_change_event, settings=settings, loop=loop)
+        self.settings = self.pipeline.settings
+        self.backend: Optional[WatchBackend] = None
+
+    def submit_event(self, event: WatchEvent) -> None:
+        """
+        Hands a raw event from a backend thread over to the pipeline on the event loop.
+        """
+        self.loop.call_soon_threadsafe(self.pipeline.submit, event)
 
     def handle_change_event(self, change_event: FileSystemChangeEvent) -> None:
         """
-        Handle a filesystem change event by pushing it into the event queue.
+        Handle a coalesced filesystem change event by broadcasting it to the subscribers of the
+        workspace. Called by the pipeline on the event loop thread.
         
         Args:
             change_event (FileSystemChangeEvent): The event to process.
         """
-        logger.info(f"Change event detected: {change_event}")
-        serialized_event = change_event.to_json()
-        self.loop.call_soon_threadsafe(self._event_queue.put_nowait, serialized_event)
+        logger.info(f"Change event detected with {len(change_event.changes)} changes")
+        self.file_explorer.publish_change_event(change_event)
+
+    def watched_directories(self) -> List[str]:
+        """
+        Returns the relative paths of all directories of the workspace tree, shallowest first, so
+        a limited watch budget is spent on the top of the tree.
+        """
+        store = self.file_explorer.tree_store
+        if store is None or store.root_index < 0 or store.is_file(store.root_index):
+            return []
+        directories = ['']
+        position = 0
+        indices = [store.root_index]
+        while position < len(indices):
+            index, path = indices[position], directories[position]
+            position += 1
+            for child in store.iter_children(index):
+                if not store.is_file(child):
+                    name = store.name(child)
+                    indices.append(child)
+                    directories.append(os.path.join(path, name) if path else name)
+        return directories
+
+    def _create_backend(self, backend_name: str) -> WatchBackend:
+        root_path = self.file_explorer.workspace_root_path
+        poller = PollingWatchBackend(root_path, self.submit_event,
+                                     min_interval=self.settings.poll_min_interval,
+                                     max_interval=self.settings.poll_max_interval)
+        if backend_name == "auto":
+            backend_name = "inotify" if InotifyWatchBackend.is_supported() else "watchdog"
+        if backend_name == "inotify":
+            system_limit = read_max_user_watches()
+            # Leave room for other workspaces and programs
+            budget = min(self.settings.watch_budget, system_limit // 2) if system_limit else self.settings.watch_budget
+            return InotifyWatchBackend(root_path, self.submit_event, watch_budget=budget, poller=poller)
+        if backend_name == "watchdog":
+            return WatchdogWatchBackend(root_path, self.submit_event)
+        if backend_name != "polling":
+            logger.warning(f"Unknown watch backend '{backend_name}', using polling")
+        return poller
 
     def start(self) -> None:
         """
         Start watching the filesystem for changes.
         """
-        self.observer = Observer()
-        self.observer.schedule(self.handler, self.file_explorer.workspace_root_path, recursive=True)
-        self.observer.start()
-        logger.info(f"Started filesystem watcher for workspace {self.file_explorer.workspace_root_path}")
+        directories = self.watched_directories()
+        backend = self._create_backend(self.settings.backend)
+        try:
+            backend.start(directories)
+        except Exception as e:
+            logger.warning(f"Cannot start {backend.name} watcher for {self.file_explorer.workspace_root_path} "
+                           f"({e}), falling back to polling")
+            backend = self._create_backend("polling")
+            backend.start(directories)
+        self.backend = backend
+        logger.info(f"Started {backend.name} filesystem watcher for workspace {self.file_explorer.workspace_root_path}")
+
+    def on_tree_changed(self, change_event: FileSystemChangeEvent) -> None:
+        """
+        Updates the observed directories after folders were added, removed or moved.
+        """
+        if self.backend is None:
+            return
+        if all(isinstance(change, AddChange) and change.node.is_file for change in change_event.changes):
+            return
+        self.backend.sync(self.watched_directories())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns the watch count, polling cost and event statistics of the watcher.
+        """
+        metrics: Dict[str, Any] = self.backend.get_metrics() if self.backend else {"backend": None}
+        metrics["pending_events"] = self.pipeline.pending_count
+        metrics["subscribers"] = self.file_explorer.change_hub.subscriber_count
+        metrics["last_sequence"] = self.file_explorer.change_hub.last_sequence
+        return metrics
 
     def stop(self) -> None:
         """
         Stop watching the filesystem and clean up resources.
         """
-        if self.observer:
-            self.observer.stop()
-            self.observer.join()
+        self.pipeline.cancel()
+        if self.backend:
+            self.backend.stop()
             logger.info(f"Stopped filesystem watcher for workspace {self.file_explorer.workspace_root_path}")
-            self.observer = None
+            self.backend = None
 
-    async def events(self) -> AsyncGenerator[str, None]:
+    async def events(self, after_sequence: Optional[int] = None,
+                     epoch: Optional[str] = None) -> AsyncGenerator[str, None]:
         """
-        Async generator that yields change events from the internal event queue.
+        Async generator that yields the change events of the workspace. Each caller gets its own
+        cursor, see ChangeEventHub.subscribe().
         
         Yields:
-            str: The serialized FileSystemChangeEvent as JSON.
+            str: The serialized FileSystemChangeEvent as JSON, with its sequence number.
         """
-        while True:
-            event = await self._event_queue.get()
+        async for event in self.file_explorer.change_hub.subscribe(after_sequence, epoch):
             yield event
@@ -0,0 +1,84 @@
+"""
+The thread pools that run file explorer disk I/O off the event loop.
+
+All workspaces share one pool with a fixed number of workers (FILE_EXPLORER_IO_WORKERS, default 8),
+so a burst of slow operations cannot create an unbounded number of threads, and the event loop
+stays free to serve subscriptions while they run. Long-running background work (reclaiming
+deleted folders, copying across filesystems) runs on a separate small pool
+(FILE_EXPLORER_BACKGROUND_WORKERS, default 2), so it never delays requests.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IO_WORKERS = 8
+DEFAULT_BACKGROUND_WORKERS = 2
+
+T = TypeVar('T')
+
+_executor: Optional[ThreadPoolExecutor] = None
+_background_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Set on shutdown; long-running background operations check it and stop early
+background_stop_event = threading.Event()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared file explorer I/O executor, creating it on first use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = max(1, int(os.getenv('FILE_EXPLORER_IO_WORKERS', DEFAULT_IO_WORKERS)))
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='file-explorer-io')
+            logger.info(f"Started file explorer I/O executor with {max_workers} workers")
+        return _executor
+
+
+def get_background_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared executor for long-running background operations, creating it on first use.
+    """
+    global _background_executor
+    with _executor_lock:
+        if _background_executor is None:
+            max_workers = max(1, int(os.getenv('FILE_EXPLORER_BACKGROUND_WORKERS', DEFAULT_BACKGROUND_WORKERS)))
+            _background_executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                      thread_name_prefix='file-explorer-background')
+        return _background_executor
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Runs a blocking function on the I/O executor and waits for its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_io_executor() -> None:
+    """
+    Waits for running I/O to finish and stops the executors; they are re-created on next use.
+
+    Background operations are stopped early and queued ones dropped; whatever they left behind is
+    cleaned up the next time the workspace is opened.
+    """
+    global _executor, _background_executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+        background_executor, _background_executor = _background_executor, None
+    if background_executor is not None:
+        background_stop_event.set()
+        background_executor.shutdown(wait=True, cancel_futures=True)
+        background_stop_event.clear()
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -0,0 +1,282 @@
+"""
+Random access to large workspace files by line or byte range.
+
+Files are memory-mapped instead of read, so only the pages that are actually touched are loaded.
+To find lines quickly, a sparse line index records the byte offset of every stride-th line (64
+by default). Locating any line is then one lookup plus scanning at most stride - 1 newlines, which
+is constant time no matter where the line is in the file. For a file with 30 million lines the
+index takes under 4 MB.
+
+Indexes are cached per (path, mtime_ns, size), so a file that changes is re-indexed on next use.
+Building an index reads the file once; numpy is used to locate newlines when it is installed.
+
+Line numbers are 1-based, byte offsets 0-based.
+"""
+
+import logging
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STRIDE = 64
+_SCAN_CHUNK_SIZE = 16 * 1024 * 1024
+STREAM_CHUNK_SIZE = 256 * 1024
+
+FileKey = Tuple[str, int, int]
+
+
+class LineIndex:
+    """
+    Byte offsets of every stride-th line of a file.
+    """
+
+    def __init__(self, size: int, line_count: int, checkpoints: array, stride: int = DEFAULT_STRIDE):
+        """
+        Initialize the LineIndex.
+
+        Args:
+            size (int): The file size in bytes.
+            line_count (int): The number of lines; a final line without a newline counts.
+            checkpoints (array): Offset of line k * stride (0-based) at position k.
+            stride (int): The distance between indexed lines.
+        """
+        self.size = size
+        self.line_count = line_count
+        self.checkpoints = checkpoints
+        self.stride = stride
+
+    @classmethod
+    def build(cls, data, stride: int = DEFAULT_STRIDE) -> 'LineIndex':
+        """
+        Indexes a buffer (usually a memory map of the file) in a single pass.
+        """
+        size = len(data)
+        checkpoints = array('q', [0])
+        newline_count = 0
+        if np is not None:
+            view = memoryview(data)
+            for chunk_start in range(0, size, _SCAN_CHUNK_SIZE):
+                chunk = np.frombuffer(view[chunk_start:chunk_start + _SCAN_CHUNK_SIZE], dtype=np.uint8)
+                newlines = np.flatnonzero(chunk == 10)
+                # Newline number n (0-based) starts line n + 1, which is indexed if divisible by stride
+                first = (stride - 1 - newline_count) % stride
+                checkpoints.extend((newlines[first::stride] + (chunk_start + 1)).tolist())
+                newline_count += len(newlines)
+            view.release()
+        else:
+            position = data.find(b'\n')
+            while position != -1:
+                newline_count += 1
+                if newline_count % stride == 0:
+                    checkpoints.append(position + 1)
+                position = data.find(b'\n', position + 1)
+
+        ends_with_newline = size > 0 and data[size - 1:size] == b'\n'
+        line_count = newline_count if ends_with_newline or size == 0 else newline_count + 1
+        # A checkpoint at the very end of the file does not start a line
+        while len(checkpoints) > 1 and checkpoints[-1] >= size:
+            checkpoints.pop()
+        return cls(size, line_count, checkpoints, stride)
+
+    def line_offset(self, data, line_number: int) -> int:
+        """
+        Returns the byte offset at which a line starts, or the file size past the last line.
+
+        Args:
+            data: The indexed buffer.
+            line_number (int): The 1-based line number.
+        """
+        if line_number > self.line_count:
+            return self.size
+        line = max(line_number, 1) - 1
+        position = self.checkpoints[line // self.stride]
+        for _ in range(line % self.stride):
+            position = data.find(b'\n', position) + 1
+        return position
+
+    def nbytes(self) -> int:
+        return self.checkpoints.itemsize * len(self.checkpoints)
+
+
+@dataclass
+class LineRange:
+    """
+    A range of lines read from a file.
+
+    Attributes:
+        start_line: The 1-based number of the first line returned.
+        end_line: The number of the last line returned (start_line - 1 if none).
+        total_lines: The number of lines in the file.
+        start_byte: The offset of the first returned byte.
+        end_byte: The offset after the last returned byte.
+        file_size: The size of the file in bytes.
+        data: The bytes of the lines, including their newlines.
+    """
+    start_line: int
+    end_line: int
+    total_lines: int
+    start_byte: int
+    end_byte: int
+    file_size: int
+    data: bytes
+
+    def to_dict(self) -> dict:
+        return {
+            "start_line": self.start_line,
+            "end_line": self.end_line,
+            "total_lines": self.total_lines,
+            "start_byte": self.start_byte,
+            "end_byte": self.end_byte,
+            "file_size": self.file_size,
+            "content": self.data.decode('utf-8', errors='replace'),
+        }
+
+
+class LargeFileReader:
+    """
+    Reads line and byte ranges of files through memory maps and cached line indexes.
+    """
+
+    def __init__(self, max_cached_indexes: int = 64, stride: int = DEFAULT_STRIDE):
+        """
+        Initialize the LargeFileReader.
+
+        Args:
+            max_cached_indexes (int): Number of line indexes kept, least recently used first out.
+            stride (int): The line index stride.
+        """
+        self.max_cached_indexes = max_cached_indexes
+        self.stride = stride
+        self._indexes: 'OrderedDict[FileKey, LineIndex]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_key(path: str) -> FileKey:
+        """
+        Returns the cache key of a file: (path, mtime_ns, size).
+        """
+        stat_result = os.stat(path)
+        return path, stat_result.st_mtime_ns, stat_result.st_size
+
+    def _get_index(self, key: FileKey, data) -> LineIndex:
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+        index = LineIndex.build(data, self.stride)
+        logger.debug(f"Indexed {index.line_count} lines of {key[0]} ({index.nbytes()} bytes of index)")
+        with self._lock:
+            # Drop indexes of older versions of the same file
+            for stale_key in [cached for cached in self._indexes if cached[0] == key[0]]:
+                del self._indexes[stale_key]
+            self._indexes[key] = index
+            while len(self._indexes) > self.max_cached_indexes:
+                self._indexes.popitem(last=False)
+        return index
+
+    def get_line_index(self, path: str) -> LineIndex:
+        """
+        Returns the line index of a file, building it if the file is new or changed.
+        """
+        key = self.file_key(path)
+        if key[2] == 0:
+            return LineIndex(0, 0, array('q', [0]), self.stride)
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return self._get_index(key, data)
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        Drops cached indexes of a file, or all of them.
+        """
+        with self._lock:
+            if path is None:
+                self._indexes.clear()
+                return
+            for key in [key for key in self._indexes if key[0] == path]:
+                del self._indexes[key]
+
+    def line_byte_range(self, path: str, start_line: int, line_count: int) -> Tuple[LineIndex, int, int]:
+        """
+        Returns the line index and the byte range [start, end) of line_count lines from start_line.
+
+        Raises:
+            ValueError: If start_line is smaller than 1 or line_count is negative.
+        """
+        if start_line < 1:
+            raise ValueError("start_line must be at least 1")
+        if line_count < 0:
+            raise ValueError("line_count must not be negative")
+        key = self.file_key(path)
+        if key[2] == 0:
+            return LineIndex(0, 0, array('q', [0]), self.stride), 0, 0
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            index = self._get_index(key, data)
+            start = index.line_offset(data, start_line)
+            end = index.line_offset(data, start_line + line_count)
+        return index, start, end
+
+    def read_lines(self, path: str, start_line: int, line_count: int) -> LineRange:
+        """
+        Reads line_count lines starting at the 1-based start_line.
+
+        Raises:
+            ValueError: If the range arguments are invalid.
+        """
+        index, start, end = self.line_byte_range(path, start_line, line_count)
+        data = self._pread(path, start, end - start)
+        last_line = min(start_line + line_count - 1, index.line_count)
+        return LineRange(start_line=start_line, end_line=max(last_line, start_line - 1),
+                         total_lines=index.line_count, start_byte=start, end_byte=end,
+                         file_size=index.size, data=data)
+
+    def read_bytes(self, path: str, offset: int, length: int) -> bytes:
+        """
+        Reads up to length bytes at offset.
+
+        Raises:
+            ValueError: If offset or length is negative.
+        """
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must not be negative")
+        return self._pread(path, offset, length)
+
+    @staticmethod
+    def _pread(path: str, offset: int, length: int) -> bytes:
+        if length == 0:
+            return b''
+        with open(path, 'rb') as file:
+            file.seek(offset)
+            return file.read(length)
+
+    @staticmethod
+    def iter_bytes(path: str, start: int, end: Optional[int] = None,
+                   chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yields the bytes [start, end) of a file in chunks, for streaming responses.
+        """
+        with open(path, 'rb') as file:
+            file.seek(start)
+            remaining = None if end is None else max(0, end - start)
+            while remaining is None or remaining > 0:
+                chunk = file.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+
+# Shared by all workspaces
+large_file_reader = LargeFileReader(int(os.getenv('FILE_EXPLORER_LINE_INDEX_CACHE_SIZE', 64)))
@@ -5,7 +5,6 @@ from autobyteus_server.file_explorer.file_system_changes import (
     FileSystemChangeEvent,
     AddChange
 )
-from autobyteus_server.file_explorer.tree_node import TreeNode
 
 class AddFileOrFolderOperation(BaseFileOperation):
     """
@@ -35,9 +34,6 @@ class AddFileOrFolderOperation(BaseFileOperation):
         parent_directory = os.path.dirname(absolute_path)
         if not os.path.exists(parent_directory):
             os.makedirs(parent_directory)
-            # Update the tree for each newly created parent directory
-            relative_dir_path = os.path.relpath(parent_directory, self.file_explorer.workspace_root_path)
-            self._create_missing_directories_in_tree(relative_dir_path, changes)
 
         # Create the file or folder
         if self.is_file:
@@ -45,50 +41,14 @@ class AddFileOrFolderOperation(BaseFileOperation):
         else:
             os.makedirs(absolute_path, exist_ok=True)
 
-        # Finally update the tree with the newly created node
-        parts = normalized_path.split(os.sep)
-        current_node = self.file_explorer.root_node
-        # Traverse or create intermediate directories if they somehow weren't created yet
-        for part in parts[:-1]:
-            for child in current_node.children:
-                if child.name == part and not child.is_file:
-                    current_node = child
-                    break
-
-        new_node_name = parts[-1]
-        new_node = TreeNode(name=new_node_name, is_file=self.is_file, parent=current_node)
-        current_node.add_child(new_node)
+        # Update the tree, creating nodes for any newly created parent directories
+        parent_node = self._ensure_directory_nodes(os.path.dirname(normalized_path) or '.', changes)
+        new_node = parent_node.create_child(os.path.basename(normalized_path), is_file=self.is_file)
 
         add_change = AddChange(
             node=new_node,
-            parent_id=current_node.id
+            parent_id=parent_node.id
         )
         changes.append(add_change)
 
         return FileSystemChangeEvent(changes=changes)
-
-    def _create_missing_directories_in_tree(self, relative_dir_path: str, changes: List[AddChange]) -> None:
-        """
-        Create any missing directory nodes in the in-memory tree, 
-        mirroring the actual directories created on the filesystem.
-        """
-        normalized_dir_path = os.path.normpath(relative_dir_path)
-        parts = normalized_dir_path.split(os.sep)
-
-        current_node = self.file_explorer.root_node
-        for part in parts:
-            if part == ".":
-                continue
-            found = False
-            for child in current_node.children:
-                if child.name == part and not child.is_file:
-                    current_node = child
-                    found = True
-                    break
-
-            if not found:
-                new_dir_node = TreeNode(name=part, is_file=False, parent=current_node)
-                current_node.add_child(new_dir_node)
-                add_change = AddChange(node=new_dir_node, parent_id=current_node.id)
-                changes.append(add_change)
-                current_node = new_dir_node
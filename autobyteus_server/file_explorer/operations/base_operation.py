@@ -1,6 +1,8 @@
 import abc
-from typing import TYPE_CHECKING
-from autobyteus_server.file_explorer.file_system_changes import FileSystemChangeEvent
+import os
+from typing import TYPE_CHECKING, List
+from autobyteus_server.file_explorer.file_system_changes import FileSystemChangeEvent, AddChange
+from autobyteus_server.file_explorer.tree_node import TreeNode
 
 if TYPE_CHECKING:
     from autobyteus_server.file_explorer.file_explorer import FileExplorer
@@ -24,3 +26,42 @@ class BaseFileOperation(abc.ABC):
         Execute the file operation and return a FileSystemChangeEvent.
         """
         pass
+
+    def _find_node(self, relative_path: str, error_message: str) -> TreeNode:
+        """
+        Resolves a node of the workspace tree through the file explorer's path index.
+
+        Raises:
+            ValueError: If the path is not part of the tree.
+        """
+        node = self.file_explorer.find_node(relative_path)
+        if node is None:
+            raise ValueError(error_message)
+        return node
+
+    def _ensure_directory_nodes(self, relative_dir_path: str, changes: List[AddChange]) -> TreeNode:
+        """
+        Makes sure every folder of relative_dir_path exists in the in-memory tree, mirroring
+        directories created on the filesystem, and records an AddChange for each created node.
+
+        Returns:
+            TreeNode: The node of the deepest folder.
+        """
+        normalized_dir_path = os.path.normpath(relative_dir_path)
+        current_node = self.file_explorer.root_node
+        if normalized_dir_path == '.':
+            return current_node
+
+        existing_node = self.file_explorer.find_node(normalized_dir_path)
+        if existing_node is not None and not existing_node.is_file:
+            return existing_node
+
+        path_so_far = ''
+        for part in normalized_dir_path.split(os.sep):
+            path_so_far = os.path.join(path_so_far, part) if path_so_far else part
+            child = self.file_explorer.find_node(path_so_far)
+            if child is None or child.is_file:
+                child = current_node.create_child(part, is_file=False)
+                changes.append(AddChange(node=child, parent_id=current_node.id))
+            current_node = child
+        return current_node
@@ -0,0 +1,273 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, List, Optional
+
+from autobyteus_server.file_explorer.operations.base_operation import BaseFileOperation
+from autobyteus_server.file_explorer.operations.add_file_or_folder_operation import AddFileOrFolderOperation
+from autobyteus_server.file_explorer.operations.move_file_operation import MoveFileOperation
+from autobyteus_server.file_explorer.operations.remove_file_operation import RemoveFileOperation
+from autobyteus_server.file_explorer.operations.rename_file_operation import RenameFileOperation
+from autobyteus_server.file_explorer.operations.write_file_operation import WriteFileOperation
+from autobyteus_server.file_explorer.file_system_changes import (
+    AddChange, FileSystemChange, FileSystemChangeEvent
+)
+from autobyteus_server.file_explorer.watch_event_pipeline import coalesce_changes, is_node_live
+
+logger = logging.getLogger(__name__)
+
+
+class BatchOperationType(str, Enum):
+    WRITE = "write"
+    ADD = "add"
+    MOVE = "move"
+    RENAME = "rename"
+    DELETE = "delete"
+
+
+@dataclass
+class BatchOperationSpec:
+    """
+    One operation of a batch. path is the file or folder the operation applies to; the other
+    fields are only used by the operation types that need them.
+    """
+    type: BatchOperationType
+    path: str
+    content: Optional[str] = None
+    destination_path: Optional[str] = None
+    new_name: Optional[str] = None
+    is_file: bool = True
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of a batch: the merged change event of all applied operations and, if an
+    operation failed, its index and error.
+    """
+    change_event: FileSystemChangeEvent
+    applied: int
+    failed_index: Optional[int] = None
+    error: Optional[str] = None
+    rolled_back: bool = False
+
+    def to_json(self) -> str:
+        return (f'{{"applied":{self.applied},"failed_index":{json.dumps(self.failed_index)},'
+                f'"error":{json.dumps(self.error)},"rolled_back":{json.dumps(self.rolled_back)},'
+                f'"change_event":{self.change_event.to_json()}}}')
+
+
+class BatchFileOperation(BaseFileOperation):
+    """
+    Operation to apply an ordered list of file operations in one pass.
+
+    The operations run one after the other until one fails. Their changes are merged into a
+    single FileSystemChangeEvent, so a node touched by several operations appears once with its
+    net effect. With atomic=True, a failure undoes all operations applied before it, in reverse
+    order, and the event is empty; deleted files are moved to a temporary directory until the
+    batch is done so they can be restored.
+    """
+
+    def __init__(self, file_explorer, operations: List[BatchOperationSpec], atomic: bool = False):
+        super().__init__(file_explorer)
+        self.operations = operations
+        self.atomic = atomic
+        self.applied = 0
+        self.failed_index: Optional[int] = None
+        self.error: Optional[str] = None
+        self.rolled_back = False
+        self._undo_steps: List[Callable[[], None]] = []
+        self._trash_directory: Optional[str] = None
+
+    def execute(self) -> FileSystemChangeEvent:
+        changes: List[FileSystemChange] = []
+        try:
+            for index, spec in enumerate(self.operations):
+                try:
+                    changes.extend(self._apply(spec))
+                except Exception as e:
+                    self.failed_index = index
+                    self.error = str(e)
+                    logger.warning(f"Batch operation {index} ({spec.type.value} {spec.path}) failed: {e}")
+                    break
+                self.applied += 1
+
+            if self.failed_index is not None and self.atomic:
+                self._rollback()
+                return FileSystemChangeEvent(changes=[])
+        finally:
+            if self._trash_directory is not None:
+                shutil.rmtree(self._trash_directory, ignore_errors=True)
+
+        root_node = self.file_explorer.root_node
+        return FileSystemChangeEvent(changes=coalesce_changes(changes, lambda node: is_node_live(node, root_node)))
+
+    def result(self, change_event: FileSystemChangeEvent) -> BatchResult:
+        return BatchResult(change_event=change_event, applied=self.applied, failed_index=self.failed_index,
+                           error=self.error, rolled_back=self.rolled_back)
+
+    def _record_undo(self, undo: Callable[[], None]) -> None:
+        if self.atomic:
+            self._undo_steps.append(undo)
+
+    def _rollback(self) -> None:
+        rollback_errors = []
+        for undo in reversed(self._undo_steps):
+            try:
+                undo()
+            except Exception as e:
+                rollback_errors.append(str(e))
+                logger.error(f"Error rolling back batch operation: {e}")
+        self._undo_steps = []
+        self.rolled_back = not rollback_errors
+        if rollback_errors:
+            self.error = f"{self.error} (rollback incomplete: {'; '.join(rollback_errors)})"
+
+    def _absolute(self, relative_path: str) -> str:
+        return os.path.normpath(os.path.join(self.file_explorer.workspace_root_path, relative_path))
+
+    @staticmethod
+    def _missing_ancestor(absolute_path: str) -> Optional[str]:
+        """
+        Returns the top-most missing directory above absolute_path, which creating it will create.
+        """
+        missing = None
+        directory = os.path.dirname(absolute_path)
+        while directory and not os.path.exists(directory):
+            missing = directory
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+        return missing
+
+    @staticmethod
+    def _detach_added_nodes(changes: List[FileSystemChange]) -> None:
+        for change in reversed(changes):
+            if isinstance(change, AddChange) and change.node.parent is not None:
+                change.node.parent.remove_child(change.node)
+
+    def _apply(self, spec: BatchOperationSpec) -> List[FileSystemChange]:
+        if spec.type == BatchOperationType.WRITE:
+            return self._apply_write(spec)
+        if spec.type == BatchOperationType.ADD:
+            return self._apply_add(spec)
+        if spec.type == BatchOperationType.MOVE:
+            return self._apply_move(spec)
+        if spec.type == BatchOperationType.RENAME:
+            return self._apply_rename(spec)
+        if spec.type == BatchOperationType.DELETE:
+            return self._apply_delete(spec)
+        raise ValueError(f"Unsupported operation type: {spec.type}")
+
+    def _run_creating(self, missing_ancestor: Optional[str], operation: BaseFileOperation) -> List[FileSystemChange]:
+        """
+        Runs an operation that may create missing parent directories, removing them if it fails.
+        """
+        try:
+            return operation.execute().changes
+        except Exception:
+            if self.atomic and missing_ancestor is not None and os.path.isdir(missing_ancestor):
+                shutil.rmtree(missing_ancestor, ignore_errors=True)
+            raise
+
+    def _apply_write(self, spec: BatchOperationSpec) -> List[FileSystemChange]:
+        if spec.content is None:
+            raise ValueError("A write operation requires content.")
+        absolute_path = self._absolute(spec.path)
+        previous_content = None
+        if self.atomic and os.path.isfile(absolute_path):
+            with open(absolute_path, 'rb') as file:
+                previous_content = file.read()
+        missing_ancestor = self._missing_ancestor(absolute_path)
+        changes = self._run_creating(missing_ancestor, WriteFileOperation(self.file_explorer, spec.path, spec.content))
+
+        def undo() -> None:
+            if previous_content is not None:
+                with open(absolute_path, 'wb') as file:
+                    file.write(previous_content)
+                return
+            os.remove(absolute_path)
+            if missing_ancestor is not None:
+                shutil.rmtree(missing_ancestor)
+            self._detach_added_nodes(changes)
+
+        self._record_undo(undo)
+        return changes
+
+    def _apply_add(self, spec: BatchOperationSpec) -> List[FileSystemChange]:
+        absolute_path = self._absolute(spec.path)
+        missing_ancestor = self._missing_ancestor(absolute_path)
+        changes = self._run_creating(missing_ancestor, AddFileOrFolderOperation(self.file_explorer, spec.path, spec.is_file))
+
+        def undo() -> None:
+            if missing_ancestor is not None:
+                shutil.rmtree(missing_ancestor)
+            elif spec.is_file:
+                os.remove(absolute_path)
+            else:
+                shutil.rmtree(absolute_path)
+            self._detach_added_nodes(changes)
+
+        self._record_undo(undo)
+        return changes
+
+    def _apply_move(self, spec: BatchOperationSpec) -> List[FileSystemChange]:
+        if not spec.destination_path:
+            raise ValueError("A move operation requires a destination_path.")
+        absolute_source = self._absolute(spec.path)
+        absolute_destination = self._absolute(spec.destination_path)
+        if os.path.isdir(absolute_destination):
+            absolute_destination = os.path.join(absolute_destination, os.path.basename(absolute_source))
+        node = self.file_explorer.find_node(os.path.normpath(spec.path))
+        old_parent = node.parent if node is not None else None
+        old_name = node.name if node is not None else None
+        changes = MoveFileOperation(self.file_explorer, spec.path, spec.destination_path).execute().changes
+
+        def undo() -> None:
+            shutil.move(absolute_destination, absolute_source)
+            node.parent.remove_child(node)
+            node.name = old_name
+            old_parent.add_child(node)
+
+        self._record_undo(undo)
+        return changes
+
+    def _apply_rename(self, spec: BatchOperationSpec) -> List[FileSystemChange]:
+        if not spec.new_name:
+            raise ValueError("A rename operation requires a new_name.")
+        absolute_target = self._absolute(spec.path)
+        absolute_destination = os.path.join(os.path.dirname(absolute_target), spec.new_name)
+        node = self.file_explorer.find_node(os.path.normpath(spec.path))
+        old_name = node.name if node is not None else None
+        changes = RenameFileOperation(self.file_explorer, spec.path, spec.new_name).execute().changes
+
+        def undo() -> None:
+            os.rename(absolute_destination, absolute_target)
+            node.name = old_name
+
+        self._record_undo(undo)
+        return changes
+
+    def _apply_delete(self, spec: BatchOperationSpec) -> List[FileSystemChange]:
+        if not self.atomic:
+            return RemoveFileOperation(self.file_explorer, spec.path).execute().changes
+
+        if self._trash_directory is None:
+            self._trash_directory = tempfile.mkdtemp(prefix='autobyteus-batch-')
+        absolute_path = self._absolute(spec.path)
+        trash_path = os.path.join(self._trash_directory, str(len(self._undo_steps)))
+        node = self.file_explorer.find_node(os.path.normpath(spec.path))
+        parent = node.parent if node is not None else None
+        changes = RemoveFileOperation(self.file_explorer, spec.path, trash_path=trash_path).execute().changes
+
+        def undo() -> None:
+            shutil.move(trash_path, absolute_path)
+            parent.add_child(node)
+
+        self._record_undo(undo)
+        return changes
@@ -1,11 +1,11 @@
 import os
 import shutil
+from typing import Tuple
 from autobyteus_server.file_explorer.operations.base_operation import BaseFileOperation
 from autobyteus_server.file_explorer.file_system_changes import (
     FileSystemChangeEvent,
     MoveChange
 )
-from autobyteus_server.file_explorer.tree_node import TreeNode
 
 class MoveFileOperation(BaseFileOperation):
     """
@@ -18,6 +18,25 @@ class MoveFileOperation(BaseFileOperation):
         self.destination_path = destination_path
 
     def execute(self) -> FileSystemChangeEvent:
+        normalized_source, absolute_source, final_destination = self.resolve()
+
+        try:
+            shutil.move(absolute_source, final_destination)
+        except PermissionError as pe:
+            raise PermissionError(f"Permission denied: Cannot move {absolute_source}") from pe
+        except OSError as oe:
+            raise OSError(f"Error moving {absolute_source} to {final_destination}: {oe}") from oe
+
+        return self.move_node(normalized_source, final_destination)
+
+    def resolve(self) -> Tuple[str, str, str]:
+        """
+        Validates the source and destination paths.
+
+        Returns:
+            Tuple[str, str, str]: The normalized relative source path, the absolute source path and
+                                  the absolute path the source will have after the move.
+        """
         normalized_source = os.path.normpath(self.source_path)
         if os.path.isabs(normalized_source):
             raise ValueError("The path must be relative to the workspace root.")
@@ -45,53 +64,28 @@ class MoveFileOperation(BaseFileOperation):
         if os.path.exists(final_destination):
             raise ValueError(f"Destination path already exists: {self.destination_path}")
 
-        try:
-            shutil.move(absolute_source, final_destination)
-        except PermissionError as pe:
-            raise PermissionError(f"Permission denied: Cannot move {absolute_source}") from pe
-        except OSError as oe:
-            raise OSError(f"Error moving {absolute_source} to {final_destination}: {oe}") from oe
+        return normalized_source, absolute_source, final_destination
 
-        # Remove source node
-        source_parts = normalized_source.split(os.sep)
-        source_current_node = self.file_explorer.root_node
-        source_parent_node = None
-
-        for part in source_parts:
-            source_parent_node = source_current_node
-            for child in source_current_node.children:
-                if child.name == part:
-                    source_current_node = child
-                    break
-            else:
-                raise ValueError(f"Source path not found in tree: {self.source_path}")
-
-        if source_parent_node and source_current_node in source_parent_node.children:
-            source_parent_node.children.remove(source_current_node)
-        else:
+    def move_node(self, normalized_source: str, final_destination: str) -> FileSystemChangeEvent:
+        """
+        Moves the node of the source to its new parent and name in the tree, after the move on disk.
+        """
+        source_current_node = self._find_node(normalized_source, f"Source path not found in tree: {self.source_path}")
+        source_parent_node = source_current_node.parent
+        if source_parent_node is None:
             raise ValueError(f"Cannot remove the node from tree: {self.source_path}")
 
-        # Update new parent reference
-        new_parent_directory = os.path.dirname(final_destination)
-        relative_new_parent = os.path.relpath(new_parent_directory, self.file_explorer.workspace_root_path)
-        normalized_new_parent = os.path.normpath(relative_new_parent).split(os.sep)
-
-        new_parent_node = self.file_explorer.root_node
-        if normalized_new_parent and normalized_new_parent[0] != '.':
-            for part in normalized_new_parent:
-                found = False
-                for child in new_parent_node.children:
-                    if child.name == part and not child.is_file:
-                        new_parent_node = child
-                        found = True
-                        break
-                if not found:
-                    raise ValueError(f"Destination directory does not exist in tree: {self.destination_path}")
-
-        source_current_node.parent = new_parent_node
+        relative_new_parent = os.path.relpath(os.path.dirname(final_destination), self.file_explorer.workspace_root_path)
+        new_parent_node = self._find_node(relative_new_parent,
+                                          f"Destination directory does not exist in tree: {self.destination_path}")
+        if new_parent_node.is_file:
+            raise ValueError(f"Destination directory does not exist in tree: {self.destination_path}")
+
+        # Detach, rename and re-attach the node; the path index re-keys the whole subtree
+        source_parent_node.remove_child(source_current_node)
         new_name = os.path.basename(final_destination)
         source_current_node.name = new_name
-        new_parent_node.children.append(source_current_node)
+        new_parent_node.add_child(source_current_node)
 
         move_change = MoveChange(
             node=source_current_node,
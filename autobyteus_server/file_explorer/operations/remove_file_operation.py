@@ -1,20 +1,28 @@
 import os
 import shutil
+from typing import Optional
 from autobyteus_server.file_explorer.operations.base_operation import BaseFileOperation
 from autobyteus_server.file_explorer.file_system_changes import (
     FileSystemChangeEvent,
     DeleteChange
 )
-from autobyteus_server.file_explorer.tree_node import TreeNode
 
 class RemoveFileOperation(BaseFileOperation):
     """
     Operation to remove a file or folder from the workspace.
     """
 
-    def __init__(self, file_explorer, file_or_folder_path: str):
+    def __init__(self, file_explorer, file_or_folder_path: str, trash_path: Optional[str] = None):
+        """
+        Args:
+            file_explorer: The file explorer of the workspace.
+            file_or_folder_path (str): The relative path to remove.
+            trash_path (Optional[str]): If given, the file or folder is moved to this absolute path
+                instead of being deleted, so the removal can be undone.
+        """
         super().__init__(file_explorer)
         self.file_or_folder_path = file_or_folder_path
+        self.trash_path = trash_path
 
     def execute(self) -> FileSystemChangeEvent:
         normalized_path = os.path.normpath(self.file_or_folder_path)
@@ -30,7 +38,9 @@ class RemoveFileOperation(BaseFileOperation):
             raise ValueError(f"Path not found: {self.file_or_folder_path}")
 
         try:
-            if os.path.isfile(absolute_path):
+            if self.trash_path is not None:
+                shutil.move(absolute_path, self.trash_path)
+            elif os.path.isfile(absolute_path):
                 os.remove(absolute_path)
             elif os.path.isdir(absolute_path):
                 shutil.rmtree(absolute_path)
@@ -41,23 +51,11 @@ class RemoveFileOperation(BaseFileOperation):
         except OSError as oe:
             raise OSError(f"Error deleting {absolute_path}: {oe}") from oe
 
-        parts = normalized_path.split(os.sep)
-        current_node = self.file_explorer.root_node
-        parent_node = None
-
-        for part in parts:
-            parent_node = current_node
-            for child in current_node.children:
-                if child.name == part:
-                    current_node = child
-                    break
-            else:
-                raise ValueError(f"Path not found in tree: {self.file_or_folder_path}")
-
-        if parent_node and current_node in parent_node.children:
-            parent_node.children.remove(current_node)
-        else:
+        current_node = self._find_node(normalized_path, f"Path not found in tree: {self.file_or_folder_path}")
+        parent_node = current_node.parent
+        if parent_node is None:
             raise ValueError(f"Cannot remove the node from tree: {self.file_or_folder_path}")
+        parent_node.remove_child(current_node)
 
         delete_change = DeleteChange(
             node_id=current_node.id,
@@ -4,7 +4,6 @@ from autobyteus_server.file_explorer.file_system_changes import (
     FileSystemChangeEvent,
     RenameChange
 )
-from autobyteus_server.file_explorer.tree_node import TreeNode
 
 class RenameFileOperation(BaseFileOperation):
     """
@@ -41,20 +40,8 @@ class RenameFileOperation(BaseFileOperation):
             raise OSError(f"Error renaming {absolute_target} to {absolute_destination}: {oe}") from oe
 
         # Update in-memory tree
-        parts = normalized_target.split(os.sep)
-        current_node = self.file_explorer.root_node
-        parent_node = None
-
-        for part in parts:
-            parent_node = current_node
-            for child in current_node.children:
-                if child.name == part:
-                    current_node = child
-                    break
-            else:
-                raise ValueError(f"Target path not found in tree: {self.target_path}")
-
-        old_name = current_node.name
+        current_node = self._find_node(normalized_target, f"Target path not found in tree: {self.target_path}")
+        parent_node = current_node.parent
         current_node.name = self.new_name
 
         rename_change = RenameChange(
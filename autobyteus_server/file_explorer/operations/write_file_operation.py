@@ -5,7 +5,6 @@ from autobyteus_server.file_explorer.file_system_changes import (
     FileSystemChangeEvent,
     AddChange
 )
-from autobyteus_server.file_explorer.tree_node import TreeNode
 
 class WriteFileOperation(BaseFileOperation):
     """
@@ -37,56 +36,17 @@ class WriteFileOperation(BaseFileOperation):
 
         if not os.path.exists(directory):
             os.makedirs(directory)
-            relative_dir_path = os.path.relpath(directory, self.file_explorer.workspace_root_path)
-            normalized_dir_path = os.path.normpath(relative_dir_path)
-            parts = normalized_dir_path.split(os.sep)
-            current_node = self.file_explorer.root_node
-
-            for part in parts:
-                if part == ".":
-                    continue
-                found = False
-                for child in current_node.children:
-                    if child.name == part and not child.is_file:
-                        current_node = child
-                        found = True
-                        break
-                if not found:
-                    new_node = TreeNode(name=part, is_file=False, parent=current_node)
-                    current_node.add_child(new_node)
-                    current_node = new_node
-                    add_change = AddChange(
-                        node=new_node,
-                        parent_id=current_node.parent.id
-                    )
-                    changes.append(add_change)
 
         with open(absolute_file_path, 'w', encoding='utf-8') as file:
             file.write(self.content)
 
-        parts = normalized_path.split(os.sep)
-        current_node = self.file_explorer.root_node
-
-        for part in parts[:-1]:
-            for child in current_node.children:
-                if child.name == part and not child.is_file:
-                    current_node = child
-                    break
-
-        new_part = parts[-1]
-        existing_node = None
-        for child in current_node.children:
-            if child.name == new_part:
-                existing_node = child
-                break
-
-        if not existing_node:
-            new_node = TreeNode(name=new_part, is_file=True, parent=current_node)
-            current_node.add_child(new_node)
+        parent_node = self._ensure_directory_nodes(os.path.dirname(normalized_path) or '.', changes)
+        if self.file_explorer.find_node(normalized_path) is None:
+            new_node = parent_node.create_child(os.path.basename(normalized_path), is_file=True)
             add_change = AddChange(
                 node=new_node,
-                parent_id=current_node.id
+                parent_id=parent_node.id
             )
             changes.append(add_change)
 
-        return FileSystemChangeEvent(changes=changes)
\ No newline at end of file
+        return FileSystemChangeEvent(changes=changes)
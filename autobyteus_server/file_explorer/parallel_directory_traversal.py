@@ -0,0 +1,147 @@
+# parallel_directory_traversal.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, List, Optional, Tuple
+
+from autobyteus_server.file_explorer.directory_traversal import DirectoryTraversal, DirectoryListing, DirectoryListener
+from autobyteus_server.file_explorer.traversal_ignore_strategy.traversal_ignore_strategy import TraversalIgnoreStrategy
+from autobyteus_server.file_explorer.traversal_ignore_strategy.ignore_matcher import IgnoreMatcher
+from autobyteus_server.file_explorer.tree_node import TreeNode
+from autobyteus_server.file_explorer.sort_strategy.sort_strategy import SortStrategy
+
+# (directory node, directory path, ignore rules inherited by its entries)
+PendingDirectory = Tuple[TreeNode, str, IgnoreMatcher]
+
+
+class ParallelDirectoryTraversal(DirectoryTraversal):
+    """
+    A DirectoryTraversal that reads directories with os.scandir and fans the reads out
+    across a bounded thread pool.
+
+    The file type of every entry is taken from the directory entry itself, so sorting, ignore
+    checks and node creation do not issue extra stat calls. Each directory is read by exactly
+    one worker, which appends the children to its own node in sorted order, so the resulting
+    tree is identical to the one produced by DirectoryTraversal.
+    """
+
+    def __init__(self, file_ignore_strategies: Optional[List[TraversalIgnoreStrategy]] = None,
+                 sort_strategy: Optional[SortStrategy] = None,
+                 root_node_factory: Optional[Callable[[str, bool], TreeNode]] = None,
+                 max_workers: Optional[int] = None,
+                 directory_listener: Optional[DirectoryListener] = None,
+                 collect_file_sizes: bool = False):
+        """
+        Initialize ParallelDirectoryTraversal.
+
+        Args:
+            file_ignore_strategies (Optional[List[TraversalIgnoreStrategy]]): A list of strategies to ignore files or folders.
+                If none is provided, no file or folder will be ignored.
+            sort_strategy (Optional[SortStrategy]): A strategy for sorting directories and files.
+                If none is provided, DefaultSortStrategy is used.
+            root_node_factory (Optional[Callable[[str, bool], TreeNode]]): Creates the root node from its name and
+                is_file flag. If none is provided, plain TreeNode objects are built.
+            max_workers (Optional[int]): Maximum number of directories read concurrently.
+                Defaults to a value suited for I/O bound work based on the CPU count.
+            directory_listener (Optional[DirectoryListener]): Called for every directory that is read, from the
+                worker threads.
+            collect_file_sizes (bool): Whether the listings carry the sizes of the files.
+        """
+        super().__init__(file_ignore_strategies=file_ignore_strategies, sort_strategy=sort_strategy,
+                         root_node_factory=root_node_factory, directory_listener=directory_listener,
+                         collect_file_sizes=collect_file_sizes)
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    def populate(self, node: TreeNode, folder_path: str, ignore_matcher: Optional[IgnoreMatcher] = None) -> None:
+        """
+        Traverses a directory and attaches its structure below an existing node, reading
+        directories concurrently.
+
+        Args:
+            node (TreeNode): The node representing folder_path.
+            folder_path (str): The absolute path of the directory.
+            ignore_matcher (Optional[IgnoreMatcher]): The ignore rules that apply to the entries of folder_path,
+                not including its own .gitignore. Compiled from the traversal's strategies if not provided.
+        """
+        ignore_matcher = ignore_matcher or self.create_ignore_matcher(folder_path)
+        directories = self._scan_directory(node, folder_path, ignore_matcher)
+        # Small subtrees, such as folders created while the workspace is watched, are read level by
+        # level on the calling thread; a thread pool is only started once a level is wide enough
+        while directories and len(directories) < self.max_workers:
+            directories = [sub_directory for directory in directories
+                           for sub_directory in self._scan_directory(*directory)]
+        if not directories:
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="directory-traversal") as executor:
+            pending = {executor.submit(self._scan_directory, *directory) for directory in directories}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for sub_directory in future.result():
+                        pending.add(executor.submit(self._scan_directory, *sub_directory))
+
+    def list_directory(self, folder_path: str, ignore_matcher: IgnoreMatcher) -> Optional[DirectoryListing]:
+        """
+        Reads the visible entries of a single directory with os.scandir.
+
+        Args:
+            folder_path (str): The absolute path of the directory.
+            ignore_matcher (IgnoreMatcher): The ignore rules inherited by the directory.
+
+        Returns:
+            Optional[DirectoryListing]: The listing, or None if the directory cannot be read.
+        """
+        try:
+            mtime_ns = os.stat(folder_path).st_mtime_ns if self.directory_listener else None
+            with os.scandir(folder_path) as iterator:
+                entries = list(iterator)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            return None  # Skip directories that cannot be accessed
+
+        sorted_entries = self.sort_strategy.sort_entries(entries)
+
+        # Check for .gitignore once per directory
+        has_gitignore = any(entry.name == '.gitignore' and entry.is_file() for entry in entries)
+        if has_gitignore:
+            ignore_matcher = ignore_matcher.with_gitignore(folder_path)
+
+        visible_entries = []
+        file_sizes = [] if self.collect_file_sizes else None
+        for entry in sorted_entries:
+            if ignore_matcher.is_ignored(entry.name, entry.path, is_dir=entry.is_dir()):
+                continue
+            is_file = entry.is_file()
+            visible_entries.append((entry.name, entry.path, is_file))
+            if file_sizes is not None:
+                file_sizes.append(_entry_size(entry) if is_file else 0)
+
+        return DirectoryListing(visible_entries, ignore_matcher, has_gitignore, mtime_ns, file_sizes)
+
+    def _scan_directory(self, current_node: TreeNode, current_path: str,
+                        current_matcher: IgnoreMatcher) -> List[PendingDirectory]:
+        """
+        Reads a single directory, attaches its non-ignored entries to current_node and returns
+        the sub-directories that still need to be traversed.
+        """
+        listing = self.list_directory(current_path, current_matcher)
+        if listing is None:
+            return []
+
+        sub_directories: List[PendingDirectory] = []
+        for name, path, is_file in listing.entries:
+            child_node = current_node.create_child(name, is_file=is_file)
+
+            if not is_file:
+                sub_directories.append((child_node, path, listing.ignore_matcher.descend(name)))
+
+        if self.directory_listener:
+            self.directory_listener(current_node, current_path, listing)
+
+        return sub_directories
+
+
+def _entry_size(entry: os.DirEntry) -> int:
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return 0
@@ -0,0 +1,114 @@
+"""
+Constant-time resolution of workspace-relative paths to nodes of a CompactTreeStore.
+"""
+
+import os
+import sys
+from typing import TYPE_CHECKING, Any, Dict, ItemsView, List, Optional
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.compact_tree import CompactTreeStore
+
+
+class PathIndex:
+    """
+    Maps relative paths (as produced by TreeNode.get_path()) to node indices of a CompactTreeStore.
+
+    Once attached, the store keeps the index up to date on every structural change: linking a
+    node indexes its whole subtree, unlinking drops it, and renaming or moving a folder re-keys
+    all of its descendants. The root node is indexed under the empty path.
+
+    Listeners (e.g. the FileFinderIndex) are told about every change with add_nodes() and
+    remove_nodes(), so they stay in sync without walking the tree themselves.
+    """
+
+    def __init__(self, store: 'CompactTreeStore'):
+        """
+        Initialize the PathIndex and attach it to the store.
+
+        Args:
+            store (CompactTreeStore): The store to index. Its current tree is indexed immediately.
+        """
+        self.store = store
+        self._index: Dict[str, int] = {}
+        self.listeners: List[Any] = []
+        self.rebuild()
+        store.path_index = self
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, path: str) -> bool:
+        return self.resolve(path) is not None
+
+    def items(self) -> ItemsView[str, int]:
+        """
+        Returns the (path, node index) pairs of all indexed nodes.
+        """
+        return self._index.items()
+
+    def rebuild(self) -> None:
+        """
+        Re-indexes the whole tree of the store.
+        """
+        self._index = {}
+        for listener in self.listeners:
+            listener.clear()
+        if self.store.root_index >= 0:
+            self.add_subtree(self.store.root_index)
+
+    def resolve(self, path: str) -> Optional[int]:
+        """
+        Resolves a path relative to the workspace root to a node index.
+
+        Args:
+            path (str): The relative path. '' and '.' resolve to the root node.
+
+        Returns:
+            Optional[int]: The node index, or None if no node exists at that path.
+        """
+        normalized_path = os.path.normpath(path) if path else ''
+        if normalized_path == '.':
+            normalized_path = ''
+        return self._index.get(normalized_path)
+
+    def path_of(self, index: int) -> str:
+        """
+        Returns the key under which an attached node is indexed.
+        """
+        return '' if index == self.store.root_index else self.store.get_path(index)
+
+    def add_subtree(self, index: int) -> None:
+        """
+        Indexes an attached node and all of its descendants.
+        """
+        path = self.path_of(index)
+        self._index[path] = index
+        added = [(index, path)]
+        for child, child_path in self.store.iter_subtree(index, prefix=path):
+            self._index[child_path] = child
+            added.append((child, child_path))
+        for listener in self.listeners:
+            listener.add_nodes(added)
+
+    def remove_subtree(self, index: int) -> None:
+        """
+        Drops an attached node and all of its descendants from the index. Must be called before
+        the node is detached or renamed, while its current path can still be computed.
+        """
+        path = self.path_of(index)
+        if self._index.get(path) == index:
+            del self._index[path]
+        removed = [index]
+        for child, child_path in self.store.iter_subtree(index, prefix=path):
+            if self._index.get(child_path) == child:
+                del self._index[child_path]
+            removed.append(child)
+        for listener in self.listeners:
+            listener.remove_nodes(removed)
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate memory used by the index in bytes.
+        """
+        return sys.getsizeof(self._index) + sum(sys.getsizeof(path) for path in self._index)
@@ -0,0 +1,95 @@
+"""
+The single pass that opens a workspace.
+
+Building the directory tree is the only walk over the workspace on disk. Everything else that is
+derived from the files of a workspace (the scan progress, the file finder index, directory
+statistics, project type signals) is produced by visitors of that walk instead of walking the
+disk again:
+
+- visit_directory() is called for every directory read while the tree is built, from the
+  traversal threads, with the directory's listing.
+- scan_finished() is called once the tree and its path index are complete, on the scanning thread
+  and with the tree lock held. When a tree is restored from a snapshot only the changed
+  directories are read again, so visitors derive what they need for the others from the finished
+  tree here.
+"""
+
+import logging
+import threading
+from typing import TYPE_CHECKING, List
+
+from autobyteus_server.file_explorer.directory_traversal import DirectoryListing
+from autobyteus_server.file_explorer.tree_node import TreeNode
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+logger = logging.getLogger(__name__)
+
+
+class ScanVisitor:
+    """
+    Base class of the visitors of a workspace scan. Both callbacks do nothing by default.
+    """
+
+    # Set by visitors that want the sizes of the files in the listings (one stat per file)
+    needs_file_sizes = False
+
+    def visit_directory(self, node: TreeNode, path: str, listing: DirectoryListing) -> None:
+        """
+        Called for every directory read from disk during the scan.
+
+        Args:
+            node (TreeNode): The node of the directory; its children are the listing's entries.
+            path (str): The absolute path of the directory.
+            listing (DirectoryListing): The visible entries of the directory.
+        """
+
+    def scan_finished(self, file_explorer: 'FileExplorer') -> None:
+        """
+        Called once the tree of the file explorer is complete.
+        """
+
+
+class ScanPipeline:
+    """
+    The visitors of the scans of one workspace, called in the order they were added.
+    """
+
+    def __init__(self, visitors: List[ScanVisitor] = None):
+        self._visitors: List[ScanVisitor] = list(visitors or [])
+        self._lock = threading.Lock()
+
+    @property
+    def visitors(self) -> List[ScanVisitor]:
+        return list(self._visitors)
+
+    @property
+    def needs_file_sizes(self) -> bool:
+        return any(visitor.needs_file_sizes for visitor in self._visitors)
+
+    def add_visitor(self, visitor: ScanVisitor) -> None:
+        """
+        Adds a visitor; it takes part in the next scan.
+        """
+        with self._lock:
+            self._visitors = self._visitors + [visitor]
+
+    def remove_visitor(self, visitor: ScanVisitor) -> None:
+        with self._lock:
+            self._visitors = [existing for existing in self._visitors if existing is not visitor]
+
+    def visit_directory(self, node: TreeNode, path: str, listing: DirectoryListing) -> None:
+        for visitor in self._visitors:
+            visitor.visit_directory(node, path, listing)
+
+    def scan_finished(self, file_explorer: 'FileExplorer') -> None:
+        """
+        Calls scan_finished() of every visitor. A failing visitor is logged and does not stop the others.
+        """
+        for visitor in self._visitors:
+            try:
+                visitor.scan_finished(file_explorer)
+            except Exception as e:
+                logger.error(f"Scan visitor {type(visitor).__name__} failed for "
+                             f"{file_explorer.workspace_root_path}: {e}")
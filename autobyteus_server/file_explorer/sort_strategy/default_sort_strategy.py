@@ -26,3 +26,16 @@ class DefaultSortStrategy(SortStrategy):
             List[str]: Sorted list of paths.
         """
         return sorted(paths, key=lambda path: (not os.path.isdir(path), os.path.basename(path).lower()))
+
+    def sort_entries(self, entries: List[os.DirEntry]) -> List[os.DirEntry]:
+        """
+        Sorts directory entries using the same ordering as sort(), reading the directory flag
+        from the entry instead of the filesystem.
+
+        Args:
+            entries (List[os.DirEntry]): Entries of a single directory.
+
+        Returns:
+            List[os.DirEntry]: Sorted list of entries.
+        """
+        return sorted(entries, key=lambda entry: (not entry.is_dir(), entry.name.lower()))
@@ -1,5 +1,6 @@
 # autobyteus_server/file_explorer/sort_strategy/sort_strategy.py
 
+import os
 from abc import ABC, abstractmethod
 from typing import List
 
@@ -12,3 +13,19 @@ class SortStrategy(ABC):
     @abstractmethod
     def sort(self, paths: List[str]) -> List[str]:
         pass
+
+    def sort_entries(self, entries: List[os.DirEntry]) -> List[os.DirEntry]:
+        """
+        Sorts directory entries produced by os.scandir.
+
+        The default implementation delegates to sort() on the entry paths. Strategies that can use
+        the cached entry type information should override this to avoid extra stat calls.
+
+        Args:
+            entries (List[os.DirEntry]): Entries of a single directory.
+
+        Returns:
+            List[os.DirEntry]: Sorted list of entries.
+        """
+        entries_by_path = {entry.path: entry for entry in entries}
+        return [entries_by_path[path] for path in self.sort(list(entries_by_path))]
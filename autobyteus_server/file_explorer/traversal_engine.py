@@ -0,0 +1,73 @@
+# traversal_engine.py
+
+import os
+import logging
+from enum import Enum
+from typing import Callable, List, Optional
+
+from autobyteus_server.file_explorer.directory_traversal import DirectoryTraversal, DirectoryListener
+from autobyteus_server.file_explorer.parallel_directory_traversal import ParallelDirectoryTraversal
+from autobyteus_server.file_explorer.traversal_ignore_strategy.traversal_ignore_strategy import TraversalIgnoreStrategy
+from autobyteus_server.file_explorer.sort_strategy.sort_strategy import SortStrategy
+from autobyteus_server.file_explorer.tree_node import TreeNode
+
+logger = logging.getLogger(__name__)
+
+
+class TraversalEngine(str, Enum):
+    """
+    The available engines for building a workspace directory tree.
+
+    LISTDIR walks one directory at a time with os.listdir (DirectoryTraversal).
+    SCANDIR reads directories with os.scandir on a bounded thread pool (ParallelDirectoryTraversal).
+    """
+    LISTDIR = "listdir"
+    SCANDIR = "scandir"
+
+    @classmethod
+    def from_env(cls) -> 'TraversalEngine':
+        """
+        Reads the engine from the FILE_EXPLORER_TRAVERSAL_ENGINE environment variable.
+
+        Returns:
+            TraversalEngine: The configured engine, SCANDIR if unset or unknown.
+        """
+        value = os.getenv('FILE_EXPLORER_TRAVERSAL_ENGINE', cls.SCANDIR.value).strip().lower()
+        try:
+            return cls(value)
+        except ValueError:
+            logger.warning(f"Unknown traversal engine '{value}', falling back to '{cls.SCANDIR.value}'")
+            return cls.SCANDIR
+
+
+def create_directory_traversal(engine: TraversalEngine,
+                               file_ignore_strategies: Optional[List[TraversalIgnoreStrategy]] = None,
+                               sort_strategy: Optional[SortStrategy] = None,
+                               root_node_factory: Optional[Callable[[str, bool], TreeNode]] = None,
+                               directory_listener: Optional[DirectoryListener] = None,
+                               collect_file_sizes: bool = False) -> DirectoryTraversal:
+    """
+    Creates the directory traversal implementation for the given engine.
+
+    Args:
+        engine (TraversalEngine): The engine to use.
+        file_ignore_strategies (Optional[List[TraversalIgnoreStrategy]]): Strategies to ignore files or folders.
+        sort_strategy (Optional[SortStrategy]): Strategy for sorting directories and files.
+        root_node_factory (Optional[Callable[[str, bool], TreeNode]]): Creates the root node of the tree.
+        directory_listener (Optional[DirectoryListener]): Called for every directory that is read.
+        collect_file_sizes (bool): Whether the directory listings carry the sizes of the files.
+
+    Returns:
+        DirectoryTraversal: The traversal implementation.
+    """
+    if engine == TraversalEngine.SCANDIR:
+        max_workers = os.getenv('FILE_EXPLORER_TRAVERSAL_WORKERS')
+        return ParallelDirectoryTraversal(file_ignore_strategies=file_ignore_strategies,
+                                          sort_strategy=sort_strategy,
+                                          root_node_factory=root_node_factory,
+                                          max_workers=int(max_workers) if max_workers else None,
+                                          directory_listener=directory_listener,
+                                          collect_file_sizes=collect_file_sizes)
+    return DirectoryTraversal(file_ignore_strategies=file_ignore_strategies, sort_strategy=sort_strategy,
+                              root_node_factory=root_node_factory, directory_listener=directory_listener,
+                              collect_file_sizes=collect_file_sizes)
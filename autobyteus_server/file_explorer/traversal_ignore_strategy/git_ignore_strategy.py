@@ -30,12 +30,13 @@ class GitIgnoreStrategy(TraversalIgnoreStrategy):
         else:
             self.spec = pathspec.PathSpec([])  # Empty spec if no .gitignore
 
-    def should_ignore(self, path: str) -> bool:
+    def should_ignore(self, path: str, is_dir: Optional[bool] = None) -> bool:
         """
         Determines if a file or folder should be ignored based on patterns specified in the .gitignore file.
 
         Args:
             path (str): The absolute path of the file or folder.
+            is_dir (Optional[bool]): Whether the path is a directory. Checked on disk when None.
 
         Returns:
             bool: True if the file or folder matches a pattern in the .gitignore file and should be ignored, 
@@ -50,7 +51,9 @@ class GitIgnoreStrategy(TraversalIgnoreStrategy):
         relative_path_str = str(relative_path).replace(os.sep, '/')
         
         # Append '/' if the path is a directory to correctly match directory patterns
-        if os.path.isdir(path):
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+        if is_dir:
             relative_path_str += '/'
         
         return self.spec.match_file(relative_path_str)
@@ -0,0 +1,223 @@
+# autobyteus_server/file_explorer/traversal_ignore_strategy/ignore_matcher.py
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Pattern, Sequence, Tuple
+
+import pathspec
+
+from autobyteus_server.file_explorer.traversal_ignore_strategy.traversal_ignore_strategy import TraversalIgnoreStrategy
+from autobyteus_server.file_explorer.traversal_ignore_strategy.git_ignore_strategy import GitIgnoreStrategy
+
+# pathspec names a group in every pattern regex; the names must go before regexes can be combined
+_NAMED_GROUP = re.compile(r'\(\?P<[^>]+>')
+
+
+class CompiledGitIgnore:
+    """
+    The patterns of a single .gitignore file, compiled into one regular expression.
+
+    Paths are matched relative to the directory containing the .gitignore, with '/' separators
+    and a trailing '/' for directories, exactly as GitIgnoreStrategy passes them to pathspec.
+    Within a file the last matching pattern decides, so negated patterns ('!keep.log') are
+    honored; files without negations are matched with a single regex search.
+    """
+
+    def __init__(self, lines: Sequence[str]):
+        """
+        Initialize CompiledGitIgnore.
+
+        Args:
+            lines (Sequence[str]): The non-empty, non-comment lines of the .gitignore file.
+        """
+        spec = pathspec.PathSpec.from_lines('gitwildmatch', lines)
+        patterns: List[Tuple[str, bool]] = [
+            (_NAMED_GROUP.sub('(?:', pattern.regex.pattern), pattern.include)
+            for pattern in spec.patterns
+            if pattern.include is not None and pattern.regex is not None
+        ]
+        self.has_negations = any(not include for _, include in patterns)
+        self.is_empty = not patterns
+        # Any match at all is needed before a path can be ignored
+        self._combined: Optional[Pattern[str]] = (
+            re.compile('|'.join(f'(?:{source})' for source, _ in patterns)) if patterns else None
+        )
+        # Last pattern first, so the first match found is the one that decides
+        self._ordered: List[Tuple[Pattern[str], bool]] = (
+            [(re.compile(source), include) for source, include in reversed(patterns)]
+            if self.has_negations else []
+        )
+
+    @classmethod
+    def from_file(cls, gitignore_path: str) -> 'CompiledGitIgnore':
+        """
+        Reads and compiles a .gitignore file.
+        """
+        with open(gitignore_path, 'r', encoding='utf-8', errors='replace') as gitignore_file:
+            # Read all non-empty, non-comment lines
+            lines = [line.strip() for line in gitignore_file if line.strip() and not line.startswith('#')]
+        return cls(lines)
+
+    def matches(self, relative_path: str) -> bool:
+        """
+        Returns True if the relative path is ignored by this file.
+        """
+        if self._combined is None or self._combined.match(relative_path) is None:
+            return False
+        if not self.has_negations:
+            return True
+        for regex, include in self._ordered:
+            if regex.match(relative_path):
+                return include
+        return False
+
+
+class GitIgnoreCache:
+    """
+    A bounded, thread-safe cache of compiled .gitignore files, revalidated with the file's
+    modification time and size so edits are picked up.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[Tuple[int, int], CompiledGitIgnore]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, folder_path: str) -> Optional[CompiledGitIgnore]:
+        """
+        Returns the compiled .gitignore of a directory, or None if it has none (or it is empty).
+        """
+        gitignore_path = os.path.join(folder_path, '.gitignore')
+        try:
+            stat_result = os.stat(gitignore_path)
+        except OSError:
+            return None
+        version = (stat_result.st_mtime_ns, stat_result.st_size)
+
+        with self._lock:
+            entry = self._entries.get(gitignore_path)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(gitignore_path)
+                compiled = entry[1]
+                return None if compiled.is_empty else compiled
+
+        try:
+            compiled = CompiledGitIgnore.from_file(gitignore_path)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self._entries[gitignore_path] = (version, compiled)
+            self._entries.move_to_end(gitignore_path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return None if compiled.is_empty else compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by all traversals and workspaces
+gitignore_cache = GitIgnoreCache()
+
+
+class IgnoreMatcher:
+    """
+    Decides which entries of one directory are ignored, without touching the filesystem.
+
+    A matcher holds the stack of compiled .gitignore files that apply to the directory, each with
+    the directory's path relative to the .gitignore location precomputed, plus any other ignore
+    strategies (e.g. SpecificFolderIgnoreStrategy), which are asked with the is_dir flag supplied
+    by the traversal. Checking an entry is a string concatenation and one regex match per
+    .gitignore; matchers for sub-directories are derived in O(stack size) with descend().
+
+    As with a list of strategies, an entry is ignored if any .gitignore or strategy ignores it.
+    """
+
+    __slots__ = ('_rules', '_strategies')
+
+    def __init__(self, rules: Tuple[Tuple[str, CompiledGitIgnore], ...] = (),
+                 strategies: Tuple[TraversalIgnoreStrategy, ...] = ()):
+        """
+        Initialize IgnoreMatcher.
+
+        Args:
+            rules: (path prefix relative to the .gitignore directory, compiled .gitignore) pairs.
+            strategies: Ignore strategies that are not .gitignore based.
+        """
+        self._rules = rules
+        self._strategies = strategies
+
+    @classmethod
+    def from_strategies(cls, strategies: Sequence[TraversalIgnoreStrategy], folder_path: str,
+                        cache: Optional[GitIgnoreCache] = None) -> 'IgnoreMatcher':
+        """
+        Builds the matcher for the entries of folder_path from a list of ignore strategies.
+
+        GitIgnoreStrategy instances are compiled; they apply if folder_path is inside their root.
+        The .gitignore of folder_path itself is not included, see with_gitignore().
+
+        Args:
+            strategies (Sequence[TraversalIgnoreStrategy]): The strategies to apply.
+            folder_path (str): The absolute path of the directory.
+            cache (Optional[GitIgnoreCache]): Cache of compiled .gitignore files. Defaults to the shared one.
+        """
+        cache = cache or gitignore_cache
+        real_folder_path = os.path.realpath(folder_path)
+        rules: List[Tuple[str, CompiledGitIgnore]] = []
+        other_strategies: List[TraversalIgnoreStrategy] = []
+        for strategy in strategies:
+            if not isinstance(strategy, GitIgnoreStrategy):
+                other_strategies.append(strategy)
+                continue
+            relative_path = os.path.relpath(real_folder_path, str(strategy.root_path))
+            if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+                continue  # Only paths below the .gitignore are affected
+            compiled = cache.get(str(strategy.root_path))
+            if compiled is None:
+                continue
+            prefix = '' if relative_path == os.curdir else relative_path.replace(os.sep, '/') + '/'
+            rules.append((prefix, compiled))
+        return cls(tuple(rules), tuple(other_strategies))
+
+    def with_gitignore(self, folder_path: str, cache: Optional[GitIgnoreCache] = None) -> 'IgnoreMatcher':
+        """
+        Returns a matcher that additionally applies the .gitignore found in folder_path, the
+        directory this matcher is for.
+        """
+        compiled = (cache or gitignore_cache).get(folder_path)
+        if compiled is None or any(prefix == '' and rules is compiled for prefix, rules in self._rules):
+            return self
+        # Prepend for higher priority, as the traversals did with strategies
+        return IgnoreMatcher((('', compiled),) + self._rules, self._strategies)
+
+    def descend(self, name: str) -> 'IgnoreMatcher':
+        """
+        Returns the matcher for the entries of the sub-directory name, not including that
+        directory's own .gitignore.
+        """
+        if not self._rules:
+            return self
+        return IgnoreMatcher(tuple((prefix + name + '/', rules) for prefix, rules in self._rules),
+                             self._strategies)
+
+    def is_ignored(self, name: str, path: str, is_dir: bool) -> bool:
+        """
+        Returns True if the entry should be ignored.
+
+        Args:
+            name (str): The entry name.
+            path (str): The absolute path of the entry, passed to non-.gitignore strategies.
+            is_dir (bool): Whether the entry is a directory.
+        """
+        entry = name + '/' if is_dir else name
+        for prefix, rules in self._rules:
+            if rules.matches(prefix + entry):
+                return True
+        for strategy in self._strategies:
+            if strategy.should_ignore(path, is_dir=is_dir):
+                return True
+        return False
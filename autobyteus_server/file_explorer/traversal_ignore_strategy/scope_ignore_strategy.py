@@ -0,0 +1,161 @@
+# autobyteus_server/file_explorer/traversal_ignore_strategy/scope_ignore_strategy.py
+
+import logging
+import os
+import threading
+from fnmatch import fnmatchcase
+from typing import Callable, Iterable, List, Optional, Set
+
+from autobyteus_server.file_explorer.traversal_ignore_strategy.ignore_matcher import CompiledGitIgnore
+from autobyteus_server.file_explorer.traversal_ignore_strategy.traversal_ignore_strategy import TraversalIgnoreStrategy
+from autobyteus_server.file_explorer.workspace_scope import WorkspaceScope, split_pattern
+
+logger = logging.getLogger(__name__)
+
+
+class ScopeIgnoreStrategy(TraversalIgnoreStrategy):
+    """
+    A strategy to ignore what is outside of the scope of a sparse workspace.
+
+    Folders that cannot contain included files are ignored as a whole, so they are never read.
+    With max_files, files are admitted in the order they are read until the limit is reached; once
+    it is, further files and folders holding no admitted file are ignored. The admitted files are
+    remembered, so reading a folder again keeps its files.
+    """
+
+    def __init__(self, root_path: str, scope: Optional[WorkspaceScope] = None,
+                 tree_files: Optional[Callable[[], Iterable[str]]] = None):
+        """
+        Initialize ScopeIgnoreStrategy.
+
+        Args:
+            root_path (str): The root path of the workspace; globs are relative to it.
+            scope (Optional[WorkspaceScope]): The scope. Defaults to loading everything.
+            tree_files (Optional[Callable[[], Iterable[str]]]): Returns the relative paths of the files in
+                the tree, used to release the slots of removed files once max_files is reached.
+        """
+        self.root_path = os.path.normpath(root_path)
+        self.tree_files = tree_files
+        self._lock = threading.Lock()
+        self._admitted: Set[str] = set()
+        self._admitted_directories: Set[str] = set()
+        self._stale = False
+        self.truncated = False
+        self.set_scope(scope or WorkspaceScope())
+
+    def set_scope(self, scope: WorkspaceScope) -> None:
+        """
+        Replaces the scope; it applies to the folders read from now on.
+        """
+        self.scope = scope
+        self._include = CompiledGitIgnore(list(scope.include)) if scope.include else None
+        self._exclude = CompiledGitIgnore(list(scope.exclude)) if scope.exclude else None
+        split_patterns = [split_pattern(pattern) for pattern in scope.include]
+        # A pattern without a slash matches at any depth, so every folder may hold included files
+        self._include_anywhere = any(not anchored for anchored, _ in split_patterns)
+        self._include_parts = [parts for anchored, parts in split_patterns if anchored]
+
+    def reset(self) -> None:
+        """
+        Forgets the admitted files, before the whole tree is read again.
+        """
+        with self._lock:
+            self._admitted = set()
+            self._admitted_directories = set()
+            self._stale = False
+            self.truncated = False
+
+    def sync_files(self, file_paths: Iterable[str]) -> None:
+        """
+        Sets the admitted files to the files of the tree, e.g. before reading part of it again.
+        """
+        if not self.scope.max_files:
+            return
+        admitted = {path.replace(os.sep, '/') for path in file_paths}
+        admitted_directories = {directory for path in admitted for directory in self._parents(path)}
+        with self._lock:
+            self._admitted = admitted
+            self._admitted_directories = admitted_directories
+            self._stale = False
+
+    def mark_stale(self) -> None:
+        """
+        Tells the strategy that files may have been removed from the tree.
+        """
+        if self.scope.max_files:
+            self._stale = True
+
+    def should_ignore(self, path: str, is_dir: Optional[bool] = None) -> bool:
+        """
+        Determines if a file or folder is outside of the scope.
+
+        Args:
+            path (str): The absolute path of the file or folder.
+            is_dir (Optional[bool]): Whether the path is a directory. Checked on disk when None.
+
+        Returns:
+            bool: True if the file or folder should be ignored, False otherwise.
+        """
+        scope = self.scope
+        if not scope.is_sparse:
+            return False
+        if path.startswith(self.root_path + os.sep):
+            relative_path = path[len(self.root_path) + 1:]
+        else:
+            relative_path = os.path.relpath(path, self.root_path)
+        relative_path = relative_path.replace(os.sep, '/')
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+
+        parts = relative_path.split('/')
+        if scope.max_depth and len(parts) > scope.max_depth:
+            return True
+        entry = relative_path + '/' if is_dir else relative_path
+        if self._exclude is not None and self._exclude.matches(entry):
+            return True
+        if self._include is not None and not self._include.matches(entry):
+            if not is_dir or not self._may_contain_included(parts):
+                return True
+        if scope.max_files:
+            return not self._admit(relative_path, is_dir)
+        return False
+
+    def _may_contain_included(self, parts: List[str]) -> bool:
+        if self._include_anywhere:
+            return True
+        for pattern_parts in self._include_parts:
+            for position, pattern_part in enumerate(pattern_parts):
+                if pattern_part == '**' or position == len(parts):
+                    return True
+                if not fnmatchcase(parts[position], pattern_part):
+                    break
+        return False
+
+    def _admit(self, relative_path: str, is_dir: bool) -> bool:
+        with self._lock:
+            if is_dir:
+                if len(self._admitted) < self.scope.max_files or relative_path in self._admitted_directories:
+                    return True
+            elif relative_path in self._admitted:
+                return True
+            elif len(self._admitted) < self.scope.max_files:
+                self._admitted.add(relative_path)
+                self._admitted_directories.update(self._parents(relative_path))
+                return True
+            stale = self._stale and self.tree_files is not None
+        if stale:
+            # Removed files may have freed slots
+            self.sync_files(self.tree_files())
+            return self._admit(relative_path, is_dir)
+        if not is_dir and not self.truncated:
+            self.truncated = True
+            logger.warning(f"Workspace {self.root_path} reached its limit of {self.scope.max_files} files; "
+                           f"further files are left out")
+        return False
+
+    @staticmethod
+    def _parents(relative_path: str) -> Iterable[str]:
+        parent = relative_path.rpartition('/')[0]
+        while parent:
+            yield parent
+            parent = parent.rpartition('/')[0]
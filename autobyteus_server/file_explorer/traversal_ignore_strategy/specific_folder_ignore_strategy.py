@@ -1,7 +1,7 @@
 # autobyteus_server/file_explorer/traversal_ignore_strategy/specific_folder_ignore_strategy.py
 
 import os
-from typing import List
+from typing import List, Optional
 
 from autobyteus_server.file_explorer.traversal_ignore_strategy.traversal_ignore_strategy import TraversalIgnoreStrategy
 
@@ -20,14 +20,17 @@ class SpecificFolderIgnoreStrategy(TraversalIgnoreStrategy):
         """
         self.folders_to_ignore = set(folders_to_ignore)
 
-    def should_ignore(self, path: str) -> bool:
+    def should_ignore(self, path: str, is_dir: Optional[bool] = None) -> bool:
         """
         Determines if a folder should be ignored based on its name.
 
         Args:
             path (str): The path of the folder.
+            is_dir (Optional[bool]): Whether the path is a directory. Checked on disk when None.
 
         Returns:
             bool: True if the folder should be ignored, False otherwise.
         """
-        return os.path.isdir(path) and os.path.basename(path) in self.folders_to_ignore
+        if os.path.basename(path) not in self.folders_to_ignore:
+            return False
+        return os.path.isdir(path) if is_dir is None else is_dir
@@ -1,6 +1,7 @@
 # autobyteus_server/file_explorer/traversal_ignore_strategy/traversal_ignore_strategy.py
 
 from abc import ABC, abstractmethod
+from typing import Optional
 
 class TraversalIgnoreStrategy(ABC):
     """
@@ -8,12 +9,14 @@ class TraversalIgnoreStrategy(ABC):
     """
 
     @abstractmethod
-    def should_ignore(self, path: str) -> bool:
+    def should_ignore(self, path: str, is_dir: Optional[bool] = None) -> bool:
         """
         Determines whether a file or folder should be ignored during directory traversal.
 
         Args:
             path (str): The path of the file or folder.
+            is_dir (Optional[bool]): Whether the path is a directory, if the caller already knows it
+                (e.g. from a directory entry). When None, strategies query the filesystem themselves.
 
         Returns:
             bool: True if the file or folder should be ignored, False otherwise.
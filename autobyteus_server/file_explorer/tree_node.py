@@ -25,6 +25,10 @@ class TreeNode:
     -------
     add_child(node: 'TreeNode')
         Adds a child to this node.
+    create_child(name: str, is_file: bool) -> 'TreeNode'
+        Creates a new node and adds it as a child of this node.
+    remove_child(node: 'TreeNode')
+        Removes a child from this node.
     to_dict() -> Dict[str, Any]
         Returns a dictionary representation of the TreeNode.
     from_dict(data: Dict[str, Any]) -> 'TreeNode'
@@ -47,6 +51,25 @@ class TreeNode:
         node.parent = self  # Ensure the child's parent is set correctly
         self.children.append(node)
 
+    def create_child(self, name: str, is_file: bool = False) -> 'TreeNode':
+        """
+        Creates a new node of the same kind as this node and adds it as a child.
+
+        Tree builders and file operations use this instead of constructing TreeNode directly,
+        so they work unchanged on alternative tree representations.
+
+        Returns:
+            TreeNode: The newly created child node.
+        """
+        child = TreeNode(name, is_file=is_file)
+        self.add_child(child)
+        return child
+
+    def remove_child(self, node: 'TreeNode'):
+        """Removes a child from this node."""
+        self.children.remove(node)
+        node.parent = None
+
     def get_path(self) -> str:
             """
             Constructs and returns the relative path of the current node with respect to the root.
@@ -81,21 +104,23 @@ class TreeNode:
             "id": self.id
         }
 
-        stack = deque([(self, root_dict)])
+        # Paths are built from the parent's path instead of walking up to the root per node
+        stack = deque([(self, root_dict, '' if self.parent is None else root_dict["path"])])
 
         while stack:
-            current_node, current_dict = stack.pop()
+            current_node, current_dict, current_path = stack.pop()
             for child in current_node.children:
+                child_path = os.path.join(current_path, child.name) if current_path else child.name
                 child_dict = {
                     "name": child.name,
-                    "path": child.get_path(),
+                    "path": child_path,
                     "is_file": child.is_file,
                     "children": [],
                     "id": child.id
                 }
                 current_dict["children"].append(child_dict)
                 if not child.is_file:
-                    stack.append((child, child_dict))
+                    stack.append((child, child_dict, child_path))
 
         return root_dict
 
@@ -0,0 +1,141 @@
+"""
+Depth-limited, paginated serialization of workspace directory trees.
+
+Clients render the first levels of a tree and expand folders on demand instead of receiving the
+whole tree at once. Node dictionaries have the same shape as TreeNode.to_dict(); folders
+additionally carry:
+
+- "has_children": whether the folder has any children, loaded or not.
+- "next_cursor": set when only a page of the folder's children is included. Pass it back as the
+  cursor to fetch the following children.
+
+A folder whose "children" is empty while "has_children" is true has not been expanded yet.
+"""
+
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from autobyteus_server.file_explorer.compact_tree import NO_NODE, CompactTreeNode
+from autobyteus_server.file_explorer.tree_node import TreeNode
+
+
+def _relative_path(node: TreeNode) -> str:
+    """Returns the path prefix for the children of node ('' for the root)."""
+    return '' if node.parent is None else node.get_path()
+
+
+def _iter_children_after(node: TreeNode, cursor: Optional[str]) -> Iterator[TreeNode]:
+    """
+    Iterates the children of node, starting after the child whose id is cursor.
+
+    Raises:
+        ValueError: If the cursor does not refer to a child of node.
+    """
+    if cursor is None:
+        yield from node.children
+        return
+
+    if isinstance(node, CompactTreeNode):
+        store = node.store
+        index = store.index_of(cursor)
+        if index is None or store.parent(index) != node.index:
+            raise ValueError(f"Invalid or expired cursor: {cursor}")
+        child = store.next_sibling(index)
+        while child != NO_NODE:
+            yield store.view(child)
+            child = store.next_sibling(child)
+        return
+
+    children = iter(node.children)
+    for child in children:
+        if child.id == cursor:
+            yield from children
+            return
+    raise ValueError(f"Invalid or expired cursor: {cursor}")
+
+
+def _node_dict(node: TreeNode, path: str) -> Dict[str, Any]:
+    node_dict = {
+        "name": node.name,
+        "path": path,
+        "is_file": node.is_file,
+        "children": [],
+        "id": node.id
+    }
+    if not node.is_file:
+        node_dict["has_children"] = bool(node.children)
+        node_dict["next_cursor"] = None
+    return node_dict
+
+
+def _fill_children(node: TreeNode, node_dict: Dict[str, Any], parent_path: str, depth: int,
+                   limit: Optional[int], cursor: Optional[str] = None) -> None:
+    """
+    Adds up to limit children of node to node_dict, recursing depth - 1 levels into folders.
+    """
+    stack: List[Tuple[TreeNode, Dict[str, Any], str, int, Optional[str]]] = [
+        (node, node_dict, parent_path, depth, cursor)
+    ]
+    while stack:
+        current, current_dict, current_path, remaining_depth, current_cursor = stack.pop()
+        if remaining_depth <= 0 or current.is_file:
+            continue
+        last_child = None
+        for count, child in enumerate(_iter_children_after(current, current_cursor)):
+            if limit is not None and count >= limit:
+                current_dict["next_cursor"] = last_child.id
+                break
+            child_path = os.path.join(current_path, child.name) if current_path else child.name
+            child_dict = _node_dict(child, child_path)
+            current_dict["children"].append(child_dict)
+            if not child.is_file and remaining_depth > 1:
+                stack.append((child, child_dict, child_path, remaining_depth - 1, None))
+            last_child = child
+
+
+def serialize_tree(root: TreeNode, max_depth: int, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Serializes a tree down to max_depth levels below root.
+
+    Args:
+        root (TreeNode): The node to serialize.
+        max_depth (int): Number of levels of children to include. 0 returns only the node itself.
+        limit (Optional[int]): Maximum number of children included per folder.
+
+    Returns:
+        Dict[str, Any]: The node dictionary.
+    """
+    root_dict = _node_dict(root, root.get_path())
+    _fill_children(root, root_dict, _relative_path(root), max_depth, limit)
+    return root_dict
+
+
+def get_children_page(node: TreeNode, depth: int = 1, cursor: Optional[str] = None,
+                      limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Returns one page of the children of a folder, each expanded depth - 1 further levels.
+
+    Args:
+        node (TreeNode): The folder whose children are returned.
+        depth (int): Number of levels to include, 1 for the direct children only.
+        cursor (Optional[str]): The next_cursor of a previous page.
+        limit (Optional[int]): Maximum number of children per folder.
+
+    Returns:
+        Dict[str, Any]: {"node_id", "children", "next_cursor"}.
+
+    Raises:
+        ValueError: If node is a file, depth is smaller than 1 or the cursor is invalid.
+    """
+    if node.is_file:
+        raise ValueError(f"Node is not a folder: {node.get_path()}")
+    if depth < 1:
+        raise ValueError("Depth must be at least 1")
+
+    page_dict = _node_dict(node, node.get_path())
+    _fill_children(node, page_dict, _relative_path(node), depth, limit, cursor)
+    return {
+        "node_id": node.id,
+        "children": page_dict["children"],
+        "next_cursor": page_dict["next_cursor"]
+    }
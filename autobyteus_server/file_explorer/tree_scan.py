@@ -0,0 +1,139 @@
+"""
+Progress of the scan that builds a workspace directory tree.
+
+A workspace is registered before its tree is built: the scan runs on the background executor and
+the tree it produces is visible, partially, as soon as the root exists. TreeScanProgress counts the
+directories and files read so far and wakes the subscribers following the scan, at most every
+_PROGRESS_INTERVAL_SECONDS and when the scan ends.
+"""
+
+import asyncio
+import threading
+import time
+from enum import Enum
+from typing import AsyncIterator, Optional, Set, Tuple
+
+from autobyteus_server.file_explorer.directory_traversal import DirectoryListing
+from autobyteus_server.file_explorer.scan_pipeline import ScanVisitor
+from autobyteus_server.file_explorer.tree_node import TreeNode
+
+_PROGRESS_INTERVAL_SECONDS = 0.2
+
+
+class TreeScanStatus(str, Enum):
+    PENDING = "pending"
+    SCANNING = "scanning"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class TreeScanProgress(ScanVisitor):
+    """
+    The state of the scan of one workspace tree.
+
+    Attributes:
+        status: Pending until the scan starts, then scanning, completed or failed.
+        directories_scanned: The number of directories read so far.
+        files_scanned: The number of (not ignored) files found so far.
+        error: The error of a failed scan.
+    """
+
+    def __init__(self):
+        self.status = TreeScanStatus.PENDING
+        self.directories_scanned = 0
+        self.files_scanned = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.version = 0
+        self._lock = threading.Lock()
+        self._last_notified = 0.0
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (TreeScanStatus.COMPLETED, TreeScanStatus.FAILED)
+
+    def start(self) -> None:
+        """
+        Resets the counters for a new scan.
+        """
+        with self._lock:
+            self.status = TreeScanStatus.SCANNING
+            self.directories_scanned = 0
+            self.files_scanned = 0
+            self.error = None
+            self.started_at = time.time()
+            self.finished_at = None
+            self.version += 1
+        self._notify()
+
+    def record_directory(self, listing: DirectoryListing) -> None:
+        """
+        Counts a directory that was read and its files. Called from the traversal threads.
+        """
+        with self._lock:
+            self.directories_scanned += 1
+            self.files_scanned += sum(1 for _, _, is_file in listing.entries if is_file)
+            self.version += 1
+            now = time.monotonic()
+            if now - self._last_notified < _PROGRESS_INTERVAL_SECONDS:
+                return
+            self._last_notified = now
+        self._notify()
+
+    def visit_directory(self, node: TreeNode, path: str, listing: DirectoryListing) -> None:
+        self.record_directory(listing)
+
+    def finish(self, error: Optional[Exception] = None) -> None:
+        """
+        Marks the scan completed, or failed with the given error.
+        """
+        with self._lock:
+            self.status = TreeScanStatus.FAILED if error else TreeScanStatus.COMPLETED
+            self.error = str(error) if error else None
+            self.finished_at = time.time()
+            self.version += 1
+        self._notify()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return self._to_dict()
+
+    def _to_dict(self) -> dict:
+        return {
+            "status": self.status.value,
+            "directories_scanned": self.directories_scanned,
+            "files_scanned": self.files_scanned,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    async def watch(self) -> AsyncIterator[dict]:
+        """
+        Yields the state of the scan whenever it changes, starting with the current state, until the
+        scan is finished.
+        """
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        self._waiters.add(waiter)
+        seen_version = None
+        try:
+            while True:
+                event.clear()
+                with self._lock:
+                    version, state = self.version, self._to_dict()
+                if version != seen_version:
+                    seen_version = version
+                    yield state
+                if state["status"] in (TreeScanStatus.COMPLETED.value, TreeScanStatus.FAILED.value):
+                    return
+                await event.wait()
+        finally:
+            self._waiters.discard(waiter)
+
+    def _notify(self) -> None:
+        for loop, event in list(self._waiters):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
@@ -0,0 +1,133 @@
+"""
+Streaming JSON serialization of workspace directory trees.
+
+TreeNode.to_dict() materializes one dictionary per node and computes every path by walking up
+to the root, before json.dumps() walks the dictionaries again. For large workspaces the
+serializers here produce the same JSON in a single traversal instead:
+
+- Paths are built incrementally from the parent's path while descending.
+- The JSON is written directly as compact chunks of text, without intermediate dictionaries.
+- Compact trees are read straight from the CompactTreeStore arrays, without node views.
+
+The output has the shape of TreeNode.to_dict() ("name", "path", "is_file", "children", "id").
+With max_depth, folders additionally carry "has_children" and "next_cursor" exactly like
+tree_pagination.serialize_tree().
+"""
+
+import json.encoder
+import os
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from autobyteus_server.file_explorer.compact_tree import CompactTreeNode
+from autobyteus_server.file_explorer.tree_node import TreeNode
+
+# Same escaping as json.dumps() with its default ensure_ascii=True
+_encode_string: Callable[[str], str] = json.encoder.encode_basestring_ascii
+
+# Number of pieces buffered before a chunk is yielded
+_CHUNK_PARTS = 4096
+
+
+def children_path_prefix(node: TreeNode) -> str:
+    """
+    Returns the path prefix of the children of node: '' for a root, the node's path otherwise.
+    """
+    return '' if node.parent is None else node.get_path()
+
+
+def _node_accessors(node: TreeNode) -> Tuple[Any, Callable, Callable, Callable, Callable]:
+    """
+    Returns (handle, name, is_file, id, children) accessors for the tree of node. Compact trees
+    are accessed by node index so no views have to be created.
+    """
+    if isinstance(node, CompactTreeNode):
+        store = node.store
+        return node.index, store.name, store.is_file, store.node_id, store.iter_children
+    return (node,
+            lambda n: n.name,
+            lambda n: n.is_file,
+            lambda n: n.id,
+            lambda n: n.children)
+
+
+def iter_tree_json(node: TreeNode, max_depth: Optional[int] = None,
+                   include_children: bool = True) -> Iterator[str]:
+    """
+    Serializes a tree to compact JSON, yielding the text in chunks.
+
+    Args:
+        node (TreeNode): The node to serialize.
+        max_depth (Optional[int]): If given, only this many levels below node are included, and
+            folders carry "has_children" and "next_cursor" like tree_pagination.serialize_tree().
+        include_children (bool): If False, only the node itself is written, with empty "children".
+
+    Yields:
+        str: Consecutive pieces of the JSON document.
+    """
+    handle, get_name, get_is_file, get_id, get_children = _node_accessors(node)
+    depth_limited = max_depth is not None
+    if not include_children:
+        max_depth, depth_limited = 0, False
+
+    def open_node(current: Any, path: str, is_file: bool) -> str:
+        return (f'{{"name":{_encode_string(get_name(current))},"path":{_encode_string(path)},'
+                f'"is_file":{"true" if is_file else "false"},"children":[')
+
+    def close_node(current: Any, is_file: bool, has_children: bool) -> str:
+        tail = f'],"id":{_encode_string(get_id(current))}'
+        if depth_limited and not is_file:
+            tail += f',"has_children":{"true" if has_children else "false"},"next_cursor":null'
+        return tail + '}'
+
+    parts: List[str] = []
+    # (children iterator, children path prefix, remaining depth, closing text, first child pending)
+    stack: List[List[Any]] = []
+
+    def visit(current: Any, path: str, prefix: str, remaining: Optional[int]) -> None:
+        is_file = get_is_file(current)
+        parts.append(open_node(current, path, is_file))
+        if is_file:
+            parts.append(close_node(current, True, False))
+            return
+        children: Iterable[Any] = get_children(current)
+        if remaining is not None and remaining <= 0:
+            parts.append(close_node(current, False, next(iter(children), None) is not None))
+            return
+        children_iter = iter(children)
+        first_child = next(children_iter, None)
+        if first_child is None:
+            parts.append(close_node(current, False, False))
+            return
+        stack.append([children_iter, prefix, None if remaining is None else remaining - 1,
+                      close_node(current, False, True), first_child])
+
+    visit(handle, node.get_path(), children_path_prefix(node), max_depth)
+    while stack:
+        frame = stack[-1]
+        pending = frame[4]
+        if pending is not None:
+            child = pending
+            frame[4] = None
+        else:
+            child = next(frame[0], None)
+            if child is None:
+                parts.append(frame[3])
+                stack.pop()
+                continue
+            parts.append(',')
+        parent_path = frame[1]
+        name = get_name(child)
+        child_path = os.path.join(parent_path, name) if parent_path else name
+        visit(child, child_path, child_path, frame[2])
+        if len(parts) >= _CHUNK_PARTS:
+            yield ''.join(parts)
+            parts.clear()
+    if parts:
+        yield ''.join(parts)
+
+
+def tree_to_json(node: TreeNode, max_depth: Optional[int] = None, include_children: bool = True) -> str:
+    """
+    Serializes a tree to a compact JSON string. See iter_tree_json() for the arguments.
+    """
+    return ''.join(iter_tree_json(node, max_depth=max_depth, include_children=include_children))
@@ -0,0 +1,300 @@
+"""
+Persistent snapshots of workspace directory trees.
+
+A snapshot stores the CompactTreeStore of a workspace together with the modification time of
+every directory (taken before the directory was read) and the hash of every .gitignore file that
+shaped the tree. When the workspace is opened again, the snapshot is revalidated instead of
+walking the whole workspace:
+
+- A directory whose mtime is unchanged still has the same entries, so only its sub-directories
+  need to be checked.
+- A directory whose mtime changed is re-read and its children are diffed against the snapshot;
+  unchanged sub-directories keep their subtrees and are checked in turn.
+- A directory whose .gitignore changed (edited, added or removed) is rescanned completely, since
+  the ignore rules apply to everything below it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from autobyteus_server.file_explorer.compact_tree import CompactTreeStore, pack_sections, unpack_sections
+from autobyteus_server.file_explorer.directory_traversal import DirectoryListing, DirectoryTraversal
+from autobyteus_server.file_explorer.traversal_ignore_strategy.ignore_matcher import IgnoreMatcher
+from autobyteus_server.file_explorer.tree_node import TreeNode
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+_SNAPSHOT_MAGIC = b'ABTREESNAP'
+
+# (directory index, directory path, ignore rules inherited by its entries)
+PendingDirectory = Tuple[int, str, IgnoreMatcher]
+
+
+def hash_gitignore(folder_path: str) -> Optional[str]:
+    """
+    Returns the SHA-1 of the .gitignore file in folder_path, or None if there is none.
+    """
+    try:
+        with open(os.path.join(folder_path, '.gitignore'), 'rb') as gitignore_file:
+            return hashlib.sha1(gitignore_file.read()).hexdigest()
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError, PermissionError):
+        return None
+
+
+class TreeSnapshot:
+    """
+    The directory tree of a workspace and the directory state it was built from.
+    """
+
+    def __init__(self, root_path: str, store: CompactTreeStore,
+                 directory_mtimes: Optional[Dict[int, int]] = None,
+                 gitignore_hashes: Optional[Dict[int, str]] = None):
+        """
+        Initialize a TreeSnapshot.
+
+        Args:
+            root_path (str): The absolute root path of the workspace.
+            store (CompactTreeStore): The tree of the workspace.
+            directory_mtimes (Optional[Dict[int, int]]): Modification time in ns per directory node index.
+            gitignore_hashes (Optional[Dict[int, str]]): .gitignore hash per directory node index.
+        """
+        self.root_path = os.path.normpath(root_path)
+        self.store = store
+        self.directory_mtimes: Dict[int, int] = directory_mtimes or {}
+        self.gitignore_hashes: Dict[int, str] = gitignore_hashes or {}
+
+    def record_directory(self, node: TreeNode, path: str, listing: DirectoryListing) -> None:
+        """
+        Records the state of a directory that was read. Used as the traversal's directory listener.
+        """
+        if listing.mtime_ns is not None:
+            self.directory_mtimes[node.index] = listing.mtime_ns
+        else:
+            self.directory_mtimes.pop(node.index, None)
+        gitignore_hash = hash_gitignore(path) if listing.has_gitignore else None
+        if gitignore_hash is not None:
+            self.gitignore_hashes[node.index] = gitignore_hash
+        else:
+            self.gitignore_hashes.pop(node.index, None)
+
+    def revalidate(self, traversal: DirectoryTraversal) -> Tuple[int, int]:
+        """
+        Brings the tree up to date with the file system, re-reading only changed directories.
+
+        Args:
+            traversal (DirectoryTraversal): The traversal used to read changed directories, configured with
+                the ignore strategies of the workspace. Its directory listener should be this snapshot's
+                record_directory.
+
+        Returns:
+            Tuple[int, int]: The number of directories checked and the number re-read.
+        """
+        store = self.store
+        checked = rescanned = 0
+        stack: List[PendingDirectory] = [
+            (store.root_index, self.root_path, traversal.create_ignore_matcher(self.root_path))
+        ]
+        while stack:
+            index, path, current_matcher = stack.pop()
+            checked += 1
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+
+            recorded_hash = self.gitignore_hashes.get(index)
+            changed = mtime_ns is None or mtime_ns != self.directory_mtimes.get(index)
+            current_hash = hash_gitignore(path) if changed or recorded_hash is not None else None
+
+            if current_hash != recorded_hash:
+                # The ignore rules changed, which can affect everything below this directory
+                self._rescan_subtree(index, path, current_matcher, traversal)
+                rescanned += 1
+            elif changed:
+                stack.extend(self._rescan_directory(index, path, current_matcher, traversal))
+                rescanned += 1
+            else:
+                if current_hash is not None:
+                    current_matcher = current_matcher.with_gitignore(path)
+                for child in store.iter_children(index):
+                    if not store.is_file(child):
+                        name = store.name(child)
+                        stack.append((child, os.path.join(path, name), current_matcher.descend(name)))
+        return checked, rescanned
+
+    def _detach_children(self, index: int) -> None:
+        for child in list(self.store.iter_children(index)):
+            self.store.unlink(child)
+
+    def _rescan_subtree(self, index: int, path: str, ignore_matcher: IgnoreMatcher,
+                        traversal: DirectoryTraversal) -> None:
+        self._detach_children(index)
+        self.directory_mtimes.pop(index, None)
+        self.gitignore_hashes.pop(index, None)
+        traversal.populate(self.store.view(index), path, ignore_matcher)
+
+    def _rescan_directory(self, index: int, path: str, ignore_matcher: IgnoreMatcher,
+                          traversal: DirectoryTraversal) -> List[PendingDirectory]:
+        """
+        Re-reads a single directory and reconciles its children with the listing. Returns the
+        existing sub-directories that still need to be checked.
+        """
+        store = self.store
+        listing = traversal.list_directory(path, ignore_matcher)
+        if listing is None:
+            self._detach_children(index)
+            self.directory_mtimes.pop(index, None)
+            self.gitignore_hashes.pop(index, None)
+            return []
+
+        existing = {store.name(child): child for child in store.iter_children(index)}
+        ordered_children: List[int] = []
+        new_directories: List[Tuple[int, str]] = []
+        pending: List[PendingDirectory] = []
+        for name, child_path, is_file in listing.entries:
+            child = existing.pop(name, None)
+            if child is not None and store.is_file(child) != is_file:
+                store.unlink(child)
+                child = None
+            if child is None:
+                child = store.create_node(name, is_file)
+                if not is_file:
+                    new_directories.append((child, child_path))
+            elif not is_file:
+                pending.append((child, child_path, listing.ignore_matcher.descend(name)))
+            ordered_children.append(child)
+
+        for stale_child in existing.values():
+            store.unlink(stale_child)
+        # Relink in listing order so the children follow the sort strategy
+        for child in ordered_children:
+            store.link(child, index)
+
+        self.record_directory(store.view(index), path, listing)
+        for child, child_path in new_directories:
+            traversal.populate(store.view(child), child_path,
+                               listing.ignore_matcher.descend(store.name(child)))
+        return pending
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the snapshot. State recorded for nodes that were removed from the tree is dropped.
+        """
+        attached = [index for index in self.directory_mtimes if self.store.is_attached(index)]
+        header = json.dumps({"version": SNAPSHOT_VERSION, "root_path": self.root_path}).encode('utf-8')
+        gitignore_hashes = {str(index): value for index, value in self.gitignore_hashes.items()
+                            if self.store.is_attached(index)}
+        sections = [
+            header,
+            array('i', attached).tobytes(),
+            array('q', (self.directory_mtimes[index] for index in attached)).tobytes(),
+            json.dumps(gitignore_hashes).encode('utf-8'),
+            self.store.to_bytes()
+        ]
+        return _SNAPSHOT_MAGIC + pack_sections(sections)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'TreeSnapshot':
+        """
+        Restores a snapshot serialized with to_bytes().
+
+        Raises:
+            ValueError: If the data is not a compatible snapshot.
+        """
+        if not data.startswith(_SNAPSHOT_MAGIC):
+            raise ValueError("Not a tree snapshot")
+        sections = unpack_sections(data[len(_SNAPSHOT_MAGIC):])
+        if len(sections) != 5:
+            raise ValueError("Unexpected number of sections in tree snapshot")
+        header = json.loads(sections[0])
+        if header.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported tree snapshot version: {header.get('version')}")
+        indices = array('i')
+        indices.frombytes(sections[1])
+        mtimes = array('q')
+        mtimes.frombytes(sections[2])
+        if len(indices) != len(mtimes):
+            raise ValueError("Inconsistent directory state in tree snapshot")
+        gitignore_hashes = {int(index): value for index, value in json.loads(sections[3]).items()}
+        return cls(root_path=header["root_path"],
+                   store=CompactTreeStore.from_bytes(sections[4]),
+                   directory_mtimes=dict(zip(indices, mtimes)),
+                   gitignore_hashes=gitignore_hashes)
+
+
+class TreeSnapshotCache:
+    """
+    Stores one tree snapshot per workspace root path in a cache directory.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the TreeSnapshotCache.
+
+        Args:
+            cache_dir (str): The directory holding the snapshot files. Created on first save.
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def snapshot_path(self, root_path: str) -> Path:
+        """
+        Returns the snapshot file used for a workspace root path.
+        """
+        key = hashlib.sha1(os.path.normpath(root_path).encode('utf-8', 'surrogateescape')).hexdigest()
+        return self.cache_dir / f"{key}.snapshot"
+
+    def load(self, root_path: str) -> Optional[TreeSnapshot]:
+        """
+        Loads the snapshot of a workspace.
+
+        Returns:
+            Optional[TreeSnapshot]: The snapshot, or None if there is no usable snapshot.
+        """
+        path = self.snapshot_path(root_path)
+        try:
+            snapshot = TreeSnapshot.from_bytes(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable tree snapshot {path}: {e}")
+            return None
+        if snapshot.root_path != os.path.normpath(root_path):
+            logger.warning(f"Ignoring tree snapshot {path} recorded for {snapshot.root_path}")
+            return None
+        return snapshot
+
+    def save(self, snapshot: TreeSnapshot) -> None:
+        """
+        Writes the snapshot of a workspace, replacing the previous one atomically. Failures are
+        logged, since the snapshot is only an optimization.
+        """
+        path = self.snapshot_path(snapshot.root_path)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            data = snapshot.to_bytes()
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as temp_file:
+                    temp_file.write(data)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to save tree snapshot {path}: {e}")
+
+    def remove(self, root_path: str) -> None:
+        """
+        Deletes the snapshot of a workspace if there is one.
+        """
+        try:
+            self.snapshot_path(root_path).unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,485 @@
+"""
+Backends that observe a workspace and report raw WatchEvents.
+
+A recursive watchdog observer registers an inotify watch on every directory below the root,
+including node_modules, .git and other folders the traversal ignores, and stops working once the
+system limit (fs.inotify.max_user_watches) is reached. The backends here watch exactly the
+directories of the workspace tree, which already excludes ignored folders:
+
+- InotifyWatchBackend uses a single inotify instance with one non-recursive watch per directory, up
+  to a watch budget. Directories beyond the budget, or that cannot be watched because the system
+  limit is reached, are observed by polling instead.
+- PollingWatchBackend stats directories periodically and reports a directory whose modification
+  time changed, so the pipeline re-reads it. The interval adapts: it grows while nothing changes,
+  resets after a change and never drops below a multiple of the time a poll takes.
+- WatchdogWatchBackend keeps the recursive watchdog observer for platforms whose native API is
+  recursive anyway (macOS, Windows).
+
+All backends are driven with the relative paths of the directories to observe (see sync()) and
+report events through a thread-safe submit callable.
+"""
+
+import abc
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from autobyteus_server.file_explorer.watch_event_pipeline import WatchEvent, WatchEventKind
+
+logger = logging.getLogger(__name__)
+
+Submit = Callable[[WatchEvent], None]
+
+
+class WatchBackend(abc.ABC):
+    """
+    Observes a set of directories of a workspace.
+    """
+
+    name = "base"
+
+    def __init__(self, root_path: str, submit: Submit):
+        """
+        Initialize the backend.
+
+        Args:
+            root_path (str): The absolute root path of the workspace.
+            submit (Submit): Receives the raw events; called from the backend's own thread.
+        """
+        self.root_path = root_path
+        self.submit = submit
+
+    def _absolute(self, relative_path: str) -> str:
+        return os.path.join(self.root_path, relative_path) if relative_path else self.root_path
+
+    @abc.abstractmethod
+    def start(self, directories: List[str]) -> None:
+        """
+        Starts observing the given directories (relative paths, '' for the root, shallowest first).
+        """
+
+    @abc.abstractmethod
+    def sync(self, directories: List[str]) -> None:
+        """
+        Updates the observed directories after the tree changed.
+        """
+
+    @abc.abstractmethod
+    def stop(self) -> None:
+        """
+        Stops observing and releases all resources.
+        """
+
+    @abc.abstractmethod
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns the state and cost of the backend, for monitoring.
+        """
+
+
+class PollingWatchBackend(WatchBackend):
+    """
+    Detects changes by comparing directory modification times.
+
+    Only entries being added, removed or renamed change a directory's mtime, which is exactly what
+    matters for the tree. Changed directories are reported as DIRECTORY_CHANGED events.
+    """
+
+    name = "polling"
+
+    def __init__(self, root_path: str, submit: Submit, min_interval: float = 1.0, max_interval: float = 30.0,
+                 max_load: float = 0.1):
+        """
+        Initialize the PollingWatchBackend.
+
+        Args:
+            min_interval (float): Seconds between polls right after a change was detected.
+            max_interval (float): Upper bound for the interval while nothing changes.
+            max_load (float): Maximum fraction of time spent polling; the interval is at least the
+                duration of a poll divided by this.
+        """
+        super().__init__(root_path, submit)
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.max_load = max_load
+        self.interval = min_interval
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.poll_count = 0
+        self.total_poll_seconds = 0.0
+        self.last_poll_seconds = 0.0
+        self.changes_detected = 0
+
+    def _stat(self, relative_path: str) -> Optional[int]:
+        try:
+            return os.stat(self._absolute(relative_path)).st_mtime_ns
+        except OSError:
+            return None
+
+    def start(self, directories: List[str]) -> None:
+        self.sync(directories)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"watch-poller-{os.path.basename(self.root_path)}",
+                                        daemon=True)
+        self._thread.start()
+
+    def sync(self, directories: List[str]) -> None:
+        with self._lock:
+            current = self._mtimes
+            self._mtimes = {directory: current[directory] if directory in current else self._stat(directory)
+                            for directory in directories}
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def poll(self) -> List[str]:
+        """
+        Stats all observed directories once and reports the changed ones.
+
+        Returns:
+            List[str]: The relative paths of the directories that changed.
+        """
+        start_time = time.perf_counter()
+        with self._lock:
+            directories = list(self._mtimes.items())
+        changed = []
+        for directory, recorded_mtime in directories:
+            mtime = self._stat(directory)
+            if mtime != recorded_mtime:
+                changed.append(directory)
+                with self._lock:
+                    if directory in self._mtimes:
+                        self._mtimes[directory] = mtime
+        for directory in changed:
+            self.submit(WatchEvent(WatchEventKind.DIRECTORY_CHANGED, self._absolute(directory), True))
+
+        self.last_poll_seconds = time.perf_counter() - start_time
+        self.total_poll_seconds += self.last_poll_seconds
+        self.poll_count += 1
+        self.changes_detected += len(changed)
+        # Poll quickly while things change, back off while idle, and bound the CPU spent polling
+        self.interval = self.min_interval if changed else min(self.max_interval, self.interval * 1.5)
+        self.interval = max(self.interval, self.last_poll_seconds / self.max_load)
+        return changed
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error polling {self.root_path}: {e}")
+
+    @property
+    def directory_count(self) -> int:
+        return len(self._mtimes)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "polled_directories": self.directory_count,
+            "poll_count": self.poll_count,
+            "poll_interval_seconds": round(self.interval, 3),
+            "last_poll_seconds": round(self.last_poll_seconds, 6),
+            "total_poll_seconds": round(self.total_poll_seconds, 6),
+            "changes_detected": self.changes_detected,
+        }
+
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o0004000
+
+_WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+               | IN_MOVE_SELF | IN_ONLYDIR | IN_EXCL_UNLINK)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+
+
+def read_max_user_watches() -> Optional[int]:
+    """
+    Returns the system-wide inotify watch limit per user, if known.
+    """
+    try:
+        with open('/proc/sys/fs/inotify/max_user_watches') as limit_file:
+            return int(limit_file.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+class InotifyWatchBackend(WatchBackend):
+    """
+    Watches each directory with its own non-recursive inotify watch, up to a budget, and polls the rest.
+    """
+
+    name = "inotify"
+
+    def __init__(self, root_path: str, submit: Submit, watch_budget: int,
+                 poller: Optional[PollingWatchBackend] = None):
+        """
+        Initialize the InotifyWatchBackend.
+
+        Args:
+            watch_budget (int): Maximum number of inotify watches this workspace may use.
+            poller (Optional[PollingWatchBackend]): Observes the directories that get no watch.
+
+        Raises:
+            OSError: If inotify is not available.
+        """
+        super().__init__(root_path, submit)
+        if _libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        self.watch_budget = watch_budget
+        self.poller = poller or PollingWatchBackend(root_path, submit)
+        self._fd = -1
+        self._wd_by_path: Dict[str, int] = {}
+        self._path_by_wd: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._stop_read, self._stop_write = -1, -1
+        self._thread: Optional[threading.Thread] = None
+        self._system_limit_reached = False
+        self.event_count = 0
+        self.overflow_count = 0
+        self.failed_watch_count = 0
+
+    @staticmethod
+    def is_supported() -> bool:
+        return _libc is not None
+
+    def start(self, directories: List[str]) -> None:
+        fd = _libc.inotify_init1(IN_CLOEXEC | IN_NONBLOCK)
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+        self._fd = fd
+        self._stop_read, self._stop_write = os.pipe()
+        unwatched = self._sync_watches(directories)
+        self.poller.start(unwatched)
+        self._thread = threading.Thread(target=self._run, name=f"watch-inotify-{os.path.basename(self.root_path)}",
+                                        daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {len(self._wd_by_path)} directories of {self.root_path} with inotify, "
+                    f"polling {len(unwatched)}")
+
+    def sync(self, directories: List[str]) -> None:
+        if self._fd < 0:
+            return
+        self.poller.sync(self._sync_watches(directories))
+
+    def _sync_watches(self, directories: List[str]) -> List[str]:
+        """
+        Watches the first directories within the budget and returns the ones left for polling.
+        """
+        wanted = set(directories)
+        with self._lock:
+            # Remove first: a renamed directory keeps its watch descriptor, which must be re-added
+            for path in [path for path in self._wd_by_path if path not in wanted]:
+                wd = self._wd_by_path.pop(path)
+                self._path_by_wd.pop(wd, None)
+                _libc.inotify_rm_watch(self._fd, wd)
+
+            unwatched: List[str] = []
+            for directory in directories:
+                if directory in self._wd_by_path:
+                    continue
+                if len(self._wd_by_path) >= self.watch_budget or self._system_limit_reached:
+                    unwatched.append(directory)
+                    continue
+                wd = _libc.inotify_add_watch(self._fd, os.fsencode(self._absolute(directory)), _WATCH_MASK)
+                if wd < 0:
+                    error = ctypes.get_errno()
+                    if error == errno.ENOSPC:
+                        logger.warning(f"System inotify watch limit reached while watching {self.root_path}; "
+                                       f"polling the remaining directories")
+                        self._system_limit_reached = True
+                        unwatched.append(directory)
+                    elif error not in (errno.ENOENT, errno.ENOTDIR):
+                        self.failed_watch_count += 1
+                        unwatched.append(directory)
+                    continue
+                stale_path = self._path_by_wd.get(wd)
+                if stale_path is not None:
+                    self._wd_by_path.pop(stale_path, None)
+                self._wd_by_path[directory] = wd
+                self._path_by_wd[wd] = directory
+            return unwatched
+
+    def stop(self) -> None:
+        if self._stop_write >= 0:
+            os.write(self._stop_write, b'x')
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self.poller.stop()
+        with self._lock:
+            for fd in (self._fd, self._stop_read, self._stop_write):
+                if fd >= 0:
+                    os.close(fd)
+            self._fd = self._stop_read = self._stop_write = -1
+            self._wd_by_path.clear()
+            self._path_by_wd.clear()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                readable, _, _ = select.select([self._fd, self._stop_read], [], [])
+            except (OSError, ValueError):
+                return
+            if self._stop_read in readable:
+                return
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                logger.error(f"Error reading inotify events for {self.root_path}: {e}")
+                return
+            try:
+                self._dispatch(data)
+            except Exception as e:
+                logger.error(f"Error handling inotify events for {self.root_path}: {e}")
+
+    def _dispatch(self, data: bytes) -> None:
+        """
+        Converts a buffer of inotify events into WatchEvents, pairing moves by their cookie.
+        """
+        moved_from: Dict[int, WatchEvent] = {}
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += _EVENT_HEADER.size + length
+            self.event_count += 1
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost; the whole tree has to be reconciled
+                self.overflow_count += 1
+                logger.warning(f"inotify queue overflow for {self.root_path}, re-reading the workspace")
+                self.submit(WatchEvent(WatchEventKind.RESCAN, self.root_path, True))
+                continue
+            with self._lock:
+                directory = self._path_by_wd.get(wd)
+                if mask & IN_IGNORED:
+                    # The watch was removed, by inotify_rm_watch or because the directory is gone
+                    if directory is not None and self._wd_by_path.get(directory) == wd:
+                        del self._wd_by_path[directory]
+                    self._path_by_wd.pop(wd, None)
+                    continue
+            if directory is None or mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                continue  # Reported by the parent directory's watch
+
+            path = os.path.join(self._absolute(directory), os.fsdecode(raw_name))
+            is_directory = bool(mask & IN_ISDIR)
+            if mask & IN_CREATE:
+                self.submit(WatchEvent(WatchEventKind.CREATED, path, is_directory))
+            elif mask & IN_DELETE:
+                self.submit(WatchEvent(WatchEventKind.DELETED, path, is_directory))
+            elif mask & IN_CLOSE_WRITE:
+                self.submit(WatchEvent(WatchEventKind.MODIFIED, path, False))
+            elif mask & IN_MOVED_FROM:
+                moved_from[cookie] = WatchEvent(WatchEventKind.DELETED, path, is_directory)
+            elif mask & IN_MOVED_TO:
+                source = moved_from.pop(cookie, None)
+                if source is not None:
+                    self.submit(WatchEvent(WatchEventKind.MOVED, source.path, is_directory, path))
+                else:
+                    self.submit(WatchEvent(WatchEventKind.CREATED, path, is_directory))
+        # Moved out of the watched directories
+        for event in moved_from.values():
+            self.submit(event)
+
+    @property
+    def watch_count(self) -> int:
+        return len(self._wd_by_path)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = self.poller.get_metrics()
+        metrics.update({
+            "backend": self.name,
+            "watch_count": self.watch_count,
+            "watch_budget": self.watch_budget,
+            "system_watch_limit": read_max_user_watches(),
+            "system_limit_reached": self._system_limit_reached,
+            "failed_watches": self.failed_watch_count,
+            "event_count": self.event_count,
+            "overflow_count": self.overflow_count,
+        })
+        return metrics
+
+
+class WatchdogWatchBackend(WatchBackend):
+    """
+    A recursive watchdog observer on the workspace root, for platforms with recursive native APIs.
+    Events below ignored folders are filtered by the pipeline.
+    """
+
+    name = "watchdog"
+
+    def __init__(self, root_path: str, submit: Submit):
+        super().__init__(root_path, submit)
+        self.observer = None
+        self.event_count = 0
+
+    def _count_and_submit(self, event: WatchEvent) -> None:
+        self.event_count += 1
+        self.submit(event)
+
+    def start(self, directories: List[str]) -> None:
+        from watchdog.observers import Observer
+        from autobyteus_server.file_explorer.watchdog_handler import WatchdogHandler
+
+        self.observer = Observer()
+        self.observer.schedule(WatchdogHandler(self._count_and_submit), self.root_path, recursive=True)
+        self.observer.start()
+
+    def sync(self, directories: List[str]) -> None:
+        pass  # The observer is recursive
+
+    def stop(self) -> None:
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"backend": self.name, "event_count": self.event_count}
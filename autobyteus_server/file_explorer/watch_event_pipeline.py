@@ -0,0 +1,621 @@
+"""
+Applies filesystem watcher events to the in-memory workspace tree.
+
+Watchdog reports every single create, delete and move, which arrive in bursts when tools such
+as git checkout or npm install touch many files at once. The pipeline collects the events of a
+burst and applies them to the tree only (file contents are never touched), then publishes one
+coalesced FileSystemChangeEvent:
+
+- Events are debounced: a batch is flushed once no event arrived for the debounce interval, or at
+  the latest after the maximum delay, so long-running bursts still produce regular updates.
+- Changes are coalesced per node: a file created and deleted within a batch produces nothing, a
+  node moved several times produces one move.
+- A directory that receives more events than the rescan threshold within one batch is re-read
+  and diffed against the tree as a whole instead of applying its events one by one. Changes to a
+  .gitignore file also re-read the directory, since they change which entries are visible.
+
+Events are submitted on the event loop thread; the watchdog handler hands them over with
+loop.call_soon_threadsafe(). Applying a batch reads directories, so with a loop it runs on the
+bounded I/O executor under the file explorer's tree lock, one batch at a time, and the change event
+is published back on the loop. Without a loop (e.g. in tests), flush() applies a batch on the
+calling thread.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from autobyteus_server.file_explorer.compact_tree import CompactTreeNode
+from autobyteus_server.file_explorer.io_executor import run_io
+from autobyteus_server.file_explorer.file_system_changes import (
+    AddChange, DeleteChange, FileSystemChange, FileSystemChangeEvent, MoveChange, RenameChange
+)
+from autobyteus_server.file_explorer.traversal_engine import create_directory_traversal
+from autobyteus_server.file_explorer.traversal_ignore_strategy.ignore_matcher import IgnoreMatcher
+from autobyteus_server.file_explorer.tree_node import TreeNode
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+logger = logging.getLogger(__name__)
+
+
+class WatchEventKind(str, Enum):
+    CREATED = "created"
+    DELETED = "deleted"
+    MOVED = "moved"
+    MODIFIED = "modified"
+    # Emitted by backends that cannot tell what changed: re-read one directory, or a whole subtree
+    DIRECTORY_CHANGED = "directory_changed"
+    RESCAN = "rescan"
+
+
+class WatchEvent(NamedTuple):
+    """
+    A raw filesystem event as reported by the watcher, with absolute paths.
+    """
+    kind: WatchEventKind
+    path: str
+    is_directory: bool = False
+    dest_path: Optional[str] = None
+
+
+@dataclass
+class WatchSettings:
+    """
+    Tuning of the watcher pipeline.
+
+    Attributes:
+        debounce_seconds: Quiet period after the last event before a batch is applied.
+        max_delay_seconds: Maximum time an event waits before its batch is applied.
+        rescan_threshold: Number of events for one directory within a batch above which the
+            directory is re-read instead of applying its events individually.
+        backend: The watch backend: "auto", "inotify", "polling" or "watchdog" (see watch_backends).
+        watch_budget: Maximum number of inotify watches per workspace; further directories are polled.
+        poll_min_interval: Seconds between polls right after a change was detected.
+        poll_max_interval: Upper bound of the polling interval while nothing changes.
+    """
+    debounce_seconds: float = 0.2
+    max_delay_seconds: float = 2.0
+    rescan_threshold: int = 200
+    backend: str = "auto"
+    watch_budget: int = 8192
+    poll_min_interval: float = 1.0
+    poll_max_interval: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> 'WatchSettings':
+        """
+        Reads the settings from the FILE_EXPLORER_WATCH_* environment variables (DEBOUNCE_MS,
+        MAX_DELAY_MS, RESCAN_THRESHOLD, BACKEND, BUDGET, POLL_MIN_MS and POLL_MAX_MS), using the
+        defaults for unset or invalid values.
+        """
+        defaults = cls()
+
+        def read(name: str, default: float) -> float:
+            value = os.getenv(name)
+            if not value:
+                return default
+            try:
+                return float(value)
+            except ValueError:
+                logger.warning(f"Invalid value '{value}' for {name}, using {default}")
+                return default
+
+        return cls(debounce_seconds=read('FILE_EXPLORER_WATCH_DEBOUNCE_MS', defaults.debounce_seconds * 1000) / 1000,
+                   max_delay_seconds=read('FILE_EXPLORER_WATCH_MAX_DELAY_MS', defaults.max_delay_seconds * 1000) / 1000,
+                   rescan_threshold=int(read('FILE_EXPLORER_WATCH_RESCAN_THRESHOLD', defaults.rescan_threshold)),
+                   backend=os.getenv('FILE_EXPLORER_WATCH_BACKEND', defaults.backend).strip().lower(),
+                   watch_budget=int(read('FILE_EXPLORER_WATCH_BUDGET', defaults.watch_budget)),
+                   poll_min_interval=read('FILE_EXPLORER_WATCH_POLL_MIN_MS', defaults.poll_min_interval * 1000) / 1000,
+                   poll_max_interval=read('FILE_EXPLORER_WATCH_POLL_MAX_MS', defaults.poll_max_interval * 1000) / 1000)
+
+
+def _is_within(path: str, directory: str) -> bool:
+    """Returns True if the relative path is directory itself or below it ('' is the root)."""
+    return directory == '' or path == directory or path.startswith(directory + os.sep)
+
+
+def _parent_path(relative_path: str) -> str:
+    return os.path.dirname(relative_path)
+
+
+class WatchEventPipeline:
+    """
+    Debounces watcher events and applies them to the tree of a FileExplorer.
+    """
+
+    def __init__(self, file_explorer: 'FileExplorer', callback: Callable[[FileSystemChangeEvent], None],
+                 settings: Optional[WatchSettings] = None, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Initialize the WatchEventPipeline.
+
+        Args:
+            file_explorer (FileExplorer): The file explorer whose tree is kept up to date.
+            callback (Callable[[FileSystemChangeEvent], None]): Called with the coalesced event of every
+                batch that changed the tree.
+            settings (Optional[WatchSettings]): The pipeline settings. Defaults to WatchSettings.from_env().
+            loop (Optional[asyncio.AbstractEventLoop]): The loop used to schedule flushes. Without a loop,
+                batches are only applied when flush() is called.
+        """
+        self.file_explorer = file_explorer
+        self.callback = callback
+        self.settings = settings or WatchSettings.from_env()
+        self.loop = loop
+        self.traversal = create_directory_traversal(file_explorer.traversal_engine,
+                                                    file_ignore_strategies=file_explorer.ignore_strategies)
+        self._pending: List[WatchEvent] = []
+        self._batch_started: Optional[float] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._matchers: Dict[str, IgnoreMatcher] = {}
+        # Batches are applied one at a time, in the order their events arrived
+        self._flush_lock = asyncio.Lock()
+        # Running background flushes, referenced until they finish
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def submit(self, event: WatchEvent) -> None:
+        """
+        Adds an event to the current batch and (re)schedules the flush of the batch.
+        """
+        self._pending.append(event)
+        if self.loop is None:
+            return
+        now = self.loop.time()
+        if self._batch_started is None:
+            self._batch_started = now
+        if self._timer is not None:
+            self._timer.cancel()
+        deadline = self._batch_started + self.settings.max_delay_seconds
+        delay = max(0.0, min(self.settings.debounce_seconds, deadline - now))
+        self._timer = self.loop.call_later(delay, self._start_flush)
+
+    def cancel(self) -> None:
+        """
+        Drops pending events and any scheduled flush.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._batch_started = None
+        self._pending = []
+
+    def flush(self) -> Optional[FileSystemChangeEvent]:
+        """
+        Applies the pending events to the tree on the calling thread and publishes the resulting
+        change event. Waits for a file operation holding the tree lock.
+
+        Returns:
+            Optional[FileSystemChangeEvent]: The published event, or None if the tree did not change.
+        """
+        events = self._take_pending()
+        if not events:
+            return None
+        return self._publish(self._apply_batch(events))
+
+    async def flush_async(self) -> Optional[FileSystemChangeEvent]:
+        """
+        Applies the pending events to the tree on the I/O executor and publishes the resulting
+        change event on the event loop. Waits for the batch being applied, if any.
+
+        Returns:
+            Optional[FileSystemChangeEvent]: The published event, or None if the tree did not change.
+        """
+        async with self._flush_lock:
+            events = self._take_pending()
+            if not events:
+                return None
+            return self._publish(await run_io(self._apply_batch, events))
+
+    def _start_flush(self) -> None:
+        task = self.loop.create_task(self.flush_async())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def _take_pending(self) -> List[WatchEvent]:
+        events = self._pending
+        self.cancel()
+        return events
+
+    def _apply_batch(self, events: List[WatchEvent]) -> List[FileSystemChange]:
+        """
+        Applies a batch of events to the tree under the tree lock and returns the coalesced changes.
+        """
+        with self.file_explorer.tree_lock:
+            if self.file_explorer.root_node is None:
+                return []
+            self._matchers = {}
+            try:
+                changes = self.apply(events)
+            finally:
+                self._matchers = {}
+        return coalesce_changes(changes, self._is_live)
+
+    def _publish(self, changes: List[FileSystemChange]) -> Optional[FileSystemChangeEvent]:
+        if not changes:
+            return None
+        change_event = FileSystemChangeEvent(changes=changes)
+        try:
+            self.callback(change_event)
+        except Exception as e:
+            logger.error(f"Error publishing filesystem change event: {e}")
+        return change_event
+
+    def apply(self, events: List[WatchEvent]) -> List[FileSystemChange]:
+        """
+        Applies a batch of events to the tree without coalescing the resulting changes.
+        """
+        self._invalidate_contents(events)
+        relative_events = [event for event in (self._to_relative(event) for event in events) if event is not None]
+        rescans = self._plan_rescans(relative_events)
+        changed_directories = {path for kind, path, _, _ in relative_events
+                                if kind == WatchEventKind.DIRECTORY_CHANGED
+                                and not any(_is_within(path, directory) for directory in rescans)}
+        changes: List[FileSystemChange] = []
+
+        for kind, path, is_directory, dest_path in relative_events:
+            src_rescanned = any(_is_within(path, directory) for directory in rescans)
+            try:
+                if kind == WatchEventKind.MOVED:
+                    dest_rescanned = any(_is_within(dest_path, directory) for directory in rescans)
+                    if src_rescanned and dest_rescanned:
+                        continue
+                    if src_rescanned:
+                        self._apply_created(dest_path, changes)
+                    elif dest_rescanned:
+                        self._apply_deleted(path, changes, force=True)
+                    else:
+                        self._apply_moved(path, dest_path, changes)
+                elif src_rescanned or kind in (WatchEventKind.RESCAN, WatchEventKind.DIRECTORY_CHANGED):
+                    continue
+                elif kind == WatchEventKind.CREATED:
+                    self._apply_created(path, changes)
+                elif kind == WatchEventKind.DELETED:
+                    self._apply_deleted(path, changes)
+                elif kind == WatchEventKind.MODIFIED and not is_directory:
+                    if self.file_explorer.find_node(path) is None:
+                        self._apply_created(path, changes)
+            except Exception as e:
+                logger.error(f"Error applying {kind.value} event for {path}: {e}")
+
+        for directory in sorted(rescans):
+            try:
+                self.rescan(directory, changes)
+            except Exception as e:
+                logger.error(f"Error re-reading {directory or '.'}: {e}")
+        for directory in sorted(changed_directories):
+            try:
+                self.rescan(directory, changes, recursive=False)
+            except Exception as e:
+                logger.error(f"Error re-reading {directory or '.'}: {e}")
+        return changes
+
+    def _invalidate_contents(self, events: List[WatchEvent]) -> None:
+        # Also for ignored files, which can still be read through the file explorer
+        content_cache = self.file_explorer.content_cache
+        for event in events:
+            if event.kind in (WatchEventKind.RESCAN, WatchEventKind.DIRECTORY_CHANGED):
+                continue
+            recursive = event.is_directory or event.kind != WatchEventKind.MODIFIED
+            content_cache.invalidate(event.path, recursive=recursive)
+            if event.dest_path is not None:
+                content_cache.invalidate(event.dest_path, recursive=recursive)
+
+    def _to_relative(self, event: WatchEvent) -> Optional[Tuple[WatchEventKind, str, bool, Optional[str]]]:
+        root_path = self.file_explorer.workspace_root_path
+
+        def relative(path: Optional[str]) -> Optional[str]:
+            if path is None:
+                return None
+            relative_path = os.path.relpath(os.path.normpath(path), root_path)
+            if relative_path == os.curdir:
+                return ''
+            if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+                return None
+            return relative_path
+
+        path = relative(event.path)
+        dest_path = relative(event.dest_path)
+        if event.kind == WatchEventKind.MOVED:
+            if path is None and dest_path is None:
+                return None
+            if path is None:
+                return WatchEventKind.CREATED, dest_path, event.is_directory, None
+            if dest_path is None:
+                return WatchEventKind.DELETED, path, event.is_directory, None
+        elif path is None:
+            return None
+        return event.kind, path, event.is_directory, dest_path
+
+    def _plan_rescans(self, events: List[Tuple[WatchEventKind, str, bool, Optional[str]]]) -> Set[str]:
+        """
+        Returns the directories to re-read: those with more events than the rescan threshold and
+        those whose .gitignore changed. Directories below another rescanned directory are dropped.
+        """
+        counts: Dict[str, int] = {}
+        rescans: Set[str] = set()
+        for kind, path, _, dest_path in events:
+            if kind == WatchEventKind.RESCAN:
+                rescans.add(path)
+                continue
+            if kind == WatchEventKind.DIRECTORY_CHANGED:
+                continue
+            for event_path in (path, dest_path):
+                if not event_path:
+                    continue
+                directory = _parent_path(event_path)
+                counts[directory] = counts.get(directory, 0) + 1
+                if os.path.basename(event_path) == '.gitignore':
+                    rescans.add(directory)
+        for directory, count in counts.items():
+            if count > self.settings.rescan_threshold:
+                logger.info(f"Re-reading {directory or '.'} after {count} events in one batch")
+                rescans.add(directory)
+        return {directory for directory in rescans
+                if not any(other != directory and _is_within(directory, other) for other in rescans)}
+
+    # Ignore rules
+
+    def _matcher_for(self, directory: str) -> Optional[IgnoreMatcher]:
+        """
+        Returns the ignore matcher for the entries of a directory, including its own .gitignore, or
+        None if the directory itself is ignored.
+        """
+        if directory in self._matchers:
+            return self._matchers[directory]
+        root_path = self.file_explorer.workspace_root_path
+        absolute_directory = os.path.join(root_path, directory) if directory else root_path
+        if directory == '':
+            matcher = self.traversal.create_ignore_matcher(root_path).with_gitignore(root_path)
+        else:
+            parent_matcher = self._matcher_for(_parent_path(directory))
+            name = os.path.basename(directory)
+            if parent_matcher is None or parent_matcher.is_ignored(name, absolute_directory, is_dir=True):
+                matcher = None
+            else:
+                matcher = parent_matcher.descend(name).with_gitignore(absolute_directory)
+        self._matchers[directory] = matcher
+        return matcher
+
+    def _is_ignored(self, relative_path: str, is_directory: bool) -> bool:
+        matcher = self._matcher_for(_parent_path(relative_path))
+        if matcher is None:
+            return True
+        absolute_path = os.path.join(self.file_explorer.workspace_root_path, relative_path)
+        return matcher.is_ignored(os.path.basename(relative_path), absolute_path, is_dir=is_directory)
+
+    # Tree updates
+
+    def _is_live(self, node: TreeNode) -> bool:
+        return is_node_live(node, self.file_explorer.root_node)
+
+    def _ensure_directory_nodes(self, relative_dir_path: str, changes: List[FileSystemChange]) -> TreeNode:
+        """
+        Returns the node of a folder, creating nodes for folders missing from the tree.
+        """
+        current_node = self.file_explorer.root_node
+        if relative_dir_path == '':
+            return current_node
+        existing_node = self.file_explorer.find_node(relative_dir_path)
+        if existing_node is not None and not existing_node.is_file:
+            return existing_node
+
+        path_so_far = ''
+        for part in relative_dir_path.split(os.sep):
+            path_so_far = os.path.join(path_so_far, part) if path_so_far else part
+            child = self.file_explorer.find_node(path_so_far)
+            if child is not None and child.is_file:
+                current_node.remove_child(child)
+                changes.append(DeleteChange(node_id=child.id, parent_id=current_node.id))
+                child = None
+            if child is None:
+                child = current_node.create_child(part, is_file=False)
+                changes.append(AddChange(node=child, parent_id=current_node.id))
+            current_node = child
+        return current_node
+
+    def _apply_created(self, relative_path: str, changes: List[FileSystemChange]) -> None:
+        if relative_path == '':
+            return
+        absolute_path = os.path.join(self.file_explorer.workspace_root_path, relative_path)
+        if not os.path.lexists(absolute_path):
+            return  # Already gone again, the deletion event follows
+        is_file = not os.path.isdir(absolute_path)
+        if self._is_ignored(relative_path, not is_file):
+            return
+
+        existing_node = self.file_explorer.find_node(relative_path)
+        if existing_node is not None:
+            if existing_node.is_file == is_file:
+                return
+            # Replaced by an entry of the other type
+            existing_parent = existing_node.parent
+            existing_parent.remove_child(existing_node)
+            changes.append(DeleteChange(node_id=existing_node.id, parent_id=existing_parent.id))
+
+        parent_node = self._ensure_directory_nodes(_parent_path(relative_path), changes)
+        new_node = parent_node.create_child(os.path.basename(relative_path), is_file=is_file)
+        if not is_file:
+            # Entries created before the watch on the new directory was set up produce no events
+            matcher = self._matcher_for(relative_path)
+            if matcher is not None:
+                self.traversal.populate(new_node, absolute_path, matcher)
+        changes.append(AddChange(node=new_node, parent_id=parent_node.id))
+
+    def _apply_deleted(self, relative_path: str, changes: List[FileSystemChange], force: bool = False) -> None:
+        if relative_path == '':
+            return
+        node = self.file_explorer.find_node(relative_path)
+        if node is None or node.parent is None:
+            return
+        if not force and os.path.lexists(os.path.join(self.file_explorer.workspace_root_path, relative_path)):
+            return  # Re-created since, the creation event decides what the entry is now
+        parent_node = node.parent
+        parent_node.remove_child(node)
+        changes.append(DeleteChange(node_id=node.id, parent_id=parent_node.id))
+
+    def _apply_moved(self, source_path: str, dest_path: str, changes: List[FileSystemChange]) -> None:
+        root_path = self.file_explorer.workspace_root_path
+        node = self.file_explorer.find_node(source_path) if source_path else None
+        absolute_dest = os.path.join(root_path, dest_path)
+        dest_exists = os.path.lexists(absolute_dest)
+        dest_is_dir = os.path.isdir(absolute_dest)
+
+        if node is None or node.parent is None:
+            self._apply_created(dest_path, changes)
+            return
+        if not dest_exists or self._is_ignored(dest_path, dest_is_dir):
+            self._apply_deleted(source_path, changes, force=True)
+            return
+
+        dest_node = self.file_explorer.find_node(dest_path)
+        if dest_node is not None and dest_node is not node:
+            # The destination is already in the tree, e.g. a file replaced by an atomic save
+            self._apply_deleted(source_path, changes, force=True)
+            self._apply_created(dest_path, changes)
+            return
+
+        old_parent = node.parent
+        new_parent = self._ensure_directory_nodes(_parent_path(dest_path), changes)
+        new_name = os.path.basename(dest_path)
+        if new_parent is old_parent or new_parent.id == old_parent.id:
+            node.name = new_name
+            changes.append(RenameChange(node=node, parent_id=old_parent.id))
+        else:
+            old_parent.remove_child(node)
+            node.name = new_name
+            new_parent.add_child(node)
+            changes.append(MoveChange(node=node, old_parent_id=old_parent.id, new_parent_id=new_parent.id))
+
+    def rescan(self, relative_dir_path: str, changes: List[FileSystemChange], recursive: bool = True) -> None:
+        """
+        Re-reads a directory subtree and reconciles the tree with it, recording the differences.
+        Sub-directories that still exist keep their nodes (and ids).
+
+        Args:
+            relative_dir_path (str): The directory to re-read, '' for the root.
+            changes (List[FileSystemChange]): Receives the changes made to the tree.
+            recursive (bool): If False, only the entries of the directory itself are reconciled;
+                new sub-directories are still read completely.
+        """
+        root_path = self.file_explorer.workspace_root_path
+        absolute_path = os.path.join(root_path, relative_dir_path) if relative_dir_path else root_path
+        node = self.file_explorer.find_node(relative_dir_path)
+        if node is None:
+            self._apply_created(relative_dir_path, changes)
+            return
+        if not os.path.isdir(absolute_path) or self._matcher_for(relative_dir_path) is None:
+            if os.path.lexists(absolute_path):
+                self._apply_deleted(relative_dir_path, changes, force=True)
+                self._apply_created(relative_dir_path, changes)
+            else:
+                self._apply_deleted(relative_dir_path, changes)
+            return
+
+        stack: List[Tuple[TreeNode, str, IgnoreMatcher]] = [
+            (node, absolute_path, self._matcher_for(relative_dir_path))
+        ]
+        while stack:
+            current_node, current_path, current_matcher = stack.pop()
+            listing = self.traversal.list_directory(current_path, current_matcher)
+            if listing is None:
+                continue
+            existing = {child.name: child for child in current_node.children}
+            for name, child_path, is_file in listing.entries:
+                child = existing.pop(name, None)
+                if child is not None and child.is_file == is_file:
+                    if not is_file and recursive:
+                        stack.append((child, child_path, listing.ignore_matcher.descend(name)))
+                    continue
+                if child is not None:
+                    current_node.remove_child(child)
+                    changes.append(DeleteChange(node_id=child.id, parent_id=current_node.id))
+                new_node = current_node.create_child(name, is_file=is_file)
+                if not is_file:
+                    self.traversal.populate(new_node, child_path, listing.ignore_matcher.descend(name))
+                changes.append(AddChange(node=new_node, parent_id=current_node.id))
+            for stale_child in existing.values():
+                current_node.remove_child(stale_child)
+                changes.append(DeleteChange(node_id=stale_child.id, parent_id=current_node.id))
+
+
+def is_node_live(node: TreeNode, root_node: Optional[TreeNode]) -> bool:
+    """
+    Returns True if node is still part of the tree under root_node, i.e. it was not removed.
+    """
+    if isinstance(node, CompactTreeNode):
+        return node.store.is_attached(node.index)
+    while node.parent is not None:
+        node = node.parent
+    return node is root_node
+
+
+def coalesce_changes(changes: List[FileSystemChange],
+                     is_live: Callable[[TreeNode], bool]) -> List[FileSystemChange]:
+    """
+    Merges the changes of one batch so every node appears at most once with its net effect.
+
+    Args:
+        changes (List[FileSystemChange]): The changes in the order they were applied.
+        is_live (Callable[[TreeNode], bool]): Whether a node is still part of the tree.
+
+    Returns:
+        List[FileSystemChange]: The coalesced changes, in order of first appearance.
+    """
+    result: List[Optional[FileSystemChange]] = []
+    added: Dict[str, int] = {}
+    moved: Dict[str, Tuple[int, str]] = {}  # node id -> (position, original parent id)
+
+    for change in changes:
+        if isinstance(change, AddChange):
+            added[change.node.id] = len(result)
+            result.append(change)
+        elif isinstance(change, (RenameChange, MoveChange)):
+            node_id = change.node.id
+            old_parent_id = change.parent_id if isinstance(change, RenameChange) else change.old_parent_id
+            new_parent_id = change.parent_id if isinstance(change, RenameChange) else change.new_parent_id
+            if node_id in added:
+                result[added[node_id]].parent_id = new_parent_id
+            elif node_id in moved:
+                position, original_parent_id = moved[node_id]
+                result[position] = _relocation(change.node, original_parent_id, new_parent_id)
+            else:
+                moved[node_id] = (len(result), old_parent_id)
+                result.append(change)
+        elif isinstance(change, DeleteChange):
+            node_id = change.node_id
+            if node_id in added:
+                result[added.pop(node_id)] = None
+                continue
+            if node_id in moved:
+                position, original_parent_id = moved.pop(node_id)
+                result[position] = None
+                change = DeleteChange(node_id=node_id, parent_id=original_parent_id)
+            result.append(change)
+        else:
+            result.append(change)
+
+    coalesced: List[FileSystemChange] = []
+    for change in result:
+        if change is None:
+            continue
+        if isinstance(change, (AddChange, RenameChange, MoveChange)) and not is_live(change.node):
+            # Removed together with an ancestor later in the batch
+            if isinstance(change, AddChange):
+                continue
+            original_parent_id = change.parent_id if isinstance(change, RenameChange) else change.old_parent_id
+            change = DeleteChange(node_id=change.node.id, parent_id=original_parent_id)
+        coalesced.append(change)
+    return coalesced
+
+
+def _relocation(node: TreeNode, old_parent_id: str, new_parent_id: str) -> FileSystemChange:
+    if old_parent_id == new_parent_id:
+        return RenameChange(node=node, parent_id=new_parent_id)
+    return MoveChange(node=node, old_parent_id=old_parent_id, new_parent_id=new_parent_id)
@@ -1,136 +1,65 @@
 import logging
 import os
-from typing import Callable, TYPE_CHECKING, List
+from typing import Callable
 
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
-if TYPE_CHECKING:
-    from autobyteus_server.file_explorer.file_explorer import FileExplorer
-
-from autobyteus_server.file_explorer.operations.move_file_operation import MoveFileOperation
-from autobyteus_server.file_explorer.operations.remove_file_operation import RemoveFileOperation
-from autobyteus_server.file_explorer.operations.write_file_operation import WriteFileOperation
-from autobyteus_server.file_explorer.file_system_changes import FileSystemChangeEvent
-from autobyteus_server.file_explorer.traversal_ignore_strategy.traversal_ignore_strategy import TraversalIgnoreStrategy
-from autobyteus_server.file_explorer.traversal_ignore_strategy.git_ignore_strategy import GitIgnoreStrategy
+from autobyteus_server.file_explorer.watch_event_pipeline import WatchEvent, WatchEventKind
 
 logger = logging.getLogger(__name__)
 
+_GIT_DIR_PART = os.sep + '.git' + os.sep
+
+
 class WatchdogHandler(FileSystemEventHandler):
     """
-    Handler for filesystem events to convert them into FileSystemChangeEvents,
-    leveraging existing file operations and applying ignore strategies.
+    Handler for filesystem events that forwards them as WatchEvents to the watcher pipeline.
+
+    The handler runs on the watchdog observer thread, so it only converts events; ignore rules are
+    applied and the tree is updated by the WatchEventPipeline on the event loop thread.
     """
 
-    def __init__(self, file_explorer: 'FileExplorer', callback: Callable[[FileSystemChangeEvent], None], 
-                 ignore_strategies: List[TraversalIgnoreStrategy]):
+    def __init__(self, submit: Callable[[WatchEvent], None]):
         """
-        Initialize the handler with a FileExplorer instance, callback, and ignore strategies.
+        Initialize the handler.
 
         Args:
-            file_explorer (FileExplorer): The FileExplorer instance managing the workspace.
-            callback (Callable): Function to call with FileSystemChangeEvent.
-            ignore_strategies (List[TraversalIgnoreStrategy]): Strategies to filter events.
+            submit (Callable[[WatchEvent], None]): Thread-safe function receiving every event.
         """
         super().__init__()
-        self.file_explorer = file_explorer
-        self.callback = callback
-        self.ignore_strategies = ignore_strategies
-
-    def _should_ignore(self, path: str) -> bool:
-        """
-        Determine if a path should be ignored based on strategies and dynamic .gitignore files.
-
-        Args:
-            path (str): The absolute path to check.
-
-        Returns:
-            bool: True if the path should be ignored, False otherwise.
-        """
-        # Check base strategies
-        if any(strategy.should_ignore(path) for strategy in self.ignore_strategies):
-            logger.debug(f"Ignoring path {path} due to base ignore strategy")
-            return True
+        self.submit = submit
 
-        # Check for local .gitignore in the parent directory
-        parent_dir = os.path.dirname(path)
-        gitignore_path = os.path.join(parent_dir, '.gitignore')
-        if os.path.isfile(gitignore_path):
-            local_git_strategy = GitIgnoreStrategy(root_path=parent_dir)
-            if local_git_strategy.should_ignore(path):
-                logger.debug(f"Ignoring path {path} due to local .gitignore in {parent_dir}")
-                return True
-
-        return False
+    @staticmethod
+    def _is_git_internal(path: str) -> bool:
+        # .git is always ignored; dropping its (very frequent) events early keeps batches small
+        return _GIT_DIR_PART in path or path.endswith(os.sep + '.git')
 
     def on_created(self, event: FileSystemEvent) -> None:
         """
-        Handle file/folder creation events by writing an empty file, if not ignored.
+        Forwards file/folder creation events; the pipeline adds the node without touching the file.
         """
-        if self._should_ignore(event.src_path):
-            logger.info(f"Skipping creation event for ignored path: {event.src_path}")
-            return
-
-        logger.info(f"File created: {event.src_path}")
-        relative_path = os.path.relpath(event.src_path, self.file_explorer.workspace_root_path)
-        try:
-            change_event = self.file_explorer.write_file_content(relative_path, "")
-            self.callback(change_event)
-        except Exception as e:
-            logger.error(f"Error handling creation event for {relative_path}: {e}")
+        if not self._is_git_internal(event.src_path):
+            self.submit(WatchEvent(WatchEventKind.CREATED, event.src_path, event.is_directory))
 
     def on_deleted(self, event: FileSystemEvent) -> None:
         """
-        Handle file/folder deletion events using RemoveFileOperation, if not ignored.
+        Forwards file/folder deletion events.
         """
-        if self._should_ignore(event.src_path):
-            logger.info(f"Skipping deletion event for ignored path: {event.src_path}")
-            return
-
-        logger.info(f"File deleted: {event.src_path}")
-        relative_path = os.path.relpath(event.src_path, self.file_explorer.workspace_root_path)
-        try:
-            operation = RemoveFileOperation(self.file_explorer, relative_path)
-            change_event = operation.execute()
-            self.callback(change_event)
-        except Exception as e:
-            logger.error(f"Error handling deletion event for {relative_path}: {e}")
+        if not self._is_git_internal(event.src_path):
+            self.submit(WatchEvent(WatchEventKind.DELETED, event.src_path, event.is_directory))
 
     def on_moved(self, event: FileSystemEvent) -> None:
         """
-        Handle file/folder move or rename events using MoveFileOperation, if not ignored.
+        Forwards file/folder move or rename events.
         """
-        if self._should_ignore(event.src_path) or self._should_ignore(event.dest_path):
-            logger.info(f"Skipping move event for ignored path: {event.src_path} -> {event.dest_path}")
+        if self._is_git_internal(event.src_path) and self._is_git_internal(event.dest_path):
             return
-
-        logger.info(f"File moved from {event.src_path} to {event.dest_path}")
-        src_relative = os.path.relpath(event.src_path, self.file_explorer.workspace_root_path)
-        dest_relative = os.path.relpath(event.dest_path, self.file_explorer.workspace_root_path)
-        try:
-            operation = MoveFileOperation(self.file_explorer, src_relative, dest_relative)
-            change_event = operation.execute()
-            self.callback(change_event)
-        except Exception as e:
-            logger.error(f"Error handling move/rename event from {src_relative} to {dest_relative}: {e}")
+        self.submit(WatchEvent(WatchEventKind.MOVED, event.src_path, event.is_directory, event.dest_path))
 
     def on_modified(self, event: FileSystemEvent) -> None:
         """
-        Handle file modification events using WriteFileOperation, if not ignored.
+        Forwards file modification events. Content changes do not affect the tree; the pipeline
+        only uses them to catch creations it missed.
         """
-        if event.is_directory:
-            return  # Ignore directory modifications
-
-        if self._should_ignore(event.src_path):
-            logger.info(f"Skipping modification event for ignored path: {event.src_path}")
-            return
-
-        logger.info(f"File modified: {event.src_path}")
-        relative_path = os.path.relpath(event.src_path, self.file_explorer.workspace_root_path)
-        try:
-            content = self.file_explorer.read_file_content(relative_path)
-            operation = WriteFileOperation(self.file_explorer, relative_path, content)
-            change_event = operation.execute()
-            self.callback(change_event)
-        except Exception as e:
-            logger.error(f"Error handling modification event for {relative_path}: {e}")
+        if not event.is_directory and not self._is_git_internal(event.src_path):
+            self.submit(WatchEvent(WatchEventKind.MODIFIED, event.src_path, False))
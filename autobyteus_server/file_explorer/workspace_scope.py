@@ -0,0 +1,167 @@
+"""
+The part of a workspace that is loaded, for monorepos too large to load completely.
+
+A sparse workspace only holds the files matched by its include globs (all files if there are
+none), minus those matched by its exclude globs, down to max_depth levels below the root and at
+most max_files files. Globs use .gitignore syntax relative to the workspace root: 'services/api'
+covers that folder and everything below it, 'packages/*/src/**/*.ts' only matching files, and a
+pattern without a slash, such as 'node_modules', matches at any depth.
+
+The scope is applied by ScopeIgnoreStrategy while the tree is read, so everything built from the
+tree (the watcher, the file finder, the code and search indexes, content search) follows it. When
+the scope of a loaded workspace changes, ScopeChange tells which parts of the tree must be read
+again.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+_WILDCARD_CHARACTERS = set('*?[')
+
+
+def split_pattern(pattern: str) -> Tuple[bool, List[str]]:
+    """
+    Splits a glob into its path components.
+
+    Returns:
+        Tuple[bool, List[str]]: Whether the pattern is anchored to the workspace root (it contains a
+            slash other than a trailing one) and its components.
+    """
+    stripped = pattern.rstrip('/')
+    anchored = '/' in stripped
+    return anchored, [part for part in stripped.lstrip('/').split('/') if part]
+
+
+def _literal_prefix(pattern: str) -> Tuple[str, bool]:
+    """
+    Returns the folder below which a pattern can match, and whether the pattern is that path itself.
+    """
+    anchored, parts = split_pattern(pattern)
+    if not anchored:
+        return '', False
+    literal: List[str] = []
+    for part in parts:
+        if part == '**' or _WILDCARD_CHARACTERS & set(part):
+            return os.path.join(*literal) if literal else '', False
+        literal.append(part)
+    return os.path.join(*literal), True
+
+
+def _ancestors(path: str) -> List[str]:
+    ancestors = ['']
+    parent = os.path.dirname(path)
+    while parent:
+        ancestors.append(parent)
+        parent = os.path.dirname(parent)
+    return ancestors
+
+
+@dataclass(frozen=True)
+class WorkspaceScope:
+    """
+    The include and exclude globs and the limits of a sparse workspace. The default scope loads everything.
+    """
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+    max_depth: Optional[int] = None
+    max_files: Optional[int] = None
+
+    def __post_init__(self):
+        # Frozen, so normalized values are set through object.__setattr__
+        object.__setattr__(self, 'include', self._normalize_patterns(self.include))
+        object.__setattr__(self, 'exclude', self._normalize_patterns(self.exclude))
+        if self.max_depth is not None and self.max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+        if self.max_files is not None and self.max_files < 1:
+            raise ValueError("max_files must be at least 1")
+
+    @staticmethod
+    def _normalize_patterns(patterns: Iterable[str]) -> Tuple[str, ...]:
+        normalized = []
+        for pattern in patterns or ():
+            pattern = pattern.strip().replace('\\', '/')
+            while pattern.startswith('./'):
+                pattern = pattern[2:]
+            if pattern and pattern not in normalized:
+                normalized.append(pattern)
+        return tuple(normalized)
+
+    @property
+    def is_sparse(self) -> bool:
+        return bool(self.include or self.exclude or self.max_depth or self.max_files)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "include": list(self.include),
+            "exclude": list(self.exclude),
+            "max_depth": self.max_depth,
+            "max_files": self.max_files,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'WorkspaceScope':
+        """
+        Creates a scope from the dictionary returned by to_dict(), e.g. from the workspace settings.
+        None or an empty dictionary is the default scope.
+        """
+        data = data or {}
+        return cls(
+            include=tuple(data.get("include") or ()),
+            exclude=tuple(data.get("exclude") or ()),
+            max_depth=data.get("max_depth"),
+            max_files=data.get("max_files"),
+        )
+
+    def changes_from(self, previous: 'WorkspaceScope') -> 'ScopeChange':
+        """
+        Works out which parts of a tree read with the previous scope must be read again for this one.
+
+        Args:
+            previous (WorkspaceScope): The scope the tree was read with.
+
+        Returns:
+            ScopeChange: The folders to re-read.
+        """
+        if self == previous:
+            return ScopeChange()
+        if self.max_files != previous.max_files or bool(self.include) != bool(previous.include):
+            # Which files fit in the limit, or whether anything outside of the includes is visible,
+            # depends on the whole tree
+            return ScopeChange(full=True)
+
+        change = ScopeChange()
+        changed_patterns = (set(self.include) ^ set(previous.include)) | (set(self.exclude) ^ set(previous.exclude))
+        for pattern in changed_patterns:
+            prefix, is_literal = _literal_prefix(pattern)
+            if prefix == '' and not is_literal:
+                return ScopeChange(full=True)
+            # The folders leading to the pattern may appear or disappear, and what is below it changes
+            change.directories.update(_ancestors(prefix))
+            change.subtrees.add(prefix)
+        if self.max_depth != previous.max_depth:
+            depths = [depth for depth in (self.max_depth, previous.max_depth) if depth is not None]
+            change.depth = min(depths)
+        return change
+
+
+@dataclass
+class ScopeChange:
+    """
+    The parts of a tree to read again after a scope change.
+
+    Attributes:
+        full (bool): Whether the whole tree must be read again.
+        directories (Set[str]): Folders whose own entries must be read again.
+        subtrees (Set[str]): Folders to read again with everything below them.
+        depth (Optional[int]): If set, the folders at this depth are read again with everything below
+            them, after the maximum depth changed.
+    """
+    full: bool = False
+    directories: Set[str] = field(default_factory=set)
+    subtrees: Set[str] = field(default_factory=set)
+    depth: Optional[int] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.full and not self.directories and not self.subtrees and self.depth is None
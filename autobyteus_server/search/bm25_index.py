@@ -0,0 +1,521 @@
+"""
+BM25 relevance search over the files of a workspace.
+
+Every file of the workspace tree is a document made of the tokens of its content and, weighted
+higher, of its path (see text_tokenizer). The inverted index keeps, per term, the ids of the
+documents containing it and the term's frequency in them, in flat arrays: one offsets array
+and one array each of document ids and frequencies, sorted by term. A query gathers the
+postings of its terms and scores all their documents at once with numpy (numpy is optional;
+without it the same arithmetic runs in Python).
+
+Updates are incremental. A changed file gets a new document id: its old id is marked dead, and
+its new postings go to a small per-term delta that queries read besides the main arrays. Once
+the delta and the dead documents make up a tenth of the index, everything is merged back into
+the main arrays, which are then saved to the workspace's index file, so a restarted server only
+re-tokenizes the files that changed since.
+"""
+
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import threading
+import zlib
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from autobyteus_server.file_explorer.change_tracker import WorkspaceChangeTracker
+from autobyteus_server.file_explorer.compact_tree import pack_sections, unpack_sections
+from autobyteus_server.file_explorer.content_search import get_search_process_pool
+from autobyteus_server.search.text_tokenizer import TokenizedFile, tokenize, tokenize_files
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+logger = logging.getLogger(__name__)
+
+BM25_INDEX_VERSION = 1
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+FILES_PER_BATCH = 64
+# Fewer changed files than this are tokenized in the calling thread instead of the worker processes
+INLINE_TOKENIZE_LIMIT = 16
+MAX_FILE_SIZE = 1024 * 1024
+MAX_TERM_FREQUENCY = 65535
+# The delta is merged into the main arrays once changed and deleted documents reach this share
+COMPACTION_RATIO = 0.1
+MIN_COMPACTION_DOCUMENTS = 256
+
+
+class _Postings:
+    """
+    The merged inverted index: term t occurs in the documents doc_ids[offsets[t]:offsets[t + 1]],
+    with the frequencies at the same positions.
+    """
+
+    def __init__(self, offsets: Optional[array] = None, doc_ids: Optional[array] = None,
+                 frequencies: Optional[array] = None):
+        self.offsets = offsets if offsets is not None else array('q', [0])
+        self.doc_ids = doc_ids if doc_ids is not None else array('i')
+        self.frequencies = frequencies if frequencies is not None else array('H')
+
+    @property
+    def term_count(self) -> int:
+        return len(self.offsets) - 1
+
+
+class BM25IndexStore:
+    """
+    Stores one BM25 index per workspace root path in a directory.
+    """
+
+    def __init__(self, store_dir: str):
+        """
+        Initialize the BM25IndexStore.
+
+        Args:
+            store_dir (str): The directory holding the index files. Created on first save.
+        """
+        self.store_dir = Path(store_dir)
+
+    def index_path(self, root_path: str) -> Path:
+        """
+        Returns the index file used for a workspace root path.
+        """
+        key = hashlib.sha1(os.path.normpath(root_path).encode('utf-8', 'surrogateescape')).hexdigest()
+        return self.store_dir / f"{key}.bm25"
+
+    def load(self, root_path: str) -> Optional[dict]:
+        """
+        Loads the index of a workspace.
+
+        Returns:
+            Optional[dict]: The header (paths, stats, lengths, terms) and the postings arrays, or
+                None if there is no usable index.
+        """
+        path = self.index_path(root_path)
+        try:
+            sections = unpack_sections(zlib.decompress(path.read_bytes()))
+            header = json.loads(sections[0])
+            if header['version'] != BM25_INDEX_VERSION or header['root_path'] != os.path.normpath(root_path):
+                return None
+            lengths, offsets, doc_ids, frequencies = array('f'), array('q'), array('i'), array('H')
+            for target, section in zip((lengths, offsets, doc_ids, frequencies), sections[1:5]):
+                target.frombytes(section)
+            if len(lengths) != len(header['paths']) or len(offsets) != len(header['terms']) + 1:
+                raise ValueError("Inconsistent index sections")
+            return {**header, "lengths": lengths, "postings": _Postings(offsets, doc_ids, frequencies)}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, IndexError, TypeError, zlib.error) as e:
+            logger.warning(f"Ignoring unreadable BM25 index {path}: {e}")
+            return None
+
+    def save(self, root_path: str, paths: List[str], stats: List[Tuple[int, int]], lengths: array,
+             terms: List[str], postings: _Postings) -> None:
+        """
+        Writes the index of a workspace, replacing the previous one atomically. Failures are
+        logged, since the index can always be rebuilt.
+        """
+        path = self.index_path(root_path)
+        header = json.dumps({
+            "version": BM25_INDEX_VERSION,
+            "root_path": os.path.normpath(root_path),
+            "paths": paths,
+            "stats": stats,
+            "terms": terms,
+        }, separators=(',', ':')).encode('utf-8')
+        data = zlib.compress(pack_sections([header, lengths.tobytes(), postings.offsets.tobytes(),
+                                            postings.doc_ids.tobytes(), postings.frequencies.tobytes()]), 1)
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as temp_file:
+                    temp_file.write(data)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to save BM25 index {path}: {e}")
+
+    def remove(self, root_path: str) -> None:
+        """
+        Deletes the index of a workspace if there is one.
+        """
+        try:
+            self.index_path(root_path).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class BM25Index:
+    """
+    Ranks the files of one workspace by their BM25 relevance to a query, kept up to date
+    incrementally.
+    """
+
+    def __init__(self, file_explorer: 'FileExplorer', store: Optional[BM25IndexStore] = None,
+                 k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        """
+        Initialize the BM25Index. Nothing is read until the first refresh().
+
+        Args:
+            file_explorer (FileExplorer): The file explorer of the workspace.
+            store (Optional[BM25IndexStore]): Persists the index across restarts.
+            k1 (float): Term frequency saturation.
+            b (float): Document length normalization, between 0 and 1.
+        """
+        self.file_explorer = file_explorer
+        self.root_path = file_explorer.workspace_root_path
+        self.store = store
+        self.k1 = k1
+        self.b = b
+        self.change_tracker = WorkspaceChangeTracker(file_explorer)
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._terms: Dict[str, int] = {}
+        self._term_list: List[str] = []
+        # Per document id; removed documents keep their id (with path None) until the next compaction
+        self._paths: List[Optional[str]] = []
+        self._lengths = array('f')
+        self._live = bytearray()
+        self._doc_ids: Dict[str, int] = {}
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self._live_count = 0
+        self._total_length = 0.0
+        self._postings = _Postings()
+        self._delta: Dict[int, Tuple[array, array]] = {}
+        self._delta_documents = 0
+        self._dead_documents = 0
+
+    @property
+    def is_built(self) -> bool:
+        return self.change_tracker.is_refreshed
+
+    @property
+    def is_stale(self) -> bool:
+        """
+        Whether files changed, or the tree was rebuilt, since the last refresh.
+        """
+        return self.change_tracker.is_stale
+
+    def __len__(self) -> int:
+        """
+        Returns the number of indexed files.
+        """
+        return self._live_count
+
+    def refresh(self, full: bool = False) -> Dict[str, int]:
+        """
+        Brings the index up to date with the workspace.
+
+        Args:
+            full (bool): Stat every file of the workspace instead of only the changed ones. A full
+                refresh is also done on first use and after the tree was rebuilt.
+
+        Returns:
+            Dict[str, int]: The number of files checked, tokenized and removed, and the number of
+                indexed files and terms.
+        """
+        with self._refresh_lock:
+            if not self._loaded:
+                self._load()
+            candidates, removed, token = self.change_tracker.collect(self._stats, lambda path: True, full=full)
+            changed, missing = self.change_tracker.stat_changed(candidates, self._stats.get)
+            removed |= missing
+            tokenized = self._tokenize(changed)
+            with self._lock:
+                for path, mtime_ns, size, length, counts in tokenized:
+                    if counts is None:
+                        removed.add(path)
+                    else:
+                        self._add_document(path, (mtime_ns, size), length, counts)
+                for path in removed:
+                    self._remove_document(path)
+                compacted = self._compact_if_needed()
+            if compacted and self.store is not None:
+                self._save()
+            self.change_tracker.refreshed(token)
+            stats = {
+                "checked": len(candidates),
+                "tokenized": len(tokenized),
+                "removed": len(removed),
+                "files": self._live_count,
+                "terms": len(self._terms),
+            }
+            logger.debug(f"Refreshed BM25 index of {self.root_path}: {stats}")
+            return stats
+
+    def _tokenize(self, paths: List[str]) -> List[TokenizedFile]:
+        if not paths:
+            return []
+        if len(paths) < INLINE_TOKENIZE_LIMIT:
+            return tokenize_files(self.root_path, paths, MAX_FILE_SIZE)
+        # Shares the worker processes of the content search
+        process_pool = get_search_process_pool()
+        futures = [process_pool.submit(tokenize_files, self.root_path, paths[start:start + FILES_PER_BATCH],
+                                       MAX_FILE_SIZE)
+                   for start in range(0, len(paths), FILES_PER_BATCH)]
+        results: List[TokenizedFile] = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _add_document(self, path: str, stat: Tuple[int, int], length: int, counts: Dict[str, int]) -> None:
+        self._remove_document(path)
+        doc_id = len(self._paths)
+        self._paths.append(path)
+        self._lengths.append(length)
+        self._live.append(1)
+        self._doc_ids[path] = doc_id
+        self._stats[path] = stat
+        self._live_count += 1
+        self._total_length += length
+        for term, frequency in counts.items():
+            term_id = self._terms.get(term)
+            if term_id is None:
+                term_id = self._terms[term] = len(self._term_list)
+                self._term_list.append(term)
+            postings = self._delta.get(term_id)
+            if postings is None:
+                postings = self._delta[term_id] = (array('i'), array('H'))
+            postings[0].append(doc_id)
+            postings[1].append(min(frequency, MAX_TERM_FREQUENCY))
+        self._delta_documents += 1
+
+    def _remove_document(self, path: str) -> None:
+        doc_id = self._doc_ids.pop(path, None)
+        if doc_id is None:
+            return
+        del self._stats[path]
+        self._paths[doc_id] = None
+        self._live[doc_id] = 0
+        self._live_count -= 1
+        self._total_length -= self._lengths[doc_id]
+        self._dead_documents += 1
+
+    def _compact_if_needed(self) -> bool:
+        pending = self._delta_documents + self._dead_documents
+        if not pending:
+            return False
+        if len(self._postings.doc_ids) and pending < max(MIN_COMPACTION_DOCUMENTS, COMPACTION_RATIO * self._live_count):
+            return False
+        self._compact()
+        return True
+
+    def _compact(self) -> None:
+        """
+        Merges the delta into the main arrays, drops dead documents and unused terms, and
+        renumbers the documents densely.
+        """
+        if np is not None:
+            term_list, postings = self._merged_postings_numpy()
+        else:
+            term_list, postings = self._merged_postings_python()
+        live_doc_ids = [doc_id for doc_id, is_live in enumerate(self._live) if is_live]
+        self._paths = [self._paths[doc_id] for doc_id in live_doc_ids]
+        self._lengths = array('f', (self._lengths[doc_id] for doc_id in live_doc_ids))
+        self._live = bytearray(b'\x01') * len(live_doc_ids)
+        self._doc_ids = {path: doc_id for doc_id, path in enumerate(self._paths)}
+        self._term_list = term_list
+        self._terms = {term: term_id for term_id, term in enumerate(term_list)}
+        self._postings = postings
+        self._delta = {}
+        self._delta_documents = 0
+        self._dead_documents = 0
+
+    def _merged_postings_numpy(self) -> Tuple[List[str], _Postings]:
+        live = np.frombuffer(bytes(self._live), dtype=np.uint8).astype(bool)
+        new_doc_ids = np.cumsum(live, dtype=np.int64) - 1
+        main = self._postings
+        term_ids = [np.repeat(np.arange(main.term_count, dtype=np.int64), np.diff(np.frombuffer(main.offsets, np.int64)))]
+        doc_ids = [np.frombuffer(main.doc_ids, np.int32)]
+        frequencies = [np.frombuffer(main.frequencies, np.uint16)]
+        for term_id, (delta_doc_ids, delta_frequencies) in self._delta.items():
+            term_ids.append(np.full(len(delta_doc_ids), term_id, dtype=np.int64))
+            doc_ids.append(np.frombuffer(delta_doc_ids.tobytes(), np.int32))
+            frequencies.append(np.frombuffer(delta_frequencies.tobytes(), np.uint16))
+        term_ids, doc_ids, frequencies = (np.concatenate(parts) for parts in (term_ids, doc_ids, frequencies))
+        keep = live[doc_ids]
+        term_ids, doc_ids, frequencies = term_ids[keep], new_doc_ids[doc_ids[keep]], frequencies[keep]
+        used_term_ids, term_ids = np.unique(term_ids, return_inverse=True)
+        order = np.lexsort((doc_ids, term_ids))
+        offsets = np.zeros(len(used_term_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(used_term_ids)), out=offsets[1:])
+        postings = _Postings(array('q', offsets.tobytes()), array('i', doc_ids[order].astype(np.int32).tobytes()),
+                             array('H', frequencies[order].tobytes()))
+        return [self._term_list[term_id] for term_id in used_term_ids.tolist()], postings
+
+    def _merged_postings_python(self) -> Tuple[List[str], _Postings]:
+        new_doc_ids: List[int] = []
+        next_doc_id = 0
+        for is_live in self._live:
+            new_doc_ids.append(next_doc_id if is_live else -1)
+            next_doc_id += is_live
+        merged: Dict[int, List[Tuple[int, int]]] = {}
+        main = self._postings
+        for term_id in range(main.term_count):
+            for position in range(main.offsets[term_id], main.offsets[term_id + 1]):
+                doc_id = new_doc_ids[main.doc_ids[position]]
+                if doc_id >= 0:
+                    merged.setdefault(term_id, []).append((doc_id, main.frequencies[position]))
+        for term_id, (delta_doc_ids, delta_frequencies) in self._delta.items():
+            for doc_id, frequency in zip(delta_doc_ids, delta_frequencies):
+                if new_doc_ids[doc_id] >= 0:
+                    merged.setdefault(term_id, []).append((new_doc_ids[doc_id], frequency))
+        term_list: List[str] = []
+        postings = _Postings()
+        for term_id in sorted(merged):
+            term_list.append(self._term_list[term_id])
+            for doc_id, frequency in sorted(merged[term_id]):
+                postings.doc_ids.append(doc_id)
+                postings.frequencies.append(frequency)
+            postings.offsets.append(len(postings.doc_ids))
+        return term_list, postings
+
+    def _load(self) -> None:
+        self._loaded = True
+        data = self.store.load(self.root_path) if self.store is not None else None
+        if data is None:
+            return
+        with self._lock:
+            self._reset()
+            self._paths = list(data['paths'])
+            self._lengths = data['lengths']
+            self._live = bytearray(b'\x01') * len(self._paths)
+            self._doc_ids = {path: doc_id for doc_id, path in enumerate(self._paths)}
+            self._stats = {path: tuple(stat) for path, stat in zip(self._paths, data['stats'])}
+            self._live_count = len(self._paths)
+            self._total_length = float(sum(self._lengths))
+            self._term_list = list(data['terms'])
+            self._terms = {term: term_id for term_id, term in enumerate(self._term_list)}
+            self._postings = data['postings']
+
+    def _save(self) -> None:
+        # Called right after a compaction: there is no delta and every document is live
+        with self._lock:
+            paths = list(self._paths)
+            stats = [self._stats[path] for path in paths]
+            lengths, terms, postings = self._lengths, list(self._term_list), self._postings
+        self.store.save(self.root_path, paths, stats, lengths, terms, postings)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Ranks the indexed files by their BM25 score for the query terms.
+
+        Args:
+            query (str): Free text; it is tokenized like the files.
+            limit (int): The maximum number of results.
+
+        Returns:
+            List[Tuple[str, float]]: (relative path, score) of the best matching files, best first.
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if limit <= 0:
+            return []
+        with self._lock:
+            term_ids = [self._terms[term] for term in query_terms if term in self._terms]
+            if not term_ids or not self._live_count:
+                return []
+            if np is not None:
+                scored = self._score_numpy(term_ids, limit)
+            else:
+                scored = self._score_python(term_ids, limit)
+            results = [(self._paths[doc_id], score) for doc_id, score in scored]
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return [(path, round(score, 4)) for path, score in results]
+
+    def _idf(self, document_frequency: int) -> float:
+        return math.log(1.0 + (self._live_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _score_numpy(self, term_ids: Sequence[int], limit: int) -> List[Tuple[int, float]]:
+        main = self._postings
+        live = np.frombuffer(bytes(self._live), dtype=np.uint8).astype(bool)
+        lengths = np.frombuffer(self._lengths.tobytes(), dtype=np.float32)
+        main_doc_ids = np.frombuffer(main.doc_ids, dtype=np.int32) if len(main.doc_ids) else np.empty(0, np.int32)
+        main_frequencies = (np.frombuffer(main.frequencies, dtype=np.uint16) if len(main.frequencies)
+                            else np.empty(0, np.uint16))
+        average_length = self._total_length / self._live_count
+        k1, b = self.k1, self.b
+        scores = np.zeros(len(self._paths), dtype=np.float32)
+        for term_id in term_ids:
+            doc_ids, frequencies = [], []
+            if term_id < main.term_count:
+                start, end = main.offsets[term_id], main.offsets[term_id + 1]
+                doc_ids.append(main_doc_ids[start:end])
+                frequencies.append(main_frequencies[start:end])
+            delta = self._delta.get(term_id)
+            if delta is not None:
+                doc_ids.append(np.frombuffer(delta[0].tobytes(), dtype=np.int32))
+                frequencies.append(np.frombuffer(delta[1].tobytes(), dtype=np.uint16))
+            doc_ids = np.concatenate(doc_ids)
+            keep = live[doc_ids]
+            doc_ids = doc_ids[keep]
+            if not doc_ids.size:
+                continue
+            term_frequencies = np.concatenate(frequencies)[keep].astype(np.float32)
+            normalization = k1 * (1.0 - b + b * lengths[doc_ids] / average_length)
+            # A document occurs at most once in the postings of a term
+            scores[doc_ids] += self._idf(doc_ids.size) * term_frequencies * (k1 + 1.0) / (term_frequencies + normalization)
+        matches = np.flatnonzero(scores)
+        if matches.size > limit:
+            matches = matches[np.argpartition(-scores[matches], limit - 1)[:limit]]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in matches]
+
+    def _score_python(self, term_ids: Sequence[int], limit: int) -> List[Tuple[int, float]]:
+        main = self._postings
+        average_length = self._total_length / self._live_count
+        k1, b = self.k1, self.b
+        scores: Dict[int, float] = {}
+        for term_id in term_ids:
+            postings: List[Tuple[int, int]] = []
+            if term_id < main.term_count:
+                for position in range(main.offsets[term_id], main.offsets[term_id + 1]):
+                    postings.append((main.doc_ids[position], main.frequencies[position]))
+            delta = self._delta.get(term_id)
+            if delta is not None:
+                postings.extend(zip(*delta))
+            postings = [(doc_id, frequency) for doc_id, frequency in postings if self._live[doc_id]]
+            if not postings:
+                continue
+            idf = self._idf(len(postings))
+            for doc_id, frequency in postings:
+                normalization = k1 * (1.0 - b + b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (k1 + 1.0) / (frequency + normalization)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate memory used by the index in bytes.
+        """
+        with self._lock:
+            postings = self._postings
+            arrays = [self._lengths, postings.offsets, postings.doc_ids, postings.frequencies]
+            arrays.extend(array_ for pair in self._delta.values() for array_ in pair)
+            return (sum(array_.itemsize * len(array_) for array_ in arrays) + len(self._live)
+                    + sum(sys.getsizeof(container) for container in (self._terms, self._term_list, self._paths,
+                                                                       self._doc_ids, self._stats, self._delta))
+                    + sum(sys.getsizeof(term) for term in self._term_list)
+                    + sum(sys.getsizeof(path) for path in self._paths if path is not None))
+
+    def close(self) -> None:
+        """
+        Stops following the changes of the workspace.
+        """
+        self.change_tracker.close()
@@ -1,23 +1,37 @@
+from typing import TYPE_CHECKING
+
 from autobyteus_server.search.hackathon_search_result import HackathonSearchResult
 
+if TYPE_CHECKING:
+    from autobyteus_server.workspaces.workspace import Workspace
+
 class HackathonSearchService:
     """
-    A fake search service for hackathon purposes that returns fixed file paths based on the query.
+    Searches the files of a workspace for the ones most relevant to a free text query.
     """
-    
-    def search(self, query: str) -> HackathonSearchResult:
+
+    def __init__(self, workspace: 'Workspace'):
+        """
+        Initializes the HackathonSearchService.
+
+        Args:
+            workspace (Workspace): The workspace whose files are searched.
+        """
+        self.workspace = workspace
+
+    def search(self, query: str, limit: int = 20) -> HackathonSearchResult:
         """
-        Returns a fixed list of file paths regardless of the query.
-        
+        Returns the workspace files ranked by their BM25 relevance to the query. Files changed
+        since the last search are re-indexed first.
+
         Args:
             query (str): The search query.
-        
+            limit (int): The maximum number of paths.
+
         Returns:
-            HackathonSearchResult: The search result containing fixed file paths.
+            HackathonSearchResult: The search result containing the matching file paths, best first.
         """
-        fixed_paths = [
-            "src/project/module1/file1.py",
-            "src/project/module2/file2.py",
-            "src/project/module3/file3.py"
-        ]
-        return HackathonSearchResult(paths=fixed_paths)
\ No newline at end of file
+        search_index = self.workspace.get_search_index()
+        if not search_index.is_built or search_index.is_stale:
+            search_index.refresh()
+        return HackathonSearchResult(paths=[path for path, _ in search_index.search(query, limit)])
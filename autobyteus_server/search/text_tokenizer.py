@@ -0,0 +1,89 @@
+"""
+Tokenization of workspace files for relevance search.
+
+Words are lower-cased, and identifiers are also split into their parts, so 'getUserName' and
+'get_user_name' both yield 'get', 'user' and 'name' besides the whole identifier. The tokens of
+a file's path are added with a higher weight, since file and folder names say a lot about what
+a file is about.
+
+This module only imports the standard library, so starting a worker process is cheap.
+"""
+
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 64
+PATH_TOKEN_WEIGHT = 3
+BINARY_SNIFF_SIZE = 8192
+
+_WORD = re.compile(r'[^\W_]+(?:_+[^\W_]+)*')
+_CAMEL_CASE_PART = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+# (relative path, mtime_ns, size, number of tokens, term frequencies); the frequencies are None if
+# the file could not be read
+TokenizedFile = Tuple[str, int, int, int, Optional[Dict[str, int]]]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lower-case tokens: every word, and the parts of words that are compound
+    identifiers. Tokens shorter than 2 characters and numbers are dropped.
+    """
+    tokens: List[str] = []
+    for word in _WORD.findall(text):
+        if len(word) > MAX_TOKEN_LENGTH:
+            continue
+        lower_word = word.lower()
+        if len(lower_word) >= MIN_TOKEN_LENGTH and not lower_word.isdigit():
+            tokens.append(lower_word)
+        parts = _identifier_parts(word)
+        if len(parts) > 1:
+            for part in parts:
+                if len(part) >= MIN_TOKEN_LENGTH and not part.isdigit():
+                    tokens.append(part.lower())
+    return tokens
+
+
+def _identifier_parts(word: str) -> List[str]:
+    parts: List[str] = []
+    for chunk in word.split('_'):
+        if chunk.isascii():
+            parts.extend(_CAMEL_CASE_PART.findall(chunk))
+        elif chunk:
+            parts.append(chunk)
+    return parts
+
+
+def tokenize_files(root_path: str, paths: Sequence[str], max_file_size: int) -> List[TokenizedFile]:
+    """
+    Computes the term frequencies of files: the tokens of their content plus the weighted tokens
+    of their path. Binary files and files larger than max_file_size are represented by their
+    path only.
+
+    Args:
+        root_path (str): The workspace root.
+        paths (Sequence[str]): The relative paths of the files.
+        max_file_size (int): The size above which contents are not read.
+
+    Returns:
+        List[TokenizedFile]: One entry per file, in the given order.
+    """
+    results: List[TokenizedFile] = []
+    for path in paths:
+        try:
+            with open(os.path.join(root_path, path), 'rb') as file:
+                stat = os.fstat(file.fileno())
+                data = file.read(max_file_size + 1) if stat.st_size <= max_file_size else b''
+        except OSError:
+            results.append((path, 0, 0, 0, None))
+            continue
+        counts: Counter = Counter()
+        if data and len(data) <= max_file_size and b'\0' not in data[:BINARY_SNIFF_SIZE]:
+            counts.update(tokenize(data.decode('utf-8', errors='replace')))
+        for token in tokenize(path):
+            counts[token] += PATH_TOKEN_WEIGHT
+        results.append((path, stat.st_mtime_ns, stat.st_size, sum(counts.values()), dict(counts)))
+    return results
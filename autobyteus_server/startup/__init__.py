@@ -4,5 +4,6 @@ This includes database migrations, cache warming, resource verification, etc.
 """
 
 from .migrations import run_migrations
+from .workspace_restore import restore_workspaces
 
-__all__ = ['run_migrations']
+__all__ = ['run_migrations', 'restore_workspaces']
@@ -0,0 +1,12 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+def restore_workspaces():
+    """Register the persisted workspaces; each one is built when it is first accessed"""
+    try:
+        from autobyteus_server.workspaces.workspace_manager import WorkspaceManager
+        WorkspaceManager().restore_workspaces()
+    except Exception as e:
+        # The server works without the restored workspaces; they can be added again
+        logger.error(f"Error restoring workspaces: {str(e)}")
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, Dict, Optional
 from autobyteus_server.workflow.config import WORKFLOW_CONFIG
 from autobyteus_server.workflow.types.base_step import BaseStep
 from autobyteus_server.workflow.types.base_workflow import WorkflowStatus
+from autobyteus_server.workflow.runtime.workflow_agent_conversation_manager import WorkflowAgentConversationManager
 from autobyteus_server.workflow.types.workflow_template_config import StepsTemplateConfig
 
 if TYPE_CHECKING:
@@ -98,6 +99,19 @@ class AutomatedCodingWorkflow:
         """
         return self.steps.get(step_id)
 
+    def is_running(self) -> bool:
+        """
+        Whether a step is processing a requirement or a conversation of a step is still open.
+
+        Returns:
+            bool: True if the workflow is working, False otherwise.
+        """
+        if any(step.is_running for step in self.steps.values()):
+            return True
+        workspace = self._workspace
+        return workspace is not None and \
+            WorkflowAgentConversationManager().has_open_conversations(workspace.workspace_id)
+
     def execute_step(self, step_id: str) -> Optional[str]:
         """
         Execute a specific step within the workflow using its ID.
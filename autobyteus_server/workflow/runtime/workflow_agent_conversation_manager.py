@@ -2,7 +2,6 @@
 import logging
 from typing import List, Optional
 from autobyteus.conversation.user_message import UserMessage
-from autobyteus.llm.llm_factory import LLMFactory
 from autobyteus_server.agent_runtime.base_agent_conversation_manager import BaseAgentConversationManager
 from autobyteus_server.workflow.runtime.workflow_agent_streaming_conversation import WorkflowAgentStreamingConversation
 
@@ -26,6 +25,8 @@ class WorkflowAgentConversationManager(BaseAgentConversationManager):
         """
         Creates a new workflow agent conversation.
         """
+        # Imported on use: the factory loads the SDKs of all LLM providers
+        from autobyteus.llm.llm_factory import LLMFactory
         llm = LLMFactory.create_llm(llm_model)
 
         conversation = WorkflowAgentStreamingConversation(
@@ -40,3 +41,10 @@ class WorkflowAgentConversationManager(BaseAgentConversationManager):
         _ = self._runtime.execute_coroutine(conversation.start())
         self._conversations[conversation.conversation_id] = conversation
         return conversation
+
+    def has_open_conversations(self, workspace_id: str) -> bool:
+        """
+        Whether a conversation of a workflow step of the workspace is still open.
+        """
+        return any(getattr(conversation, 'workspace_id', None) == workspace_id
+                   for conversation in list(self._conversations.values()))
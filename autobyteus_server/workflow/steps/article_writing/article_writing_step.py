@@ -5,7 +5,6 @@ import uuid
 from autobyteus_server.workflow.types.base_step import BaseStep
 from autobyteus.agent.agent import Agent
 from autobyteus.llm.base_llm import BaseLLM
-from autobyteus.llm.llm_factory import LLMFactory
 from autobyteus.events.event_types import EventType
 from autobyteus.conversation.user_message import UserMessage
 from autobyteus_server.workflow.persistence.conversation.domain.models import Message as PersistenceMessage
@@ -23,6 +22,11 @@ class ArticleWritingStep(BaseStep):
         self.agents: Dict[str, Agent] = {}  # Changed to handle multiple agents
         self.response_queues: Dict[str, asyncio.Queue] = {}  # Queues per conversation
 
+    @property
+    def is_running(self) -> bool:
+        # The agents of the step keep running until their conversation is closed
+        return super().is_running or bool(self.agents)
+
     def init_response_queue(self, conversation_id: str):
         if conversation_id not in self.response_queues:
             self.response_queues[conversation_id] = asyncio.Queue()
@@ -41,15 +45,23 @@ class ArticleWritingStep(BaseStep):
         prompt += f"{requirement}"
         return prompt
     
-    async def process_requirement(
+    async def _process_requirement(
         self, 
         requirement: str, 
         context_file_paths: List[Dict[str, str]],  # List of dicts with 'path' and 'type'
         llm_model: Optional[str],
-        conversation_id: Optional[str] = None  # New parameter
+        conversation_id: Optional[str] = None,  # New parameter
+        auto_context: bool = False,
+        context_token_budget: Optional[int] = None
     ) -> str:
         context, image_file_paths = self._construct_context(context_file_paths)
+        if auto_context:
+            auto_context_text, _ = await self._construct_auto_context(
+                requirement, context_file_paths, context, context_token_budget)
+            context += auto_context_text
 
+        # Imported on use: the factory loads the SDKs of all LLM providers
+        from autobyteus.llm.llm_factory import LLMFactory
         if not conversation_id:
             # This is the beginning of a new conversation
             llm_instance = LLMFactory.create_llm(llm_model)
@@ -109,6 +121,7 @@ class ArticleWritingStep(BaseStep):
         context = ""
         image_file_paths = []
         root_path = self.workflow.workspace.root_path
+        content_cache = self.workflow.workspace.get_file_explorer().content_cache
         for file in context_file_paths:
             path = file['path']
             file_type = file['type']
@@ -117,9 +130,8 @@ class ArticleWritingStep(BaseStep):
             if file_type == 'image':
                 image_file_paths.append(full_path)
             elif file_type == 'text':
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    context += f"File: {path}\n{content}\n\n"
+                content = content_cache.read_text(full_path)
+                context += f"File: {path}\n{content}\n\n"
             else:
                 raise ValueError(f"Unsupported file type: {file_type} for file: {path}")
 
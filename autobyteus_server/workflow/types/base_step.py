@@ -8,6 +8,9 @@ from autobyteus_server.workflow.utils.prompt_template_manager import PromptTempl
 from autobyteus_server.workflow.persistence.conversation.provider.persistence_proxy import PersistenceProxy
 from autobyteus.conversation.user_message import UserMessage
 from autobyteus_server.workflow.runtime.workflow_agent_conversation_manager import WorkflowAgentConversationManager
+from autobyteus_server.file_explorer.io_executor import run_io
+from autobyteus_server.workspaces.workspace_tools.context_selector.context_selector import ContextSelector, format_context
+from autobyteus_server.workspaces.workspace_tools.context_selector.token_estimator import estimate_tokens
 
 if TYPE_CHECKING:
     from autobyteus_server.workflow.automated_coding_workflow import AutomatedCodingWorkflow
@@ -22,6 +25,8 @@ class BaseStep(ABC, EventEmitter):
     name: str
 
     def __init__(self, workflow: 'AutomatedCodingWorkflow', prompt_dir: str):
+        # The number of requirements being processed; set first, as EventEmitter reads every attribute
+        self._active_requirements = 0
         super().__init__()
         self.id = UniqueIDGenerator.generate_id()
         self.workflow = workflow
@@ -31,6 +36,13 @@ class BaseStep(ABC, EventEmitter):
         self.tools = []
         self.agent_conversation_manager = WorkflowAgentConversationManager()
 
+    @property
+    def is_running(self) -> bool:
+        """
+        Whether the step is processing a requirement.
+        """
+        return self._active_requirements > 0
+
     def get_prompt_template(self, llm_model: str) -> Optional[PromptTemplate]:
         return self.prompt_template_manager.get_template(self.name, llm_model, self.prompt_dir)
 
@@ -67,7 +79,9 @@ class BaseStep(ABC, EventEmitter):
         requirement: str,
         context_file_paths: List[Dict[str, str]],
         llm_model: Optional[str],
-        conversation_id: Optional[str] = None
+        conversation_id: Optional[str] = None,
+        auto_context: bool = False,
+        context_token_budget: Optional[int] = None
     ) -> str:
         """
         Process a requirement either as a new conversation or as part of an existing one.
@@ -77,11 +91,35 @@ class BaseStep(ABC, EventEmitter):
             context_file_paths (List[Dict[str, str]]): List of context file paths
             llm_model (Optional[str]): The LLM model to use
             conversation_id (Optional[str]): Existing conversation ID if continuing a conversation
+            auto_context (bool): Also add the workspace files most relevant to the requirement
+            context_token_budget (Optional[int]): The tokens the whole context may take when
+                auto_context is set; defaults to AUTO_CONTEXT_TOKEN_BUDGET
 
         Returns:
             str: The conversation ID
         """
+        self._active_requirements += 1
+        try:
+            return await self._process_requirement(requirement, context_file_paths, llm_model,
+                                                   conversation_id, auto_context, context_token_budget)
+        finally:
+            self._active_requirements -= 1
+
+    async def _process_requirement(
+        self,
+        requirement: str,
+        context_file_paths: List[Dict[str, str]],
+        llm_model: Optional[str],
+        conversation_id: Optional[str],
+        auto_context: bool,
+        context_token_budget: Optional[int]
+    ) -> str:
         context, image_file_paths, text_file_paths = self._construct_context(context_file_paths)
+        if auto_context:
+            auto_context_text, auto_file_paths = await self._construct_auto_context(
+                requirement, context_file_paths, context, context_token_budget)
+            context += auto_context_text
+            text_file_paths.extend(auto_file_paths)
 
         if not conversation_id:
             # Start of a new conversation
@@ -153,6 +191,7 @@ class BaseStep(ABC, EventEmitter):
         image_file_paths = []
         text_file_paths = []
         root_path = self.workflow.workspace.root_path
+        content_cache = self.workflow.workspace.get_file_explorer().content_cache
 
         for file in context_file_paths:
             path = file['path']
@@ -167,15 +206,42 @@ class BaseStep(ABC, EventEmitter):
                     image_file_paths.append(full_path)
             elif file_type == 'text':
                 full_path = os.path.join(root_path, path)
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    context += f"File: {path}\n{content}\n\n"
+                content = content_cache.read_text(full_path)
+                context += f"File: {path}\n{content}\n\n"
                 text_file_paths.append(full_path)
             else:
                 raise ValueError(f"Unsupported file type: {file_type} for file: {path}")
 
         return context, image_file_paths, text_file_paths
 
+    async def _construct_auto_context(
+        self,
+        requirement: str,
+        context_file_paths: List[Dict[str, str]],
+        context: str,
+        context_token_budget: Optional[int]
+    ) -> Tuple[str, List[str]]:
+        """
+        Selects the workspace files most relevant to a requirement, within what the token budget
+        leaves after the context the user picked.
+
+        Args:
+            requirement (str): The requirement to process
+            context_file_paths (List[Dict[str, str]]): The context files the user picked
+            context (str): The context constructed from them
+            context_token_budget (Optional[int]): The tokens the whole context may take
+
+        Returns:
+            Tuple[str, List[str]]: The context of the selected files and their full paths
+        """
+        workspace = self.workflow.workspace
+        selector = ContextSelector(workspace, token_budget=context_token_budget)
+        picked_paths = [file['path'] for file in context_file_paths if file['type'] == 'text']
+        remaining_budget = selector.token_budget - estimate_tokens(context)
+        selected = await run_io(selector.select, requirement, picked_paths, remaining_budget)
+        logger.info(f"Auto context selected {len(selected)} files for step {self.name}")
+        return format_context(selected), [os.path.join(workspace.root_path, file.path) for file in selected]
+
     def close_conversation(self, conversation_id: str) -> None:
         """Closes a conversation and cleans up associated resources."""
         try:
@@ -0,0 +1 @@
+# This file makes persistence a Python package.
@@ -0,0 +1 @@
+# This file makes converters a Python package.
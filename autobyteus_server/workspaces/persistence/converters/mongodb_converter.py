@@ -0,0 +1,15 @@
+from autobyteus_server.workspaces.persistence.domain.models import WorkspaceRecord as DomainWorkspaceRecord
+from autobyteus_server.workspaces.persistence.models.mongodb.workspace_record import MongoWorkspaceRecord
+
+class MongoDBConverter:
+    @staticmethod
+    def to_domain_record(mongo_record: MongoWorkspaceRecord) -> DomainWorkspaceRecord:
+        return DomainWorkspaceRecord(
+            id=str(mongo_record._id) if getattr(mongo_record, "_id", None) is not None else None,
+            workspace_id=mongo_record.workspace_id,
+            root_path=mongo_record.root_path,
+            project_type=mongo_record.project_type,
+            settings=dict(mongo_record.settings or {}),
+            created_at=mongo_record.created_at,
+            updated_at=mongo_record.updated_at
+        )
@@ -0,0 +1,15 @@
+from autobyteus_server.workspaces.persistence.domain.models import WorkspaceRecord as DomainWorkspaceRecord
+from autobyteus_server.workspaces.persistence.models.sql.workspace_record import WorkspaceRecord as SQLWorkspaceRecord
+
+class SQLConverter:
+    @staticmethod
+    def to_domain_record(sql_record: SQLWorkspaceRecord) -> DomainWorkspaceRecord:
+        return DomainWorkspaceRecord(
+            id=str(sql_record.id) if sql_record.id is not None else None,
+            workspace_id=sql_record.workspace_id,
+            root_path=sql_record.root_path,
+            project_type=sql_record.project_type,
+            settings=dict(sql_record.settings or {}),
+            created_at=sql_record.created_at,
+            updated_at=sql_record.updated_at
+        )
@@ -0,0 +1 @@
+# This file makes domain a Python package.
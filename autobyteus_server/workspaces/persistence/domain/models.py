@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+@dataclass
+class WorkspaceRecord:
+    """
+    The persisted part of a workspace: enough to register it again after a restart.
+    """
+    workspace_id: str
+    root_path: str
+    project_type: str = "UNKNOWN"
+    settings: Dict[str, Any] = field(default_factory=dict)
+    id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,2 @@
+# This file makes models a Python package and defines its public API.
+from .sql.workspace_record import WorkspaceRecord
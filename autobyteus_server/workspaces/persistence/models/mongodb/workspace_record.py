@@ -0,0 +1,62 @@
+from repository_mongodb import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class MongoWorkspaceRecord(BaseModel):
+    __collection_name__ = "workspaces"
+
+    workspace_id: str
+    root_path: str
+    project_type: str
+    settings: Dict[str, Any]
+    created_at: datetime
+    updated_at: datetime
+
+    def __init__(
+        self,
+        workspace_id: str,
+        root_path: str,
+        project_type: str,
+        settings: Optional[Dict[str, Any]] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+        **kwargs
+    ):
+        super().__init__(
+            workspace_id=workspace_id,
+            root_path=root_path,
+            project_type=project_type,
+            settings=settings or {},
+            created_at=created_at or datetime.utcnow(),
+            updated_at=updated_at or datetime.utcnow(),
+            **kwargs
+        )
+
+    def to_dict(self) -> dict:
+        """Convert workspace record to dictionary representation."""
+        data = {
+            "workspace_id": self.workspace_id,
+            "root_path": self.root_path,
+            "project_type": self.project_type,
+            "settings": self.settings,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+        if hasattr(self, '_id') and self._id is not None:
+            data["_id"] = self._id
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MongoWorkspaceRecord':
+        """Create workspace record instance from dictionary."""
+        record = cls(
+            workspace_id=data["workspace_id"],
+            root_path=data["root_path"],
+            project_type=data["project_type"],
+            settings=data.get("settings"),
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at")
+        )
+        if "_id" in data:
+            record._id = data["_id"]
+        return record
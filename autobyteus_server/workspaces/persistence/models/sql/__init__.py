@@ -0,0 +1 @@
+# This file makes sql a Python package under models.
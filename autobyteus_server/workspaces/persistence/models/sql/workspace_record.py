@@ -0,0 +1,42 @@
+from sqlalchemy import Column, String, DateTime, Integer, JSON
+from datetime import datetime
+from typing import Any, Dict, Optional
+from repository_sqlalchemy import Base
+
+class WorkspaceRecord(Base):
+    __tablename__ = 'workspaces'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    workspace_id = Column(String(36), unique=True, nullable=False)
+    root_path = Column(String, unique=True, nullable=False)
+    project_type = Column(String, nullable=False)
+    settings = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __init__(
+        self,
+        workspace_id: str,
+        root_path: str,
+        project_type: str,
+        settings: Optional[Dict[str, Any]] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None
+    ):
+        self.workspace_id = workspace_id
+        self.root_path = root_path
+        self.project_type = project_type
+        self.settings = settings or {}
+        self.created_at = created_at or datetime.utcnow()
+        self.updated_at = updated_at or datetime.utcnow()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "workspace_id": self.workspace_id,
+            "root_path": self.root_path,
+            "project_type": self.project_type,
+            "settings": self.settings,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
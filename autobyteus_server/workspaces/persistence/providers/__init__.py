@@ -0,0 +1 @@
+# This file makes providers a Python package.
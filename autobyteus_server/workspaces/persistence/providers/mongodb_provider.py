@@ -0,0 +1,18 @@
+from autobyteus_server.workspaces.persistence.repositories.mongodb.workspace_record_repository import MongoWorkspaceRecordRepository
+from autobyteus_server.workspaces.persistence.converters.mongodb_converter import MongoDBConverter
+from autobyteus_server.workspaces.persistence.domain.models import WorkspaceRecord as DomainWorkspaceRecord
+from typing import List
+
+class MongoDBProvider:
+    def __init__(self):
+        self.repository = MongoWorkspaceRecordRepository()
+        self.converter = MongoDBConverter()
+
+    def save_workspace(self, record: DomainWorkspaceRecord) -> DomainWorkspaceRecord:
+        return self.converter.to_domain_record(self.repository.save_workspace(record))
+
+    def get_all_workspaces(self) -> List[DomainWorkspaceRecord]:
+        return [self.converter.to_domain_record(r) for r in self.repository.get_all_workspaces()]
+
+    def delete_workspace(self, workspace_id: str) -> bool:
+        return self.repository.delete_workspace(workspace_id)
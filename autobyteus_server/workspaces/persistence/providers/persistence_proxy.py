@@ -0,0 +1,27 @@
+import os
+from typing import List
+from autobyteus_server.workspaces.persistence.domain.models import WorkspaceRecord as DomainWorkspaceRecord
+
+class WorkspacePersistenceProvider:
+    """
+    Persists the workspace registry in the app database selected by PERSISTENCE_PROVIDER.
+    """
+    def __init__(self):
+        provider_type = os.getenv('PERSISTENCE_PROVIDER', 'sqlite').lower()
+        if provider_type == 'mongodb':
+            from autobyteus_server.workspaces.persistence.providers.mongodb_provider import MongoDBProvider
+            self.provider = MongoDBProvider()
+        elif provider_type in ['postgresql', 'sqlite']:
+            from autobyteus_server.workspaces.persistence.providers.sql_provider import SQLProvider
+            self.provider = SQLProvider()
+        else:
+            raise ValueError(f"Unsupported persistence provider: {provider_type}")
+
+    def save_workspace(self, record: DomainWorkspaceRecord) -> DomainWorkspaceRecord:
+        return self.provider.save_workspace(record)
+
+    def get_all_workspaces(self) -> List[DomainWorkspaceRecord]:
+        return self.provider.get_all_workspaces()
+
+    def delete_workspace(self, workspace_id: str) -> bool:
+        return self.provider.delete_workspace(workspace_id)
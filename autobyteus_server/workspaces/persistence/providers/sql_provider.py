@@ -0,0 +1,18 @@
+from autobyteus_server.workspaces.persistence.repositories.sql.workspace_record_repository import SQLWorkspaceRecordRepository
+from autobyteus_server.workspaces.persistence.converters.sql_converter import SQLConverter
+from autobyteus_server.workspaces.persistence.domain.models import WorkspaceRecord as DomainWorkspaceRecord
+from typing import List
+
+class SQLProvider:
+    def __init__(self):
+        self.repository = SQLWorkspaceRecordRepository()
+        self.converter = SQLConverter()
+
+    def save_workspace(self, record: DomainWorkspaceRecord) -> DomainWorkspaceRecord:
+        return self.converter.to_domain_record(self.repository.save_workspace(record))
+
+    def get_all_workspaces(self) -> List[DomainWorkspaceRecord]:
+        return [self.converter.to_domain_record(r) for r in self.repository.get_all_workspaces()]
+
+    def delete_workspace(self, workspace_id: str) -> bool:
+        return self.repository.delete_workspace(workspace_id)
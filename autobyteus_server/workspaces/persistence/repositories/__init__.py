@@ -0,0 +1 @@
+# This file makes repositories a Python package.
@@ -0,0 +1 @@
+# This file makes mongodb a Python package under repositories.
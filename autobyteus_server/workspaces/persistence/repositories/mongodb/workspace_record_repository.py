@@ -0,0 +1,54 @@
+import logging
+from datetime import datetime
+from typing import List, Optional
+from repository_mongodb import BaseRepository
+from autobyteus_server.workspaces.persistence.models.mongodb.workspace_record import MongoWorkspaceRecord
+from autobyteus_server.workspaces.persistence.domain.models import WorkspaceRecord as DomainWorkspaceRecord
+
+logger = logging.getLogger(__name__)
+
+class MongoWorkspaceRecordRepository(BaseRepository[MongoWorkspaceRecord]):
+    model = MongoWorkspaceRecord
+
+    def save_workspace(self, record: DomainWorkspaceRecord) -> MongoWorkspaceRecord:
+        """
+        Creates the record of a workspace, or updates it if its workspace ID or root path is known.
+        """
+        try:
+            existing = self.collection.find_one(
+                {"$or": [{"workspace_id": record.workspace_id}, {"root_path": record.root_path}]},
+                session=self.session)
+            mongo_record = MongoWorkspaceRecord(
+                workspace_id=record.workspace_id,
+                root_path=record.root_path,
+                project_type=record.project_type,
+                settings=record.settings,
+                created_at=existing.get("created_at") if existing else None,
+                updated_at=datetime.utcnow()
+            )
+            if existing is None:
+                result = self.collection.insert_one(mongo_record.to_dict(), session=self.session)
+                mongo_record._id = result.inserted_id
+            else:
+                mongo_record._id = existing["_id"]
+                self.collection.replace_one({"_id": existing["_id"]}, mongo_record.to_dict(), session=self.session)
+            return mongo_record
+        except Exception as e:
+            logger.error(f"Failed to save workspace record: {str(e)}")
+            raise
+
+    def get_all_workspaces(self) -> List[MongoWorkspaceRecord]:
+        try:
+            data = self.collection.find({}, session=self.session)
+            return [MongoWorkspaceRecord.from_dict(item) for item in data]
+        except Exception as e:
+            logger.error(f"Failed to retrieve workspace records: {str(e)}")
+            raise
+
+    def delete_workspace(self, workspace_id: str) -> bool:
+        try:
+            result = self.collection.delete_one({"workspace_id": workspace_id}, session=self.session)
+            return result.deleted_count > 0
+        except Exception as e:
+            logger.error(f"Failed to delete workspace record: {str(e)}")
+            raise
@@ -0,0 +1,65 @@
+import logging
+from datetime import datetime
+from typing import List, Optional
+from repository_sqlalchemy import BaseRepository
+from autobyteus_server.workspaces.persistence.models.sql.workspace_record import WorkspaceRecord as SQLWorkspaceRecord
+from autobyteus_server.workspaces.persistence.domain.models import WorkspaceRecord as DomainWorkspaceRecord
+
+logger = logging.getLogger(__name__)
+
+class SQLWorkspaceRecordRepository(BaseRepository[SQLWorkspaceRecord]):
+    model = SQLWorkspaceRecord
+
+    def save_workspace(self, record: DomainWorkspaceRecord) -> SQLWorkspaceRecord:
+        """
+        Creates the record of a workspace, or updates it if its workspace ID or root path is known.
+        """
+        try:
+            sql_record = self.session.query(SQLWorkspaceRecord).filter(
+                (SQLWorkspaceRecord.workspace_id == record.workspace_id)
+                | (SQLWorkspaceRecord.root_path == record.root_path)).first()
+            if sql_record is None:
+                return self.create(SQLWorkspaceRecord(
+                    workspace_id=record.workspace_id,
+                    root_path=record.root_path,
+                    project_type=record.project_type,
+                    settings=record.settings
+                ))
+            return self.update(sql_record, {
+                "workspace_id": record.workspace_id,
+                "root_path": record.root_path,
+                "project_type": record.project_type,
+                "settings": dict(record.settings),
+                "updated_at": datetime.utcnow()
+            })
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to save workspace record: {str(e)}")
+            raise
+
+    def get_all_workspaces(self) -> List[SQLWorkspaceRecord]:
+        try:
+            return self.session.query(SQLWorkspaceRecord).order_by(SQLWorkspaceRecord.id).all()
+        except Exception as e:
+            logger.error(f"Failed to retrieve workspace records: {str(e)}")
+            raise
+
+    def get_workspace_by_workspace_id(self, workspace_id: str) -> Optional[SQLWorkspaceRecord]:
+        try:
+            return self.session.query(SQLWorkspaceRecord).filter(
+                SQLWorkspaceRecord.workspace_id == workspace_id).first()
+        except Exception as e:
+            logger.error(f"Failed to get workspace record by workspace id: {str(e)}")
+            raise
+
+    def delete_workspace(self, workspace_id: str) -> bool:
+        try:
+            sql_record = self.get_workspace_by_workspace_id(workspace_id)
+            if sql_record is None:
+                return False
+            self.delete(sql_record)
+            return True
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to delete workspace record: {str(e)}")
+            raise
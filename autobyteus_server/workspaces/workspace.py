@@ -9,13 +9,18 @@ access to the directory tree and workflow functionalities.
 
 import uuid
 import os
-from typing import Dict, Optional
+from typing import Callable, Optional
 from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.search.bm25_index import BM25Index
 from autobyteus_server.search.hackathon_search_service import HackathonSearchService
 from autobyteus_server.workspaces.setting.project_types import ProjectType
 from autobyteus_server.workflow.automated_coding_workflow import AutomatedCodingWorkflow
 from autobyteus_server.workspaces.workspace_tools.command_executor import CommandExecutionResult, CommandExecutor
 from autobyteus_server.ai_terminal.ai_terminal import AITerminal
+from autobyteus_server.workspaces.workspace_tools.workspace_indexer.symbol_index import SymbolIndex
+
+_NO_MEMORY_USAGE = {"tree": 0, "content_cache": 0, "symbol_index": 0, "search_index": 0, "total": 0}
+
 
 class Workspace:
     """
@@ -31,7 +36,11 @@ class Workspace:
         root_path: str,
         project_type: ProjectType,
         file_explorer: FileExplorer = None,
-        workflow: AutomatedCodingWorkflow = None
+        workflow: AutomatedCodingWorkflow = None,
+        symbol_index: Optional[SymbolIndex] = None,
+        search_index: Optional[BM25Index] = None,
+        workspace_id: Optional[str] = None,
+        settings: Optional[dict] = None
     ):
         """
         Initialize a Workspace instance.
@@ -43,40 +52,30 @@ class Workspace:
                 Defaults to None.
             workflow (AutomatedCodingWorkflow, optional): An instance of AutomatedCodingWorkflow to handle
                 automated coding tasks within the workspace. Defaults to None.
+            symbol_index (SymbolIndex, optional): The index of the code symbols of the workspace.
+                Defaults to None, in which case an unpersisted index is created on first use.
+            search_index (BM25Index, optional): The relevance index of the workspace files.
+                Defaults to None, in which case an unpersisted index is created on first use.
+            workspace_id (str, optional): The stable ID of a workspace restored from the registry.
+                Defaults to None, in which case a new ID is generated.
+            settings (dict, optional): The persisted settings of the workspace. Defaults to None.
         """
         self.root_path = root_path
         self.project_type = project_type
         self.name = os.path.basename(root_path)  # Name is set to the basename of root_path
-        self.workspace_id = str(uuid.uuid4())
+        self.workspace_id = workspace_id or str(uuid.uuid4())
+        self.settings: dict = dict(settings or {})
         self.file_explorer: FileExplorer = file_explorer
         self._workflow: AutomatedCodingWorkflow = workflow
         self._command_executor: CommandExecutor = None
         self._ai_terminal: Optional[AITerminal] = None
-        self._file_name_index: Optional[Dict[str, str]] = None  # Map from file name to file path
-        self._build_file_name_index()
-        self.hackathon_search_service = HackathonSearchService()  # Initialize HackathonSearchService
-
-    def _build_file_name_index(self):
-        """
-        Builds an index of file names to file paths for quick search.
-        """
-        file_explorer = self.get_file_explorer()
-        all_file_paths = file_explorer.get_all_file_paths()
-        self._file_name_index = {}
-        for path in all_file_paths:
-            file_name = os.path.basename(path)
-            self._file_name_index[file_name] = path
-
-    def get_file_name_index(self) -> Dict[str, str]:
-        """
-        Returns the file name index.
-
-        Returns:
-            Dict[str, str]: A dictionary mapping file names to their paths.
-        """
-        if self._file_name_index is None:
-            self._build_file_name_index()
-        return self._file_name_index
+        self._symbol_index: Optional[SymbolIndex] = symbol_index
+        self._search_index: Optional[BM25Index] = search_index
+        self.hackathon_search_service = HackathonSearchService(self)
+        self.is_loaded = file_explorer is not None
+        self._memory_usage: dict = dict(_NO_MEMORY_USAGE)
+        # Set by the WorkspaceManager; loads the workspace again after release()
+        self.loader: Optional[Callable[['Workspace'], Optional['Workspace']]] = None
 
     @property
     def project_type(self) -> ProjectType:
@@ -107,14 +106,18 @@ class Workspace:
         """
         Retrieve the FileExplorer instance for navigating the workspace's directory structure.
 
-        If the FileExplorer is not already initialized, it will be created using the workspace's root path.
+        A released workspace is loaded again through its loader, so the manager tracks it.
 
         Returns:
             FileExplorer: The FileExplorer instance associated with this workspace.
+
+        Raises:
+            ValueError: If the workspace is not loaded and cannot be loaded again.
         """
+        if self.file_explorer is None and self.loader is not None:
+            self.loader(self)
         if self.file_explorer is None:
-            self.file_explorer = FileExplorer(self.root_path)
-            self.file_explorer.build_workspace_directory_tree()
+            raise ValueError(f"Workspace {self.workspace_id} is not loaded")
         return self.file_explorer
 
     def set_file_explorer(self, file_explorer: FileExplorer):
@@ -126,6 +129,32 @@ class Workspace:
         """
         self.file_explorer = file_explorer
 
+    def get_symbol_index(self) -> SymbolIndex:
+        """
+        Retrieve the index of the classes, functions and methods of the workspace.
+
+        The index is created on first use and filled by its first refresh().
+
+        Returns:
+            SymbolIndex: The SymbolIndex associated with this workspace.
+        """
+        if self._symbol_index is None:
+            self._symbol_index = SymbolIndex(self.get_file_explorer())
+        return self._symbol_index
+
+    def get_search_index(self) -> BM25Index:
+        """
+        Retrieve the BM25 relevance index of the files of the workspace.
+
+        The index is created on first use and filled by its first refresh().
+
+        Returns:
+            BM25Index: The BM25Index associated with this workspace.
+        """
+        if self._search_index is None:
+            self._search_index = BM25Index(self.get_file_explorer())
+        return self._search_index
+
     @property
     def workflow(self) -> AutomatedCodingWorkflow:
         """
@@ -186,6 +215,86 @@ class Workspace:
         executor = self.get_command_executor()
         return await executor.execute_command(command)
 
+    def load(self, file_explorer: FileExplorer, workflow: AutomatedCodingWorkflow,
+             symbol_index: Optional[SymbolIndex] = None, search_index: Optional[BM25Index] = None) -> None:
+        """
+        Attaches the in-memory parts of the workspace, e.g. again after release().
+
+        Args:
+            file_explorer (FileExplorer): The file explorer of the workspace.
+            workflow (AutomatedCodingWorkflow): The workflow of the workspace.
+            symbol_index (SymbolIndex, optional): The index of the code symbols of the workspace.
+            search_index (BM25Index, optional): The relevance index of the workspace files.
+        """
+        self.file_explorer = file_explorer
+        self.workflow = workflow
+        self._symbol_index = symbol_index
+        self._search_index = search_index
+        self.is_loaded = True
+
+    def release(self) -> None:
+        """
+        Releases the directory tree, the indexes, the workflow, the terminal and the command executor,
+        keeping only the metadata of the workspace (id, root path, name and project type).
+        """
+        self.close()
+        if self.file_explorer is not None:
+            self.file_explorer.stop_watching()
+        self.file_explorer = None
+        self._workflow = None
+        self._command_executor = None
+        self._ai_terminal = None
+        self._symbol_index = None
+        self._search_index = None
+        self._memory_usage = dict(_NO_MEMORY_USAGE)
+        self.is_loaded = False
+
+    def is_busy(self) -> bool:
+        """
+        Whether releasing the workspace would interrupt work: its tree is being scanned, background
+        operations are running, clients follow its file system changes, or a workflow step is running.
+        """
+        file_explorer = self.file_explorer
+        if file_explorer is None:
+            return False
+        return (not file_explorer.scan_progress.is_finished
+                or (self._workflow is not None and self._workflow.is_running())
+                or file_explorer.change_hub.subscriber_count > 0
+                or any(not operation.is_finished for operation in file_explorer.background_operations.list_operations()))
+
+    def get_memory_usage(self) -> dict:
+        """
+        Returns the memory held by the workspace, in bytes, as estimated by the last refresh_memory_usage().
+
+        Returns:
+            dict: The bytes of the directory tree (with its path and file name indexes), the file
+                content cache, the symbol index and the search index, and their total.
+        """
+        return dict(self._memory_usage)
+
+    def refresh_memory_usage(self) -> bool:
+        """
+        Estimates the memory held by the workspace again. This walks the tree and the indexes under
+        their locks, so it is called off the event loop. While the tree is scanned the previous
+        estimate is kept; the workspace is busy and cannot be released anyway.
+
+        Returns:
+            bool: True if the estimate changed.
+        """
+        file_explorer = self.file_explorer
+        if file_explorer is not None and not file_explorer.scan_progress.is_finished:
+            return False
+        usage = {
+            "tree": file_explorer.get_memory_usage() if file_explorer is not None else 0,
+            "content_cache": file_explorer.content_cache.get_stats()["bytes"] if file_explorer is not None else 0,
+            "symbol_index": self._symbol_index.nbytes() if self._symbol_index is not None else 0,
+            "search_index": self._search_index.nbytes() if self._search_index is not None else 0,
+        }
+        usage["total"] = sum(usage.values())
+        changed = usage != self._memory_usage
+        self._memory_usage = usage
+        return changed
+
     def close(self):
         """
         Close and cleanup workspace resources.
@@ -194,6 +303,10 @@ class Workspace:
             self._ai_terminal.close()
         if self._command_executor:
             self._command_executor.close()
+        if self._symbol_index is not None:
+            self._symbol_index.close()
+        if self._search_index is not None:
+            self._search_index.close()
 
     def __del__(self):
         """
@@ -1,13 +1,27 @@
+import asyncio
 import logging
-from typing import Optional, List
+import os
+import threading
+from typing import Dict, Optional, List
 
 from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.file_system_changes import FileSystemChangeEvent
+from autobyteus_server.file_explorer.io_executor import run_io
+from autobyteus_server.file_explorer.tree_snapshot import TreeSnapshotCache
+from autobyteus_server.file_explorer.workspace_scope import WorkspaceScope
 from autobyteus.utils.singleton import SingletonMeta
 from autobyteus_server.workspaces.workspace import Workspace
+from autobyteus_server.workspaces.workspace_memory_budget import WorkspaceMemoryBudget
+from autobyteus_server.workspaces.persistence.domain.models import WorkspaceRecord
 from autobyteus_server.workspaces.workspace_registry import WorkspaceRegistry
-from autobyteus_server.workspaces.workspace_tools.project_type_determiner import ProjectTypeDeterminer
+from autobyteus_server.workspaces.setting.project_types import ProjectType
+from autobyteus_server.workspaces.workspace_tools.project_type_determiner import (
+    ProjectTypeDeterminer, ProjectTypeVisitor)
+from autobyteus_server.search.bm25_index import BM25Index, BM25IndexStore
+from autobyteus_server.workspaces.workspace_tools.workspace_indexer.symbol_index import SymbolIndex, SymbolStore
 
 from autobyteus_server.workflow.automated_coding_workflow import AutomatedCodingWorkflow
+from autobyteus_server.config import app_config_provider
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +32,16 @@ class WorkspaceManager(metaclass=SingletonMeta):
     Attributes:
         workspace_registry (WorkspaceRegistry): A registry to store workspaces.
         project_type_determiner (ProjectTypeDeterminer): A tool to determine the project type.
+        tree_snapshot_cache (Optional[TreeSnapshotCache]): Persists workspace trees across restarts,
+            unless disabled through FILE_EXPLORER_TREE_SNAPSHOTS.
+        symbol_store (Optional[SymbolStore]): Persists workspace symbol indexes across restarts,
+            unless disabled through WORKSPACE_INDEX_PERSIST.
+        search_index_store (Optional[BM25IndexStore]): Persists workspace relevance indexes across
+            restarts, unless disabled through WORKSPACE_INDEX_PERSIST.
+        memory_budget (WorkspaceMemoryBudget): Decides which idle workspaces are released; a released
+            workspace is loaded again when it is next retrieved.
+        persistence (Optional[WorkspacePersistenceProvider]): Persists the registry in the app database
+            so workspaces keep their IDs across restarts, unless disabled through WORKSPACE_REGISTRY_PERSIST.
     """
 
     def __init__(self):
@@ -26,6 +50,116 @@ class WorkspaceManager(metaclass=SingletonMeta):
         """
         self.workspace_registry = WorkspaceRegistry()
         self.project_type_determiner = ProjectTypeDeterminer()
+        self._tree_snapshot_cache: Optional[TreeSnapshotCache] = None
+        self._symbol_store: Optional[SymbolStore] = None
+        self._search_index_store: Optional[BM25IndexStore] = None
+        self._persistence = None
+        self.memory_budget = WorkspaceMemoryBudget()
+        # Running tree scans of workspaces added in the background, referenced until they finish
+        self._scan_tasks: Dict[str, asyncio.Future] = {}
+        # The running refresh of the memory estimates, referenced until it finishes
+        self._memory_refresh_task: Optional[asyncio.Future] = None
+        # Serializes loading and releasing workspaces, which may happen from I/O threads
+        self._load_lock = threading.RLock()
+
+    @property
+    def tree_snapshot_cache(self) -> Optional[TreeSnapshotCache]:
+        """
+        The cache of workspace tree snapshots under the app data directory, created on first use.
+        """
+        if os.getenv('FILE_EXPLORER_TREE_SNAPSHOTS', 'true').lower() != 'true':
+            return None
+        if self._tree_snapshot_cache is None:
+            snapshots_dir = app_config_provider.config.get_workspace_snapshots_dir()
+            self._tree_snapshot_cache = TreeSnapshotCache(str(snapshots_dir))
+        return self._tree_snapshot_cache
+
+    @property
+    def symbol_store(self) -> Optional[SymbolStore]:
+        """
+        The store of workspace symbol indexes under the app data directory, created on first use.
+        """
+        if os.getenv('WORKSPACE_INDEX_PERSIST', 'true').lower() != 'true':
+            return None
+        if self._symbol_store is None:
+            indexes_dir = app_config_provider.config.get_workspace_indexes_dir()
+            self._symbol_store = SymbolStore(str(indexes_dir))
+        return self._symbol_store
+
+    @property
+    def search_index_store(self) -> Optional[BM25IndexStore]:
+        """
+        The store of workspace relevance indexes under the app data directory, created on first use.
+        """
+        if os.getenv('WORKSPACE_INDEX_PERSIST', 'true').lower() != 'true':
+            return None
+        if self._search_index_store is None:
+            indexes_dir = app_config_provider.config.get_workspace_indexes_dir()
+            self._search_index_store = BM25IndexStore(str(indexes_dir))
+        return self._search_index_store
+
+    @property
+    def persistence(self):
+        """
+        The persistence provider of the workspace registry, created on first use.
+        """
+        if os.getenv('WORKSPACE_REGISTRY_PERSIST', 'true').lower() != 'true':
+            return None
+        if self._persistence is None:
+            from autobyteus_server.workspaces.persistence.providers.persistence_proxy import WorkspacePersistenceProvider
+            self._persistence = WorkspacePersistenceProvider()
+        return self._persistence
+
+    def restore_workspaces(self) -> List[Workspace]:
+        """
+        Registers the workspaces persisted in the app database under their stored IDs.
+
+        Nothing is loaded: a restored workspace is built when it is first retrieved, like a released one.
+        Workspaces whose root folder no longer exists are skipped.
+
+        Returns:
+            List[Workspace]: The restored workspaces.
+        """
+        persistence = self.persistence
+        if persistence is None:
+            return []
+        restored = []
+        for record in persistence.get_all_workspaces():
+            if self.workspace_registry.workspace_exists_by_id(record.workspace_id) or \
+                    self.workspace_registry.get_workspace_by_root_path(record.root_path):
+                continue
+            if not os.path.isdir(record.root_path):
+                logger.warning(f"Skipping workspace {record.workspace_id}: {record.root_path} no longer exists")
+                continue
+            try:
+                project_type = ProjectType[record.project_type]
+            except KeyError:
+                project_type = ProjectType.UNKNOWN
+            workspace = Workspace(root_path=record.root_path, project_type=project_type,
+                                  workspace_id=record.workspace_id, settings=record.settings)
+            workspace.loader = self._use_workspace
+            self.workspace_registry.add_workspace(workspace)
+            restored.append(workspace)
+        logger.info(f"Restored {len(restored)} workspaces from the registry")
+        return restored
+
+    def _save_workspace_record(self, workspace: Workspace) -> None:
+        """
+        Persists the registry entry of a workspace. A failure is logged; the workspace stays registered
+        for this run.
+        """
+        try:
+            persistence = self.persistence
+            if persistence is None:
+                return
+            persistence.save_workspace(WorkspaceRecord(
+                workspace_id=workspace.workspace_id,
+                root_path=workspace.root_path,
+                project_type=workspace.project_type.name,
+                settings=workspace.settings
+            ))
+        except Exception as e:
+            logger.error(f"Failed to persist workspace {workspace.workspace_id} at {workspace.root_path}: {e}")
 
     def get_workspace_file_explorer(self, workspace_id: str) -> Optional[FileExplorer]:
         """
@@ -37,7 +171,7 @@ class WorkspaceManager(metaclass=SingletonMeta):
         Returns:
             Optional[FileExplorer]: The FileExplorer object if the workspace exists, None otherwise.
         """
-        workspace = self.workspace_registry.get_workspace_by_id(workspace_id)
+        workspace = self.get_workspace_by_id(workspace_id)
         return workspace.file_explorer if workspace else None
 
     def add_workspace(self, workspace_root_path: str) -> Workspace:
@@ -55,35 +189,241 @@ class WorkspaceManager(metaclass=SingletonMeta):
         existing_workspace = self.workspace_registry.get_workspace_by_root_path(workspace_root_path)
         if existing_workspace:
             logger.info(f"Workspace already exists at path: {workspace_root_path}")
-            return existing_workspace
+            return self._use_workspace(existing_workspace)
+
+        workspace = self._create_workspace(workspace_root_path)
+        workspace.file_explorer.build_workspace_directory_tree()
+        logger.info(f"Built directory tree for workspace at {workspace_root_path}, "
+                    f"project type '{workspace.project_type}'")
+        self._start_file_explorer(workspace.file_explorer)
+
+        workspace.refresh_memory_usage()
 
-        # Determine the project type
-        project_type = self.project_type_determiner.determine(workspace_root_path)
-        logger.info(f"Determined project type '{project_type}' for workspace at {workspace_root_path}")
+        self.workspace_registry.add_workspace(workspace)
+        self._save_workspace_record(workspace)
+        logger.info(f"Workspace with ID {workspace.workspace_id} added to registry.")
+
+        return self._use_workspace(workspace, loaded=True)
+
+    async def add_workspace_in_background(self, workspace_root_path: str) -> Workspace:
+        """
+        Adds a workspace to the workspace registry without waiting for its directory tree, or
+        returns the existing one.
+
+        The tree is built on the background executor. Until the build is done the workspace serves
+        the partial tree, and its file explorer's scan_progress reports the progress.
+
+        Args:
+            workspace_root_path (str): The root path of the workspace.
+
+        Returns:
+            Workspace: The created or existing Workspace object.
+        """
+        existing_workspace = self.workspace_registry.get_workspace_by_root_path(workspace_root_path)
+        if existing_workspace:
+            logger.info(f"Workspace already exists at path: {workspace_root_path}")
+            return self._use_workspace(existing_workspace)
+
+        workspace = self._create_workspace(workspace_root_path)
+        self.workspace_registry.add_workspace(workspace)
+        self._save_workspace_record(workspace)
+        logger.info(f"Workspace with ID {workspace.workspace_id} added to registry, scanning its directory tree.")
+        # Mutations requested before the scan takes the tree lock wait for it
+        workspace.file_explorer.mark_scan_pending()
+        self._scan_tasks[workspace.workspace_id] = asyncio.ensure_future(self._scan_workspace(workspace))
+        return self._use_workspace(workspace, loaded=True)
+
+    async def _scan_workspace(self, workspace: Workspace) -> None:
+        file_explorer = workspace.file_explorer
+        project_type = workspace.project_type
+        try:
+            await file_explorer.scan_workspace_directory_tree()
+            logger.info(f"Built directory tree for workspace at {workspace.root_path}, "
+                        f"project type '{workspace.project_type}'")
+            self._start_file_explorer(file_explorer)
+            if workspace.project_type != project_type:
+                await run_io(self._save_workspace_record, workspace)
+        except Exception as e:
+            logger.error(f"Failed to build directory tree for workspace at {workspace.root_path}: {e}")
+        finally:
+            self._scan_tasks.pop(workspace.workspace_id, None)
+        if workspace.is_loaded and await run_io(workspace.refresh_memory_usage):
+            self._enforce_memory_budget()
+
+    def _create_workspace(self, workspace_root_path: str) -> Workspace:
+        """
+        Creates a workspace with its file explorer, indexes and workflow; the directory tree is not built.
+        The project type is unknown until the tree scan determined it.
+        """
+        workspace = Workspace(root_path=workspace_root_path, project_type=ProjectType.UNKNOWN)
+        workspace.loader = self._use_workspace
+        self._load_workspace(workspace)
+        return workspace
 
-        # Build the directory tree
-        file_explorer = FileExplorer(workspace_root_path)
-        file_explorer.build_workspace_directory_tree()
-        logger.info(f"Built directory tree for workspace at {workspace_root_path}")
+    def _load_workspace(self, workspace: Workspace) -> None:
+        """
+        Creates the file explorer, indexes and workflow of a workspace; the directory tree is not built.
+        """
+        workspace_root_path = workspace.root_path
+        file_explorer = FileExplorer(workspace_root_path, snapshot_cache=self.tree_snapshot_cache,
+                                     scope=WorkspaceScope.from_dict(workspace.settings.get("scope")))
 
         # Create the workflow
         workflow = AutomatedCodingWorkflow()
         logger.info(f"Initialized AutomatedCodingWorkflow for workspace at {workspace_root_path}")
 
-        # Create and register the Workspace
-        workspace = Workspace(root_path=workspace_root_path, 
-                              project_type=project_type, file_explorer=file_explorer, workflow=workflow)
-        
+        symbol_index = SymbolIndex(file_explorer, store=self.symbol_store)
+        search_index = BM25Index(file_explorer, store=self.search_index_store)
+        workspace.load(file_explorer, workflow, symbol_index=symbol_index, search_index=search_index)
+
         workflow.workspace = workspace
-        
-        self.workspace_registry.add_workspace(workspace)
-        logger.info(f"Workspace with ID {workspace.workspace_id} added to registry.")
+        file_explorer.scan_pipeline.add_visitor(ProjectTypeVisitor(workspace, self.project_type_determiner))
+
+    def _reload_workspace(self, workspace: Workspace) -> None:
+        """
+        Loads a released workspace again. With a running event loop its tree is scanned in the
+        background, as for a newly added workspace; otherwise it is built right away.
+        """
+        logger.info(f"Reloading released workspace {workspace.workspace_id} at {workspace.root_path}")
+        self._load_workspace(workspace)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            project_type = workspace.project_type
+            workspace.file_explorer.build_workspace_directory_tree()
+            self._start_file_explorer(workspace.file_explorer)
+            workspace.refresh_memory_usage()
+            if workspace.project_type != project_type:
+                self._save_workspace_record(workspace)
+            return
+        # Mutations requested before the scan takes the tree lock wait for it
+        workspace.file_explorer.mark_scan_pending()
+        self._scan_tasks[workspace.workspace_id] = asyncio.ensure_future(self._scan_workspace(workspace))
+
+    def _use_workspace(self, workspace: Optional[Workspace], loaded: bool = False) -> Optional[Workspace]:
+        """
+        Marks a workspace as used, loading it again if it was released.
+
+        The memory budget is only evaluated when a workspace was loaded; the memory estimates are
+        refreshed in the background when they are due, and the budget evaluated again if they changed.
 
+        Args:
+            workspace (Optional[Workspace]): The workspace.
+            loaded (bool): Whether the caller just loaded the workspace.
+        """
+        if workspace is None:
+            return None
+        with self._load_lock:
+            if not workspace.is_loaded and self.workspace_registry.workspace_exists_by_id(workspace.workspace_id):
+                self._reload_workspace(workspace)
+                loaded = True
+            self.memory_budget.touch(workspace.workspace_id)
+        if loaded:
+            self._enforce_memory_budget()
+        if self.memory_budget.claim_refresh():
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # Not on the event loop, e.g. on an I/O thread
+                self._refresh_memory_usage()
+            else:
+                self._memory_refresh_task = asyncio.ensure_future(run_io(self._refresh_memory_usage))
         return workspace
 
+    def _refresh_memory_usage(self) -> None:
+        """
+        Estimates the memory of the loaded workspaces again and releases the idle ones that no longer
+        fit in the budget. Walks the trees and indexes, so it runs off the event loop.
+        """
+        try:
+            changed = False
+            for workspace in self.get_all_workspaces():
+                if workspace.is_loaded:
+                    changed = workspace.refresh_memory_usage() or changed
+            if changed:
+                self._enforce_memory_budget()
+        except Exception as e:
+            logger.error(f"Failed to refresh the memory usage of the workspaces: {e}")
+
+    def _enforce_memory_budget(self) -> None:
+        """
+        Releases the idle workspaces that no longer fit in the memory budget, by their cached estimates.
+        """
+        with self._load_lock:
+            for idle_workspace in self.memory_budget.select_for_demotion(self.get_all_workspaces()):
+                if idle_workspace.workspace_id in self._scan_tasks:
+                    continue
+                usage = idle_workspace.get_memory_usage()["total"]
+                idle_workspace.release()
+                logger.info(f"Released idle workspace {idle_workspace.workspace_id} at {idle_workspace.root_path} "
+                            f"(about {usage // 1024} KB)")
+
+    @staticmethod
+    def _start_file_explorer(file_explorer: FileExplorer) -> None:
+        """
+        Starts the work that needs the complete directory tree.
+        """
+        # Reclaim what background operations interrupted by a restart left in the trash
+        file_explorer.background_operations.cleanup_interrupted()
+        if os.getenv('FILE_EXPLORER_WATCH', 'true').lower() == 'true':
+            file_explorer.start_watching()
+
+    async def set_workspace_scope(self, workspace_id: str, scope: WorkspaceScope) -> Optional[FileSystemChangeEvent]:
+        """
+        Changes which part of a workspace is loaded and persists it with the workspace.
+
+        The folders the change affects are read again once a running scan is done; a released
+        workspace uses the scope when it is loaded again.
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+            scope (WorkspaceScope): The include and exclude globs and limits of the workspace.
+
+        Returns:
+            Optional[FileSystemChangeEvent]: The changes made to the tree, or None if the workspace
+                does not exist.
+        """
+        workspace = self.get_workspace_by_id(workspace_id)
+        if workspace is None:
+            return None
+        if scope.is_sparse:
+            workspace.settings["scope"] = scope.to_dict()
+        else:
+            workspace.settings.pop("scope", None)
+        await run_io(self._save_workspace_record, workspace)
+        return await workspace.file_explorer.set_scope_async(scope)
+
+    def remove_workspace(self, workspace_id: str) -> bool:
+        """
+        Releases a workspace and removes it from the registry.
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+
+        Returns:
+            bool: True if the workspace was removed, False if it does not exist.
+        """
+        with self._load_lock:
+            workspace = self.workspace_registry.remove_workspace(workspace_id)
+            if workspace is None:
+                return False
+            scan_task = self._scan_tasks.pop(workspace_id, None)
+            if scan_task is not None:
+                scan_task.cancel()
+            self.memory_budget.forget(workspace_id)
+            workspace.release()
+        try:
+            if self.persistence is not None:
+                self.persistence.delete_workspace(workspace_id)
+        except Exception as e:
+            logger.error(f"Failed to delete the persisted record of workspace {workspace_id}: {e}")
+        logger.info(f"Workspace with ID {workspace_id} removed from registry.")
+        return True
+
     def get_workspace_by_root_path(self, workspace_root_path: str) -> Optional[Workspace]:
         """
         Retrieves a workspace from the workspace registry using the root path.
+        A released workspace is loaded again.
 
         Args:
             workspace_root_path (str): The root path of the workspace.
@@ -91,11 +431,11 @@ class WorkspaceManager(metaclass=SingletonMeta):
         Returns:
             Optional[Workspace]: The workspace if it exists, None otherwise.
         """
-        return self.workspace_registry.get_workspace_by_root_path(workspace_root_path)
+        return self._use_workspace(self.workspace_registry.get_workspace_by_root_path(workspace_root_path))
 
     def get_workspace_by_id(self, workspace_id: str) -> Optional[Workspace]:
         """
-        Retrieves a workspace using its ID.
+        Retrieves a workspace using its ID. A released workspace is loaded again.
 
         Args:
             workspace_id (str): The ID of the workspace.
@@ -103,13 +443,31 @@ class WorkspaceManager(metaclass=SingletonMeta):
         Returns:
             Optional[Workspace]: The workspace if it exists, None otherwise.
         """
-        return self.workspace_registry.get_workspace_by_id(workspace_id)
+        return self._use_workspace(self.workspace_registry.get_workspace_by_id(workspace_id))
 
     def get_all_workspaces(self) -> List[Workspace]:
         """
-        Retrieves all registered workspaces.
+        Retrieves all registered workspaces, without loading released ones.
 
         Returns:
             List[Workspace]: A list of all Workspace objects.
         """
-        return self.workspace_registry.get_all_workspaces()
\ No newline at end of file
+        return self.workspace_registry.get_all_workspaces()
+
+    def get_memory_usage(self) -> Dict[str, dict]:
+        """
+        Estimates the memory held by each registered workspace.
+
+        Returns:
+            Dict[str, dict]: Per workspace ID, whether it is loaded, how many seconds ago it was last
+                used, and its last estimated memory usage in bytes as returned by
+                Workspace.get_memory_usage().
+        """
+        return {
+            workspace.workspace_id: {
+                "loaded": workspace.is_loaded,
+                "idle_seconds": self.memory_budget.idle_seconds(workspace.workspace_id),
+                **workspace.get_memory_usage(),
+            }
+            for workspace in self.get_all_workspaces()
+        }
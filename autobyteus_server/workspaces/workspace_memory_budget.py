@@ -0,0 +1,135 @@
+"""
+Module: workspace_memory_budget
+
+Bounds how many workspaces keep their tree, indexes, workflow and terminal in memory.
+
+Every access to a workspace marks it as used. When more workspaces are loaded than
+WORKSPACE_MAX_LOADED, or their estimated memory exceeds WORKSPACE_MEMORY_BUDGET_MB, the least
+recently used ones are chosen for demotion: they keep only their metadata (id, root path, project
+type) and are loaded again on their next access. A workspace is never demoted while it is busy
+(scanning, running background operations or followed by subscribers) or before it has been idle
+for WORKSPACE_MIN_IDLE_SECONDS, so workspaces in use are not reloaded over and over.
+
+Measuring a workspace walks its tree and indexes, so the estimates are cached on the workspaces and
+refreshed at most every WORKSPACE_MEMORY_REFRESH_SECONDS, off the event loop. The budget is only
+evaluated when a workspace is loaded or the estimates changed.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from autobyteus_server.workspaces.workspace import Workspace
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LOADED = 8
+DEFAULT_MEMORY_BUDGET_MB = 1024
+DEFAULT_MIN_IDLE_SECONDS = 60
+DEFAULT_REFRESH_SECONDS = 30
+
+
+class WorkspaceMemoryBudget:
+    """
+    Tracks when workspaces were last used and picks the ones to demote.
+    """
+
+    def __init__(self, max_loaded: Optional[int] = None, max_bytes: Optional[int] = None,
+                 min_idle_seconds: Optional[float] = None, refresh_seconds: Optional[float] = None):
+        """
+        Initialize the WorkspaceMemoryBudget.
+
+        Args:
+            max_loaded (Optional[int]): The number of workspaces kept loaded. Defaults to
+                WORKSPACE_MAX_LOADED, or 8. 0 means no limit.
+            max_bytes (Optional[int]): The estimated memory the loaded workspaces may use. Defaults to
+                WORKSPACE_MEMORY_BUDGET_MB megabytes, or 1GB. 0 means no limit.
+            min_idle_seconds (Optional[float]): How long a workspace must be unused before it can be
+                demoted. Defaults to WORKSPACE_MIN_IDLE_SECONDS, or 60.
+            refresh_seconds (Optional[float]): How often the memory estimates of the workspaces are
+                refreshed. Defaults to WORKSPACE_MEMORY_REFRESH_SECONDS, or 30.
+        """
+        self.max_loaded = max_loaded if max_loaded is not None else int(
+            os.getenv('WORKSPACE_MAX_LOADED', DEFAULT_MAX_LOADED))
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            float(os.getenv('WORKSPACE_MEMORY_BUDGET_MB', DEFAULT_MEMORY_BUDGET_MB)) * 1024 * 1024)
+        self.min_idle_seconds = min_idle_seconds if min_idle_seconds is not None else float(
+            os.getenv('WORKSPACE_MIN_IDLE_SECONDS', DEFAULT_MIN_IDLE_SECONDS))
+        self.refresh_seconds = refresh_seconds if refresh_seconds is not None else float(
+            os.getenv('WORKSPACE_MEMORY_REFRESH_SECONDS', DEFAULT_REFRESH_SECONDS))
+        self._last_refresh: Optional[float] = None
+        # Workspace id -> time of last use, least recently used first
+        self._last_used: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def touch(self, workspace_id: str) -> None:
+        """
+        Marks a workspace as used now.
+        """
+        with self._lock:
+            self._last_used[workspace_id] = time.monotonic()
+            self._last_used.move_to_end(workspace_id)
+
+    def forget(self, workspace_id: str) -> None:
+        with self._lock:
+            self._last_used.pop(workspace_id, None)
+
+    def idle_seconds(self, workspace_id: str) -> Optional[float]:
+        """
+        Returns how long ago a workspace was last used, or None if it never was.
+        """
+        with self._lock:
+            last_used = self._last_used.get(workspace_id)
+        return time.monotonic() - last_used if last_used is not None else None
+
+    def claim_refresh(self) -> bool:
+        """
+        Returns True, at most once per refresh_seconds, when the memory estimates should be refreshed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._last_refresh is not None and now - self._last_refresh < self.refresh_seconds:
+                return False
+            self._last_refresh = now
+            return True
+
+    def select_for_demotion(self, workspaces: Iterable['Workspace']) -> List['Workspace']:
+        """
+        Picks the loaded workspaces to demote so the others fit in the budget, least recently used first.
+        Uses the cached memory estimates of the workspaces.
+
+        Args:
+            workspaces (Iterable[Workspace]): The registered workspaces.
+
+        Returns:
+            List[Workspace]: The workspaces to demote. May leave the budget exceeded when the
+                remaining workspaces are busy or were used recently.
+        """
+        loaded = [workspace for workspace in workspaces if workspace.is_loaded]
+        if not self.max_loaded and not self.max_bytes:
+            return []
+        with self._lock:
+            order = {workspace_id: position for position, workspace_id in enumerate(self._last_used)}
+            last_used = dict(self._last_used)
+        # Never used workspaces count as the least recently used ones
+        loaded.sort(key=lambda workspace: order.get(workspace.workspace_id, -1))
+        usage = {workspace.workspace_id: workspace.get_memory_usage()["total"] for workspace in loaded}
+        count, total_bytes = len(loaded), sum(usage.values())
+        now = time.monotonic()
+        demoted: List['Workspace'] = []
+        for workspace in loaded:
+            over_count = self.max_loaded and count > self.max_loaded
+            over_bytes = self.max_bytes and total_bytes > self.max_bytes
+            if not over_count and not over_bytes:
+                break
+            idle = now - last_used.get(workspace.workspace_id, float('-inf'))
+            if idle < self.min_idle_seconds or workspace.is_busy():
+                continue
+            demoted.append(workspace)
+            count -= 1
+            total_bytes -= usage[workspace.workspace_id]
+        return demoted
@@ -41,6 +41,21 @@ class WorkspaceRegistry(metaclass=SingletonMeta):
         self.id_to_workspace[workspace.workspace_id] = workspace
         self.root_path_to_workspace[workspace.root_path] = workspace
 
+    def remove_workspace(self, workspace_id: str) -> Optional[Workspace]:
+        """
+        Removes a workspace from the registry.
+
+        Args:
+            workspace_id (str): The ID of the workspace.
+
+        Returns:
+            Optional[Workspace]: The removed workspace, or None if it was not registered.
+        """
+        workspace = self.id_to_workspace.pop(workspace_id, None)
+        if workspace is not None:
+            self.root_path_to_workspace.pop(workspace.root_path, None)
+        return workspace
+
     def get_workspace_by_id(self, workspace_id: str) -> Optional[Workspace]:
         """
         Retrieves a workspace from the registry using its ID.
@@ -0,0 +1,285 @@
+"""
+Module: context_selector
+
+Automatic selection of the workspace files to give an LLM as context for a requirement.
+
+Files are ranked by a weighted sum of local signals, each between 0 and 1:
+- lexical: the BM25 relevance of the file to the requirement, relative to the best match;
+- symbols: the file defines a class, function or method the requirement names;
+- imports: a file the user picked imports it;
+- recency: how recently the file was modified, halved every RECENCY_HALF_LIFE_HOURS.
+Recency only reorders files found by the other signals; on its own it does not make a file relevant.
+
+The best files are then packed into a token budget measured with the local token estimator. No
+file takes more than half of the budget; longer files are cut after the last whole line that fits.
+"""
+
+import logging
+import os
+import re
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from autobyteus_server.workspaces.workspace_tools.context_selector.token_estimator import (
+    estimate_tokens, truncate_to_tokens)
+
+if TYPE_CHECKING:
+    from autobyteus_server.workspaces.workspace import Workspace
+
+logger = logging.getLogger(__name__)
+
+LEXICAL_WEIGHT = 1.0
+SYMBOL_WEIGHT = 0.8
+IMPORT_WEIGHT = 0.7
+RECENCY_WEIGHT = 0.2
+RECENCY_HALF_LIFE_HOURS = 24
+LEXICAL_CANDIDATES = 50
+SYMBOL_MATCHES = 5
+MAX_RANKED_FILES = 50
+DEFAULT_TOKEN_BUDGET = 8000
+MAX_FILE_SHARE = 0.5
+# Files that would keep fewer tokens than this after truncation are left out
+MIN_FILE_TOKENS = 64
+TRUNCATION_MARKER = "[... truncated]\n"
+
+_CODE_IDENTIFIER = re.compile(
+    r'`([^`\s]+)`'
+    r'|\b([A-Za-z_]\w*)\('
+    r'|\b([A-Za-z_]\w*(?:\.[A-Za-z_]\w*)+|[A-Za-z]\w*_\w*|[a-z]+[A-Z]\w*|[A-Z][a-z0-9]+[A-Z]\w*)\b')
+_PYTHON_IMPORT = re.compile(r'^[ \t]*(?:from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]+\(?([\w, \t*]+)|import[ \t]+([\w., \t]+))',
+                            re.MULTILINE)
+_SCRIPT_IMPORT = re.compile(r'''(?:\bfrom|\bimport|\brequire\(|\bimport\()\s*['"](\.{1,2}/[^'"]+)['"]''')
+_SCRIPT_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs', '.vue')
+_SCRIPT_RESOLUTION_SUFFIXES = ('', '.ts', '.tsx', '.js', '.jsx', '.vue', '/index.ts', '/index.tsx', '/index.js')
+
+
+class RankedFile(NamedTuple):
+    path: str
+    score: float
+    signals: Dict[str, float]
+
+
+class SelectedFile(NamedTuple):
+    path: str
+    score: float
+    content: str
+    tokens: int
+    truncated: bool
+
+
+def mentioned_symbols(requirement: str) -> List[str]:
+    """
+    Returns the names in a requirement that look like code identifiers: `quoted` words, calls,
+    dotted names (their last part), snake_case and camelCase words.
+    """
+    names: List[str] = []
+    for match in _CODE_IDENTIFIER.finditer(requirement):
+        name = next(group for group in match.groups() if group)
+        name = name.rstrip('()').rsplit('.', 1)[-1]
+        if len(name) > 1 and name not in names:
+            names.append(name)
+    return names
+
+
+def format_context(selected: Iterable[SelectedFile]) -> str:
+    """
+    Formats selected files like the context built from the files the user picked.
+    """
+    context = ""
+    for selected_file in selected:
+        # Truncated content ends after a whole line
+        content = selected_file.content + TRUNCATION_MARKER if selected_file.truncated else selected_file.content
+        context += f"File: {selected_file.path}\n{content}\n\n"
+    return context
+
+
+class ContextSelector:
+    """
+    Ranks the files of a workspace by their relevance to a requirement and packs the best ones
+    into a token budget.
+    """
+
+    def __init__(self, workspace: 'Workspace', token_budget: Optional[int] = None):
+        """
+        Initialize the ContextSelector.
+
+        Args:
+            workspace (Workspace): The workspace to select files from.
+            token_budget (Optional[int]): The default budget of select(). Defaults to
+                AUTO_CONTEXT_TOKEN_BUDGET, or 8000 tokens.
+        """
+        self.workspace = workspace
+        self.token_budget = token_budget if token_budget is not None else int(
+            os.getenv('AUTO_CONTEXT_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET))
+
+    def rank(self, requirement: str, picked_paths: Iterable[str] = (),
+             limit: int = MAX_RANKED_FILES) -> List[RankedFile]:
+        """
+        Ranks the workspace files for a requirement. Indexes are refreshed first if files changed.
+
+        Args:
+            requirement (str): The requirement.
+            picked_paths (Iterable[str]): The relative paths of the files the user picked. They are
+                not ranked; the files they import are.
+            limit (int): The maximum number of files.
+
+        Returns:
+            List[RankedFile]: The ranked files, best first, with the value of each signal.
+        """
+        picked = {os.path.normpath(path) for path in picked_paths}
+        signals: Dict[str, Dict[str, float]] = {}
+
+        def add_signal(path: str, name: str, value: float) -> None:
+            if path not in picked:
+                file_signals = signals.setdefault(path, {})
+                file_signals[name] = max(value, file_signals.get(name, 0.0))
+
+        search_index = self.workspace.get_search_index()
+        if not search_index.is_built or search_index.is_stale:
+            search_index.refresh()
+        lexical = search_index.search(requirement, LEXICAL_CANDIDATES)
+        if lexical:
+            best_score = lexical[0][1]
+            for path, score in lexical:
+                add_signal(path, "lexical", score / best_score)
+
+        names = mentioned_symbols(requirement)
+        if names:
+            symbol_index = self.workspace.get_symbol_index()
+            if not symbol_index.is_built or symbol_index.is_stale:
+                symbol_index.refresh()
+            for name in names:
+                for result in symbol_index.search(name, SYMBOL_MATCHES):
+                    # Exact name matches only
+                    if result["score"] >= 100:
+                        add_signal(result["path"], "symbols", 1.0)
+
+        for path in self._imported_files(picked):
+            add_signal(path, "imports", 1.0)
+
+        now = time.time()
+        ranked: List[RankedFile] = []
+        for path, file_signals in signals.items():
+            try:
+                age_hours = max(0.0, now - os.stat(self._absolute_path(path)).st_mtime) / 3600
+            except OSError:
+                continue
+            file_signals["recency"] = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+            score = (LEXICAL_WEIGHT * file_signals.get("lexical", 0.0)
+                     + SYMBOL_WEIGHT * file_signals.get("symbols", 0.0)
+                     + IMPORT_WEIGHT * file_signals.get("imports", 0.0)
+                     + RECENCY_WEIGHT * file_signals["recency"])
+            ranked.append(RankedFile(path, round(score, 4), file_signals))
+        ranked.sort(key=lambda ranked_file: (-ranked_file.score, ranked_file.path))
+        return ranked[:limit]
+
+    def select(self, requirement: str, picked_paths: Iterable[str] = (),
+               token_budget: Optional[int] = None) -> List[SelectedFile]:
+        """
+        Picks the best ranked files that fit in a token budget, truncating long ones.
+
+        Args:
+            requirement (str): The requirement.
+            picked_paths (Iterable[str]): The relative paths of the files the user picked.
+            token_budget (Optional[int]): The tokens the selected files may take, including their
+                headers as formatted by format_context(). Defaults to the selector's budget.
+
+        Returns:
+            List[SelectedFile]: The selected files, best first.
+        """
+        budget = token_budget if token_budget is not None else self.token_budget
+        if budget < MIN_FILE_TOKENS:
+            return []
+        content_cache = self.workspace.get_file_explorer().content_cache
+        max_file_tokens = max(MIN_FILE_TOKENS, int(budget * MAX_FILE_SHARE))
+        remaining = budget
+        selected: List[SelectedFile] = []
+        for ranked_file in self.rank(requirement, picked_paths):
+            if remaining < MIN_FILE_TOKENS:
+                break
+            try:
+                content = content_cache.read_text(self._absolute_path(ranked_file.path))
+            except (OSError, UnicodeDecodeError):
+                continue
+            header_tokens = estimate_tokens(f"File: {ranked_file.path}\n{TRUNCATION_MARKER}\n")
+            content, tokens, truncated = truncate_to_tokens(content, min(max_file_tokens, remaining) - header_tokens)
+            if truncated and tokens < MIN_FILE_TOKENS:
+                continue
+            selected.append(SelectedFile(ranked_file.path, ranked_file.score, content, tokens, truncated))
+            remaining -= tokens + header_tokens
+        logger.debug(f"Selected {len(selected)} context files using {budget - remaining} of {budget} tokens")
+        return selected
+
+    def _absolute_path(self, path: str) -> str:
+        return os.path.join(self.workspace.root_path, path)
+
+    def _imported_files(self, picked: Set[str]) -> Set[str]:
+        """
+        Resolves the imports of the picked Python and JavaScript/TypeScript files to workspace files.
+        """
+        content_cache = self.workspace.get_file_explorer().content_cache
+        imported: Set[str] = set()
+        for path in picked:
+            try:
+                source = content_cache.read_text(self._absolute_path(path))
+            except (OSError, UnicodeDecodeError):
+                continue
+            if path.endswith('.py'):
+                candidates = self._python_import_candidates(path, source)
+            elif path.endswith(_SCRIPT_EXTENSIONS):
+                candidates = self._script_import_candidates(path, source)
+            else:
+                continue
+            imported.update(candidate for candidate in candidates if self._is_workspace_file(candidate))
+        return imported
+
+    @staticmethod
+    def _python_import_candidates(path: str, source: str) -> List[str]:
+        directory = os.path.dirname(path)
+        # Absolute imports resolve against the workspace root or any folder above the file (src layouts)
+        ancestors = [directory]
+        while ancestors[-1]:
+            ancestors.append(os.path.dirname(ancestors[-1]))
+        candidates: List[str] = []
+        for from_module, from_names, modules in _PYTHON_IMPORT.findall(source):
+            if modules:
+                module_names, bases = [name.split(' as ')[0].strip() for name in modules.split(',')], ancestors
+            else:
+                level = len(from_module) - len(from_module.lstrip('.'))
+                module = from_module[level:]
+                if level:
+                    base = directory
+                    for _ in range(level - 1):
+                        base = os.path.dirname(base)
+                    bases = [base]
+                else:
+                    bases = ancestors
+                names = [name.split(' as ')[0].strip() for name in from_names.split(',')]
+                module_names = [module] + [f"{module}.{name}" if module else name
+                                           for name in names if name and name != '*']
+            for module_name in module_names:
+                if not module_name:
+                    continue
+                module_path = module_name.replace('.', os.sep)
+                for base in bases:
+                    candidates.append(os.path.join(base, module_path + '.py'))
+                    candidates.append(os.path.join(base, module_path, '__init__.py'))
+        return candidates
+
+    @staticmethod
+    def _script_import_candidates(path: str, source: str) -> List[str]:
+        directory = os.path.dirname(path)
+        candidates: List[str] = []
+        for specifier in _SCRIPT_IMPORT.findall(source):
+            target = os.path.normpath(os.path.join(directory, specifier))
+            candidates.extend(target + suffix for suffix in _SCRIPT_RESOLUTION_SUFFIXES)
+        return candidates
+
+    def _is_workspace_file(self, path: str) -> bool:
+        path = os.path.normpath(path)
+        if path.startswith(os.pardir):
+            return False
+        file_explorer = self.workspace.get_file_explorer()
+        with file_explorer.tree_lock:
+            index = file_explorer.path_index.resolve(path)
+            return index is not None and file_explorer.path_index.store.is_file(index)
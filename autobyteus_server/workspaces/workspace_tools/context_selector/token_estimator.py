@@ -0,0 +1,63 @@
+"""
+Module: token_estimator
+
+A local estimate of how many LLM tokens a text takes, for budgeting prompt context without a
+model-specific tokenizer.
+
+Byte pair encodings used by current models turn common words into one token and split longer or
+rarer words into pieces of about four characters; punctuation and symbols are mostly a token each,
+and non-ASCII characters take several bytes, hence more tokens. The estimate follows these rules
+and errs on the high side for code, so context packed to a budget does not overflow it.
+"""
+
+import re
+from typing import List, Tuple
+
+CHARS_PER_TOKEN = 4
+
+_PIECE = re.compile(r'\w+|[^\w\s]')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens of a text.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The estimated token count.
+    """
+    tokens = 0
+    for piece in _PIECE.findall(text):
+        if piece.isascii():
+            tokens += (len(piece) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+        else:
+            tokens += len(piece.encode('utf-8')) // 2 or 1
+    # Line breaks and indentation runs
+    return tokens + text.count('\n')
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> Tuple[str, int, bool]:
+    """
+    Cuts a text after the last whole line that fits in a token budget.
+
+    Args:
+        text (str): The text.
+        max_tokens (int): The budget.
+
+    Returns:
+        Tuple[str, int, bool]: The kept text, its estimated token count, and whether lines were cut.
+    """
+    total = estimate_tokens(text)
+    if total <= max_tokens:
+        return text, total, False
+    kept: List[str] = []
+    tokens = 0
+    for line in text.splitlines(keepends=True):
+        line_tokens = estimate_tokens(line)
+        if tokens + line_tokens > max_tokens:
+            break
+        kept.append(line)
+        tokens += line_tokens
+    return ''.join(kept), tokens, True
@@ -1,9 +1,15 @@
 # autobyteus_server/workspaces/project_type_determiner/project_type_determiner.py
 
 import os
+from typing import TYPE_CHECKING, Iterable
 
+from autobyteus_server.file_explorer.scan_pipeline import ScanVisitor
 from autobyteus_server.workspaces.setting.project_types import ProjectType
 
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.file_explorer import FileExplorer
+    from autobyteus_server.workspaces.workspace import Workspace
+
 class ProjectTypeDeterminer:
     """
     Class to determine the type of a project.
@@ -34,9 +40,37 @@ class ProjectTypeDeterminer:
         Returns:
             ProjectType: The type of the project, one of the ProjectType enum values.
         """
-        for file_name in os.listdir(workspace_root_path):
+        return self.determine_from_names(os.listdir(workspace_root_path))
+
+    def determine_from_names(self, file_names: Iterable[str]) -> ProjectType:
+        """
+        Determine the type of the project from the names of the files in the workspace root.
+
+        Args:
+            file_names (Iterable[str]): The names of the entries of the root directory.
+
+        Returns:
+            ProjectType: The type of the project, one of the ProjectType enum values.
+        """
+        for file_name in file_names:
             if file_name in self.PROJECT_TYPE_FILES:
                 return self.PROJECT_TYPE_FILES[file_name]
 
         # Default to 'unknown' if no specific project type can be determined
         return ProjectType.UNKNOWN
+
+
+class ProjectTypeVisitor(ScanVisitor):
+    """
+    Sets the project type of a workspace from the root of its scanned tree, so the root is not
+    listed again.
+    """
+
+    def __init__(self, workspace: 'Workspace', determiner: ProjectTypeDeterminer):
+        self.workspace = workspace
+        self.determiner = determiner
+
+    def scan_finished(self, file_explorer: 'FileExplorer') -> None:
+        store = file_explorer.tree_store
+        names = (store.name(child) for child in store.iter_children(store.root_index))
+        self.workspace.project_type = self.determiner.determine_from_names(names)
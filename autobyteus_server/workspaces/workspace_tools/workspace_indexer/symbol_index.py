@@ -0,0 +1,369 @@
+"""
+Module: symbol_index
+
+An incremental index of the code symbols (classes, functions and methods) of a workspace.
+
+Symbols are stored per content hash: a file is only parsed again when its content changed, and
+files with the same content share their symbols. A refresh checks the files that the
+WorkspaceChangeTracker reports (every file the first time, afterwards only the changed ones) and
+only hashes the files whose mtime or size changed. Files are hashed and parsed in the worker
+processes of the content search, in batches, unless only a few of them changed.
+
+The index is persisted per workspace by a SymbolStore, so a restarted server re-parses only the
+files that changed in the meantime.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from rapidfuzz import fuzz, process
+
+from autobyteus_server.file_explorer.change_tracker import FileStat, WorkspaceChangeTracker
+from autobyteus_server.file_explorer.content_search import get_search_process_pool
+from autobyteus_server.workspaces.workspace_tools.workspace_indexer.symbol_parsers import (
+    DEFAULT_SYMBOL_PARSERS, CodeSymbol, ParsedFile, SymbolParser, find_parser, parse_files)
+
+if TYPE_CHECKING:
+    from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+logger = logging.getLogger(__name__)
+
+SYMBOL_INDEX_VERSION = 1
+FILES_PER_BATCH = 64
+# Fewer changed files than this are parsed in the calling thread instead of the worker processes
+INLINE_PARSE_LIMIT = 16
+MAX_FILE_SIZE = 2 * 1024 * 1024
+FUZZY_SCORE_CUTOFF = 70
+
+# (mtime_ns, size, content hash) per indexed file
+FileEntry = Tuple[int, int, str]
+
+
+class SymbolStore:
+    """
+    Stores one symbol index per workspace root path in a directory.
+    """
+
+    def __init__(self, store_dir: str):
+        """
+        Initialize the SymbolStore.
+
+        Args:
+            store_dir (str): The directory holding the index files. Created on first save.
+        """
+        self.store_dir = Path(store_dir)
+
+    def index_path(self, root_path: str) -> Path:
+        """
+        Returns the index file used for a workspace root path.
+        """
+        key = hashlib.sha1(os.path.normpath(root_path).encode('utf-8', 'surrogateescape')).hexdigest()
+        return self.store_dir / f"{key}.symbols.json"
+
+    def load(self, root_path: str) -> Optional[Tuple[Dict[str, FileEntry], Dict[str, List[CodeSymbol]]]]:
+        """
+        Loads the index of a workspace.
+
+        Returns:
+            Optional[Tuple[Dict[str, FileEntry], Dict[str, List[CodeSymbol]]]]: The indexed files and
+                the symbols per content hash, or None if there is no usable index.
+        """
+        path = self.index_path(root_path)
+        try:
+            data = json.loads(path.read_bytes())
+            if data['version'] != SYMBOL_INDEX_VERSION or data['root_path'] != os.path.normpath(root_path):
+                return None
+            files = {file_path: tuple(entry) for file_path, entry in data['files'].items()}
+            symbols = {content_hash: [CodeSymbol(*symbol) for symbol in file_symbols]
+                       for content_hash, file_symbols in data['symbols'].items()}
+            return files, symbols
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable symbol index {path}: {e}")
+            return None
+
+    def save(self, root_path: str, files: Dict[str, FileEntry], symbols: Dict[str, List[CodeSymbol]]) -> None:
+        """
+        Writes the index of a workspace, replacing the previous one atomically. Failures are
+        logged, since the index can always be rebuilt.
+        """
+        path = self.index_path(root_path)
+        data = json.dumps({
+            "version": SYMBOL_INDEX_VERSION,
+            "root_path": os.path.normpath(root_path),
+            "files": files,
+            "symbols": symbols,
+        }, separators=(',', ':')).encode('utf-8')
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as temp_file:
+                    temp_file.write(data)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to save symbol index {path}: {e}")
+
+    def remove(self, root_path: str) -> None:
+        """
+        Deletes the index of a workspace if there is one.
+        """
+        try:
+            self.index_path(root_path).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class _SymbolLookup:
+    """
+    Search structures over all symbols of the index, rebuilt after every change so searches
+    never wait for a refresh.
+    """
+
+    def __init__(self, files: Dict[str, FileEntry], symbols: Dict[str, List[CodeSymbol]]):
+        entries: List[Tuple[str, str, CodeSymbol]] = []  # (lower-case name, path, symbol)
+        for path, (_, _, content_hash) in files.items():
+            for symbol in symbols.get(content_hash, ()):
+                entries.append((symbol.name.lower(), path, symbol))
+        entries.sort(key=lambda entry: (entry[0], entry[1], entry[2].line))
+        self.entries = entries
+        # Unique lower-case names, with the range of their entries
+        self.names: List[str] = []
+        self.name_ranges: List[Tuple[int, int]] = []
+        for index, (key, _, _) in enumerate(entries):
+            if self.names and self.names[-1] == key:
+                self.name_ranges[-1] = (self.name_ranges[-1][0], index + 1)
+            else:
+                self.names.append(key)
+                self.name_ranges.append((index, index + 1))
+
+
+class SymbolIndex:
+    """
+    The code symbols of one workspace, kept up to date incrementally.
+    """
+
+    def __init__(self, file_explorer: 'FileExplorer', store: Optional[SymbolStore] = None,
+                 parsers: Optional[Sequence[SymbolParser]] = None):
+        """
+        Initialize the SymbolIndex. Nothing is read until the first refresh().
+
+        Args:
+            file_explorer (FileExplorer): The file explorer of the workspace.
+            store (Optional[SymbolStore]): Persists the index across restarts.
+            parsers (Optional[Sequence[SymbolParser]]): The parsers to use; defaults to Python,
+                JavaScript/TypeScript and Java.
+        """
+        self.file_explorer = file_explorer
+        self.root_path = file_explorer.workspace_root_path
+        self.store = store
+        self.parsers: List[SymbolParser] = list(DEFAULT_SYMBOL_PARSERS if parsers is None else parsers)
+        self._files: Dict[str, FileEntry] = {}
+        self._symbols: Dict[str, List[CodeSymbol]] = {}
+        self._lookup = _SymbolLookup({}, {})
+        self._loaded = False
+        self._refresh_lock = threading.Lock()
+        self.change_tracker = WorkspaceChangeTracker(file_explorer)
+
+    def register_parser(self, parser: SymbolParser) -> None:
+        """
+        Adds a parser, taking precedence over the existing ones. The next refresh re-checks all files.
+        """
+        self.parsers.insert(0, parser)
+        self.change_tracker.reset()
+        with self._refresh_lock:
+            # Previously unparsed files of the parser's language must be parsed, even if unchanged
+            self._files = {path: entry for path, entry in self._files.items() if not parser.handles(path)}
+
+    @property
+    def is_built(self) -> bool:
+        return self.change_tracker.is_refreshed
+
+    @property
+    def is_stale(self) -> bool:
+        """
+        Whether files changed, or the tree was rebuilt, since the last refresh.
+        """
+        return self.change_tracker.is_stale
+
+    def __len__(self) -> int:
+        """
+        Returns the number of indexed symbols.
+        """
+        return len(self._lookup.entries)
+
+    def refresh(self, full: bool = False) -> Dict[str, int]:
+        """
+        Brings the index up to date with the workspace and saves it if anything changed.
+
+        Args:
+            full (bool): Stat every file of the workspace instead of only the changed ones. A full
+                refresh is also done on first use and after the tree was rebuilt.
+
+        Returns:
+            Dict[str, int]: The number of files checked, parsed and removed, and the number of
+                indexed files and symbols.
+        """
+        with self._refresh_lock:
+            if not self._loaded:
+                self._load()
+            candidates, removed, token = self.change_tracker.collect(self._files, self._indexable, full=full)
+            changed, missing = self.change_tracker.stat_changed(candidates, self._indexed_stat)
+            removed |= missing
+            to_parse = [(path, self._files[path][2] if path in self._files else None) for path in changed]
+
+            parsed_count = 0
+            for path, mtime_ns, size, content_hash, symbols in self._parse(to_parse):
+                if content_hash is None:
+                    removed.add(path)
+                    continue
+                self._files[path] = (mtime_ns, size, content_hash)
+                if symbols is not None:
+                    self._symbols[content_hash] = symbols
+                    parsed_count += 1
+            for path in removed:
+                self._files.pop(path, None)
+
+            if to_parse or removed:
+                used_hashes = {entry[2] for entry in self._files.values()}
+                self._symbols = {content_hash: symbols for content_hash, symbols in self._symbols.items()
+                                 if content_hash in used_hashes}
+                self._lookup = _SymbolLookup(self._files, self._symbols)
+                if self.store is not None:
+                    self.store.save(self.root_path, self._files, self._symbols)
+            self.change_tracker.refreshed(token)
+            stats = {
+                "checked": len(candidates),
+                "parsed": parsed_count,
+                "removed": len(removed),
+                "files": len(self._files),
+                "symbols": sum(len(self._symbols.get(entry[2], ())) for entry in self._files.values()),
+            }
+            logger.debug(f"Refreshed symbol index of {self.root_path}: {stats}")
+            return stats
+
+    def _load(self) -> None:
+        self._loaded = True
+        loaded = self.store.load(self.root_path) if self.store is not None else None
+        if loaded is not None:
+            self._files, self._symbols = loaded
+            self._lookup = _SymbolLookup(self._files, self._symbols)
+
+    def _indexable(self, path: str) -> bool:
+        return find_parser(self.parsers, path) is not None
+
+    def _indexed_stat(self, path: str) -> Optional[FileStat]:
+        entry = self._files.get(path)
+        return entry[:2] if entry else None
+
+    def _parse(self, files: List[Tuple[str, Optional[str]]]) -> List[ParsedFile]:
+        if not files:
+            return []
+        if len(files) < INLINE_PARSE_LIMIT:
+            return parse_files(self.root_path, files, self.parsers, MAX_FILE_SIZE)
+        # Shares the worker processes of the content search
+        process_pool = get_search_process_pool()
+        futures = [process_pool.submit(parse_files, self.root_path, files[start:start + FILES_PER_BATCH],
+                                       self.parsers, MAX_FILE_SIZE)
+                   for start in range(0, len(files), FILES_PER_BATCH)]
+        results: List[ParsedFile] = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def search(self, query: str, limit: int = 20, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Finds symbols by name: exact matches first, then names starting with the query (shortest
+        first), then fuzzy matches. Matching is case-insensitive.
+
+        Args:
+            query (str): The name, or part of it, to search for.
+            limit (int): The maximum number of results.
+            kind (Optional[str]): Only return symbols of this kind ('class', 'function' or 'method').
+
+        Returns:
+            List[Dict[str, Any]]: The matching symbols with their file location and score.
+        """
+        query = query.strip().lower()
+        if not query or limit <= 0:
+            return []
+        lookup = self._lookup
+        results: List[Dict[str, Any]] = []
+        seen: Set[int] = set()
+
+        def add_range(start: int, end: int, score: float) -> bool:
+            for index in range(start, end):
+                name, path, symbol = lookup.entries[index]
+                if index in seen or (kind is not None and symbol.kind != kind):
+                    continue
+                seen.add(index)
+                results.append(self._to_dict(path, symbol, score))
+                if len(results) >= limit:
+                    return True
+            return False
+
+        # Names starting with the query are adjacent in the sorted names; shortest first
+        prefix_names = sorted(range(bisect.bisect_left(lookup.names, query),
+                                    bisect.bisect_left(lookup.names, query + '\uffff')),
+                              key=lambda name_index: len(lookup.names[name_index]))
+        for name_index in prefix_names:
+            name = lookup.names[name_index]
+            score = 100.0 if name == query else round(90.0 + 10.0 * len(query) / len(name), 2)
+            if add_range(*lookup.name_ranges[name_index], score):
+                return results
+
+        for _, score, name_index in process.extract(query, lookup.names, scorer=fuzz.WRatio, limit=limit * 2,
+                                                    score_cutoff=FUZZY_SCORE_CUTOFF):
+            if add_range(*lookup.name_ranges[name_index], round(score * 0.85, 2)):
+                break
+        return results
+
+    @staticmethod
+    def _to_dict(path: str, symbol: CodeSymbol, score: float) -> Dict[str, Any]:
+        return {
+            "name": symbol.name,
+            "qualified_name": f"{symbol.container}.{symbol.name}" if symbol.container else symbol.name,
+            "kind": symbol.kind,
+            "path": path,
+            "line": symbol.line,
+            "end_line": symbol.end_line,
+            "score": score,
+        }
+
+    def get_file_symbols(self, path: str) -> List[CodeSymbol]:
+        """
+        Returns the indexed symbols of a file, in declaration order.
+        """
+        entry = self._files.get(os.path.normpath(path))
+        return list(self._symbols.get(entry[2], ())) if entry else []
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate memory used by the index in bytes.
+        """
+        # Held by refresh() while it changes the files and symbols
+        with self._refresh_lock:
+            symbols = [symbol for file_symbols in self._symbols.values() for symbol in file_symbols]
+            return (sys.getsizeof(self._files) + sys.getsizeof(self._symbols) + sys.getsizeof(self._lookup.entries)
+                    + sum(sys.getsizeof(path) + sys.getsizeof(entry) for path, entry in self._files.items())
+                    + sum(sys.getsizeof(symbol) + sys.getsizeof(symbol.name) for symbol in symbols)
+                    # One (lower-case name, path, symbol) lookup entry per symbol and file sharing it
+                    + len(self._lookup.entries) * (sys.getsizeof(()) + 3 * 8))
+
+    def close(self) -> None:
+        """
+        Stops following the changes of the workspace.
+        """
+        self.change_tracker.close()
@@ -0,0 +1,260 @@
+"""
+Module: symbol_parsers
+
+Parsers that extract the code symbols (classes, functions and methods) of source files, and the
+function that runs them in worker processes.
+
+Python is parsed with the ast module. Brace-delimited languages (JavaScript/TypeScript, Java)
+use BraceLanguageSymbolParser, which matches declarations line by line and tracks braces to
+find the enclosing class and the end of every block. Other languages can be supported by
+passing another SymbolParser to the SymbolIndex; parsers are pickled to the worker processes,
+so they must be defined at module level.
+
+This module only imports the standard library, so starting a worker process is cheap.
+"""
+
+import ast
+import hashlib
+import os
+import re
+from typing import Iterable, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+
+class CodeSymbol(NamedTuple):
+    """
+    A class, function or method declared in a source file.
+
+    Attributes:
+        name: The declared name.
+        kind: 'class', 'function' or 'method'.
+        line: The 1-based line of the declaration.
+        end_line: The last line of the declaration's body.
+        container: The qualified name of the enclosing class, or None at module level.
+    """
+    name: str
+    kind: str
+    line: int
+    end_line: int
+    container: Optional[str] = None
+
+
+# (relative path, mtime_ns, size, content hash, symbols); the hash is None if the file could not be
+# read and the symbols are None if its content still has the previously indexed hash
+ParsedFile = Tuple[str, int, int, Optional[str], Optional[List[CodeSymbol]]]
+
+
+class SymbolParser:
+    """
+    Extracts the symbols of the files of one language.
+
+    Attributes:
+        language (str): The name of the language.
+        extensions (Tuple[str, ...]): The lower-case file extensions handled by the parser.
+    """
+    language: str = ''
+    extensions: Tuple[str, ...] = ()
+
+    def handles(self, path: str) -> bool:
+        return os.path.splitext(path)[1].lower() in self.extensions
+
+    def parse(self, source: str) -> List[CodeSymbol]:
+        """
+        Returns the symbols declared in a source file, in declaration order.
+
+        Raises:
+            ValueError: If the source cannot be parsed.
+        """
+        raise NotImplementedError("This method should be implemented by subclasses.")
+
+
+class PythonSymbolParser(SymbolParser):
+    """
+    Parses Python with the ast module. Functions nested in functions are not indexed.
+    """
+    language = 'python'
+    extensions = ('.py', '.pyi')
+
+    def parse(self, source: str) -> List[CodeSymbol]:
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError) as e:
+            raise ValueError(f"Invalid Python source: {e}") from e
+        symbols: List[CodeSymbol] = []
+        self._collect(tree.body, None, symbols)
+        return symbols
+
+    def _collect(self, body: Iterable[ast.stmt], container: Optional[str], symbols: List[CodeSymbol]) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                symbols.append(CodeSymbol(node.name, 'class', node.lineno, node.end_lineno, container))
+                self._collect(node.body, f"{container}.{node.name}" if container else node.name, symbols)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = 'method' if container else 'function'
+                symbols.append(CodeSymbol(node.name, kind, node.lineno, node.end_lineno, container))
+            elif isinstance(node, (ast.If, ast.Try, ast.With, ast.AsyncWith)):
+                # Conditional definitions, e.g. under "if TYPE_CHECKING:" or "try: ... except ImportError:"
+                for field in ('body', 'orelse', 'finalbody'):
+                    self._collect(getattr(node, field, ()), container, symbols)
+                for handler in getattr(node, 'handlers', ()):
+                    self._collect(handler.body, container, symbols)
+
+
+_STRINGS_AND_COMMENTS = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|`(?:\\.|[^`\\])*`|//.*')
+
+
+class BraceLanguageSymbolParser(SymbolParser):
+    """
+    Parses languages whose blocks are delimited by braces with one regular expression per kind
+    of declaration, capturing the declared name in a group.
+
+    A declaration's block ends on the line where the brace depth drops back to the depth of the
+    declaration. Methods are only matched directly inside a class body, functions only outside
+    of one. Block comments and multi-line strings are not recognized, which can shift the
+    computed end lines but rarely the declarations themselves.
+    """
+
+    def __init__(self, language: str, extensions: Sequence[str], class_pattern: str, function_pattern: str,
+                 method_pattern: str, keywords: Sequence[str] = ()):
+        """
+        Initialize a BraceLanguageSymbolParser.
+
+        Args:
+            language (str): The name of the language.
+            extensions (Sequence[str]): The file extensions of the language.
+            class_pattern (str): Matches a class declaration at the start of a line.
+            function_pattern (str): Matches a function declaration outside of classes.
+            method_pattern (str): Matches a method declaration in a class body.
+            keywords (Sequence[str]): Names that are never methods (e.g. 'if', 'for').
+        """
+        self.language = language
+        self.extensions = tuple(extension.lower() for extension in extensions)
+        self.class_pattern: Pattern = re.compile(class_pattern)
+        self.function_pattern: Pattern = re.compile(function_pattern)
+        self.method_pattern: Pattern = re.compile(method_pattern)
+        self.keywords = frozenset(keywords)
+
+    def parse(self, source: str) -> List[CodeSymbol]:
+        symbols: List[CodeSymbol] = []
+        # Open declarations: (index in symbols, brace depth before the declaration, qualified class name)
+        open_blocks: List[Tuple[int, int, Optional[str]]] = []
+        depth = 0
+        for line_number, line in enumerate(source.splitlines(), start=1):
+            code = _STRINGS_AND_COMMENTS.sub('""', line).strip()
+            if not code:
+                continue
+            container_depth, container = next(((block_depth, name) for _, block_depth, name in reversed(open_blocks)
+                                                if name is not None), (None, None))
+            in_class_body = container is not None and depth == container_depth + 1
+            symbol = None
+            name = self._declared_name(self.class_pattern, code)
+            if name is not None:
+                symbol = CodeSymbol(name, 'class', line_number, line_number, container)
+            elif in_class_body:
+                name = self._declared_name(self.method_pattern, code)
+                if name is not None:
+                    symbol = CodeSymbol(name, 'method', line_number, line_number, container)
+            elif container is None:
+                name = self._declared_name(self.function_pattern, code)
+                if name is not None:
+                    symbol = CodeSymbol(name, 'function', line_number, line_number, None)
+            if symbol is not None:
+                qualified_name = None
+                if symbol.kind == 'class':
+                    qualified_name = f"{container}.{symbol.name}" if container else symbol.name
+                symbols.append(symbol)
+                open_blocks.append((len(symbols) - 1, depth, qualified_name))
+
+            for character in code:
+                if character == '{':
+                    depth += 1
+                elif character == '}':
+                    depth = max(0, depth - 1)
+                    while open_blocks and depth <= open_blocks[-1][1]:
+                        index, _, _ = open_blocks.pop()
+                        symbols[index] = symbols[index]._replace(end_line=line_number)
+            if open_blocks and depth == open_blocks[-1][1] and code.endswith(';'):
+                # A declaration without a body, e.g. an abstract or interface method
+                open_blocks.pop()
+        return symbols
+
+    def _declared_name(self, pattern: Pattern, code: str) -> Optional[str]:
+        match = pattern.match(code)
+        if match is None:
+            return None
+        # The first group that matched, so patterns may have alternatives
+        name = next((group for group in match.groups() if group), None)
+        return None if name in self.keywords else name
+
+
+_JS_IDENTIFIER = r'[A-Za-z_$][\w$]*'
+
+JAVASCRIPT_SYMBOL_PARSER = BraceLanguageSymbolParser(
+    language='javascript',
+    extensions=('.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx', '.vue'),
+    class_pattern=rf'^(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+({_JS_IDENTIFIER})',
+    function_pattern=(rf'^(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*({_JS_IDENTIFIER})'
+                      rf'|^(?:export\s+)?(?:const|let|var)\s+({_JS_IDENTIFIER})\s*(?::[^=]+)?=\s*(?:async\s+)?'
+                      rf'(?:function\b|\([^)]*\)\s*(?::[^=]+)?=>|{_JS_IDENTIFIER}\s*=>)'),
+    method_pattern=(rf'^(?:(?:public|private|protected|static|async|readonly|abstract|override|get|set)\s+)*'
+                    rf'\*?({_JS_IDENTIFIER})\s*(?:<[^>]*>)?\s*\('),
+    keywords=('if', 'for', 'while', 'switch', 'catch', 'return', 'function', 'with', 'super'),
+)
+
+JAVA_SYMBOL_PARSER = BraceLanguageSymbolParser(
+    language='java',
+    extensions=('.java',),
+    class_pattern=r'^(?:@\w+(?:\([^)]*\))?\s+)*(?:(?:public|protected|private|abstract|final|static|sealed|strictfp)\s+)*'
+                  r'(?:class|interface|enum|record|@interface)\s+(\w+)',
+    function_pattern=r'(?!)',  # Java has no functions outside of classes
+    method_pattern=r'^(?:@\w+(?:\([^)]*\))?\s+)*(?:(?:public|protected|private|static|final|abstract|synchronized|'
+                   r'native|default|strictfp)\s+)*(?:<[^>]+>\s+)?(?:[\w.]+(?:<.*>)?(?:\[\])*\s+)?(\w+)\s*\(',
+    keywords=('if', 'for', 'while', 'switch', 'catch', 'return', 'new', 'throw', 'else', 'do', 'try', 'synchronized'),
+)
+
+DEFAULT_SYMBOL_PARSERS: List[SymbolParser] = [PythonSymbolParser(), JAVASCRIPT_SYMBOL_PARSER, JAVA_SYMBOL_PARSER]
+
+
+def find_parser(parsers: Sequence[SymbolParser], path: str) -> Optional[SymbolParser]:
+    """
+    Returns the first parser that handles a file, or None.
+    """
+    return next((parser for parser in parsers if parser.handles(path)), None)
+
+
+def parse_files(root_path: str, files: Sequence[Tuple[str, Optional[str]]], parsers: Sequence[SymbolParser],
+                max_file_size: int) -> List[ParsedFile]:
+    """
+    Hashes and parses files. A file whose content hash equals its previously indexed hash is
+    not parsed again.
+
+    Args:
+        root_path (str): The workspace root.
+        files (Sequence[Tuple[str, Optional[str]]]): (relative path, previously indexed hash) per file.
+        parsers (Sequence[SymbolParser]): The available parsers.
+        max_file_size (int): Larger files are indexed without symbols.
+
+    Returns:
+        List[ParsedFile]: One entry per file, in the given order.
+    """
+    results: List[ParsedFile] = []
+    for path, previous_hash in files:
+        try:
+            with open(os.path.join(root_path, path), 'rb') as file:
+                stat = os.fstat(file.fileno())
+                data = file.read(max_file_size + 1)
+        except OSError:
+            results.append((path, 0, 0, None, None))
+            continue
+        content_hash = hashlib.sha1(data).hexdigest()
+        if content_hash == previous_hash:
+            results.append((path, stat.st_mtime_ns, stat.st_size, content_hash, None))
+            continue
+        symbols: List[CodeSymbol] = []
+        parser = find_parser(parsers, path)
+        if parser is not None and len(data) <= max_file_size:
+            try:
+                symbols = parser.parse(data.decode('utf-8', errors='replace'))
+            except ValueError:
+                pass  # Indexed without symbols until the file is fixed
+        results.append((path, stat.st_mtime_ns, stat.st_size, content_hash, symbols))
+    return results
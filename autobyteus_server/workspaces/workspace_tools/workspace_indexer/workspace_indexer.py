@@ -5,9 +5,12 @@ This module provides the `WorkspaceIndexer` class, which is responsible for inde
 all source code entities within a workspace. This is achieved by parsing each source 
 code file and indexing its parsed entities. The indexer operates within the context 
 of a specific workspace, as provided by the `Workspace`.
+
+The entities (classes, functions and methods) are kept in the workspace's SymbolIndex, which
+only re-parses files whose content changed since they were last indexed.
 """
 
-import os
+from typing import Any, Dict, List, Optional
 from autobyteus_server.workspaces.workspace import Workspace
 from autobyteus_server.workspaces.workspace_tools.base_workspace_tool import BaseWorkspaceTool
 
@@ -26,27 +29,32 @@ class WorkspaceIndexer(BaseWorkspaceTool):
         """
         super().__init__(workspace)
 
-    def execute(self) -> None:
+    def execute(self) -> Dict[str, int]:
         """
         Index all source code entities within the workspace.
+
+        Every file of the workspace tree is checked, so files ignored by the file explorer are not
+        indexed. Files whose content did not change keep their indexed entities.
+
+        Returns:
+            Dict[str, int]: The number of files checked, parsed and removed, and the number of
+                indexed files and entities.
         """
-        for root, dirs, files in os.walk(self.workspace.root_path):
-            for file in files:
-                # Optionally, add a filter here based on file extensions
-                # For example: if file.endswith('.py'):
-                file_path = os.path.join(root, file)
-                self._parse_and_index_file(file_path)
-
-    def _parse_and_index_file(self, file_path: str) -> None:
+        return self.workspace.get_symbol_index().refresh(full=True)
+
+    def search(self, query: str, limit: int = 20, kind: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Parse and index entities from a given source code file within the workspace.
+        Search the indexed entities by name, re-indexing the files that changed first.
 
         Args:
-            file_path (str): Absolute path to the source code file.
+            query (str): The entity name, or part of it.
+            limit (int): The maximum number of results.
+            kind (Optional[str]): Only return entities of this kind ('class', 'function' or 'method').
+
+        Returns:
+            List[Dict[str, Any]]: The matching entities with their file location.
         """
-        #module_entity = self.parser.parse_source_code(file_path)
-        #try:
-        #    self.index_service.index(module_entity)
-        #except Exception as e:
-        #    # Logging can be added here to provide insights into any indexing failures
-        #    print(f"Failed to index entities from {file_path}. Error: {str(e)}")
\ No newline at end of file
+        symbol_index = self.workspace.get_symbol_index()
+        if symbol_index.is_stale:
+            symbol_index.refresh()
+        return symbol_index.search(query, limit=limit, kind=kind)
@@ -76,8 +76,7 @@ class PythonProjectRefactorer(BaseProjectRefactorer):
             str: The constructed prompt for the Python file refactoring.
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                source_code = file.read()
+            source_code = self.workspace.get_file_explorer().content_cache.read_text(file_path)
         except (UnicodeDecodeError, PermissionError):
             source_code = ""
 
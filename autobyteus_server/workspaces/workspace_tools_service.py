@@ -14,6 +14,7 @@ from autobyteus_server.workspaces.workspace_registry import WorkspaceRegistry
 from autobyteus_server.workspaces.workspace_tools.types import WorkspaceToolData
 from autobyteus_server.workspaces.workspace_tools.base_workspace_tool import BaseWorkspaceTool
 from autobyteus_server.workspaces.workspace_tools.workspace_refactorer.workspace_refactorer import WorkspaceRefactorer
+from autobyteus_server.workspaces.workspace_tools.workspace_indexer.workspace_indexer import WorkspaceIndexer
 from autobyteus_server.workflow.automated_coding_workflow import AutomatedCodingWorkflow
 from autobyteus_server.workspaces.workspace_tools.workspace_tools_registry import WorkspaceToolsRegistry
 
@@ -58,8 +59,16 @@ class WorkspaceToolsService(metaclass=SingletonMeta):
         Args:
             workspace_root_path (str): The root path of the workspace to be indexed.
         """
-        # Placeholder for indexing logic
-        pass
+        try:
+            workspace = self.workspace_registry.get_workspace_by_root_path(workspace_root_path)
+            if not workspace:
+                self.logger.warning(f"No workspace found for {workspace_root_path}. Indexing skipped.")
+                return
+
+            stats = WorkspaceIndexer(workspace).execute()
+            self.logger.info(f"Completed indexing for workspace at {workspace_root_path}: {stats}")
+        except Exception as e:
+            self.logger.error(f"Error while indexing workspace at {workspace_root_path}: {e}")
 
     def get_available_tools(self, workspace_root_path: str) -> List[WorkspaceToolData]:
         """
@@ -0,0 +1,39 @@
+import pytest
+
+from autobyteus_server.workspaces.persistence.domain.models import WorkspaceRecord
+from autobyteus_server.workspaces.persistence.repositories.sql.workspace_record_repository import SQLWorkspaceRecordRepository
+
+@pytest.fixture(scope="function")
+def sql_workspace_record_repository():
+    """
+    Provides a SQLWorkspaceRecordRepository instance for integration tests.
+    The test setup runs each test in a transaction, so no manual deletion is necessary.
+    """
+    return SQLWorkspaceRecordRepository()
+
+def test_save_workspace_creates_record(sql_workspace_record_repository):
+    record = WorkspaceRecord(workspace_id="ws-1", root_path="/projects/one", project_type="PYTHON",
+                             settings={"include": ["src/**"]})
+    saved = sql_workspace_record_repository.save_workspace(record)
+
+    assert saved.id is not None
+    assert saved.workspace_id == "ws-1"
+    assert saved.project_type == "PYTHON"
+    assert saved.settings == {"include": ["src/**"]}
+
+def test_save_workspace_updates_existing_record(sql_workspace_record_repository):
+    sql_workspace_record_repository.save_workspace(WorkspaceRecord(workspace_id="ws-1", root_path="/projects/one"))
+    sql_workspace_record_repository.save_workspace(
+        WorkspaceRecord(workspace_id="ws-1", root_path="/projects/one", project_type="NODEJS"))
+
+    records = sql_workspace_record_repository.get_all_workspaces()
+    assert len(records) == 1
+    assert records[0].project_type == "NODEJS"
+
+def test_delete_workspace(sql_workspace_record_repository):
+    sql_workspace_record_repository.save_workspace(WorkspaceRecord(workspace_id="ws-1", root_path="/projects/one"))
+    sql_workspace_record_repository.save_workspace(WorkspaceRecord(workspace_id="ws-2", root_path="/projects/two"))
+
+    assert sql_workspace_record_repository.delete_workspace("ws-1")
+    assert not sql_workspace_record_repository.delete_workspace("ws-1")
+    assert [r.workspace_id for r in sql_workspace_record_repository.get_all_workspaces()] == ["ws-2"]
@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.file_system_changes import AddChange, DeleteChange, MoveChange
+from autobyteus_server.file_explorer.operations.batch_operation import BatchOperationSpec, BatchOperationType
+
+
+@pytest.fixture
+def temp_workspace() -> Generator[FileExplorer, None, None]:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "src").mkdir()
+        (root / "src" / "main.py").write_text("print('main')", encoding="utf-8")
+        (root / "docs").mkdir()
+        (root / "docs" / "guide.md").write_text("# Guide", encoding="utf-8")
+        (root / "old.txt").write_text("old", encoding="utf-8")
+        file_explorer = FileExplorer(workspace_root_path=temp_dir)
+        file_explorer.build_workspace_directory_tree()
+        yield file_explorer
+
+
+def snapshot(file_explorer: FileExplorer) -> dict:
+    files = {}
+    for directory, _, file_names in os.walk(file_explorer.workspace_root_path):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            with open(path, encoding="utf-8") as file:
+                files[os.path.relpath(path, file_explorer.workspace_root_path)] = file.read()
+    return {"files": files, "tree": sorted_tree(json.loads(file_explorer.to_json()))}
+
+
+def sorted_tree(node: dict) -> dict:
+    # Restored nodes are re-attached at the end of their folder, like moved nodes
+    node["children"] = sorted((sorted_tree(child) for child in node["children"]), key=lambda child: child["name"])
+    return node
+
+
+def multi_file_change(failing: bool):
+    operations = [
+        BatchOperationSpec(BatchOperationType.WRITE, "src/pkg/util.py", content="def util(): pass"),
+        BatchOperationSpec(BatchOperationType.WRITE, "src/main.py", content="print('changed')"),
+        BatchOperationSpec(BatchOperationType.RENAME, "old.txt", new_name="new.txt"),
+        BatchOperationSpec(BatchOperationType.MOVE, "docs/guide.md", destination_path="src"),
+        BatchOperationSpec(BatchOperationType.DELETE, "docs"),
+        BatchOperationSpec(BatchOperationType.ADD, "tests", is_file=False),
+    ]
+    if failing:
+        operations.append(BatchOperationSpec(BatchOperationType.DELETE, "missing.txt"))
+    return operations
+
+
+def test_batch_applies_operations_in_order(temp_workspace: FileExplorer) -> None:
+    root = Path(temp_workspace.workspace_root_path)
+    published = []
+    temp_workspace.change_hub.publish = published.append
+
+    result = temp_workspace.apply_file_operations(multi_file_change(failing=False))
+
+    assert (result.applied, result.failed_index, result.error) == (6, None, None)
+    assert (root / "src" / "pkg" / "util.py").read_text(encoding="utf-8") == "def util(): pass"
+    assert (root / "src" / "main.py").read_text(encoding="utf-8") == "print('changed')"
+    assert (root / "new.txt").exists()
+    assert (root / "src" / "guide.md").exists()
+    assert not (root / "docs").exists()
+    assert (root / "tests").is_dir()
+    assert temp_workspace.find_node("src/guide.md") is not None
+    assert temp_workspace.find_node("docs") is None
+
+    # One event for the whole batch
+    assert published == [result.change_event]
+    change_types = [type(change) for change in result.change_event.changes]
+    assert change_types.count(AddChange) == 3  # pkg, util.py, tests
+    assert change_types.count(MoveChange) == 1
+    assert change_types.count(DeleteChange) == 1
+
+    output = json.loads(result.to_json())
+    assert output["applied"] == 6
+    assert len(output["change_event"]["changes"]) == len(result.change_event.changes)
+
+
+def test_batch_stops_at_first_failure(temp_workspace: FileExplorer) -> None:
+    root = Path(temp_workspace.workspace_root_path)
+    result = temp_workspace.apply_file_operations([
+        BatchOperationSpec(BatchOperationType.ADD, "a.txt"),
+        BatchOperationSpec(BatchOperationType.RENAME, "missing.txt", new_name="b.txt"),
+        BatchOperationSpec(BatchOperationType.ADD, "c.txt"),
+    ])
+    assert (result.applied, result.failed_index, result.rolled_back) == (1, 1, False)
+    assert "missing.txt" in result.error
+    assert (root / "a.txt").exists()
+    assert not (root / "c.txt").exists()
+    assert len(result.change_event.changes) == 1
+
+
+def test_atomic_batch_rolls_back(temp_workspace: FileExplorer) -> None:
+    before = snapshot(temp_workspace)
+    published = []
+    temp_workspace.change_hub.publish = published.append
+
+    result = temp_workspace.apply_file_operations(multi_file_change(failing=True), atomic=True)
+
+    assert (result.applied, result.failed_index, result.rolled_back) == (6, 6, True)
+    assert result.change_event.changes == []
+    assert published == []
+    assert snapshot(temp_workspace) == before
+    assert temp_workspace.find_node("docs/guide.md") is not None
+    assert temp_workspace.find_node("src/pkg") is None
+
+
+def test_invalid_operation_arguments(temp_workspace: FileExplorer) -> None:
+    result = temp_workspace.apply_file_operations([
+        BatchOperationSpec(BatchOperationType.MOVE, "old.txt"),
+    ])
+    assert result.failed_index == 0
+    assert "destination_path" in result.error
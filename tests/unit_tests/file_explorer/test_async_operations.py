@@ -0,0 +1,132 @@
+import asyncio
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.operations.batch_operation import BatchOperationSpec, BatchOperationType
+from autobyteus_server.file_explorer.watch_event_pipeline import WatchEvent, WatchEventKind, WatchEventPipeline
+
+
+@pytest.fixture
+def file_explorer(tmp_path) -> FileExplorer:
+    (tmp_path / "a.txt").write_text("a", encoding="utf-8")
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.build_workspace_directory_tree()
+    return file_explorer
+
+
+@pytest.mark.asyncio
+async def test_async_operations_run_off_the_loop_thread(file_explorer: FileExplorer, monkeypatch):
+    loop_thread = threading.current_thread()
+    threads = []
+    original_execute = FileExplorer._run_operation
+
+    def recording_run_operation(self, operation, *paths):
+        threads.append(threading.current_thread())
+        return original_execute(self, operation, *paths)
+
+    monkeypatch.setattr(FileExplorer, "_run_operation", recording_run_operation)
+    published = []
+    file_explorer.change_hub.publish = published.append
+
+    change_event = await file_explorer.write_file_content_async("dir/b.txt", "b")
+    await file_explorer.rename_file_or_folder_async("dir/b.txt", "c.txt")
+    await file_explorer.move_file_or_folder_async("dir/c.txt", ".")
+    await file_explorer.add_file_or_folder_async("empty", is_file=False)
+    await file_explorer.remove_file_or_folder_async("a.txt")
+
+    assert len(threads) == 5 and loop_thread not in threads
+    assert published[0] is change_event
+    assert len(published) == 5
+    root = Path(file_explorer.workspace_root_path)
+    assert (root / "c.txt").read_text(encoding="utf-8") == "b"
+    assert file_explorer.find_node("c.txt") is not None
+    assert file_explorer.find_node("a.txt") is None
+    assert await file_explorer.read_file_content_async("c.txt") == "b"
+
+
+@pytest.mark.asyncio
+async def test_mutations_of_a_workspace_are_serialized(file_explorer: FileExplorer):
+    active = 0
+    max_active = 0
+    original_execute = FileExplorer._run_operation
+
+    def slow_run_operation(operation, *paths):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        threading.Event().wait(0.02)
+        active -= 1
+        return original_execute(file_explorer, operation, *paths)
+
+    file_explorer._run_operation = slow_run_operation
+    await asyncio.gather(*(file_explorer.write_file_content_async(f"file_{number}.txt", str(number))
+                           for number in range(5)))
+    assert max_active == 1
+    assert all(file_explorer.find_node(f"file_{number}.txt") is not None for number in range(5))
+
+
+@pytest.mark.asyncio
+async def test_async_batch(file_explorer: FileExplorer):
+    result = await file_explorer.apply_file_operations_async([
+        BatchOperationSpec(BatchOperationType.WRITE, "b.txt", content="b"),
+        BatchOperationSpec(BatchOperationType.DELETE, "missing.txt"),
+    ], atomic=True)
+    assert result.rolled_back
+    assert not (Path(file_explorer.workspace_root_path) / "b.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_watcher_waits_for_running_operation(file_explorer: FileExplorer):
+    pipeline = WatchEventPipeline(file_explorer, lambda event: None, loop=asyncio.get_running_loop())
+    new_file = Path(file_explorer.workspace_root_path) / "new.txt"
+    new_file.write_text("new", encoding="utf-8")
+    pipeline.submit(WatchEvent(WatchEventKind.CREATED, str(new_file)))
+
+    # An operation holds the tree lock on an executor thread
+    locked, release = threading.Event(), threading.Event()
+
+    def operation():
+        with file_explorer.tree_lock:
+            locked.set()
+            release.wait()
+
+    running_operation = asyncio.get_running_loop().run_in_executor(None, operation)
+    await asyncio.to_thread(locked.wait)
+    assert pipeline.flush() is None
+    assert pipeline.pending_count == 1
+
+    release.set()
+    await running_operation
+    pipeline.flush()
+    assert pipeline.pending_count == 0
+    assert file_explorer.find_node("new.txt") is not None
+
+
+@pytest.mark.asyncio
+async def test_mutation_waits_for_a_scheduled_scan(tmp_path):
+    (tmp_path / "a.txt").write_text("a", encoding="utf-8")
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.mark_scan_pending()
+    scan = asyncio.ensure_future(file_explorer.scan_workspace_directory_tree())
+
+    await file_explorer.write_file_content_async("dir/b.txt", "b")
+
+    await scan
+    assert (tmp_path / "dir" / "b.txt").read_text(encoding="utf-8") == "b"
+    assert file_explorer.find_node(os.path.join("dir", "b.txt")) is not None
+    assert file_explorer.find_node("a.txt") is not None
+
+
+@pytest.mark.asyncio
+async def test_mutation_of_an_unbuilt_tree_is_rejected(tmp_path):
+    file_explorer = FileExplorer(str(tmp_path))
+
+    with pytest.raises(ValueError, match="not built"):
+        await file_explorer.write_file_content_async("b.txt", "b")
+    with pytest.raises(ValueError, match="not built"):
+        file_explorer.write_file_content("b.txt", "b")
+    assert not (tmp_path / "b.txt").exists()
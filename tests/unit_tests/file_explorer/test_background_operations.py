@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from autobyteus_server.file_explorer import background_operations
+from autobyteus_server.file_explorer.background_operations import TRASH_DIRECTORY_NAME, BackgroundOperationStatus
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.file_system_changes import DeleteChange, MoveChange
+
+
+@pytest.fixture
+def file_explorer(tmp_path) -> FileExplorer:
+    (tmp_path / "big").mkdir()
+    for number in range(20):
+        (tmp_path / "big" / f"file_{number}.txt").write_text("x" * 1000, encoding="utf-8")
+    (tmp_path / "big" / "nested").mkdir()
+    (tmp_path / "big" / "nested" / "deep.txt").write_text("deep", encoding="utf-8")
+    (tmp_path / "mnt").mkdir()
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.build_workspace_directory_tree()
+    return file_explorer
+
+
+@pytest.fixture
+def mounted(monkeypatch, tmp_path):
+    # Pretend that the "mnt" folder of the workspace is on another filesystem
+    mount = str(tmp_path / "mnt")
+
+    def on_mount(path):
+        return path == mount or path.startswith(mount + os.sep)
+
+    monkeypatch.setattr(background_operations, "_same_device", lambda path, other: on_mount(path) == on_mount(other))
+
+
+def wait_until_finished(operation) -> None:
+    deadline = time.monotonic() + 5
+    while not operation.is_finished:
+        assert time.monotonic() < deadline, "operation did not finish"
+        time.sleep(0.01)
+
+
+def test_delete_updates_tree_before_reclaiming(file_explorer: FileExplorer):
+    root = Path(file_explorer.workspace_root_path)
+    published = []
+    file_explorer.change_hub.publish = published.append
+
+    change_event, operation = file_explorer.remove_file_or_folder_in_background("big")
+
+    assert not (root / "big").exists()
+    assert file_explorer.find_node("big") is None
+    assert published == [change_event]
+    assert isinstance(change_event.changes[0], DeleteChange)
+
+    wait_until_finished(operation)
+    assert operation.status == BackgroundOperationStatus.COMPLETED
+    assert operation.files_done == 21
+    assert operation.bytes_done == 20 * 1000 + 4
+    assert sorted(os.listdir(root / TRASH_DIRECTORY_NAME)) == [".gitignore"]
+    # The trash is never part of the tree
+    assert file_explorer.find_node(TRASH_DIRECTORY_NAME) is None
+
+
+def test_delete_of_missing_path_fails(file_explorer: FileExplorer):
+    with pytest.raises(ValueError):
+        file_explorer.remove_file_or_folder_in_background("missing.txt")
+    assert file_explorer.background_operations.list_operations()[-1].status == BackgroundOperationStatus.FAILED
+
+
+def test_move_on_same_filesystem_completes_immediately(file_explorer: FileExplorer):
+    change_event, operation = file_explorer.move_file_or_folder_in_background("big/nested", "mnt")
+    assert operation.status == BackgroundOperationStatus.COMPLETED
+    assert isinstance(change_event.changes[0], MoveChange)
+    assert file_explorer.find_node("mnt/nested/deep.txt") is not None
+
+
+def test_cross_device_move_copies_in_background(file_explorer: FileExplorer, mounted):
+    root = Path(file_explorer.workspace_root_path)
+    published = []
+    file_explorer.change_hub.publish = published.append
+    node_id = file_explorer.find_node("big").id
+
+    change_event, operation = file_explorer.move_file_or_folder_in_background("big", "mnt")
+    assert change_event is None
+    assert operation.bytes_total == 20 * 1000 + 4
+
+    wait_until_finished(operation)
+    assert operation.status == BackgroundOperationStatus.COMPLETED, operation.error
+    assert operation.bytes_done >= operation.bytes_total
+    assert (root / "mnt" / "big" / "nested" / "deep.txt").read_text(encoding="utf-8") == "deep"
+    assert not (root / "big").exists()
+    # Staging directories and their markers are removed when done
+    assert not (root / "mnt" / TRASH_DIRECTORY_NAME).exists()
+    assert sorted(os.listdir(root / TRASH_DIRECTORY_NAME)) == [".gitignore"]
+    # The node keeps its id and the change event is published once the data is in place
+    assert file_explorer.find_node("mnt/big").id == node_id
+    assert len(published) == 1 and isinstance(published[0].changes[0], MoveChange)
+
+
+def test_cross_device_move_to_existing_destination_fails(file_explorer: FileExplorer, mounted, monkeypatch):
+    root = Path(file_explorer.workspace_root_path)
+    measure = background_operations._measure
+
+    def measure_and_create_destination(path):
+        (root / "mnt" / "big").mkdir()  # Created while the move is copying
+        return measure(path)
+
+    monkeypatch.setattr(background_operations, "_measure", measure_and_create_destination)
+    _, operation = file_explorer.move_file_or_folder_in_background("big", "mnt")
+    wait_until_finished(operation)
+
+    assert operation.status == BackgroundOperationStatus.FAILED
+    assert "already exists" in operation.error
+    assert (root / "big" / "nested" / "deep.txt").exists()
+    assert file_explorer.find_node("big") is not None
+    assert os.listdir(root / "mnt" / "big") == []
+    assert not (root / "mnt" / TRASH_DIRECTORY_NAME).exists()
+
+
+def test_cleanup_of_interrupted_operations(file_explorer: FileExplorer, mounted):
+    root = Path(file_explorer.workspace_root_path)
+    manager = file_explorer.background_operations
+    operation = manager._start("delete", "mnt/left.txt")
+    staging_directory = manager._staging_directory(str(root / "mnt"), operation)
+    (Path(staging_directory) / "left-over").mkdir()
+    (Path(staging_directory) / "left-over" / "partial.bin").write_bytes(b"partial")
+    (root / TRASH_DIRECTORY_NAME / "deleted.txt").write_text("deleted", encoding="utf-8")
+
+    # Restart: a new explorer for the same workspace
+    restarted = FileExplorer(str(root))
+    restarted.build_workspace_directory_tree()
+    cleanup = restarted.background_operations.cleanup_interrupted()
+
+    wait_until_finished(cleanup)
+    assert cleanup.status == BackgroundOperationStatus.COMPLETED, cleanup.error
+    assert os.listdir(staging_directory) == []
+    assert sorted(os.listdir(root / TRASH_DIRECTORY_NAME)) == [".gitignore"]
+    assert restarted.background_operations.cleanup_interrupted() is None
+
+
+@pytest.mark.asyncio
+async def test_progress_subscription(file_explorer: FileExplorer, mounted):
+    file_explorer.loop = asyncio.get_running_loop()
+    manager = file_explorer.background_operations
+    change_event, operation = await file_explorer.move_file_or_folder_in_background_async("big", "mnt")
+    assert change_event is None
+
+    updates = [json.loads(update) async for update in manager.watch(operation.operation_id)]
+    assert updates[-1]["status"] == "completed"
+    assert updates[-1]["bytes_done"] == updates[-1]["bytes_total"]
+    assert all(update["operation_id"] == operation.operation_id for update in updates)
@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import pytest
+
+from autobyteus_server.file_explorer.change_event_hub import ChangeEventHub
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.file_system_changes import DeleteChange, FileSystemChangeEvent
+
+
+def make_event(node_id: str) -> FileSystemChangeEvent:
+    return FileSystemChangeEvent(changes=[DeleteChange(node_id=node_id, parent_id="root")])
+
+
+async def take(subscription, count: int):
+    iterator = subscription.__aiter__()
+    return [json.loads(await asyncio.wait_for(iterator.__anext__(), 1)) for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_every_subscriber_receives_every_event():
+    hub = ChangeEventHub(capacity=10)
+    first, second = hub.subscribe(), hub.subscribe()
+    hub.publish(make_event("a"))
+    hub.publish(make_event("b"))
+
+    for subscription in (first, second):
+        messages = await take(subscription, 2)
+        assert [message["sequence"] for message in messages] == [1, 2]
+        assert [message["changes"][0]["node_id"] for message in messages] == ["a", "b"]
+        assert all(message["epoch"] == hub.epoch for message in messages)
+
+
+@pytest.mark.asyncio
+async def test_subscriber_waits_for_new_events():
+    hub = ChangeEventHub(capacity=10)
+    subscription = hub.subscribe()
+    pending = asyncio.ensure_future(take(subscription, 1))
+    await asyncio.sleep(0.01)
+    assert not pending.done()
+
+    hub.publish(make_event("a"))
+    [message] = await pending
+    assert message["sequence"] == 1
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_missed_events():
+    hub = ChangeEventHub(capacity=10)
+    for node_id in "abc":
+        hub.publish(make_event(node_id))
+
+    messages = await take(hub.subscribe(after_sequence=1, epoch=hub.epoch), 2)
+    assert [message["sequence"] for message in messages] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_lagging_subscriber_gets_resync_required():
+    hub = ChangeEventHub(capacity=3)
+    subscription = hub.subscribe()
+    for i in range(5):
+        hub.publish(make_event(str(i)))
+
+    [resync] = await take(subscription, 1)
+    assert resync["resync_required"] is True
+    assert resync["sequence"] == 5
+    assert resync["changes"] == []
+
+    hub.publish(make_event("next"))
+    [message] = await take(subscription, 1)
+    assert message["sequence"] == 6
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("after_sequence, epoch", [(1, None), (7, None), (2, "other-epoch")])
+async def test_unavailable_resume_point_requires_resync(after_sequence, epoch):
+    hub = ChangeEventHub(capacity=2)
+    for i in range(4):
+        hub.publish(make_event(str(i)))
+
+    [message] = await take(hub.subscribe(after_sequence=after_sequence, epoch=epoch), 1)
+    assert message["resync_required"] is True
+
+
+@pytest.mark.asyncio
+async def test_file_explorer_operations_are_broadcast(tmp_path):
+    explorer = FileExplorer(str(tmp_path))
+    explorer.build_workspace_directory_tree()
+    subscription = explorer.change_hub.subscribe()
+
+    explorer.add_file_or_folder("notes.txt", is_file=True)
+    [message] = await take(subscription, 1)
+    assert message["changes"][0]["type"] == "add"
+    assert message["changes"][0]["node"]["path"] == "notes.txt"
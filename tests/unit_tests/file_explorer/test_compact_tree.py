@@ -0,0 +1,156 @@
+import json
+
+import pytest
+
+from autobyteus_server.file_explorer.compact_tree import CompactTreeStore, CompactTreeNode
+from autobyteus_server.file_explorer.directory_traversal import DirectoryTraversal
+from autobyteus_server.file_explorer.parallel_directory_traversal import ParallelDirectoryTraversal
+from autobyteus_server.file_explorer.file_system_changes import AddChange, MoveChange, FileSystemChangeEvent
+from autobyteus_server.file_explorer.tree_node import TreeNode
+
+
+@pytest.fixture
+def store() -> CompactTreeStore:
+    """
+    Builds the tree:
+    root
+        src
+            main.py
+            util.py
+        README.md
+    """
+    store = CompactTreeStore()
+    root = store.create_root('root')
+    src = root.create_child('src')
+    src.create_child('main.py', is_file=True)
+    src.create_child('util.py', is_file=True)
+    root.create_child('README.md', is_file=True)
+    store.finish_bulk_load()
+    return store
+
+
+def strip_ids(data: dict) -> dict:
+    return {
+        "name": data["name"],
+        "path": data["path"],
+        "is_file": data["is_file"],
+        "children": [strip_ids(child) for child in data["children"]]
+    }
+
+
+def test_compact_view_behaves_like_tree_node(store):
+    root = store.root
+    assert isinstance(root, TreeNode)
+    assert root.name == 'root'
+    assert not root.is_file
+    assert [child.name for child in root.children] == ['src', 'README.md']
+
+    src = root.children[0]
+    main_py = src.children[0]
+    assert main_py.is_file
+    assert main_py.parent == src
+    assert main_py.get_path() == 'src/main.py'
+    assert root.get_path() == 'root'
+    assert main_py == store.view(main_py.index)
+    assert main_py in src.children
+    assert main_py not in root.children
+
+
+def test_compact_view_serializes_like_tree_node(store):
+    plain_root = TreeNode('root')
+    plain_src = plain_root.create_child('src')
+    plain_src.create_child('main.py', is_file=True)
+    plain_src.create_child('util.py', is_file=True)
+    plain_root.create_child('README.md', is_file=True)
+
+    assert strip_ids(store.root.to_dict()) == strip_ids(plain_root.to_dict())
+    assert json.loads(store.root.to_json())["id"] == store.root.id
+
+
+def test_node_ids_resolve_until_node_is_removed(store):
+    root = store.root
+    readme = root.children[1]
+    assert store.index_of(readme.id) == readme.index
+
+    root.remove_child(readme)
+    assert store.index_of(readme.id) is None
+    assert [child.name for child in root.children] == ['src']
+    assert store.index_of('unknown-1') is None
+
+
+def test_move_and_rename_through_view(store):
+    root = store.root
+    src, readme = root.children[0], root.children[1]
+
+    root.remove_child(readme)
+    readme.name = 'GUIDE.md'
+    src.add_child(readme)
+
+    assert [child.name for child in src.children] == ['main.py', 'util.py', 'GUIDE.md']
+    assert readme.parent == src
+    assert readme.get_path() == 'src/GUIDE.md'
+
+    change = MoveChange(node=readme, old_parent_id=root.id, new_parent_id=src.id)
+    event = FileSystemChangeEvent.from_json(FileSystemChangeEvent(changes=[change]).to_json())
+    assert event.changes[0].node.name == 'GUIDE.md'
+    assert event.changes[0].node.id == readme.id
+
+
+def test_children_list_operations(store):
+    root = store.root
+    src = root.children[0]
+    util_py = src.children[1]
+
+    src.children.remove(util_py)
+    root.children.append(util_py)
+
+    assert len(src.children) == 1
+    assert root.children[-1] == util_py
+    assert util_py.parent == root
+    with pytest.raises(ValueError):
+        src.children.remove(util_py)
+
+
+def test_add_child_copies_plain_tree_nodes(store):
+    plain = TreeNode('docs')
+    plain.create_child('index.md', is_file=True)
+
+    store.root.add_child(plain)
+
+    docs = store.root.children[-1]
+    assert isinstance(docs, CompactTreeNode)
+    assert [child.get_path() for child in docs.children] == ['docs/index.md']
+    add_change = AddChange(node=docs, parent_id=store.root.id)
+    assert add_change.to_dict()["node"]["path"] == 'docs'
+
+
+def test_names_are_interned_during_bulk_load():
+    store = CompactTreeStore()
+    root = store.create_root('root')
+    for package in ('a', 'b', 'c'):
+        root.create_child(package).create_child('__init__.py', is_file=True)
+
+    init_refs = {store._name_ref[index] for index, path in store.iter_subtree(store.root_index)
+                 if path.endswith('__init__.py')}
+    assert len(init_refs) == 1
+
+
+def test_iter_subtree_builds_relative_paths(store):
+    paths = [path for _, path in store.iter_subtree(store.root_index)]
+    assert paths == ['src', 'src/main.py', 'src/util.py', 'README.md']
+    files = [path for _, path in store.iter_subtree(store.root_index, files_only=True)]
+    assert files == ['src/main.py', 'src/util.py', 'README.md']
+
+
+@pytest.mark.parametrize("traversal_cls", [DirectoryTraversal, ParallelDirectoryTraversal])
+def test_traversal_builds_into_store(tmp_path, traversal_cls):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "module.py").touch()
+    (tmp_path / "setup.py").touch()
+
+    store = CompactTreeStore()
+    root = traversal_cls(root_node_factory=store.create_root).build_tree(str(tmp_path))
+
+    assert root == store.root
+    assert [path for _, path in store.iter_subtree(store.root_index)] == ['pkg', 'pkg/module.py', 'setup.py']
+    assert store.nbytes() > 0
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from autobyteus_server.file_explorer.content_cache import FileContentCache
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.watch_event_pipeline import WatchEvent, WatchEventKind, WatchEventPipeline
+
+
+def write(path, content: str, mtime_ns: int = None):
+    path.write_text(content, encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_hit_and_miss(tmp_path):
+    cache = FileContentCache(max_bytes=1024)
+    path = write(tmp_path / "a.txt", "hello")
+    assert cache.read_text(path) == "hello"
+    assert cache.read_text(path) == "hello"
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 1, 5)
+
+
+def test_changed_file_is_reread(tmp_path):
+    cache = FileContentCache(max_bytes=1024)
+    path = write(tmp_path / "a.txt", "hello", mtime_ns=1_000_000_000)
+    cache.read_text(path)
+    write(tmp_path / "a.txt", "world", mtime_ns=2_000_000_000)
+    assert cache.read_text(path) == "world"
+    assert cache.get_stats()["misses"] == 2
+    assert cache.get_stats()["bytes"] == 5
+
+
+def test_lru_eviction_within_budget(tmp_path):
+    cache = FileContentCache(max_bytes=30, max_entry_bytes=30)
+    paths = [write(tmp_path / f"{number}.txt", "x" * 10) for number in range(4)]
+    for path in paths[:3]:
+        cache.read_text(path)
+    cache.read_text(paths[0])
+    cache.read_text(paths[3])
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 30
+    # paths[1] was least recently used
+    cache.read_text(paths[1])
+    assert cache.get_stats()["misses"] == 5
+
+
+def test_large_files_are_not_cached(tmp_path):
+    cache = FileContentCache(max_bytes=80)
+    path = write(tmp_path / "big.txt", "x" * 11)
+    assert cache.read_text(path) == "x" * 11
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_recursive_invalidation(tmp_path):
+    cache = FileContentCache(max_bytes=1024)
+    (tmp_path / "dir").mkdir()
+    inner = write(tmp_path / "dir" / "a.txt", "a")
+    sibling = write(tmp_path / "dir2.txt", "b")
+    cache.read_text(inner)
+    cache.read_text(sibling)
+    cache.invalidate(str(tmp_path / "dir"))
+    assert cache.get_stats()["entries"] == 2
+    cache.invalidate(str(tmp_path / "dir"), recursive=True)
+    stats = cache.get_stats()
+    assert (stats["entries"], stats["invalidations"]) == (1, 1)
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        FileContentCache(max_bytes=1024).read_text(str(tmp_path / "missing.txt"))
+
+
+def test_file_explorer_operations_invalidate(tmp_path):
+    write(tmp_path / "a.txt", "old")
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.build_workspace_directory_tree()
+
+    assert file_explorer.read_file_content("a.txt") == "old"
+    assert file_explorer.read_file_content("a.txt") == "old"
+    file_explorer.write_file_content("a.txt", "new")
+    assert file_explorer.read_file_content("a.txt") == "new"
+    stats = file_explorer.content_cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 2, 1)
+
+    file_explorer.rename_file_or_folder("a.txt", "b.txt")
+    assert file_explorer.content_cache.get_stats()["entries"] == 0
+
+
+def test_watcher_events_invalidate(tmp_path):
+    path = write(tmp_path / "a.txt", "old")
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.build_workspace_directory_tree()
+    file_explorer.read_file_content("a.txt")
+
+    pipeline = WatchEventPipeline(file_explorer, lambda event: None)
+    pipeline.apply([WatchEvent(WatchEventKind.MODIFIED, path)])
+    assert file_explorer.content_cache.get_stats()["entries"] == 0
@@ -0,0 +1,124 @@
+from pathlib import Path
+
+import pytest
+
+from autobyteus_server.file_explorer.content_search import (
+    ContentSearchQuery, shutdown_search_process_pool)
+from autobyteus_server.file_explorer.content_search_worker import MAX_LINE_LENGTH, search_files
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+
+@pytest.fixture
+def workspace(tmp_path) -> Path:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("import os\n\ndef main():\n    print('Hello')  # hello\n",
+                                              encoding="utf-8")
+    (tmp_path / "src" / "util.py").write_text("def helper():\n    return 'HELLO world'\n", encoding="utf-8")
+    (tmp_path / "image.bin").write_bytes(b"hello\0\x01\x02")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.js").write_text("hello from build", encoding="utf-8")
+    (tmp_path / ".gitignore").write_text("build/\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture(scope="module", autouse=True)
+def process_pool():
+    yield
+    shutdown_search_process_pool()
+
+
+def test_literal_search_is_case_insensitive_by_default(workspace: Path):
+    matches, files_searched = search_files(str(workspace), ["src/main.py", "src/util.py"], "hello",
+                                           False, False, 100, 1024 * 1024)
+    assert files_searched == 2
+    # One match per line
+    assert [(path, line_number) for path, line_number, *_ in matches] == [("src/main.py", 4), ("src/util.py", 2)]
+    path, line_number, line, start, end = matches[0]
+    assert line == "    print('Hello')  # hello"
+    assert line[start:end] == "Hello"
+
+
+def test_case_sensitive_and_regex_search(workspace: Path):
+    matches, _ = search_files(str(workspace), ["src/main.py", "src/util.py"], "HELLO", False, True, 100, 1024 * 1024)
+    assert [match[0] for match in matches] == ["src/util.py"]
+    matches, _ = search_files(str(workspace), ["src/main.py", "src/util.py"], r"^def \w+\(", True, False, 100,
+                              1024 * 1024)
+    assert [(match[0], match[1], match[2][match[3]:match[4]]) for match in matches] == [
+        ("src/main.py", 3, "def main("), ("src/util.py", 1, "def helper(")]
+
+
+def test_binary_large_and_missing_files_are_skipped(workspace: Path):
+    matches, files_searched = search_files(str(workspace), ["image.bin", "missing.txt", "src/main.py"], "hello",
+                                           False, False, 100, 1024 * 1024)
+    assert files_searched == 1
+    assert {match[0] for match in matches} == {"src/main.py"}
+    _, files_searched = search_files(str(workspace), ["src/main.py"], "hello", False, False, 100, 10)
+    assert files_searched == 0
+
+
+def test_long_lines_are_cut_around_the_match(tmp_path: Path):
+    (tmp_path / "long.txt").write_text("x" * 5000 + "needle" + "y" * 5000, encoding="utf-8")
+    matches, _ = search_files(str(tmp_path), ["long.txt"], "needle", False, False, 100, 1024 * 1024)
+    _, _, line, start, end = matches[0]
+    assert len(line) == MAX_LINE_LENGTH
+    assert line[start:end] == "needle"
+
+
+def test_invalid_queries_are_rejected():
+    with pytest.raises(ValueError):
+        ContentSearchQuery(pattern="(unclosed", is_regex=True).validate()
+    with pytest.raises(ValueError):
+        ContentSearchQuery(pattern="").validate()
+    with pytest.raises(ValueError):
+        ContentSearchQuery(pattern="a", max_results=0).validate()
+
+
+async def collect(file_explorer: FileExplorer, query: ContentSearchQuery):
+    messages = [message async for message in file_explorer.content_searcher.stream(query)]
+    matches = [match for message in messages for match in message.get("matches", [])]
+    return matches, messages[-1]
+
+
+@pytest.mark.asyncio
+async def test_stream_searches_workspace_in_worker_processes(workspace: Path):
+    file_explorer = FileExplorer(str(workspace))
+    file_explorer.build_workspace_directory_tree()
+
+    matches, summary = await collect(file_explorer, ContentSearchQuery(pattern="hello"))
+
+    # The ignored build folder and the binary file are not searched
+    assert sorted(match["path"] for match in matches) == ["src/main.py", "src/util.py"]
+    assert summary["done"] and not summary["truncated"] and not summary["cancelled"]
+    assert summary["match_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_at_max_results(tmp_path: Path):
+    for number in range(100):
+        (tmp_path / f"file_{number}.txt").write_text("match\nmatch\n", encoding="utf-8")
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.build_workspace_directory_tree()
+
+    matches, summary = await collect(file_explorer, ContentSearchQuery(pattern="match", max_results=15))
+
+    assert len(matches) == 15
+    assert summary["truncated"] and not summary["cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_search_can_be_cancelled_by_id(tmp_path: Path):
+    for number in range(200):
+        (tmp_path / f"file_{number}.txt").write_text("match\n", encoding="utf-8")
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.build_workspace_directory_tree()
+    searcher = file_explorer.content_searcher
+
+    stream = searcher.stream(ContentSearchQuery(pattern="match"))
+    first = await stream.__anext__()
+    assert searcher.cancel(first["search_id"])
+    messages = [message async for message in stream]
+
+    summary = messages[-1]
+    assert summary["cancelled"]
+    assert summary["match_count"] < 200
+    assert not searcher.cancel(first["search_id"])
@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import pytest
+
+from autobyteus_server.file_explorer import file_finder
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+
+
+@pytest.fixture
+def file_explorer(tmp_path) -> FileExplorer:
+    files = [
+        "src/components/Button.tsx",
+        "src/components/ButtonGroup.tsx",
+        "src/components/index.ts",
+        "src/utils/index.ts",
+        "src/utils/format_button_label.py",
+        "lib/widgets/button.py",
+        "lib/__init__.py",
+        "lib/widgets/__init__.py",
+        "docs/buttons.md",
+        "README.md",
+    ]
+    for path in files:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(path, encoding="utf-8")
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.build_workspace_directory_tree()
+    return file_explorer
+
+
+@pytest.fixture(params=["numpy", "pure-python"])
+def finder_backend(request, monkeypatch):
+    if request.param == "pure-python":
+        monkeypatch.setattr(file_finder, "np", None)
+
+
+def test_files_with_the_same_name_are_all_found(file_explorer: FileExplorer, finder_backend):
+    assert set(file_explorer.find_files("__init__")) == {"lib/__init__.py", "lib/widgets/__init__.py"}
+    assert set(file_explorer.find_files("index.ts")[:2]) == {"src/components/index.ts", "src/utils/index.ts"}
+
+
+def test_ranking(file_explorer: FileExplorer, finder_backend):
+    assert file_explorer.find_files("button.py")[0] == "lib/widgets/button.py"
+    assert file_explorer.find_files("Button")[0] in ("src/components/Button.tsx", "lib/widgets/button.py")
+    assert file_explorer.find_files("butgroup")[0] == "src/components/ButtonGroup.tsx"
+    # Query segments match directories in order
+    assert file_explorer.find_files("utils/index")[0] == "src/utils/index.ts"
+    assert file_explorer.find_files("comp/index")[0] == "src/components/index.ts"
+    assert file_explorer.find_files("readme", limit=1) == ["README.md"]
+    assert len(file_explorer.find_files("button", limit=3)) == 3
+    assert file_explorer.find_files("   ") == []
+
+
+def test_index_is_built_on_first_search(file_explorer: FileExplorer):
+    assert not file_explorer.file_finder.is_built
+    file_explorer.find_files("button")
+    assert file_explorer.file_finder.is_built
+    assert len(file_explorer.file_finder) == 10
+
+
+def test_index_follows_file_operations(file_explorer: FileExplorer, finder_backend):
+    file_explorer.find_files("button")
+
+    file_explorer.add_file_or_folder("src/views/Toolbar.tsx", is_file=True)
+    assert file_explorer.find_files("toolbar")[0] == "src/views/Toolbar.tsx"
+
+    file_explorer.rename_file_or_folder("src/views/Toolbar.tsx", "Sidebar.tsx")
+    assert "src/views/Toolbar.tsx" not in file_explorer.find_files("toolbar")
+    assert file_explorer.find_files("sidebar")[0] == "src/views/Sidebar.tsx"
+
+    file_explorer.move_file_or_folder("src/components", "lib")
+    assert file_explorer.find_files("buttongroup")[0] == "lib/components/ButtonGroup.tsx"
+
+    file_explorer.remove_file_or_folder("lib")
+    results = file_explorer.find_files("button", limit=20)
+    assert not any(path.startswith("lib/") for path in results)
+    assert "src/utils/format_button_label.py" in results
+    assert len(file_explorer.file_finder) == 5
+
+
+def test_index_follows_rebuilt_tree(file_explorer: FileExplorer):
+    file_explorer.find_files("button")
+    Path(file_explorer.workspace_root_path, "src", "NewButton.tsx").write_text("", encoding="utf-8")
+    file_explorer.build_workspace_directory_tree()
+    assert "src/NewButton.tsx" in file_explorer.find_files("newbutton")
+
+
+@pytest.mark.skipif(file_finder.np is None, reason="numpy is not installed")
+def test_prefilter_keeps_best_matches_when_candidates_are_limited(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_finder, "CANDIDATE_LIMIT", 20)
+    for number in range(200):
+        folder = tmp_path / f"module_{number}"
+        folder.mkdir()
+        (folder / f"service_{number}.py").write_text("", encoding="utf-8")
+    (tmp_path / "module_7" / "payment_service.py").write_text("", encoding="utf-8")
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.build_workspace_directory_tree()
+
+    assert file_explorer.find_files("payment")[0] == "module_7/payment_service.py"
+    assert file_explorer.find_files("zzz") == []
@@ -0,0 +1,154 @@
+import os
+
+import pytest
+
+from autobyteus_server.file_explorer import large_file_reader as large_file_reader_module
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.large_file_reader import LargeFileReader, LineIndex
+
+
+def write_lines(path, count, ending=b'\n', trailing=True):
+    data = ending.join(f"line {number}".encode() for number in range(1, count + 1))
+    if trailing:
+        data += ending
+    path.write_bytes(data)
+    return data
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def reader(request, monkeypatch) -> LargeFileReader:
+    if request.param == "pure":
+        monkeypatch.setattr(large_file_reader_module, "np", None)
+    elif large_file_reader_module.np is None:
+        pytest.skip("numpy is not installed")
+    return LargeFileReader(stride=4)
+
+
+@pytest.mark.parametrize("data, line_count", [
+    (b'', 0),
+    (b'\n', 1),
+    (b'a', 1),
+    (b'a\nb', 2),
+    (b'a\nb\n', 2),
+    (b'\n\n\n\n\n', 5),
+])
+def test_line_count(reader, data, line_count):
+    assert LineIndex.build(data, stride=2).line_count == line_count
+
+
+def test_line_offsets_match_split(reader, tmp_path):
+    path = tmp_path / "log.txt"
+    data = write_lines(path, 103)
+    index = reader.get_line_index(str(path))
+    expected = [0]
+    for line in data.split(b'\n')[:-1]:
+        expected.append(expected[-1] + len(line) + 1)
+    for line_number in range(1, 104):
+        assert index.line_offset(data, line_number) == expected[line_number - 1]
+    assert index.line_offset(data, 104) == len(data)
+    assert len(index.checkpoints) == 26
+
+
+def test_read_lines(reader, tmp_path):
+    path = tmp_path / "log.txt"
+    write_lines(path, 50, ending=b'\r\n', trailing=False)
+
+    line_range = reader.read_lines(str(path), 10, 3)
+    assert line_range.data == b'line 10\r\nline 11\r\nline 12\r\n'
+    assert (line_range.start_line, line_range.end_line, line_range.total_lines) == (10, 12, 50)
+
+    last = reader.read_lines(str(path), 49, 10)
+    assert last.data == b'line 49\r\nline 50'
+    assert last.end_line == 50
+    assert last.end_byte == last.file_size
+
+    past_end = reader.read_lines(str(path), 60, 5)
+    assert past_end.data == b''
+    assert past_end.end_line == 59
+
+
+def test_read_lines_of_empty_file(reader, tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b'')
+    line_range = reader.read_lines(str(path), 1, 10)
+    assert line_range.data == b''
+    assert line_range.total_lines == 0
+
+
+def test_invalid_ranges(reader, tmp_path):
+    path = tmp_path / "log.txt"
+    write_lines(path, 5)
+    with pytest.raises(ValueError):
+        reader.read_lines(str(path), 0, 1)
+    with pytest.raises(ValueError):
+        reader.read_lines(str(path), 1, -1)
+    with pytest.raises(ValueError):
+        reader.read_bytes(str(path), -1, 1)
+
+
+def test_index_is_cached_until_file_changes(reader, tmp_path):
+    path = tmp_path / "log.txt"
+    write_lines(path, 20)
+    index = reader.get_line_index(str(path))
+    assert reader.get_line_index(str(path)) is index
+
+    write_lines(path, 30)
+    os.utime(path, ns=(1, 1))
+    changed = reader.get_line_index(str(path))
+    assert changed is not index
+    assert changed.line_count == 30
+    assert len(reader._indexes) == 1
+
+
+def test_cache_is_bounded(tmp_path):
+    reader = LargeFileReader(max_cached_indexes=2)
+    paths = []
+    for number in range(3):
+        path = tmp_path / f"{number}.txt"
+        write_lines(path, 5)
+        paths.append(str(path))
+        reader.get_line_index(str(path))
+    assert [key[0] for key in reader._indexes] == paths[1:]
+
+
+def test_iter_bytes(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 10)
+    chunks = list(LargeFileReader.iter_bytes(str(path), 100, 1100, chunk_size=300))
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    assert b''.join(chunks) == (bytes(range(256)) * 10)[100:1100]
+    assert b''.join(LargeFileReader.iter_bytes(str(path), 2500)) == (bytes(range(256)) * 10)[2500:]
+
+
+def test_file_explorer_ranges(tmp_path):
+    write_lines(tmp_path / "log.txt", 100)
+    file_explorer = FileExplorer(str(tmp_path))
+
+    lines = file_explorer.read_file_lines("log.txt", 99, 5)
+    assert lines["content"] == "line 99\nline 100\n"
+    assert lines["total_lines"] == 100
+
+    assert file_explorer.read_file_bytes("log.txt", 0, 6)["content"] == "line 1"
+
+    chunks, info = file_explorer.open_file_range_stream("log.txt", start_line=2, line_count=2)
+    assert b''.join(chunks) == b'line 2\nline 3\n'
+    assert info["start_byte"] == 7
+
+    with pytest.raises(ValueError):
+        file_explorer.read_file_lines("../outside.txt")
+    with pytest.raises(FileNotFoundError):
+        file_explorer.read_file_bytes("missing.txt")
+
+
+def test_sibling_directory_with_the_root_as_prefix_is_outside(tmp_path):
+    workspace = tmp_path / "ws"
+    sibling = tmp_path / "ws2"
+    workspace.mkdir()
+    sibling.mkdir()
+    (sibling / "secret.txt").write_text("secret\n", encoding="utf-8")
+    file_explorer = FileExplorer(str(workspace))
+
+    with pytest.raises(ValueError, match="outside the workspace"):
+        file_explorer.read_file_lines("../ws2/secret.txt")
+    with pytest.raises(ValueError, match="outside the workspace"):
+        file_explorer.open_file_range_stream("../ws2/secret.txt", offset=0)
@@ -0,0 +1,119 @@
+import pytest
+
+from autobyteus_server.file_explorer.directory_traversal import DirectoryTraversal
+from autobyteus_server.file_explorer.parallel_directory_traversal import ParallelDirectoryTraversal
+from autobyteus_server.file_explorer.traversal_engine import TraversalEngine, create_directory_traversal
+from autobyteus_server.file_explorer.tree_node import TreeNode
+from autobyteus_server.file_explorer.traversal_ignore_strategy.git_ignore_strategy import GitIgnoreStrategy
+from autobyteus_server.file_explorer.traversal_ignore_strategy.specific_folder_ignore_strategy import SpecificFolderIgnoreStrategy
+
+
+@pytest.fixture
+def setup_workspace(tmp_path):
+    """
+    Sets up a workspace with nested .gitignore files and a folder ignored by name:
+    /A
+        .gitignore (ignore '*.log' and 'build/')
+        /.git
+            HEAD
+        /build
+            out.bin
+        /src
+            .gitignore (ignore 'generated.py')
+            /pkg
+                __init__.py
+                module.py
+            generated.py
+            main.py
+        /Docs
+            readme.md
+        debug.log
+        setup.py
+    """
+    A = tmp_path / "A"
+    A.mkdir()
+    (A / ".gitignore").write_text("*.log\nbuild/\n")
+    (A / ".git").mkdir()
+    (A / ".git" / "HEAD").touch()
+    (A / "build").mkdir()
+    (A / "build" / "out.bin").touch()
+    src = A / "src"
+    src.mkdir()
+    (src / ".gitignore").write_text("generated.py\n")
+    (src / "pkg").mkdir()
+    (src / "pkg" / "__init__.py").touch()
+    (src / "pkg" / "module.py").touch()
+    (src / "generated.py").touch()
+    (src / "main.py").touch()
+    (A / "Docs").mkdir()
+    (A / "Docs" / "readme.md").touch()
+    (A / "debug.log").touch()
+    (A / "setup.py").touch()
+    return A
+
+
+def traverse_to_dict(node: TreeNode) -> dict:
+    """
+    Helper function to convert TreeNode to dict for easier assertions.
+    """
+    return {
+        "name": node.name,
+        "path": node.get_path(),
+        "is_file": node.is_file,
+        "children": [traverse_to_dict(child) for child in node.children]
+    }
+
+
+def build_ignore_strategies(root_path) -> list:
+    return [
+        SpecificFolderIgnoreStrategy(folders_to_ignore=['.git']),
+        GitIgnoreStrategy(root_path=str(root_path))
+    ]
+
+
+def test_parallel_traversal_matches_sequential_traversal(setup_workspace):
+    """
+    Test that the scandir engine produces the same tree as the listdir engine.
+    """
+    A = setup_workspace
+    sequential = DirectoryTraversal(file_ignore_strategies=build_ignore_strategies(A))
+    parallel = ParallelDirectoryTraversal(file_ignore_strategies=build_ignore_strategies(A), max_workers=4)
+
+    assert traverse_to_dict(parallel.build_tree(str(A))) == traverse_to_dict(sequential.build_tree(str(A)))
+
+
+def test_parallel_traversal_applies_ignore_strategies(setup_workspace):
+    """
+    Test that ignored files and folders are excluded, including nested .gitignore rules.
+    """
+    A = setup_workspace
+    traversal = ParallelDirectoryTraversal(file_ignore_strategies=build_ignore_strategies(A), max_workers=2)
+    tree = traversal.build_tree(str(A))
+
+    assert [child.name for child in tree.children] == ["Docs", "src", ".gitignore", "setup.py"]
+    src_node = tree.children[1]
+    assert [child.name for child in src_node.children] == ["pkg", ".gitignore", "main.py"]
+    assert [child.name for child in src_node.children[0].children] == ["__init__.py", "module.py"]
+    assert all(child.parent is src_node for child in src_node.children)
+
+
+def test_parallel_traversal_of_file_returns_single_node(setup_workspace):
+    traversal = ParallelDirectoryTraversal()
+    tree = traversal.build_tree(str(setup_workspace / "setup.py"))
+
+    assert tree.is_file
+    assert tree.children == []
+
+
+def test_create_directory_traversal_selects_engine():
+    assert isinstance(create_directory_traversal(TraversalEngine.SCANDIR), ParallelDirectoryTraversal)
+    listdir_traversal = create_directory_traversal(TraversalEngine.LISTDIR)
+    assert type(listdir_traversal) is DirectoryTraversal
+
+
+def test_traversal_engine_from_env(monkeypatch):
+    monkeypatch.setenv('FILE_EXPLORER_TRAVERSAL_ENGINE', 'listdir')
+    assert TraversalEngine.from_env() == TraversalEngine.LISTDIR
+
+    monkeypatch.setenv('FILE_EXPLORER_TRAVERSAL_ENGINE', 'unknown')
+    assert TraversalEngine.from_env() == TraversalEngine.SCANDIR
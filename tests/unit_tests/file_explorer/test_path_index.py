@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from autobyteus_server.file_explorer.compact_tree import CompactTreeStore
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.path_index import PathIndex
+
+
+@pytest.fixture
+def store() -> CompactTreeStore:
+    """
+    root
+        src
+            pkg
+                module.py
+            main.py
+        docs
+    """
+    store = CompactTreeStore()
+    root = store.create_root('root')
+    src = root.create_child('src')
+    src.create_child('pkg').create_child('module.py', is_file=True)
+    src.create_child('main.py', is_file=True)
+    root.create_child('docs')
+    store.finish_bulk_load()
+    return store
+
+
+def path_of(store: CompactTreeStore, path: str) -> str:
+    return store.get_path(store.path_index.resolve(path))
+
+
+def assert_index_consistent(store: CompactTreeStore) -> None:
+    expected = {path: index for index, path in store.iter_subtree(store.root_index)}
+    expected[''] = store.root_index
+    assert store.path_index._index == expected
+
+
+def test_index_resolves_existing_paths(store):
+    index = PathIndex(store)
+
+    assert index.resolve('') == store.root_index
+    assert index.resolve('.') == store.root_index
+    assert path_of(store, os.path.join('src', 'pkg', 'module.py')) == os.path.join('src', 'pkg', 'module.py')
+    assert index.resolve(os.path.join('src', 'pkg') + os.sep) is not None
+    assert index.resolve('missing') is None
+    assert len(index) == 6
+
+
+def test_index_follows_added_and_removed_nodes(store):
+    PathIndex(store)
+    docs = store.view(store.path_index.resolve('docs'))
+
+    docs.create_child('guide').create_child('index.md', is_file=True)
+    assert path_of(store, os.path.join('docs', 'guide', 'index.md')) == os.path.join('docs', 'guide', 'index.md')
+
+    src = store.view(store.path_index.resolve('src'))
+    store.root.remove_child(src)
+    assert store.path_index.resolve(os.path.join('src', 'pkg', 'module.py')) is None
+    assert_index_consistent(store)
+
+
+def test_index_rekeys_subtree_on_rename_and_move(store):
+    PathIndex(store)
+    root = store.root
+    src = store.view(store.path_index.resolve('src'))
+    docs = store.view(store.path_index.resolve('docs'))
+
+    src.name = 'lib'
+    assert store.path_index.resolve(os.path.join('src', 'main.py')) is None
+    assert store.path_index.resolve(os.path.join('lib', 'pkg', 'module.py')) is not None
+
+    root.remove_child(src)
+    src.name = 'source'
+    docs.add_child(src)
+    assert path_of(store, os.path.join('docs', 'source', 'pkg', 'module.py')) == \
+        os.path.join('docs', 'source', 'pkg', 'module.py')
+    assert_index_consistent(store)
+
+
+def test_detached_subtree_is_indexed_when_attached(store):
+    PathIndex(store)
+    detached = store.view(store.create_node('assets', is_file=False))
+    detached.create_child('logo.png', is_file=True)
+    assert store.path_index.resolve(os.path.join('assets', 'logo.png')) is None
+
+    store.root.add_child(detached)
+    assert store.path_index.resolve(os.path.join('assets', 'logo.png')) is not None
+    assert_index_consistent(store)
+
+
+def test_file_explorer_keeps_index_consistent(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "deep.txt").write_text("deep")
+    (tmp_path / "c").mkdir()
+
+    explorer = FileExplorer(workspace_root_path=str(tmp_path))
+    explorer.build_workspace_directory_tree()
+
+    explorer.write_file_content(os.path.join("x", "y", "new.txt"), "hello")
+    explorer.move_file_or_folder("a", "c")
+    explorer.rename_file_or_folder(os.path.join("c", "a"), "renamed")
+    explorer.add_file_or_folder(os.path.join("c", "renamed", "b", "extra"), is_file=False)
+    explorer.remove_file_or_folder("x")
+
+    deep = explorer.find_node(os.path.join("c", "renamed", "b", "deep.txt"))
+    assert deep is not None and deep.is_file
+    assert explorer.find_node(os.path.join("a", "b", "deep.txt")) is None
+    assert explorer.find_node(os.path.join("x", "y", "new.txt")) is None
+    assert explorer.find_node(os.path.join("c", "renamed", "b", "extra")) is not None
+    assert explorer.find_node("") == explorer.root_node
+    assert_index_consistent(explorer.tree_store)
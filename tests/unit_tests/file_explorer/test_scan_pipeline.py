@@ -0,0 +1,117 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from autobyteus_server.file_explorer.directory_stats import DirectoryUsage
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.scan_pipeline import ScanVisitor
+from autobyteus_server.file_explorer.traversal_engine import TraversalEngine
+from autobyteus_server.workspaces.setting.project_types import ProjectType
+from autobyteus_server.workspaces.workspace_tools.project_type_determiner import (
+    ProjectTypeDeterminer, ProjectTypeVisitor)
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    for folder in ("src", "src/components", "uploads", "uploads/images"):
+        (tmp_path / folder).mkdir()
+    files = {"src/main.py": 10, "src/components/button.ts": 20, "uploads/images/a.png": 300,
+             "uploads/notes.txt": 40, "requirements.txt": 5}
+    for file, size in files.items():
+        (tmp_path / file).write_bytes(b"x" * size)
+    return tmp_path
+
+
+class RecordingVisitor(ScanVisitor):
+    def __init__(self):
+        self.directories = []
+        self.finished = 0
+
+    def visit_directory(self, node, path, listing):
+        self.directories.append(path)
+
+    def scan_finished(self, file_explorer):
+        self.finished += 1
+
+
+@pytest.mark.parametrize("traversal_engine", [TraversalEngine.LISTDIR, TraversalEngine.SCANDIR])
+def test_visitors_see_every_directory_once(workspace: Path, traversal_engine: TraversalEngine):
+    file_explorer = FileExplorer(str(workspace), traversal_engine=traversal_engine)
+    visitor = RecordingVisitor()
+    file_explorer.scan_pipeline.add_visitor(visitor)
+
+    file_explorer.build_workspace_directory_tree()
+
+    assert len(visitor.directories) == 5 and visitor.finished == 1
+    # The file finder is attached by the pipeline and still built on first search
+    assert not file_explorer.file_finder.is_built
+    assert file_explorer.find_files("button") == [os.path.join("src", "components", "button.ts")]
+
+
+@pytest.mark.parametrize("traversal_engine", [TraversalEngine.LISTDIR, TraversalEngine.SCANDIR])
+def test_scan_collects_file_sizes(workspace: Path, traversal_engine: TraversalEngine):
+    file_explorer = FileExplorer(str(workspace), traversal_engine=traversal_engine)
+    file_explorer.directory_stats.needs_file_sizes = True
+    file_explorer.build_workspace_directory_tree()
+
+    # Sizes from the scan are not stat'ed again
+    (workspace / "uploads" / "notes.txt").write_bytes(b"")
+    assert file_explorer.directory_stats.get_usage("uploads") == DirectoryUsage(2, 340)
+    assert file_explorer.directory_stats.get_usage("") == DirectoryUsage(5, 375)
+
+
+def test_usage_follows_changes(workspace: Path):
+    file_explorer = FileExplorer(str(workspace))
+    file_explorer.build_workspace_directory_tree()
+    stats = file_explorer.directory_stats
+    assert stats.get_usage("uploads") == DirectoryUsage(2, 340)
+
+    file_explorer.write_file_content(os.path.join("uploads", "notes.txt"), "y" * 100)
+    assert stats.get_usage("uploads") == DirectoryUsage(2, 400)
+
+    file_explorer.remove_file_or_folder(os.path.join("uploads", "images"))
+    assert stats.get_usage("uploads") == DirectoryUsage(1, 100)
+
+
+def test_usage_counts_files_not_in_the_tree_yet(workspace: Path):
+    file_explorer = FileExplorer(str(workspace))
+    file_explorer.build_workspace_directory_tree()
+    stats = file_explorer.directory_stats
+
+    (workspace / "uploads" / "images" / "b.png").write_bytes(b"x" * 50)
+    stats.record_file(os.path.join("uploads", "images", "b.png"), 50)
+    assert stats.get_usage("uploads") == DirectoryUsage(3, 390)
+
+    # A folder that is not part of the tree is walked on disk
+    (workspace / "other").mkdir()
+    (workspace / "other" / "file.bin").write_bytes(b"x" * 7)
+    assert stats.get_usage("other") == DirectoryUsage(1, 7)
+
+
+def test_failing_visitor_does_not_stop_the_scan(workspace: Path):
+    class FailingVisitor(ScanVisitor):
+        def scan_finished(self, file_explorer):
+            raise RuntimeError("boom")
+
+    file_explorer = FileExplorer(str(workspace))
+    file_explorer.scan_pipeline.add_visitor(FailingVisitor())
+    visitor = RecordingVisitor()
+    file_explorer.scan_pipeline.add_visitor(visitor)
+
+    file_explorer.build_workspace_directory_tree()
+    assert visitor.finished == 1
+
+
+def test_project_type_is_determined_from_the_scanned_root(workspace: Path):
+    file_explorer = FileExplorer(str(workspace))
+    workspace_stub = SimpleNamespace(project_type=ProjectType.UNKNOWN)
+    file_explorer.scan_pipeline.add_visitor(ProjectTypeVisitor(workspace_stub, ProjectTypeDeterminer()))
+
+    file_explorer.build_workspace_directory_tree()
+    assert workspace_stub.project_type == ProjectType.PYTHON
+
+    (workspace / "requirements.txt").unlink()
+    file_explorer.build_workspace_directory_tree()
+    assert workspace_stub.project_type == ProjectType.UNKNOWN
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from autobyteus_server.file_explorer.compact_tree import CompactTreeStore
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.tree_node import TreeNode
+from autobyteus_server.file_explorer.tree_pagination import get_children_page, serialize_tree
+
+
+def build_tree(root: TreeNode) -> TreeNode:
+    """
+    root
+        big
+            file_0.txt ... file_4.txt
+        src
+            pkg
+                module.py
+        README.md
+    """
+    big = root.create_child('big')
+    for i in range(5):
+        big.create_child(f'file_{i}.txt', is_file=True)
+    root.create_child('src').create_child('pkg').create_child('module.py', is_file=True)
+    root.create_child('README.md', is_file=True)
+    return root
+
+
+@pytest.fixture(params=["plain", "compact"])
+def root(request) -> TreeNode:
+    if request.param == "plain":
+        return build_tree(TreeNode('root'))
+    store = CompactTreeStore()
+    root = build_tree(store.create_root('root'))
+    store.finish_bulk_load()
+    return root
+
+
+def test_serialize_tree_stops_at_max_depth(root):
+    data = serialize_tree(root, max_depth=2)
+
+    src = next(child for child in data["children"] if child["name"] == 'src')
+    pkg = src["children"][0]
+    assert pkg["path"] == 'src/pkg'
+    assert pkg["children"] == []
+    assert pkg["has_children"] is True
+    assert data["children"][-1] == {
+        "name": 'README.md', "path": 'README.md', "is_file": True, "children": [],
+        "id": root.children[-1].id
+    }
+
+
+def test_serialize_tree_depth_zero_returns_only_root(root):
+    data = serialize_tree(root, max_depth=0)
+    assert data["children"] == []
+    assert data["has_children"] is True
+
+
+def test_children_page_cursor_walks_all_children(root):
+    big = root.children[0]
+    names = []
+    cursor = None
+    while True:
+        page = get_children_page(big, cursor=cursor, limit=2)
+        names.extend(child["name"] for child in page["children"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert names == [f'file_{i}.txt' for i in range(5)]
+
+
+def test_children_page_limit_applies_to_nested_folders(root):
+    page = get_children_page(root, depth=2, limit=2)
+    assert [child["name"] for child in page["children"]] == ['big', 'src']
+    assert page["next_cursor"] == root.children[1].id
+
+    big = page["children"][0]
+    assert [child["name"] for child in big["children"]] == ['file_0.txt', 'file_1.txt']
+    assert big["next_cursor"] == root.children[0].children[1].id
+
+
+def test_children_page_rejects_invalid_arguments(root):
+    with pytest.raises(ValueError):
+        get_children_page(root, cursor='not-a-child')
+    with pytest.raises(ValueError):
+        get_children_page(root.children[-1])
+    with pytest.raises(ValueError):
+        get_children_page(root, depth=0)
+
+
+def test_file_explorer_lazy_loading(tmp_path):
+    (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "c" / "deep.txt").touch()
+
+    explorer = FileExplorer(workspace_root_path=str(tmp_path))
+    explorer.build_workspace_directory_tree()
+
+    shallow = json.loads(explorer.to_json(max_depth=1))
+    a = shallow["children"][0]
+    assert a["name"] == 'a' and a["children"] == [] and a["has_children"]
+
+    page = explorer.get_children_page(node_id=a["id"], depth=3)
+    assert page["children"][0]["children"][0]["children"][0]["path"] == 'a/b/c/deep.txt'
+
+    with pytest.raises(ValueError):
+        explorer.get_children_page(node_id='missing')
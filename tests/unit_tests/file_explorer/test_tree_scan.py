@@ -0,0 +1,78 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.tree_scan import TreeScanProgress, TreeScanStatus
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    for folder in ("src", "src/components", "docs"):
+        (tmp_path / folder).mkdir()
+    for file in ("src/main.py", "src/components/button.ts", "src/components/panel.ts", "docs/index.md", "README.md"):
+        (tmp_path / file).write_text("content", encoding="utf-8")
+    return tmp_path
+
+
+def test_build_reports_progress(workspace: Path):
+    file_explorer = FileExplorer(str(workspace))
+    assert file_explorer.scan_progress.status == TreeScanStatus.PENDING
+
+    file_explorer.build_workspace_directory_tree()
+
+    progress = file_explorer.scan_progress.to_dict()
+    assert progress["status"] == "completed"
+    assert progress["directories_scanned"] == 4 and progress["files_scanned"] == 5
+    assert progress["finished_at"] >= progress["started_at"]
+
+
+def test_partial_tree_is_served_while_scanning(workspace: Path, monkeypatch):
+    file_explorer = FileExplorer(str(workspace))
+    seen = []
+    record_directory = file_explorer.scan_progress.record_directory
+
+    def record_and_inspect(listing):
+        record_directory(listing)
+        seen.append((file_explorer.path_index, json.loads(file_explorer.to_json())["name"]))
+
+    monkeypatch.setattr(file_explorer.scan_progress, "record_directory", record_and_inspect)
+    file_explorer.build_workspace_directory_tree()
+
+    # The root was visible from the first directory on, before the path index existed
+    assert seen and all(path_index is None and name == workspace.name for path_index, name in seen)
+    assert file_explorer.find_node("src/components/button.ts") is not None
+
+
+@pytest.mark.asyncio
+async def test_background_scan_streams_progress_until_done(workspace: Path):
+    file_explorer = FileExplorer(str(workspace))
+    scan = asyncio.ensure_future(file_explorer.scan_workspace_directory_tree())
+
+    messages = [progress async for progress in file_explorer.scan_progress.watch()]
+    await scan
+
+    assert messages[-1]["status"] == "completed" and messages[-1]["files_scanned"] == 5
+    assert all(message["status"] in ("pending", "scanning") for message in messages[:-1])
+    # Once finished, a new watcher only gets the final state
+    assert [progress async for progress in file_explorer.scan_progress.watch()] == [messages[-1]]
+
+
+def test_failed_build_is_reported(workspace: Path, monkeypatch):
+    file_explorer = FileExplorer(str(workspace))
+    monkeypatch.setattr(file_explorer, "_build_tree", lambda: (_ for _ in ()).throw(OSError("disk gone")))
+
+    with pytest.raises(OSError):
+        file_explorer.build_workspace_directory_tree()
+    assert file_explorer.scan_progress.status == TreeScanStatus.FAILED
+    assert file_explorer.scan_progress.error == "disk gone"
+
+
+def test_progress_counts_are_reset_by_a_new_scan():
+    progress = TreeScanProgress()
+    progress.start()
+    progress.finish()
+    progress.start()
+    assert progress.to_dict()["status"] == "scanning" and not progress.is_finished
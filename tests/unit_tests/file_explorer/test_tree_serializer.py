@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from autobyteus_server.file_explorer.compact_tree import CompactTreeStore
+from autobyteus_server.file_explorer.file_system_changes import (
+    AddChange, DeleteChange, FileSystemChangeEvent, MoveChange, RenameChange
+)
+from autobyteus_server.file_explorer.tree_node import TreeNode
+from autobyteus_server.file_explorer import tree_serializer
+from autobyteus_server.file_explorer.tree_pagination import serialize_tree
+from autobyteus_server.file_explorer.tree_serializer import iter_tree_json, tree_to_json
+
+
+def build_tree(root: TreeNode) -> TreeNode:
+    """
+    root
+        empty
+        src
+            pkg
+                module.py
+                "quoted" é.txt
+        README.md
+    """
+    root.create_child('empty')
+    pkg = root.create_child('src').create_child('pkg')
+    pkg.create_child('module.py', is_file=True)
+    pkg.create_child('"quoted" é.txt', is_file=True)
+    root.create_child('README.md', is_file=True)
+    return root
+
+
+@pytest.fixture(params=["plain", "compact"])
+def root(request) -> TreeNode:
+    if request.param == "plain":
+        return build_tree(TreeNode('root'))
+    store = CompactTreeStore()
+    root = build_tree(store.create_root('root'))
+    store.finish_bulk_load()
+    return root
+
+
+def find(node: TreeNode, name: str) -> TreeNode:
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current.name == name:
+            return current
+        stack.extend(current.children)
+    raise AssertionError(f"{name} not found")
+
+
+def test_tree_to_json_matches_to_dict(root):
+    assert json.loads(tree_to_json(root)) == root.to_dict()
+
+
+def test_subtree_paths_are_relative_to_root(root):
+    pkg = find(root, 'pkg')
+    data = json.loads(tree_to_json(pkg))
+    assert data == pkg.to_dict()
+    assert [child["path"] for child in data["children"]] == ['src/pkg/module.py', 'src/pkg/"quoted" é.txt']
+
+
+def test_max_depth_matches_serialize_tree(root):
+    for max_depth in range(4):
+        assert json.loads(tree_to_json(root, max_depth=max_depth)) == serialize_tree(root, max_depth)
+
+
+def test_include_children_false_writes_only_the_node(root):
+    src = find(root, 'src')
+    assert json.loads(tree_to_json(src, include_children=False)) == {
+        "name": "src", "path": "src", "is_file": False, "children": [], "id": src.id
+    }
+
+
+def test_output_is_compact_and_chunked(root, monkeypatch):
+    monkeypatch.setattr(tree_serializer, '_CHUNK_PARTS', 2)
+    chunks = list(iter_tree_json(root))
+    assert len(chunks) > 1
+    document = ''.join(chunks)
+    assert ', ' not in document and '": ' not in document
+    assert json.loads(document) == root.to_dict()
+
+
+def test_change_event_json_streams_nodes(root):
+    src = find(root, 'src')
+    event = FileSystemChangeEvent(changes=[
+        AddChange(node=src, parent_id=root.id),
+        RenameChange(node=src, parent_id=root.id),
+        MoveChange(node=src, old_parent_id='a', new_parent_id='b'),
+        DeleteChange(node_id='x', parent_id=root.id),
+    ])
+    assert json.loads(event.to_json()) == event.to_dict()
@@ -0,0 +1,131 @@
+import os
+
+import pytest
+
+from autobyteus_server.file_explorer.compact_tree import CompactTreeStore
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.traversal_engine import TraversalEngine, create_directory_traversal
+from autobyteus_server.file_explorer.tree_snapshot import TreeSnapshot, TreeSnapshotCache
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "workspace"
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "module.py").write_text("x = 1")
+    (root / "src" / "main.py").write_text("print()")
+    (root / "docs").mkdir()
+    (root / "docs" / "index.md").write_text("# docs")
+    (root / "build").mkdir()
+    (root / "build" / "out.bin").write_text("")
+    (root / ".gitignore").write_text("build/\n")
+    return root
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TreeSnapshotCache(str(tmp_path / "snapshots"))
+
+
+def tree_paths(explorer: FileExplorer):
+    store = explorer.tree_store
+    return [(path, store.is_file(index)) for index, path in store.iter_subtree(store.root_index)]
+
+
+def fresh_paths(root) -> list:
+    explorer = FileExplorer(str(root))
+    explorer.build_workspace_directory_tree()
+    return tree_paths(explorer)
+
+
+def restored_explorer(root, cache, engine=None) -> FileExplorer:
+    explorer = FileExplorer(str(root), traversal_engine=engine, snapshot_cache=cache)
+    explorer.build_workspace_directory_tree()
+    return explorer
+
+
+def test_store_round_trip():
+    store = CompactTreeStore()
+    root = store.create_root('root')
+    root.create_child('src').create_child('main.py', is_file=True)
+    removed = root.create_child('removed')
+    root.remove_child(removed)
+
+    restored = CompactTreeStore.from_bytes(store.to_bytes())
+
+    assert restored.store_id == store.store_id
+    assert restored.root.to_dict() == store.root.to_dict()
+    assert restored.index_of(removed.id) is None
+    with pytest.raises(ValueError):
+        CompactTreeStore.from_bytes(b'garbage')
+
+
+def test_first_build_saves_snapshot(workspace, cache):
+    explorer = restored_explorer(workspace, cache)
+
+    snapshot = cache.load(str(workspace))
+    assert snapshot is not None
+    assert snapshot.store.root.to_dict() == explorer.root_node.to_dict()
+    assert snapshot.gitignore_hashes.get(snapshot.store.root_index)
+    assert len(snapshot.directory_mtimes) == 4  # root, src, src/pkg, docs
+
+
+def test_unchanged_workspace_is_not_rescanned(workspace, cache):
+    first = restored_explorer(workspace, cache)
+    snapshot = cache.load(str(workspace))
+
+    explorer = FileExplorer(str(workspace), snapshot_cache=cache)
+    traversal = create_directory_traversal(explorer.traversal_engine, file_ignore_strategies=explorer.ignore_strategies,
+                                           directory_listener=snapshot.record_directory)
+    checked, rescanned = snapshot.revalidate(traversal)
+
+    assert (checked, rescanned) == (4, 0)
+    assert snapshot.store.root.to_dict() == first.root_node.to_dict()
+
+
+@pytest.mark.parametrize("traversal_engine", [TraversalEngine.LISTDIR, TraversalEngine.SCANDIR])
+def test_changed_directories_are_rescanned(workspace, cache, traversal_engine):
+    first = restored_explorer(workspace, cache, traversal_engine)
+    module_id = first.find_node(os.path.join("src", "pkg", "module.py")).id
+
+    (workspace / "src" / "pkg" / "new.py").write_text("")
+    (workspace / "docs" / "index.md").unlink()
+    (workspace / "docs" / "guide").mkdir()
+    (workspace / "docs" / "guide" / "intro.md").write_text("")
+    os.rename(workspace / "src" / "main.py", workspace / "src" / "app.py")
+
+    explorer = restored_explorer(workspace, cache, traversal_engine)
+
+    assert tree_paths(explorer) == fresh_paths(workspace)
+    # Nodes of unchanged directories keep their ids across restarts
+    assert explorer.find_node(os.path.join("src", "pkg", "module.py")).id == module_id
+
+
+def test_gitignore_change_rescans_subtree(workspace, cache):
+    restored_explorer(workspace, cache)
+
+    (workspace / ".gitignore").write_text("docs/\n")
+    explorer = restored_explorer(workspace, cache)
+
+    assert explorer.find_node("build") is not None
+    assert explorer.find_node("docs") is None
+    assert tree_paths(explorer) == fresh_paths(workspace)
+
+
+def test_unreadable_snapshot_falls_back_to_full_build(workspace, cache):
+    restored_explorer(workspace, cache)
+    cache.snapshot_path(str(workspace)).write_bytes(b'corrupt')
+
+    explorer = restored_explorer(workspace, cache)
+
+    assert tree_paths(explorer) == fresh_paths(workspace)
+    assert cache.load(str(workspace)) is not None
+
+
+def test_snapshot_of_other_root_is_ignored(workspace, cache, tmp_path):
+    explorer = restored_explorer(workspace, cache)
+    other_root = str(tmp_path / "other")
+    snapshot = TreeSnapshot(other_root, explorer.tree_store)
+    cache.snapshot_path(str(workspace)).write_bytes(snapshot.to_bytes())
+
+    assert cache.load(str(workspace)) is None
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.file_system_watcher import FileSystemWatcher
+from autobyteus_server.file_explorer.watch_backends import InotifyWatchBackend, PollingWatchBackend
+from autobyteus_server.file_explorer.watch_event_pipeline import WatchEventKind, WatchSettings
+
+requires_inotify = pytest.mark.skipif(not InotifyWatchBackend.is_supported(), reason="inotify is not available")
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "workspace"
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "docs").mkdir()
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / ".gitignore").write_text("node_modules/\n")
+    return root
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_polling_reports_changed_directories_and_adapts_interval(workspace):
+    events = []
+    backend = PollingWatchBackend(str(workspace), events.append, min_interval=1, max_interval=4)
+    backend.sync(['', 'src', os.path.join('src', 'pkg')])
+
+    assert backend.poll() == []
+    assert backend.interval == 1.5
+    backend.poll()
+    backend.poll()
+    backend.poll()
+    assert backend.interval == 4
+
+    time.sleep(0.01)
+    (workspace / "src" / "new.py").write_text("")
+    assert backend.poll() == ['src']
+    assert backend.interval == 1
+    assert [(event.kind, event.path) for event in events] == [
+        (WatchEventKind.DIRECTORY_CHANGED, str(workspace / "src"))
+    ]
+    assert backend.get_metrics()["poll_count"] == 5
+
+
+@requires_inotify
+def test_inotify_watches_within_budget_and_polls_the_rest(workspace):
+    events = []
+    backend = InotifyWatchBackend(str(workspace), events.append, watch_budget=2)
+    backend.start(['', 'src', 'docs', os.path.join('src', 'pkg')])
+    try:
+        metrics = backend.get_metrics()
+        assert metrics["watch_count"] == 2
+        assert metrics["polled_directories"] == 2
+
+        (workspace / "src" / "a.py").write_text("")
+        os.rename(workspace / "src" / "a.py", workspace / "src" / "b.py")
+        assert wait_for(lambda: len(events) >= 3)
+        assert [event.kind for event in events[:3]] == [
+            WatchEventKind.CREATED, WatchEventKind.MODIFIED, WatchEventKind.MOVED
+        ]
+        assert events[2].dest_path == str(workspace / "src" / "b.py")
+
+        backend.sync(['', 'docs'])
+        assert backend.watch_count == 2
+        assert backend.poller.directory_count == 0
+    finally:
+        backend.stop()
+
+
+@requires_inotify
+@pytest.mark.asyncio
+async def test_watcher_observes_only_tree_directories(workspace):
+    explorer = FileExplorer(str(workspace))
+    explorer.build_workspace_directory_tree()
+    watcher = FileSystemWatcher(explorer, asyncio.get_running_loop(),
+                                settings=WatchSettings(debounce_seconds=0.02, backend="inotify"))
+    explorer.file_watcher = watcher
+    subscription = explorer.change_hub.subscribe().__aiter__()
+    watcher.start()
+    try:
+        assert sorted(watcher.watched_directories()) == ['', 'docs', 'src', os.path.join('src', 'pkg')]
+        assert watcher.get_metrics()["watch_count"] == 4
+
+        (workspace / "node_modules" / "dep" / "index.js").write_text("")
+        (workspace / "docs" / "new").mkdir()
+        message = json.loads(await asyncio.wait_for(subscription.__anext__(), 2))
+
+        assert [change["node"]["path"] for change in message["changes"]] == [os.path.join("docs", "new")]
+        assert watcher.get_metrics()["watch_count"] == 5
+    finally:
+        watcher.stop()
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import shutil
+
+import pytest
+
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.file_system_changes import (
+    AddChange, DeleteChange, FileSystemChangeEvent, MoveChange, RenameChange
+)
+from autobyteus_server.file_explorer.watch_event_pipeline import (
+    WatchEvent, WatchEventKind, WatchEventPipeline, WatchSettings
+)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "workspace"
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "module.py").write_text("x = 1")
+    (root / "src" / "main.py").write_text("print()")
+    (root / "build").mkdir()
+    (root / ".gitignore").write_text("build/\n*.log\n")
+    return root
+
+
+@pytest.fixture
+def explorer(workspace):
+    explorer = FileExplorer(str(workspace))
+    explorer.build_workspace_directory_tree()
+    return explorer
+
+
+@pytest.fixture
+def published():
+    return []
+
+
+@pytest.fixture
+def pipeline(explorer, published):
+    return WatchEventPipeline(explorer, published.append, settings=WatchSettings(rescan_threshold=5))
+
+
+def tree_paths(explorer: FileExplorer):
+    store = explorer.tree_store
+    return sorted((path, store.is_file(index)) for index, path in store.iter_subtree(store.root_index))
+
+
+def fresh_paths(root) -> list:
+    explorer = FileExplorer(str(root))
+    explorer.build_workspace_directory_tree()
+    return tree_paths(explorer)
+
+
+def event(kind, path, dest_path=None, is_directory=False):
+    return WatchEvent(kind, str(path), is_directory, str(dest_path) if dest_path else None)
+
+
+def test_created_file_is_added_without_touching_its_content(workspace, explorer, pipeline, published):
+    new_file = workspace / "src" / "new.py"
+    new_file.write_text("content")
+    pipeline.submit(event(WatchEventKind.CREATED, new_file))
+
+    change_event = pipeline.flush()
+
+    assert new_file.read_text() == "content"
+    assert published == [change_event]
+    [change] = change_event.changes
+    assert isinstance(change, AddChange)
+    assert change.node.get_path() == os.path.join("src", "new.py")
+    assert change.parent_id == explorer.find_node("src").id
+
+
+def test_created_directory_is_populated(workspace, explorer, pipeline):
+    (workspace / "lib" / "inner").mkdir(parents=True)
+    (workspace / "lib" / "inner" / "a.py").write_text("")
+    pipeline.submit(event(WatchEventKind.CREATED, workspace / "lib", is_directory=True))
+    pipeline.flush()
+
+    assert explorer.find_node(os.path.join("lib", "inner", "a.py")) is not None
+    assert tree_paths(explorer) == fresh_paths(workspace)
+
+
+def test_ignored_paths_are_skipped(workspace, explorer, pipeline, published):
+    (workspace / "debug.log").write_text("")
+    (workspace / "build" / "out.bin").write_text("")
+    (workspace / ".git").mkdir()
+    pipeline.submit(event(WatchEventKind.CREATED, workspace / "debug.log"))
+    pipeline.submit(event(WatchEventKind.CREATED, workspace / "build" / "out.bin"))
+    pipeline.submit(event(WatchEventKind.CREATED, workspace / ".git", is_directory=True))
+
+    assert pipeline.flush() is None
+    assert published == []
+    assert tree_paths(explorer) == fresh_paths(workspace)
+
+
+def test_delete_and_move_update_the_tree(workspace, explorer, pipeline):
+    module_id = explorer.find_node(os.path.join("src", "pkg", "module.py")).id
+    main_node = explorer.find_node(os.path.join("src", "main.py"))
+    pkg_id = explorer.find_node(os.path.join("src", "pkg")).id
+
+    (workspace / "src" / "main.py").unlink()
+    shutil.move(str(workspace / "src" / "pkg"), str(workspace / "pkg"))
+    pipeline.submit(event(WatchEventKind.DELETED, workspace / "src" / "main.py"))
+    pipeline.submit(event(WatchEventKind.MOVED, workspace / "src" / "pkg", workspace / "pkg", is_directory=True))
+    changes = pipeline.flush().changes
+
+    assert isinstance(changes[0], DeleteChange) and changes[0].node_id == main_node.id
+    assert isinstance(changes[1], MoveChange) and changes[1].node.id == pkg_id
+    assert explorer.find_node(os.path.join("pkg", "module.py")).id == module_id
+    assert tree_paths(explorer) == fresh_paths(workspace)
+
+
+def test_rename_within_directory(workspace, explorer, pipeline):
+    os.rename(workspace / "src" / "main.py", workspace / "src" / "app.py")
+    pipeline.submit(event(WatchEventKind.MOVED, workspace / "src" / "main.py", workspace / "src" / "app.py"))
+    [change] = pipeline.flush().changes
+
+    assert isinstance(change, RenameChange)
+    assert change.node.get_path() == os.path.join("src", "app.py")
+
+
+def test_burst_is_coalesced(workspace, explorer, pipeline):
+    # An atomic save: write a temporary file, then rename it over the original
+    temp_file = workspace / "src" / "main.py.tmp"
+    temp_file.write_text("new")
+    pipeline.submit(event(WatchEventKind.CREATED, temp_file))
+    os.replace(temp_file, workspace / "src" / "main.py")
+    pipeline.submit(event(WatchEventKind.MOVED, temp_file, workspace / "src" / "main.py"))
+    # A file created and deleted again
+    scratch = workspace / "scratch.txt"
+    scratch.write_text("")
+    pipeline.submit(event(WatchEventKind.CREATED, scratch))
+    scratch.unlink()
+    pipeline.submit(event(WatchEventKind.DELETED, scratch))
+
+    assert pipeline.flush() is None
+    assert tree_paths(explorer) == fresh_paths(workspace)
+
+
+def test_directory_over_threshold_is_rescanned(workspace, explorer, pipeline):
+    src_id = explorer.find_node("src").id
+    for i in range(10):
+        (workspace / "src" / f"file_{i}.py").write_text("")
+    (workspace / "src" / "main.py").unlink()
+    # Only some of the events arrive, as when the watcher falls behind
+    for i in range(6):
+        pipeline.submit(event(WatchEventKind.CREATED, workspace / "src" / f"file_{i}.py"))
+
+    changes = pipeline.flush().changes
+
+    assert tree_paths(explorer) == fresh_paths(workspace)
+    assert explorer.find_node("src").id == src_id
+    assert sum(isinstance(change, AddChange) for change in changes) == 10
+    assert sum(isinstance(change, DeleteChange) for change in changes) == 1
+
+
+def test_gitignore_change_rescans_directory(workspace, explorer, pipeline):
+    (workspace / ".gitignore").write_text("*.log\n")
+    pipeline.submit(event(WatchEventKind.MODIFIED, workspace / ".gitignore"))
+    pipeline.flush()
+
+    assert explorer.find_node("build") is not None
+    assert tree_paths(explorer) == fresh_paths(workspace)
+
+
+@pytest.mark.asyncio
+async def test_events_are_debounced_into_one_batch(workspace, explorer, published):
+    loop = asyncio.get_running_loop()
+    pipeline = WatchEventPipeline(explorer, published.append,
+                                  settings=WatchSettings(debounce_seconds=0.05, max_delay_seconds=1), loop=loop)
+    for i in range(3):
+        (workspace / f"file_{i}.txt").write_text("")
+        pipeline.submit(event(WatchEventKind.CREATED, workspace / f"file_{i}.txt"))
+        await asyncio.sleep(0.01)
+    assert published == []
+
+    await asyncio.sleep(0.2)
+    assert len(published) == 1
+    assert isinstance(published[0], FileSystemChangeEvent)
+    assert len(published[0].changes) == 3
+
+
+def test_directory_changed_rereads_only_that_directory(workspace, explorer, pipeline):
+    (workspace / "src" / "added.py").write_text("")
+    (workspace / "src" / "pkg" / "unreported.py").write_text("")
+    pipeline.submit(event(WatchEventKind.DIRECTORY_CHANGED, workspace / "src", is_directory=True))
+    [change] = pipeline.flush().changes
+
+    assert change.node.get_path() == os.path.join("src", "added.py")
+    assert explorer.find_node(os.path.join("src", "pkg", "unreported.py")) is None
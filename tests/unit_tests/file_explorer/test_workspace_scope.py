@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.file_explorer.traversal_engine import TraversalEngine
+from autobyteus_server.file_explorer.watch_event_pipeline import WatchEvent, WatchEventKind, WatchEventPipeline
+from autobyteus_server.file_explorer.workspace_scope import WorkspaceScope
+
+
+@pytest.fixture
+def monorepo(tmp_path: Path) -> Path:
+    files = ["services/api/main.py", "services/api/handlers/users.py", "services/web/app.ts",
+             "services/legacy/old.py", "libs/util/strings.py", "README.md", "node_modules/pkg/index.js"]
+    for file in files:
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).write_text("x")
+    return tmp_path
+
+
+def paths(file_explorer: FileExplorer):
+    return sorted(path.replace(os.sep, '/') for path in file_explorer.get_all_file_paths())
+
+
+@pytest.mark.parametrize("traversal_engine", [TraversalEngine.LISTDIR, TraversalEngine.SCANDIR])
+def test_scan_only_loads_the_scope(monorepo: Path, traversal_engine: TraversalEngine):
+    scope = WorkspaceScope(include=("services",), exclude=("services/legacy",), max_depth=3)
+    file_explorer = FileExplorer(str(monorepo), traversal_engine=traversal_engine, scope=scope)
+    file_explorer.build_workspace_directory_tree()
+
+    assert paths(file_explorer) == ["services/api/main.py", "services/web/app.ts"]
+    assert file_explorer.find_files("users") == []
+
+
+def test_scope_change_rereads_only_affected_subtrees(monorepo: Path, monkeypatch):
+    file_explorer = FileExplorer(str(monorepo), scope=WorkspaceScope(include=("services/api",)))
+    file_explorer.build_workspace_directory_tree()
+    api_id = file_explorer.find_node(os.path.join("services", "api")).id
+    rescans = []
+    original_rescan = WatchEventPipeline.rescan
+
+    def recording_rescan(self, relative_dir_path, changes, recursive=True):
+        rescans.append((relative_dir_path, recursive))
+        return original_rescan(self, relative_dir_path, changes, recursive)
+
+    monkeypatch.setattr(WatchEventPipeline, "rescan", recording_rescan)
+    change_event = file_explorer.set_scope(WorkspaceScope(include=("services/api", "services/web")))
+
+    assert paths(file_explorer) == ["services/api/handlers/users.py", "services/api/main.py", "services/web/app.ts"]
+    assert len(change_event.changes) == 1
+    # The api subtree is not read again and keeps its nodes
+    assert all(not recursive for _, recursive in rescans)
+    assert file_explorer.find_node(os.path.join("services", "api")).id == api_id
+    assert file_explorer.find_files("app.ts")[0] == os.path.join("services", "web", "app.ts")
+
+    file_explorer.set_scope(WorkspaceScope())
+    assert "node_modules/pkg/index.js" in paths(file_explorer) and len(paths(file_explorer)) == 7
+
+
+def test_max_files_limits_the_tree(monorepo: Path):
+    file_explorer = FileExplorer(str(monorepo), scope=WorkspaceScope(exclude=("node_modules",), max_files=3))
+    file_explorer.build_workspace_directory_tree()
+
+    assert len(paths(file_explorer)) == 3
+    assert file_explorer.get_scope_status()["truncated"]
+
+
+def test_watcher_ignores_files_outside_of_the_scope(monorepo: Path):
+    file_explorer = FileExplorer(str(monorepo), scope=WorkspaceScope(include=("services/api",)))
+    file_explorer.build_workspace_directory_tree()
+    pipeline = WatchEventPipeline(file_explorer, lambda event: None)
+
+    (monorepo / "services" / "web" / "new.ts").write_text("x")
+    (monorepo / "services" / "api" / "new.py").write_text("x")
+    pipeline.apply([WatchEvent(WatchEventKind.CREATED, str(monorepo / "services" / "web" / "new.ts")),
+                    WatchEvent(WatchEventKind.CREATED, str(monorepo / "services" / "api" / "new.py"))])
+
+    assert paths(file_explorer) == ["services/api/handlers/users.py", "services/api/main.py", "services/api/new.py"]
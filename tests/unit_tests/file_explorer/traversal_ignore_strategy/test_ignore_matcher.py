@@ -0,0 +1,103 @@
+# tests/unit_tests/file_explorer/traversal_ignore_strategy/test_ignore_matcher.py
+
+import os
+import pytest
+
+from autobyteus_server.file_explorer.traversal_ignore_strategy.git_ignore_strategy import GitIgnoreStrategy
+from autobyteus_server.file_explorer.traversal_ignore_strategy.ignore_matcher import (
+    CompiledGitIgnore, GitIgnoreCache, IgnoreMatcher
+)
+from autobyteus_server.file_explorer.traversal_ignore_strategy.specific_folder_ignore_strategy import SpecificFolderIgnoreStrategy
+
+
+GITIGNORE = """
+# comment
+build/
+*.pyc
+!keep.pyc
+/root_only.txt
+docs/**/tmp
+node_modules
+a/b
+"""
+
+CANDIDATES = [
+    ('build', True), ('build', False), ('src/build', True), ('x.pyc', False), ('src/x.pyc', False),
+    ('keep.pyc', False), ('src/keep.pyc', False), ('root_only.txt', False), ('src/root_only.txt', False),
+    ('docs/tmp', True), ('docs/a/b/tmp', True), ('other/tmp', True), ('node_modules', True),
+    ('src/node_modules', False), ('a/b', True), ('src/a/b', True), ('main.py', False),
+]
+
+
+def write_gitignore(folder: str, content: str) -> None:
+    with open(os.path.join(folder, '.gitignore'), 'w') as f:
+        f.write(content)
+
+
+@pytest.mark.parametrize("relative_path, is_dir", CANDIDATES)
+def test_compiled_gitignore_agrees_with_pathspec(tmp_path, relative_path, is_dir):
+    write_gitignore(str(tmp_path), GITIGNORE)
+    strategy = GitIgnoreStrategy(str(tmp_path))
+    compiled = CompiledGitIgnore.from_file(str(tmp_path / '.gitignore'))
+
+    candidate = relative_path + '/' if is_dir else relative_path
+    absolute_path = os.path.join(str(tmp_path), *relative_path.split('/'))
+    assert compiled.matches(candidate) == strategy.should_ignore(absolute_path, is_dir=is_dir)
+
+
+def test_matcher_applies_stacked_gitignores_with_relative_prefixes(tmp_path):
+    write_gitignore(str(tmp_path), '/top.txt\nsub/generated/\n')
+    sub_dir = tmp_path / 'sub'
+    sub_dir.mkdir()
+    write_gitignore(str(sub_dir), '*.log\n')
+
+    root_matcher = IgnoreMatcher.from_strategies([], str(tmp_path)).with_gitignore(str(tmp_path))
+    sub_matcher = root_matcher.descend('sub').with_gitignore(str(sub_dir))
+
+    assert root_matcher.is_ignored('top.txt', str(tmp_path / 'top.txt'), is_dir=False)
+    assert not sub_matcher.is_ignored('top.txt', str(sub_dir / 'top.txt'), is_dir=False)
+    assert sub_matcher.is_ignored('generated', str(sub_dir / 'generated'), is_dir=True)
+    assert not sub_matcher.is_ignored('generated', str(sub_dir / 'generated'), is_dir=False)
+    assert sub_matcher.is_ignored('app.log', str(sub_dir / 'app.log'), is_dir=False)
+    assert not root_matcher.is_ignored('app.log', str(tmp_path / 'app.log'), is_dir=False)
+
+
+def test_matcher_compiles_strategies(tmp_path):
+    write_gitignore(str(tmp_path), 'dist/\n')
+    nested = tmp_path / 'pkg'
+    nested.mkdir()
+    strategies = [SpecificFolderIgnoreStrategy(['.git']), GitIgnoreStrategy(str(tmp_path))]
+
+    matcher = IgnoreMatcher.from_strategies(strategies, str(nested))
+
+    assert matcher.is_ignored('dist', str(nested / 'dist'), is_dir=True)
+    assert matcher.is_ignored('.git', str(nested / '.git'), is_dir=True)
+    assert not matcher.is_ignored('.git', str(nested / '.git'), is_dir=False)
+    # A GitIgnoreStrategy does not apply outside of its root
+    outside = IgnoreMatcher.from_strategies([GitIgnoreStrategy(str(nested))], str(tmp_path))
+    assert not outside.is_ignored('dist', str(tmp_path / 'dist'), is_dir=True)
+
+
+def test_root_gitignore_is_not_applied_twice(tmp_path):
+    write_gitignore(str(tmp_path), '*.tmp\n')
+    matcher = IgnoreMatcher.from_strategies([GitIgnoreStrategy(str(tmp_path))], str(tmp_path))
+    assert matcher.with_gitignore(str(tmp_path)) is matcher
+
+
+def test_cache_reuses_and_revalidates_compiled_files(tmp_path):
+    cache = GitIgnoreCache()
+    write_gitignore(str(tmp_path), '*.tmp\n')
+
+    first = cache.get(str(tmp_path))
+    assert cache.get(str(tmp_path)) is first
+
+    write_gitignore(str(tmp_path), '*.tmp\n*.bak\n')
+    os.utime(tmp_path / '.gitignore', ns=(0, 1))
+    second = cache.get(str(tmp_path))
+    assert second is not first
+    assert second.matches('x.bak')
+
+    write_gitignore(str(tmp_path), '# only comments\n')
+    os.utime(tmp_path / '.gitignore', ns=(0, 2))
+    assert cache.get(str(tmp_path)) is None
+    assert cache.get(str(tmp_path / 'missing')) is None
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from autobyteus_server.file_explorer.traversal_ignore_strategy.scope_ignore_strategy import ScopeIgnoreStrategy
+from autobyteus_server.file_explorer.workspace_scope import WorkspaceScope
+
+ROOT = os.path.join(os.sep, "workspace")
+
+
+def ignored(strategy: ScopeIgnoreStrategy, path: str, is_dir: bool = False) -> bool:
+    return strategy.should_ignore(os.path.join(ROOT, *path.split('/')), is_dir=is_dir)
+
+
+def test_default_scope_ignores_nothing():
+    strategy = ScopeIgnoreStrategy(ROOT)
+    assert not ignored(strategy, "a/b/c/d.py")
+
+
+def test_include_keeps_folders_leading_to_included_files():
+    strategy = ScopeIgnoreStrategy(ROOT, WorkspaceScope(include=("services/api", "packages/*/src/**/*.ts")))
+
+    assert not ignored(strategy, "services", is_dir=True)
+    assert not ignored(strategy, "services/api", is_dir=True)
+    assert not ignored(strategy, "services/api/deep/main.py")
+    assert ignored(strategy, "services/web", is_dir=True)
+    assert ignored(strategy, "README.md")
+
+    assert not ignored(strategy, "packages/ui/src/x", is_dir=True)
+    assert not ignored(strategy, "packages/ui/src/x/button.ts")
+    assert ignored(strategy, "packages/ui/src/x/button.css")
+    assert ignored(strategy, "packages/ui/test", is_dir=True)
+
+
+def test_exclude_and_max_depth():
+    strategy = ScopeIgnoreStrategy(ROOT, WorkspaceScope(exclude=("node_modules", "/build"), max_depth=2))
+
+    assert ignored(strategy, "web/node_modules", is_dir=True)
+    assert ignored(strategy, "build", is_dir=True)
+    assert not ignored(strategy, "web/build", is_dir=True)
+    assert not ignored(strategy, "web/index.ts")
+    assert ignored(strategy, "web/src/index.ts")
+
+
+def test_max_files_admits_files_until_the_limit():
+    tree_files = []
+    strategy = ScopeIgnoreStrategy(ROOT, WorkspaceScope(max_files=2), tree_files=lambda: tree_files)
+
+    assert not ignored(strategy, "a/one.py") and not ignored(strategy, "b/two.py")
+    assert ignored(strategy, "b/three.py") and strategy.truncated
+    # Admitted files stay admitted when their folder is read again
+    assert not ignored(strategy, "a/one.py")
+    # Once full, only folders holding admitted files are read
+    assert not ignored(strategy, "a", is_dir=True)
+    assert ignored(strategy, "c", is_dir=True)
+
+    # A file removed from the tree frees its slot
+    tree_files[:] = ["a/one.py"]
+    strategy.mark_stale()
+    assert not ignored(strategy, "b/three.py")
+
+
+@pytest.mark.parametrize("max_depth, max_files", [(0, None), (None, 0)])
+def test_invalid_limits_are_rejected(max_depth, max_files):
+    with pytest.raises(ValueError):
+        WorkspaceScope(max_depth=max_depth, max_files=max_files)
+
+
+def test_scope_change_reads_only_affected_folders():
+    previous = WorkspaceScope(include=("services/api",), exclude=("services/api/tmp",))
+
+    change = WorkspaceScope(include=("services/api", "services/web")).changes_from(previous)
+    assert not change.full
+    assert change.subtrees == {os.path.join("services", "web"), os.path.join("services", "api", "tmp")}
+    assert change.directories == {"", "services", os.path.join("services", "api")}
+
+    assert WorkspaceScope(include=("services/api",), exclude=("services/api/tmp",), max_depth=3) \
+        .changes_from(previous).depth == 3
+    assert WorkspaceScope(exclude=("services/api/tmp",)).changes_from(previous).full
+    assert WorkspaceScope(include=("services/api",), exclude=("*.log",)).changes_from(previous).full
+    assert previous.changes_from(WorkspaceScope.from_dict(previous.to_dict())).is_empty
@@ -0,0 +1,143 @@
+from pathlib import Path
+
+import pytest
+
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.search import bm25_index
+from autobyteus_server.search.bm25_index import BM25Index, BM25IndexStore
+from autobyteus_server.search.text_tokenizer import tokenize, tokenize_files
+
+
+@pytest.fixture
+def workspace(tmp_path) -> Path:
+    (tmp_path / "auth").mkdir()
+    (tmp_path / "auth" / "login_handler.py").write_text(
+        "def handle_login(user, password):\n    token = create_session_token(user)\n    return token\n",
+        encoding="utf-8")
+    (tmp_path / "auth" / "session.py").write_text(
+        "def create_session_token(user):\n    return sign(user.id)\n", encoding="utf-8")
+    (tmp_path / "billing").mkdir()
+    (tmp_path / "billing" / "invoice.py").write_text(
+        "class Invoice:\n    def total(self):\n        return sum(line.amount for line in self.lines)\n",
+        encoding="utf-8")
+    (tmp_path / "README.md").write_text("Billing and login service.\n", encoding="utf-8")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\x00\x00login login login")
+    return tmp_path
+
+
+@pytest.fixture
+def file_explorer(workspace: Path) -> FileExplorer:
+    file_explorer = FileExplorer(str(workspace))
+    file_explorer.build_workspace_directory_tree()
+    return file_explorer
+
+
+@pytest.fixture(params=["numpy", "python"])
+def scoring(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(bm25_index, "np", None)
+    elif bm25_index.np is None:
+        pytest.skip("numpy is not installed")
+    return request.param
+
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("getUserName = HTTPServer_config2 + x") == [
+        "getusername", "get", "user", "name", "httpserver_config2", "http", "server", "config"]
+    assert tokenize("über_café 42") == ["über_café", "über", "café"]
+
+
+def test_tokenize_files_skips_binary_content(workspace: Path):
+    (logo,) = tokenize_files(str(workspace), ["logo.png"], 1024)
+    assert logo[4] == {"logo": 3, "png": 3}
+    (missing,) = tokenize_files(str(workspace), ["missing.txt"], 1024)
+    assert missing[4] is None
+
+
+def test_search_ranks_by_relevance(file_explorer: FileExplorer, scoring):
+    index = BM25Index(file_explorer)
+    stats = index.refresh()
+    assert stats["files"] == 5 and stats["tokenized"] == 5
+
+    results = index.search("session token")
+    assert [path for path, _ in results][:2] == ["auth/session.py", "auth/login_handler.py"]
+    assert results[0][1] > results[1][1] > 0
+    # Path tokens count: the invoice file is found by its folder name
+    assert index.search("billing invoice")[0][0] == "billing/invoice.py"
+    assert len(index.search("login", limit=1)) == 1
+    assert index.search("unknownterm") == []
+    assert index.search("") == []
+
+
+def test_changed_files_are_updated_incrementally(file_explorer: FileExplorer, scoring, monkeypatch):
+    index = BM25Index(file_explorer)
+    index.refresh()
+
+    tokenized = []
+    original_tokenize_files = bm25_index.tokenize_files
+    monkeypatch.setattr(bm25_index, "tokenize_files",
+                        lambda root, paths, size: tokenized.extend(paths) or original_tokenize_files(root, paths, size))
+
+    file_explorer.write_file_content("billing/refund.py", "def refund(invoice):\n    return invoice.total()\n")
+    file_explorer.write_file_content("auth/session.py", "def expire_cookie(cookie):\n    pass\n")
+    assert index.is_stale
+    stats = index.refresh()
+    assert sorted(tokenized) == ["auth/session.py", "billing/refund.py"]
+    assert stats["checked"] == 2 and stats["files"] == 6
+
+    assert index.search("refund")[0][0] == "billing/refund.py"
+    assert index.search("cookie")[0][0] == "auth/session.py"
+    # The old content of the session file is no longer indexed
+    assert index.search("sign") == []
+
+    file_explorer.remove_file_or_folder("auth")
+    assert index.refresh()["removed"] == 2
+    assert index.search("cookie") == []
+    assert len(index) == 4
+
+
+def test_compaction_keeps_results(file_explorer: FileExplorer, scoring, monkeypatch):
+    index = BM25Index(file_explorer)
+    index.refresh()
+    before = index.search("login session")
+
+    monkeypatch.setattr(bm25_index, "MIN_COMPACTION_DOCUMENTS", 10 ** 6)
+    file_explorer.write_file_content("notes.txt", "session notes")
+    file_explorer.remove_file_or_folder("billing/invoice.py")
+    index.refresh()
+    assert index._delta and index._dead_documents == 1
+    uncompacted = index.search("login session")
+
+    index._compact()
+    assert not index._delta and len(index._paths) == len(index) == 5
+    assert index.search("login session") == uncompacted
+    assert {path for path, _ in uncompacted} == {path for path, _ in before} | {"notes.txt"}
+
+
+def test_index_is_persisted(file_explorer: FileExplorer, tmp_path_factory, monkeypatch):
+    store = BM25IndexStore(str(tmp_path_factory.mktemp("indexes")))
+    index = BM25Index(file_explorer, store=store)
+    index.refresh()
+    assert store.index_path(file_explorer.workspace_root_path).exists()
+    expected = index.search("login session token")
+
+    restored = BM25Index(file_explorer, store=store)
+    monkeypatch.setattr(bm25_index, "tokenize_files", lambda *args: pytest.fail("unchanged files were tokenized"))
+    stats = restored.refresh()
+    assert stats["tokenized"] == 0 and stats["files"] == 5
+    assert restored.search("login session token") == expected
+
+    store.index_path(file_explorer.workspace_root_path).write_bytes(b"garbage")
+    assert store.load(file_explorer.workspace_root_path) is None
+
+
+def test_large_refresh_runs_in_worker_processes(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(bm25_index, "FILES_PER_BATCH", 8)
+    for number in range(bm25_index.INLINE_TOKENIZE_LIMIT + 4):
+        (tmp_path / f"note_{number}.txt").write_text(f"topic{number} shared words", encoding="utf-8")
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.build_workspace_directory_tree()
+
+    index = BM25Index(file_explorer)
+    assert index.refresh()["tokenized"] == bm25_index.INLINE_TOKENIZE_LIMIT + 4
+    assert index.search("topic7")[0][0] == "note_7.txt"
@@ -3,6 +3,7 @@ This module provides tests for the WorkspaceManager.
 """
 
 import os
+import subprocess
 import tempfile
 import asyncio
 import pytest
@@ -13,6 +14,16 @@ from autobyteus_server.workspaces.workspace_manager import WorkspaceManager
 from autobyteus_server.workspaces.workspace_tools.command_executor import CommandExecutor, CommandExecutionResult
 
 
+@pytest.fixture(autouse=True)
+def no_persistence(monkeypatch):
+    """
+    Fixture to keep the workspace manager from writing snapshots, indexes and registry records.
+    """
+    monkeypatch.setenv('FILE_EXPLORER_TREE_SNAPSHOTS', 'false')
+    monkeypatch.setenv('WORKSPACE_INDEX_PERSIST', 'false')
+    monkeypatch.setenv('WORKSPACE_REGISTRY_PERSIST', 'false')
+
+
 @pytest.fixture
 def temp_workspace():
     """
@@ -45,8 +56,8 @@ def test_should_add_workspace_successfully(temp_workspace):
     assert workspace.root_path == temp_workspace
     assert isinstance(manager.get_workspace_by_root_path(temp_workspace), Workspace)
     # Assuming Workspace has a file_explorer attribute with a tree structure
-    assert len(workspace.file_explorer.children) == 1  # As we have created one subdirectory
-    assert workspace.file_explorer.children[0].name == 'test_directory'
+    assert len(workspace.file_explorer.root_node.children) == 1  # As we have created one subdirectory
+    assert workspace.file_explorer.root_node.children[0].name == 'test_directory'
 
 
 def test_should_retrieve_workspace(temp_workspace):
@@ -65,6 +76,75 @@ def test_should_retrieve_workspace(temp_workspace):
     assert workspace.root_path == temp_workspace
 
 
+@pytest.mark.asyncio
+async def test_should_write_file_right_after_adding_workspace_in_background(temp_workspace):
+    """
+    Test that a file operation requested before the background scan ran waits for the tree.
+    """
+    # Arrange
+    manager = WorkspaceManager()
+    workspace = await manager.add_workspace_in_background(temp_workspace)
+
+    # Act
+    await workspace.file_explorer.write_file_content_async(os.path.join('new_directory', 'a.txt'), 'a')
+
+    # Assert
+    with open(os.path.join(temp_workspace, 'new_directory', 'a.txt')) as file:
+        assert file.read() == 'a'
+    assert workspace.file_explorer.find_node(os.path.join('new_directory', 'a.txt')) is not None
+
+def test_should_reload_released_workspace_through_manager(temp_workspace):
+    """
+    Test that a released workspace is loaded again by its manager when its file explorer is requested.
+    """
+    # Arrange
+    os.mkdir(os.path.join(temp_workspace, 'test_directory'))
+    manager = WorkspaceManager()
+    workspace = manager.add_workspace(temp_workspace)
+    workspace.release()
+
+    # Act
+    file_explorer = workspace.get_file_explorer()
+
+    # Assert
+    assert workspace.is_loaded
+    assert file_explorer.snapshot_cache is manager.tree_snapshot_cache
+    assert file_explorer.find_node('test_directory') is not None
+
+
+def test_should_not_load_removed_workspace(temp_workspace):
+    """
+    Test that the file explorer of a released workspace that is no longer registered is not rebuilt.
+    """
+    # Arrange
+    manager = WorkspaceManager()
+    workspace = manager.add_workspace(temp_workspace)
+    manager.remove_workspace(workspace.workspace_id)
+    workspace.release()
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="not loaded"):
+        workspace.get_file_explorer()
+
+def test_should_not_measure_workspaces_on_every_retrieval(temp_workspace):
+    """
+    Test that retrieving a workspace uses the cached memory estimates until a refresh is due.
+    """
+    # Arrange
+    manager = WorkspaceManager()
+    workspace = manager.add_workspace(temp_workspace)
+    assert workspace.get_memory_usage()["total"] > 0
+    manager.memory_budget.refresh_seconds = 3600
+    manager.memory_budget.claim_refresh()
+
+    # Act
+    with patch.object(Workspace, 'refresh_memory_usage', return_value=False) as refresh_memory_usage:
+        for _ in range(10):
+            manager.get_workspace_by_id(workspace.workspace_id)
+
+    # Assert
+    refresh_memory_usage.assert_not_called()
+
 @pytest.mark.asyncio
 async def test_execute_command_success(temp_workspace):
     """
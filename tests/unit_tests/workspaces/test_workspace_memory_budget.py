@@ -0,0 +1,61 @@
+from autobyteus_server.workspaces.workspace_memory_budget import WorkspaceMemoryBudget
+
+
+class WorkspaceStub:
+    def __init__(self, workspace_id: str, total: int = 0, busy: bool = False):
+        self.workspace_id = workspace_id
+        self.total = total
+        self.busy = busy
+        self.is_loaded = True
+
+    def is_busy(self) -> bool:
+        return self.busy
+
+    def get_memory_usage(self) -> dict:
+        return {"total": self.total}
+
+
+def test_least_recently_used_workspaces_are_demoted_beyond_the_count():
+    budget = WorkspaceMemoryBudget(max_loaded=2, max_bytes=0, min_idle_seconds=0)
+    workspaces = [WorkspaceStub("a"), WorkspaceStub("b"), WorkspaceStub("c")]
+    for workspace_id in ("b", "a", "c"):
+        budget.touch(workspace_id)
+
+    assert budget.select_for_demotion(workspaces) == [workspaces[1]]
+
+    workspaces[1].is_loaded = False
+    assert budget.select_for_demotion(workspaces) == []
+
+
+def test_workspaces_are_demoted_until_they_fit_in_memory():
+    budget = WorkspaceMemoryBudget(max_loaded=0, max_bytes=100, min_idle_seconds=0)
+    workspaces = [WorkspaceStub("a", 60), WorkspaceStub("b", 30), WorkspaceStub("c", 50)]
+    for workspace in workspaces:
+        budget.touch(workspace.workspace_id)
+
+    assert budget.select_for_demotion(workspaces) == [workspaces[0]]
+
+
+def test_busy_and_recently_used_workspaces_are_kept():
+    budget = WorkspaceMemoryBudget(max_loaded=1, max_bytes=0, min_idle_seconds=0)
+    workspaces = [WorkspaceStub("a", busy=True), WorkspaceStub("b"), WorkspaceStub("c")]
+    for workspace in workspaces:
+        budget.touch(workspace.workspace_id)
+    assert budget.select_for_demotion(workspaces) == workspaces[1:]
+
+    budget.min_idle_seconds = 60
+    assert budget.select_for_demotion(workspaces) == []
+
+
+def test_no_limits_demote_nothing():
+    budget = WorkspaceMemoryBudget(max_loaded=0, max_bytes=0, min_idle_seconds=0)
+    assert budget.select_for_demotion([WorkspaceStub(str(i), 10 ** 9) for i in range(20)]) == []
+
+
+def test_refresh_is_claimed_once_per_interval():
+    budget = WorkspaceMemoryBudget(max_loaded=0, max_bytes=100, min_idle_seconds=0, refresh_seconds=60)
+    assert budget.claim_refresh()
+    assert not budget.claim_refresh()
+
+    budget.refresh_seconds = 0
+    assert budget.claim_refresh()
@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.search.bm25_index import BM25Index
+from autobyteus_server.workspaces.workspace_tools.context_selector.context_selector import (
+    TRUNCATION_MARKER, ContextSelector, format_context, mentioned_symbols)
+from autobyteus_server.workspaces.workspace_tools.context_selector.token_estimator import (
+    estimate_tokens, truncate_to_tokens)
+from autobyteus_server.workspaces.workspace_tools.workspace_indexer.symbol_index import SymbolIndex
+
+
+class WorkspaceStub:
+    """The parts of a Workspace the selector uses, without its runtime dependencies."""
+
+    def __init__(self, root_path: str):
+        self.root_path = root_path
+        self.file_explorer = FileExplorer(root_path)
+        self.file_explorer.build_workspace_directory_tree()
+        self.search_index = BM25Index(self.file_explorer)
+        self.symbol_index = SymbolIndex(self.file_explorer)
+
+    def get_file_explorer(self):
+        return self.file_explorer
+
+    def get_search_index(self):
+        return self.search_index
+
+    def get_symbol_index(self):
+        return self.symbol_index
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> WorkspaceStub:
+    (tmp_path / "src" / "shop").mkdir(parents=True)
+    (tmp_path / "src" / "shop" / "__init__.py").write_text("", encoding="utf-8")
+    (tmp_path / "src" / "shop" / "cart.py").write_text(
+        "from shop.pricing import apply_discount\nfrom .tax import vat\n\n"
+        "class Cart:\n    def checkout(self):\n        return apply_discount(self.items)\n", encoding="utf-8")
+    (tmp_path / "src" / "shop" / "pricing.py").write_text(
+        "def apply_discount(items):\n    return items\n", encoding="utf-8")
+    (tmp_path / "src" / "shop" / "tax.py").write_text("def vat(amount):\n    return amount\n", encoding="utf-8")
+    (tmp_path / "src" / "shop" / "shipping.py").write_text(
+        "class ShippingQuote:\n    # shipping rates for each carrier\n    pass\n", encoding="utf-8")
+    (tmp_path / "web").mkdir()
+    (tmp_path / "web" / "app.ts").write_text("import { api } from './api';\n", encoding="utf-8")
+    (tmp_path / "web" / "api.ts").write_text("export const api = {};\n", encoding="utf-8")
+    (tmp_path / "docs.md").write_text("Shipping rates are computed per carrier.\n" * 200, encoding="utf-8")
+    return WorkspaceStub(str(tmp_path))
+
+
+def test_token_estimate_and_truncation():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("def get_user(id):") == 7
+    assert estimate_tokens("représentation") > estimate_tokens("representation")
+    text = "line one\n" * 10
+    kept, tokens, truncated = truncate_to_tokens(text, 9)
+    assert kept == "line one\n" * 3 and tokens == 9 and truncated
+    assert truncate_to_tokens(text, 1000) == (text, estimate_tokens(text), False)
+
+
+def test_mentioned_symbols():
+    assert mentioned_symbols("Fix `Cart.checkout` so that apply_discount() uses ShippingQuote and getRates") == [
+        "checkout", "apply_discount", "ShippingQuote", "getRates"]
+    assert mentioned_symbols("Please make it faster") == []
+
+
+def test_rank_combines_signals(workspace: WorkspaceStub):
+    ranked = ContextSelector(workspace).rank("Update the ShippingQuote rates per carrier",
+                                                picked_paths=[os.path.join("src", "shop", "cart.py")])
+    by_path = {ranked_file.path: ranked_file for ranked_file in ranked}
+    shipping = by_path[os.path.join("src", "shop", "shipping.py")]
+    assert ranked[0] is shipping and shipping.signals["symbols"] == 1.0
+    assert by_path["docs.md"].signals["lexical"] > 0
+    # Imports of the picked file, absolute from a src layout and relative
+    assert by_path[os.path.join("src", "shop", "pricing.py")].signals["imports"] == 1.0
+    assert by_path[os.path.join("src", "shop", "tax.py")].signals["imports"] == 1.0
+    assert os.path.join("src", "shop", "cart.py") not in by_path
+    assert all(0 < ranked_file.signals["recency"] <= 1 for ranked_file in ranked)
+
+    script_ranked = ContextSelector(workspace).rank("refactor", picked_paths=[os.path.join("web", "app.ts")])
+    assert [ranked_file.path for ranked_file in script_ranked] == [os.path.join("web", "api.ts")]
+
+
+def test_select_packs_files_into_budget(workspace: WorkspaceStub):
+    selector = ContextSelector(workspace)
+    selected = selector.select("ShippingQuote rates per carrier", token_budget=400)
+    assert selected[0].path == os.path.join("src", "shop", "shipping.py") and not selected[0].truncated
+    docs = next(selected_file for selected_file in selected if selected_file.path == "docs.md")
+    assert docs.truncated and docs.tokens <= 200
+    context = format_context(selected)
+    assert estimate_tokens(context) <= 400
+    assert f"File: docs.md\n" in context and TRUNCATION_MARKER in context
+
+    assert selector.select("ShippingQuote", token_budget=10) == []
+
@@ -0,0 +1,169 @@
+import os
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from autobyteus_server.file_explorer.file_explorer import FileExplorer
+from autobyteus_server.workspaces.workspace_tools.workspace_indexer import symbol_index
+from autobyteus_server.workspaces.workspace_tools.workspace_indexer.symbol_index import SymbolIndex, SymbolStore
+from autobyteus_server.workspaces.workspace_tools.workspace_indexer.symbol_parsers import (
+    JAVASCRIPT_SYMBOL_PARSER, CodeSymbol, PythonSymbolParser)
+
+PYTHON_SOURCE = textwrap.dedent('''
+    import os
+
+    class UserService:
+        """Users."""
+
+        def find_user(self, user_id):
+            def helper():
+                pass
+            return helper()
+
+        async def delete_user(self, user_id):
+            pass
+
+        class Cache:
+            def get(self, key):
+                pass
+
+    def create_user_service():
+        return UserService()
+
+    try:
+        from fast import parse_config
+    except ImportError:
+        def parse_config(path):
+            pass
+''')
+
+
+@pytest.fixture
+def workspace(tmp_path) -> Path:
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "users.py").write_text(PYTHON_SOURCE, encoding="utf-8")
+    (tmp_path / "web").mkdir()
+    (tmp_path / "web" / "button.ts").write_text(
+        "export class Button {\n  render() {\n    return null;\n  }\n}\nexport function createButton() {\n}\n",
+        encoding="utf-8")
+    (tmp_path / "README.md").write_text("# UserService", encoding="utf-8")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "generated.py").write_text("class GeneratedUserService:\n    pass\n", encoding="utf-8")
+    (tmp_path / ".gitignore").write_text("build/\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def file_explorer(workspace: Path) -> FileExplorer:
+    file_explorer = FileExplorer(str(workspace))
+    file_explorer.build_workspace_directory_tree()
+    return file_explorer
+
+
+def test_python_parser_extracts_classes_functions_and_methods():
+    symbols = PythonSymbolParser().parse(PYTHON_SOURCE)
+    assert [(symbol.name, symbol.kind, symbol.container) for symbol in symbols] == [
+        ("UserService", "class", None),
+        ("find_user", "method", "UserService"),
+        ("delete_user", "method", "UserService"),
+        ("Cache", "class", "UserService"),
+        ("get", "method", "UserService.Cache"),
+        ("create_user_service", "function", None),
+        ("parse_config", "function", None),
+    ]
+    assert symbols[0].line == 4 and symbols[0].end_line == 17
+    with pytest.raises(ValueError):
+        PythonSymbolParser().parse("def broken(:\n")
+
+
+def test_brace_language_parser_tracks_classes_and_blocks():
+    symbols = JAVASCRIPT_SYMBOL_PARSER.parse(
+        "export default class Panel extends Base {\n"
+        "  constructor(props) {\n"
+        "    if (props) { super(props); }\n"
+        "  }\n"
+        "  static async load(id) { return fetch(id); }\n"
+        "}\n"
+        "const makePanel = (props) => {\n"
+        "  return new Panel(props);\n"
+        "};\n")
+    assert symbols == [
+        CodeSymbol("Panel", "class", 1, 6, None),
+        CodeSymbol("constructor", "method", 2, 4, "Panel"),
+        CodeSymbol("load", "method", 5, 5, "Panel"),
+        CodeSymbol("makePanel", "function", 7, 9, None),
+    ]
+
+
+def test_search_prefix_exact_and_fuzzy(file_explorer: FileExplorer):
+    index = SymbolIndex(file_explorer)
+    stats = index.refresh()
+
+    assert stats["files"] == 2 and stats["parsed"] == 2
+    # Ignored folders and files without a parser are not indexed
+    assert not any(result["path"].startswith("build") for result in index.search("GeneratedUserService"))
+
+    results = index.search("userservice")
+    assert results[0]["name"] == "UserService" and results[0]["score"] == 100.0
+    assert results[0]["path"] == os.path.join("app", "users.py") and results[0]["line"] == 4
+
+    assert [result["name"] for result in index.search("create")] == ["createButton", "create_user_service"]
+    assert index.search("Cache")[0]["qualified_name"] == "UserService.Cache"
+    assert index.search("render", kind="function") == []
+    assert index.search("usersrvice")[0]["name"] == "UserService"
+    assert index.search("   ") == []
+
+
+def test_only_changed_files_are_parsed(file_explorer: FileExplorer, monkeypatch):
+    index = SymbolIndex(file_explorer)
+    index.refresh()
+    assert not index.is_stale
+
+    parsed = []
+    original_parse = PythonSymbolParser.parse
+    monkeypatch.setattr(PythonSymbolParser, "parse",
+                        lambda self, source: parsed.append(source) or original_parse(self, source))
+
+    file_explorer.write_file_content("app/orders.py", "class OrderService:\n    pass\n")
+    assert index.is_stale
+    stats = index.refresh()
+    assert stats["checked"] == 1 and stats["parsed"] == 1
+    assert index.search("OrderService")[0]["path"] == os.path.join("app", "orders.py")
+
+    # Same content with a new mtime: hashed but not parsed again
+    users_path = Path(file_explorer.workspace_root_path, "app", "users.py")
+    os.utime(users_path, ns=(0, 0))
+    assert index.refresh(full=True)["parsed"] == 0
+    assert len(parsed) == 1
+
+    file_explorer.remove_file_or_folder("app")
+    stats = index.refresh()
+    assert stats["removed"] == 2
+    assert index.search("UserService") == []
+    assert index.search("Button")[0]["name"] == "Button"
+
+
+def test_index_is_persisted_by_content_hash(file_explorer: FileExplorer, tmp_path_factory, monkeypatch):
+    store = SymbolStore(str(tmp_path_factory.mktemp("indexes")))
+    SymbolIndex(file_explorer, store=store).refresh()
+    assert store.index_path(file_explorer.workspace_root_path).exists()
+
+    restored = SymbolIndex(file_explorer, store=store)
+    monkeypatch.setattr(symbol_index, "parse_files", lambda *args: pytest.fail("unchanged files were parsed"))
+    stats = restored.refresh()
+    assert stats["parsed"] == 0 and stats["files"] == 2
+    assert restored.search("find_user")[0]["kind"] == "method"
+
+
+def test_large_refresh_runs_in_worker_processes(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(symbol_index, "FILES_PER_BATCH", 8)
+    for number in range(symbol_index.INLINE_PARSE_LIMIT + 4):
+        (tmp_path / f"module_{number}.py").write_text(f"def function_{number}():\n    pass\n", encoding="utf-8")
+    file_explorer = FileExplorer(str(tmp_path))
+    file_explorer.build_workspace_directory_tree()
+
+    index = SymbolIndex(file_explorer)
+    assert index.refresh()["parsed"] == symbol_index.INLINE_PARSE_LIMIT + 4
+    assert index.search("function_7")[0]["path"] == "module_7.py"
+    assert len(index) == symbol_index.INLINE_PARSE_LIMIT + 4